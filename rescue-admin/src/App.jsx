@@ -9,6 +9,7 @@ import SearchManager from './components/SearchManager';
 import HelpEditor from './components/HelpEditor';
 import Login from './components/Login';
 import { supabase } from './supabase';
+import queryCache from './queryCache';
 import i18n from './i18n';
 
 function App() {
@@ -18,14 +19,22 @@ function App() {
   const [loading, setLoading] = useState(true);
 
   useEffect(() => {
+    let userId = null;
+
     // Session ellenőrzése induláskor
     supabase.auth.getSession().then(({ data: { session } }) => {
+      userId = session?.user?.id || null;
       setSession(session);
       setLoading(false);
     });
 
-    // Figyeljük a változásokat (login/logout)
-    const { data: authListener } = supabase.auth.onAuthStateChange((_event, session) => {
+    // Figyeljük a változásokat (login/logout). A lekérdezés cache a modulban
+    // él: kijelentkezéskor és más felhasználó belépésekor ürítjük, különben az
+    // új felhasználó az előző adatait kapná (RLS ellenőrzés nélkül)
+    const { data: authListener } = supabase.auth.onAuthStateChange((event, session) => {
+      const nextUserId = session?.user?.id || null;
+      if (event === 'SIGNED_OUT' || nextUserId !== userId) queryCache.clear();
+      userId = nextUserId;
       setSession(session);
       setLoading(false);
     });
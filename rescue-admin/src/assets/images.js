@@ -0,0 +1,23 @@
+// rescue_images.py generálja, ne szerkeszd kézzel
+import agriaLogoFallback from './agria_logo.png';
+import agriaLogoW80 from './generated/agria_logo-80w-7d10a69b.webp';
+import agriaLogoW160 from './generated/agria_logo-160w-bb146817.webp';
+import miskolcLogoFallback from './miskolc_logo.png';
+import miskolcLogoW80 from './generated/miskolc_logo-80w-36018e2e.webp';
+import miskolcLogoW160 from './generated/miskolc_logo-160w-75771040.webp';
+import miskolcLogoW320 from './generated/miskolc_logo-320w-97313b31.webp';
+import miskolcLogoW350 from './generated/miskolc_logo-350w-81e233cb.webp';
+
+export const agriaLogo = {
+  srcSet: `${agriaLogoW80} 80w, ${agriaLogoW160} 160w`,
+  fallback: agriaLogoFallback,
+  width: 160,
+  height: 160
+};
+
+export const miskolcLogo = {
+  srcSet: `${miskolcLogoW80} 80w, ${miskolcLogoW160} 160w, ${miskolcLogoW320} 320w, ${miskolcLogoW350} 350w`,
+  fallback: miskolcLogoFallback,
+  width: 350,
+  height: 37
+};
@@ -5,8 +5,9 @@ import { supabase } from '../supabase';
 
 // --- ÚJ: Képek importálása ---
 // FONTOS: Győződj meg róla, hogy a fájlnevek egyeznek a src/assets/ mappában lévőkkel!
-import agriaLogo from '../assets/agria_logo.png'; 
-import miskolcLogo from '../assets/miskolc_logo.png';
+// WebP srcset + PNG fallback (rescue_images.py generálja)
+import { agriaLogo, miskolcLogo } from '../assets/images';
+import ResponsiveImage from './ResponsiveImage';
 
 const Dashboard = ({ session }) => {
   const { t } = useTranslation();
@@ -179,7 +180,7 @@ const Dashboard = ({ session }) => {
           <div style={{ flex: '1 1 300px', display: 'flex', flexDirection: 'column', alignItems: 'center' }}>
             {/* LOGÓ LINKKEL */}
             <a href="https://www.agriaspecmento.hu/" target="_blank" rel="noopener noreferrer" style={{ display: 'block', marginBottom: '1.5rem', transition: 'transform 0.2s' }} onMouseOver={(e) => e.currentTarget.style.transform = 'scale(1.05)'} onMouseOut={(e) => e.currentTarget.style.transform = 'scale(1)'}>
-               <img src={agriaLogo} alt="Agria Speciális Mentő" style={{ maxHeight: '100px', maxWidth: '100%', objectFit: 'contain' }} />
+               <ResponsiveImage image={agriaLogo} sizes="100px" alt="Agria Speciális Mentő" style={{ maxHeight: '100px', maxWidth: '100%', width: 'auto', height: 'auto', objectFit: 'contain' }} />
             </a>
             
             <h4 style={{ marginBottom: '0.5rem', color: '#444' }}>{t('dashboard.concept_title')}</h4>
@@ -190,7 +191,7 @@ const Dashboard = ({ session }) => {
           <div style={{ flex: '1 1 300px', display: 'flex', flexDirection: 'column', alignItems: 'center' }}>
             {/* LOGÓ LINKKEL */}
             <a href="https://mfk.uni-miskolc.hu/" target="_blank" rel="noopener noreferrer" style={{ display: 'block', marginBottom: '1.5rem', transition: 'transform 0.2s' }} onMouseOver={(e) => e.currentTarget.style.transform = 'scale(1.05)'} onMouseOut={(e) => e.currentTarget.style.transform = 'scale(1)'}>
-               <img src={miskolcLogo} alt="Miskolci Egyetem" style={{ maxHeight: '100px', maxWidth: '100%', objectFit: 'contain' }} />
+               <ResponsiveImage image={miskolcLogo} sizes="(max-width: 400px) 100vw, 350px" alt="Miskolci Egyetem" style={{ maxHeight: '100px', maxWidth: '100%', width: 'auto', height: 'auto', objectFit: 'contain' }} />
             </a>
 
             <h4 style={{ marginBottom: '0.5rem', color: '#444' }}>{t('dashboard.development_title')}</h4>
@@ -45,7 +45,7 @@ const HelpEditor = () => {
 
   const loadHelp = async () => {
     try {
-      const { data, error } = await supabase.from('help_content').select('*').order('section', { ascending: true });
+      const { data, error } = await supabase.from('help_content').select('id, section, text_en, text_hu, text_pl, text_ro, text_sk, text_uk').order('section', { ascending: true });
       if (error) throw error;
       console.log('Loaded help content:', data);
       setHelpItems(data || []);
@@ -3,15 +3,23 @@ import { MapContainer, TileLayer, Marker, Popup } from 'react-leaflet';
 import 'leaflet/dist/leaflet.css';
 import { useTranslation } from 'react-i18next';
 import { supabase } from '../supabase';
+import { BASEMAP_URL } from '../basemap';
+import VectorTileLayer from './VectorTileLayer';
+
+// rescue_tiles.py szerver (pl. http://localhost:8765); ha nincs megadva,
+// a régi, teljes táblás betöltés marad
+const TILE_SERVER = import.meta.env.VITE_TILE_SERVER;
 
 const MapComponent = () => {
   const { t } = useTranslation();
   const [markers, setMarkers] = useState([]);
   const [error, setError] = useState(null);
+  const eventId = new URLSearchParams(window.location.search).get('event');
+  const useTiles = Boolean(TILE_SERVER && eventId);
 
   useEffect(() => {
-    loadMarkers();
-  }, []);
+    if (!useTiles) loadMarkers();
+  }, [useTiles]);
 
   const loadMarkers = async () => {
     try {
@@ -30,8 +38,11 @@ const MapComponent = () => {
       <h2>{t('map-h2')}</h2>
       {error && <p style={{ color: 'red' }}>{error}</p>}
       <MapContainer center={[47.4979, 19.0402]} zoom={13} style={{ height: '500px' }}>
-        <TileLayer url="https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png" attribution="© OpenStreetMap" />
-        {markers.map(marker => {
+        <TileLayer url={BASEMAP_URL} attribution="© OpenStreetMap" />
+        {useTiles && (
+          <VectorTileLayer url={`${TILE_SERVER.replace(/\/$/, '')}/tiles/${encodeURIComponent(eventId)}/{z}/{x}/{y}.json`} />
+        )}
+        {!useTiles && markers.map(marker => {
           if (marker.lat_lng && marker.lat_lng.coordinates && Array.isArray(marker.lat_lng.coordinates)) {
             const [lng, lat] = marker.lat_lng.coordinates;
             if (typeof lat === 'number' && typeof lng === 'number') {
@@ -49,4 +60,4 @@ const MapComponent = () => {
   );
 };
 
-export default MapComponent;
\ No newline at end of file
+export default MapComponent;
@@ -4,6 +4,8 @@ import { supabase } from '../supabase';
 import { MapContainer, TileLayer, Marker, Popup } from 'react-leaflet';
 import L from 'leaflet';
 import 'leaflet/dist/leaflet.css';
+import { BASEMAP_URL } from '../basemap';
+import useKeysetPage from '../useKeysetPage';
 
 // Fix for default markers in react-leaflet
 delete L.Icon.Default.prototype._getIconUrl;
@@ -64,7 +66,7 @@ const MapPicker = ({ onLocationSelected, initialPosition, bounds }) => {
       >
         <TileLayer
           attribution='&copy; <a href="https://www.openstreetmap.org/copyright">OpenStreetMap</a> contributors'
-          url="https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png"
+          url={BASEMAP_URL}
         />
         <MapEvents />
         {position && (
@@ -84,9 +86,23 @@ const MapPicker = ({ onLocationSelected, initialPosition, bounds }) => {
   );
 };
 
+const COLUMNS = 'id, age, behavior_category, clothing, event_id, height_cm, location, name, photo_url, prob_zones';
+
+// A térkép nem a lapozott listát követi (az csak az aktuális lap és keresés):
+// külön, korlátos lekérdezés a helyszínnel rendelkező személyekre
+const MAP_COLUMNS = 'id, name, age, clothing, photo_url, location';
+const MAP_LIMIT = 1000;
+
 const MissingPersonsEditor = () => {
   const { t } = useTranslation();
-  const [missingPersons, setMissingPersons] = useState([]);
+  // Lapozott lista: szerver oldali keresés, rendezés, kulcsos lapozás
+  const list = useKeysetPage({
+    table: 'missing_persons',
+    columns: COLUMNS,
+    searchColumns: ['name', 'clothing', 'behavior_category'],
+    initialSort: 'name'
+  });
+  const missingPersons = list.rows;
   const [selectedPerson, setSelectedPerson] = useState(null);
   const [eventId, setEventId] = useState('');
   const [name, setName] = useState('');
@@ -103,15 +119,17 @@ const MissingPersonsEditor = () => {
   const [uploading, setUploading] = useState(false);
   const [showLargeImage, setShowLargeImage] = useState(false);
   const [mapBounds, setMapBounds] = useState(null);
+  const [mapPersons, setMapPersons] = useState([]);
+  const [mapError, setMapError] = useState(null);
 
   useEffect(() => {
-    loadMissing();
     checkCurrentUserRole();
+    loadMapPersons();
   }, []);
 
   useEffect(() => {
     calculateMapBounds();
-  }, [missingPersons]);
+  }, [mapPersons]);
 
   const checkCurrentUserRole = async () => {
     const { data: { user } } = await supabase.auth.getUser();
@@ -121,9 +139,32 @@ const MissingPersonsEditor = () => {
     }
   };
 
+  const loadMapPersons = async () => {
+    const { data, error } = await supabase
+      .from('missing_persons')
+      .select(MAP_COLUMNS)
+      .not('location', 'is', null)
+      .order('id', { ascending: false })
+      .limit(MAP_LIMIT);
+    if (error) {
+      setMapError(error);
+      return;
+    }
+    setMapError(null);
+    setMapPersons(data || []);
+  };
+
+  // Írás után a térkép sorát is frissítjük (újratöltés nélkül)
+  const updateMapPerson = (person) => {
+    setMapPersons((current) => {
+      const rest = current.filter((item) => item.id !== person.id);
+      return person.location ? [person, ...rest] : rest;
+    });
+  };
+
   const calculateMapBounds = () => {
-    if (missingPersons.length > 0) {
-      const validLocations = missingPersons.filter(p => p.location && p.location.lat && p.location.lng);
+    if (mapPersons.length > 0) {
+      const validLocations = mapPersons.filter(p => p.location && p.location.lat && p.location.lng);
       
       if (validLocations.length > 0) {
         const lats = validLocations.map(p => p.location.lat);
@@ -139,16 +180,6 @@ const MissingPersonsEditor = () => {
     }
   };
 
-  const loadMissing = async () => {
-    try {
-      const { data, error } = await supabase.from('missing_persons').select('*');
-      if (error) throw error;
-      setMissingPersons(data || []);
-    } catch (err) {
-      alert('Error: ' + err.message);
-    }
-  };
-
   const uploadPhoto = async () => {
     if (!photoFile) return null;
     
@@ -191,7 +222,7 @@ const MissingPersonsEditor = () => {
         finalPhotoUrl = await uploadPhoto();
       }
 
-      const { error } = await supabase.from('missing_persons').insert({
+      const { data, error } = await supabase.from('missing_persons').insert({
         event_id: eventId || null,
         name: name || null,
         age: age ? parseInt(age) : null,
@@ -201,11 +232,12 @@ const MissingPersonsEditor = () => {
         behavior_category: behaviorCategory || null,
         prob_zones: probZones ? JSON.parse(probZones) : null,
         location: lat && lng ? { lat: parseFloat(lat), lng: parseFloat(lng) } : null
-      });
+      }).select(COLUMNS).single();
       
       if (error) throw error;
       alert(t('missing-create-success'));
-      loadMissing();
+      list.addRow(data);
+      updateMapPerson(data);
       resetForm();
     } catch (err) {
       alert(`${t('missing-create-fail')} ${err.message}`);
@@ -242,14 +274,17 @@ const MissingPersonsEditor = () => {
         updateData.photo_url = finalPhotoUrl;
       }
 
-      const { error } = await supabase
+      const { data, error } = await supabase
         .from('missing_persons')
         .update(updateData)
-        .eq('id', selectedPerson.id);
+        .eq('id', selectedPerson.id)
+        .select(COLUMNS)
+        .single();
       
       if (error) throw error;
       alert(t('missing-update-success'));
-      loadMissing();
+      list.replaceRow(data);
+      updateMapPerson(data);
       resetForm();
     } catch (err) {
       alert(`${t('missing-update-fail')} ${err.message}`);
@@ -267,13 +302,16 @@ const MissingPersonsEditor = () => {
         const { error } = await supabase.from('missing_persons').delete().eq('id', id);
         if (error) throw error;
         alert(t('missing-delete-success'));
-        loadMissing();
+        list.removeRow(id);
+        setMapPersons((current) => current.filter((item) => item.id !== id));
       } catch (err) {
         alert(`${t('missing-delete-fail')} ${err.message}`);
       }
     }
   };
 
+  const sortMark = (column) => (list.sort.column === column ? (list.sort.ascending ? ' ▲' : ' ▼') : '');
+
   const selectPerson = (person) => {
     setSelectedPerson(person);
     setEventId(person.event_id || '');
@@ -345,12 +383,20 @@ const MissingPersonsEditor = () => {
       {['admin', 'coordinator'].includes(currentUserRole) ? (
         <>
           <div style={{ marginBottom: '30px', overflowX: 'auto' }}>
+            <input
+              type="search"
+              value={list.search}
+              onChange={(e) => list.setSearch(e.target.value)}
+              placeholder={t('search-placeholder')}
+              style={{ marginBottom: '10px', padding: '6px', width: '100%', maxWidth: '320px' }}
+            />
+            {list.error && <p style={{ color: 'red' }}>{t('error-loading-list')} {list.error.message}</p>}
             <table style={{ width: '100%', borderCollapse: 'collapse', marginBottom: '20px' }}>
               <thead>
                 <tr style={{ backgroundColor: '#f5f5f5' }}>
-                  <th style={{ padding: '10px', border: '1px solid #ddd', textAlign: 'left' }}>{t('missing-table-name')}</th>
-                  <th style={{ padding: '10px', border: '1px solid #ddd', textAlign: 'left' }}>{t('missing-table-age')}</th>
-                  <th style={{ padding: '10px', border: '1px solid #ddd', textAlign: 'left' }}>{t('missing-table-height')}</th>
+                  <th style={{ padding: '10px', border: '1px solid #ddd', textAlign: 'left', cursor: 'pointer' }} onClick={() => list.toggleSort('name')}>{t('missing-table-name')}{sortMark('name')}</th>
+                  <th style={{ padding: '10px', border: '1px solid #ddd', textAlign: 'left', cursor: 'pointer' }} onClick={() => list.toggleSort('age')}>{t('missing-table-age')}{sortMark('age')}</th>
+                  <th style={{ padding: '10px', border: '1px solid #ddd', textAlign: 'left', cursor: 'pointer' }} onClick={() => list.toggleSort('height_cm')}>{t('missing-table-height')}{sortMark('height_cm')}</th>
                   <th style={{ padding: '10px', border: '1px solid #ddd', textAlign: 'left' }}>{t('missing-table-clothing')}</th>
                   <th style={{ padding: '10px', border: '1px solid #ddd', textAlign: 'left' }}>{t('missing-table-photo')}</th>
                   <th style={{ padding: '10px', border: '1px solid #ddd', textAlign: 'left' }}>{t('missing-table-behavior')}</th>
@@ -399,6 +445,11 @@ const MissingPersonsEditor = () => {
                 ))}
               </tbody>
             </table>
+            <div style={{ display: 'flex', gap: '10px', alignItems: 'center' }}>
+              <button type="button" onClick={list.prev} disabled={!list.hasPrev || list.loading}>{t('prev-page')}</button>
+              <span>{t('page-label')} {list.page}</span>
+              <button type="button" onClick={list.next} disabled={!list.hasNext || list.loading}>{t('next-page')}</button>
+            </div>
           </div>
           
           <div style={{ display: 'grid', gridTemplateColumns: '1fr 1fr', gap: '20px' }}>
@@ -544,6 +595,7 @@ const MissingPersonsEditor = () => {
               
               <div style={{ marginTop: '20px' }}>
                 <h3 style={{ marginBottom: '15px' }}>{t('map-h2')}</h3>
+                {mapError && <p style={{ color: 'red' }}>{t('error-loading-markers')} {mapError.message}</p>}
                 <div style={{ height: '400px', width: '100%' }}>
                   <MapContainer
                     bounds={mapBounds}
@@ -551,9 +603,9 @@ const MissingPersonsEditor = () => {
                   >
                     <TileLayer
                       attribution='&copy; <a href="https://www.openstreetmap.org/copyright">OpenStreetMap</a> contributors'
-                      url="https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png"
+                      url={BASEMAP_URL}
                     />
-                    {missingPersons.map(person => {
+                    {mapPersons.map(person => {
                       if (person.location && person.location.lat && person.location.lng) {
                         return (
                           <Marker
@@ -0,0 +1,17 @@
+// rescue_images.py generálja: WebP srcset, az eredeti kép a fallback
+const ResponsiveImage = ({ image, alt, sizes, ...props }) => (
+  <picture>
+    <source type="image/webp" srcSet={image.srcSet} sizes={sizes} />
+    <img
+      src={image.fallback}
+      width={image.width}
+      height={image.height}
+      alt={alt}
+      loading="lazy"
+      decoding="async"
+      {...props}
+    />
+  </picture>
+);
+
+export default ResponsiveImage;
\ No newline at end of file
@@ -5,6 +5,10 @@ import { MapContainer, TileLayer, Marker, Popup, Polygon, useMap, LayersControl,
 import 'leaflet/dist/leaflet.css';
 import MapPicker from './MapPicker';
 import L from 'leaflet';
+import { decodePolyline } from '../polyline';
+import { BASEMAP_URL } from '../basemap';
+import useEventChanges, { applyRowChanges } from '../useEventChanges';
+import queryCache from '../queryCache';
 
 // Fix for default markers in react-leaflet
 delete L.Icon.Default.prototype._getIconUrl;
@@ -55,6 +59,115 @@ const calculateDistance = (lat1, lon1, lat2, lon2) => {
   return R * c; // Távolság méterben
 };
 
+// map_markers sor -> térkép marker (betöltéskor és realtime változáskor is)
+const toMapMarker = (m) => ({
+  ...m,
+  type: 'map_marker',
+  lat_lng: m.latitude && m.longitude ? { coordinates: [m.longitude, m.latitude] } : null
+});
+
+// polygons sor -> térkép poligon
+const toPolygon = (m) => {
+  let coordinates = null;
+  if (m.coordinates_polyline) {
+    // Normalizált alak (rescue_polygons.py): nincs JSON.parse és regex
+    coordinates = decodePolyline(m.coordinates_polyline).map(([lat, lng]) => [lng, lat]);
+  } else if (m.coordinates) {
+    try {
+      const cleanCoords = m.coordinates.trim().replace(/\s+/g, '');
+      coordinates = JSON.parse(cleanCoords);
+    } catch (e) {
+       // Fallback parsing (maradhat a régi)
+       try {
+        const coordMatches = m.coordinates.match(/\[[^\]]+\]/g);
+        if (coordMatches) {
+          coordinates = coordMatches.map(coordPair => {
+            const numbers = coordPair.match(/-?\d+\.\d+/g);
+            if (numbers && numbers.length === 2) {
+              return [parseFloat(numbers[0]), parseFloat(numbers[1])];
+            }
+            return null;
+          }).filter(Boolean);
+        }
+      } catch (fallbackError) {}
+    }
+  }
+  return {
+    ...m,
+    type: 'polygon',
+    lat_lng: coordinates ? { coordinates } : null
+  };
+};
+
+const GAP_THRESHOLD_MS = 120 * 1000; // 2 perc (millisecben)
+const ACCURACY_THRESHOLD = 50; // Pontosság szűrés
+
+// Egy felhasználó nyomvonala (optimized_user_tracks sor) -> szakaszok
+// időbélyegekkel; null, ha nincs érvényes pont
+const buildUserTrack = (row) => {
+  // Biztonsági ellenőrzések
+  if (!row.user_id || !row.track_points) return null;
+
+  const trackPoints = row.track_points; // Ez jön a View-ból (JSON tömb)
+
+  const segments = [[]]; // Szakaszok tömbje
+  const segmentTimes = [{ start: null, end: null }];
+  
+  let lastTime = null;
+  let isFirstPoint = true;
+
+  trackPoints.forEach(point => {
+    // Null check
+    if (!point) return;
+
+    // 1. Pontosság szűrés
+    // Figyelem: A view-ban 'acc', 'lat', 'lng', 'time' kulcsok vannak!
+    if (point.acc && parseFloat(point.acc) > ACCURACY_THRESHOLD) return;
+    if (!point.lat || !point.lng || !point.time) return;
+
+    const currentTime = new Date(point.time).getTime();
+    const lat = parseFloat(point.lat);
+    const lng = parseFloat(point.lng);
+
+    // 2. Szünet detektálás (Gap detection)
+    if (lastTime) {
+      const diff = currentTime - lastTime;
+      if (diff > GAP_THRESHOLD_MS) {
+        // Új szakaszt nyitunk
+        segments.push([]);
+        segmentTimes.push({ start: currentTime, end: currentTime });
+      }
+    }
+
+    // 3. Pont hozzáadása az aktuális szakaszhoz
+    const currentSegment = segments[segments.length - 1];
+    currentSegment.push([lat, lng]);
+
+    // Idők frissítése
+    const currentTimes = segmentTimes[segmentTimes.length - 1];
+    if (isFirstPoint || currentSegment.length === 1) {
+         currentTimes.start = currentTime;
+         isFirstPoint = false;
+    }
+    currentTimes.end = currentTime;
+
+    lastTime = currentTime;
+  });
+
+  // Csak akkor mentjük, ha van érvényes pont
+  if (segments[0].length === 0) return null;
+  return {
+    segments: segments,
+    segmentTimes: segmentTimes,
+    // A View közvetlenül adja vissza a nevet és telefonszámot
+    userInfo: {
+      full_name: row.user_name || 'Ismeretlen',
+      phone_number: row.user_phone || 'N/A'
+    },
+    lastTime: lastTime
+  };
+};
+
 const SearchManager = () => {
   const { t } = useTranslation();
   const [events, setEvents] = useState([]);
@@ -100,8 +213,11 @@ const SearchManager = () => {
     { value: 'default', label: t('behavior-default') }
   ];
 
-  const cache = useRef(new Map());
+  const currentEventId = useRef(null); // a háttérben érkező válasz még a kiválasztott eseményé-e
   const tracksByUserRef = useRef({});
+  const trackRowsRef = useRef({}); // felhasználónként a nézet sora (realtime pontok hozzáfűzéséhez)
+  const snapshotRef = useRef(null); // { eventId, loads, changes }: a betöltés alatt érkezett változások
+  const applyChangesRef = useRef(null);
 
   useEffect(() => {
     if (selectedPerson) {
@@ -122,75 +238,140 @@ const SearchManager = () => {
   useEffect(() => {
     loadEvents();
     checkCurrentUser();
-    const eventChannel = supabase
-      .channel('search_events_changes')
-      .on('postgres_changes', {
-        event: '*',
-        schema: 'public',
-        table: 'search_events'
-      }, () => {
-        loadEvents();
-      })
-      .subscribe();
-    const missingPersonsChannel = supabase
-      .channel('missing_persons_changes')
-      .on('postgres_changes', {
-        event: '*',
-        schema: 'public',
-        table: 'missing_persons'
-      }, () => {
-        if (selectedEvent) loadMissingPersons(selectedEvent.id);
-      })
-      .subscribe();
-    const participantsChannel = supabase
-      .channel('event_participants_changes')
-      .on('postgres_changes', {
-        event: '*',
-        schema: 'public',
-        table: 'event_participants'
-      }, () => {
-        if (selectedEvent) loadEventParticipants(selectedEvent.id);
-      })
-      .subscribe();
-    const mapMarkersChannel = supabase
-      .channel('map_markers_changes')
-      .on('postgres_changes', {
-        event: '*',
-        schema: 'public',
-        table: 'map_markers'
-      }, () => {
-        if (selectedEvent) loadMarkers(selectedEvent.id);
-      })
-      .subscribe();
-    const polygonsChannel = supabase
-      .channel('polygons_changes')
-      .on('postgres_changes', {
-        event: '*',
-        schema: 'public',
-        table: 'polygons'
-      }, () => {
-        if (selectedEvent) loadMarkers(selectedEvent.id);
-      })
-      .subscribe();
-    const gpsTracksChannel = supabase
-      .channel('gps_tracks_changes')
-      .on('postgres_changes', {
-        event: '*',
-        schema: 'public',
-        table: 'gps_tracks'
-      }, () => {
-        if (selectedEvent) loadMarkers(selectedEvent.id);
-      })
-      .subscribe();
-    return () => {
-      supabase.removeChannel(eventChannel);
-      supabase.removeChannel(missingPersonsChannel);
-      supabase.removeChannel(participantsChannel);
-      supabase.removeChannel(mapMarkersChannel);
-      supabase.removeChannel(polygonsChannel);
-      supabase.removeChannel(gpsTracksChannel);
-    };
-  }, [selectedEvent]);
+  }, []);
+
+  // Egy multiplexelt realtime csatorna: a változások sor szinten, kötegelve
+  // kerülnek az állapotba, újratöltés nélkül
+  useEventChanges(selectedEvent?.id, (changes) => applyEventChanges(changes));
+
+  // Az esemény pillanatképének betöltése. Ami közben a realtime csatornán
+  // érkezik, azt a régebbi pillanatkép felülírná: félretesszük, és az összes
+  // betöltés után még egyszer alkalmazzuk (a sor szintű alkalmazás id szerint
+  // történik, a már benne lévő sorok nem duplázódnak).
+  const loadSnapshot = async (eventId, loads) => {
+    if (snapshotRef.current?.eventId !== eventId) snapshotRef.current = { eventId, loads: 0, changes: {} };
+    const snapshot = snapshotRef.current;
+    snapshot.loads += 1;
+    await Promise.all(loads);
+    snapshot.loads -= 1;
+    if (snapshot.loads || snapshotRef.current !== snapshot) return;
+    snapshotRef.current = null;
+    if (Object.keys(snapshot.changes).length) applyChangesRef.current(snapshot.changes, true);
+  };
+
+  const participantUser = (userId) =>
+    eventParticipants.find((participant) => participant.user_id === userId)?.user || null;
+
+  // A realtime payload csak a tábla oszlopait hozza: a join (user) mezőt az
+  // előző sorból vagy a résztvevők közül pótoljuk
+  const withUser = (row, previous) => ({
+    ...row,
+    user: previous?.user || participantUser(row.user_id)
+  });
+
+  // replay: a betöltés alatt félretett változások (a nyomvonal pontok egy
+  // része már a pillanatképben van)
+  const applyEventChanges = (changes, replay = false) => {
+    const eventId = currentEventId.current;
+    // A cache-ből az esemény azon bejegyzései esnek ki, amelyek a változott táblákból épültek
+    queryCache.invalidateTables(eventId, Object.keys(changes));
+    if (changes.search_events && !replay) {
+      // A törlésre/archiválásra kijelölt esemény (purge_requested_at) kikerül a listából
+      setEvents((current) => applyRowChanges(current, changes.search_events, (row, previous) => ({ ...previous, ...row }))
+        .filter((event) => !event.purge_requested_at));
+    }
+    if (!eventId) return;
+
+    const snapshot = snapshotRef.current;
+    if (snapshot && snapshot.eventId === eventId) {
+      Object.entries(changes).forEach(([table, payloads]) => {
+        if (table !== 'search_events') snapshot.changes[table] = [...(snapshot.changes[table] || []), ...payloads];
+      });
+      return;
+    }
+
+    if (changes.missing_persons) {
+      setMissingPersons((current) => applyRowChanges(current, changes.missing_persons));
+    }
+
+    if (changes.event_participants) {
+      setEventParticipants((current) =>
+        applyRowChanges(current, changes.event_participants, (row, previous) => ({ ...row, user: previous?.user }))
+          .sort((a, b) => String(b.joined_at || '').localeCompare(String(a.joined_at || ''))));
+      // Új résztvevő: a felhasználó adatai egy kéréssel, csak az új sorokra
+      const joined = changes.event_participants
+        .filter((change) => change.eventType === 'INSERT')
+        .map((change) => change.new.id);
+      if (joined.length) loadParticipantUsers(joined);
+    }
+
+    if (changes.map_markers || changes.polygons) {
+      setMarkers((current) => [
+        ...applyRowChanges(current.filter((m) => m.type === 'map_marker'), changes.map_markers,
+          (row, previous) => toMapMarker(withUser(row, previous))),
+        ...applyRowChanges(current.filter((m) => m.type === 'polygon'), changes.polygons,
+          (row, previous) => toPolygon(withUser(row, previous)))
+      ]);
+    }
+
+    if (changes.gps_tracks) {
+      // Az új pontok a felhasználó nyomvonalának végére; csak az érintett
+      // felhasználók szakaszait számoljuk újra
+      const pointsByUser = {};
+      changes.gps_tracks.forEach(({ eventType, new: row }) => {
+        if (eventType !== 'INSERT' || !row?.user_id) return;
+        (pointsByUser[row.user_id] = pointsByUser[row.user_id] || []).push({
+          lat: row.lat, lng: row.lng, acc: row.acc, time: row.time
+        });
+      });
+      Object.entries(pointsByUser).forEach(([userId, received]) => {
+        const user = participantUser(userId);
+        const previous = trackRowsRef.current[userId] || {
+          user_id: userId,
+          event_id: eventId,
+          user_name: user?.full_name,
+          user_phone: user?.phone_number,
+          track_points: []
+        };
+        let points = received;
+        if (replay) {
+          const known = new Set(previous.track_points.map((point) => new Date(point.time).getTime()));
+          points = received.filter((point) => !known.has(new Date(point.time).getTime()));
+          if (!points.length) return;
+        }
+        const trackPoints = [...previous.track_points, ...points];
+        // Késve érkezett pont esetén időrendbe tesszük
+        const offset = previous.track_points.length;
+        const outOfOrder = points.some((point, index) =>
+          offset + index > 0 && new Date(point.time) < new Date(trackPoints[offset + index - 1].time));
+        if (outOfOrder) trackPoints.sort((a, b) => new Date(a.time) - new Date(b.time));
+        const row = { ...previous, track_points: trackPoints };
+        trackRowsRef.current[userId] = row;
+        const track = buildUserTrack(row);
+        if (track) tracksByUserRef.current[userId] = track;
+      });
+      if (Object.keys(pointsByUser).length) {
+        setUserTracks(Object.values(tracksByUserRef.current));
+        }
+    }
+  };
+  applyChangesRef.current = applyEventChanges;
+
+  const loadParticipantUsers = async (ids) => {
+    const { data, error } = await supabase
+      .from('event_participants')
+      .select(`
+        *,
+        user:users(full_name, phone_number, role)
+      `)
+      .in('id', ids);
+    if (error) {
+      console.error('Error loading participant users:', error);
+      return;
+    }
+    setEventParticipants((current) =>
+      applyRowChanges(current, (data || []).map((row) => ({ eventType: 'UPDATE', new: row }))));
+  };
 
   const checkCurrentUser = async () => {
     try {
@@ -224,22 +405,24 @@ const SearchManager = () => {
 
   const loadEvents = async () => {
     try {
-      setLoading(true);
       setError(null);
       const cacheKey = 'events';
-      const cached = cache.current.get(cacheKey);
+      const cached = queryCache.read(cacheKey);
       
       if (cached) {
-        setEvents(cached);
-        setLoading(false);
-        return;
+        // Elavult bejegyzés: a régi listát mutatjuk, és a háttérben frissítünk
+        setEvents(cached.value);
+        if (!cached.stale) return;
+      } else {
+        setLoading(true);
       }
 
       console.log('Loading events from Supabase...');
       
       const { data, error } = await supabase
         .from('search_events')
-        .select('*');
+        .select('id, name, start_time, status')
+        .is('purge_requested_at', null); // a törlés/archiválás alatt állók nélkül
 
       if (error) {
         console.error('Supabase error:', error);
@@ -255,13 +438,14 @@ const SearchManager = () => {
         
         console.log('Events loaded with simple query:', simpleData);
         setEvents(simpleData || []);
-        cache.current.set(cacheKey, simpleData || []);
+        queryCache.write(cacheKey, simpleData || [], { tables: ['search_events'] });
       } else {
         console.log('Events loaded successfully:', data);
         setEvents(data || []);
-        cache.current.set(cacheKey, data || []);
+        queryCache.write(cacheKey, data || [], { tables: ['search_events'] });
       }
     } catch (err) {
+      queryCache.release('events');
       console.error('Error loading events:', err);
       setError(t('error-loading-events'));
       setEvents([]);
@@ -273,23 +457,24 @@ const SearchManager = () => {
   const loadMissingPersons = async (eventId) => {
     try {
       const cacheKey = `missing-persons-${eventId}`;
-      const cached = cache.current.get(cacheKey);
+      const cached = queryCache.read(cacheKey);
       
       if (cached) {
-        setMissingPersons(cached);
-        return;
+        setMissingPersons(cached.value);
+        if (!cached.stale) return;
       }
 
       const { data, error } = await supabase
         .from('missing_persons')
-        .select('*')
+        .select('id, age, behavior_category, clothing, height_cm, location, name, photo_url, prob_zones')
         .eq('event_id', eventId);
       
       if (error) throw error;
       
-      setMissingPersons(data || []);
-      cache.current.set(cacheKey, data || []);
+      queryCache.write(cacheKey, data || [], { eventId, tables: ['missing_persons'] });
+      if (currentEventId.current === eventId) setMissingPersons(data || []);
     } catch (err) {
+      queryCache.release(`missing-persons-${eventId}`);
       console.error('Error loading missing persons:', err);
       setError(t('error-loading-missing-persons'));
     }
@@ -298,11 +483,11 @@ const SearchManager = () => {
   const loadEventParticipants = async (eventId) => {
     try {
       const cacheKey = `event-participants-${eventId}`;
-      const cached = cache.current.get(cacheKey);
+      const cached = queryCache.read(cacheKey);
       
       if (cached) {
-        setEventParticipants(cached);
-        return;
+        setEventParticipants(cached.value);
+        if (!cached.stale) return;
       }
 
       const { data, error } = await supabase
@@ -316,9 +501,10 @@ const SearchManager = () => {
 
       if (error) throw error;
       
-      setEventParticipants(data || []);
-      cache.current.set(cacheKey, data || []);
+      queryCache.write(cacheKey, data || [], { eventId, tables: ['event_participants'] });
+      if (currentEventId.current === eventId) setEventParticipants(data || []);
     } catch (err) {
+      queryCache.release(`event-participants-${eventId}`);
       console.error('Error loading event participants:', err);
       setError(t('error-loading-participants'));
     }
@@ -327,17 +513,14 @@ const SearchManager = () => {
   const loadMarkers = async (eventId) => {
     try {
       const cacheKey = `markers-${eventId}`;
-      const cached = cache.current.get(cacheKey);
+      const cached = queryCache.read(cacheKey);
      
       if (cached) {
-        // Megjegyzés: A cache struktúrát érdemes lehet frissíteni, 
-        // de most egyszerűsítve kezeljük a meglévő logikával.
-        setMarkers(cached.allMarkers);
-        // Ha a cache-ben elmentettük a trackeket is:
-        if (cached.optimizedTracks) {
-            processUserTracks(cached.optimizedTracks);
-        }
-        return;
+        // A bejegyzés ugyanazokat a tömböket tartja, mint az állapot
+        // (allMarkers, a nézet sorai), így a kiválasztott esemény nincs kétszer a memóriában
+        setMarkers(cached.value.allMarkers);
+        processUserTracks(cached.value.optimizedTracks);
+        if (!cached.stale) return;
       }
 
       const [
@@ -367,50 +550,22 @@ const SearchManager = () => {
       
       // A térkép markerek feldolgozása (ez maradt a régi)
       const allMarkers = [
-        ...(mapMarkers || []).map(m => ({
-          ...m,
-          type: 'map_marker',
-          lat_lng: m.latitude && m.longitude ? { coordinates: [m.longitude, m.latitude] } : null
-        })),
-        ...(polygons || []).map(m => {
-          let coordinates = null;
-          if (m.coordinates) {
-            try {
-              const cleanCoords = m.coordinates.trim().replace(/\s+/g, '');
-              coordinates = JSON.parse(cleanCoords);
-            } catch (e) {
-               // Fallback parsing (maradhat a régi)
-               try {
-                const coordMatches = m.coordinates.match(/\[[^\]]+\]/g);
-                if (coordMatches) {
-                  coordinates = coordMatches.map(coordPair => {
-                    const numbers = coordPair.match(/-?\d+\.\d+/g);
-                    if (numbers && numbers.length === 2) {
-                      return [parseFloat(numbers[0]), parseFloat(numbers[1])];
-                    }
-                    return null;
-                  }).filter(Boolean);
-                }
-              } catch (fallbackError) {}
-            }
-          }
-          return {
-            ...m,
-            type: 'polygon',
-            lat_lng: coordinates ? { coordinates } : null
-          };
-        })
+        ...(mapMarkers || []).map(toMapMarker),
+        ...(polygons || []).map(toPolygon)
       ];
       
+      // Cache frissítése
+      queryCache.write(cacheKey, { allMarkers, optimizedTracks: optimizedTracks || [] },
+        { eventId, tables: ['map_markers', 'polygons', 'gps_tracks'] });
+      if (currentEventId.current !== eventId) return; // közben másik eseményt választottak
+
       setMarkers(allMarkers || []);
       
       // A trackeket külön dolgozzuk fel az új függvénnyel
       processUserTracks(optimizedTracks || []);
 
-      // Cache frissítése
-      cache.current.set(cacheKey, { allMarkers, optimizedTracks });
-
     } catch (err) {
+      queryCache.release(`markers-${eventId}`);
       console.error('Error loading markers:', err);
       setError(t('error-loading-markers'));
     }
@@ -420,8 +575,7 @@ const SearchManager = () => {
   // --- OKOSÍTOTT NYOMVONAL FELDOLGOZÁS (Webes verzió) ---
   const processUserTracks = (optimizedData) => {
     const tracksByUser = {};
-    const GAP_THRESHOLD_MS = 120 * 1000; // 2 perc (millisecben)
-    const ACCURACY_THRESHOLD = 50; // Pontosság szűrés
+    const trackRows = {};
 
     if (!Array.isArray(optimizedData)) {
         console.warn("processUserTracks: nem tömböt kapott", optimizedData);
@@ -429,72 +583,13 @@ const SearchManager = () => {
     }
 
     optimizedData.forEach(row => {
-      // Biztonsági ellenőrzések
-      if (!row.user_id || !row.track_points) return;
-
-      const userId = row.user_id;
-      const trackPoints = row.track_points; // Ez jön a View-ból (JSON tömb)
-
-      const segments = [[]]; // Szakaszok tömbje
-      const segmentTimes = [{ start: null, end: null }];
-      
-      let lastTime = null;
-      let isFirstPoint = true;
-
-      trackPoints.forEach(point => {
-        // Null check
-        if (!point) return;
-
-        // 1. Pontosság szűrés
-        // Figyelem: A view-ban 'acc', 'lat', 'lng', 'time' kulcsok vannak!
-        if (point.acc && parseFloat(point.acc) > ACCURACY_THRESHOLD) return;
-        if (!point.lat || !point.lng || !point.time) return;
-
-        const currentTime = new Date(point.time).getTime();
-        const lat = parseFloat(point.lat);
-        const lng = parseFloat(point.lng);
-
-        // 2. Szünet detektálás (Gap detection)
-        if (lastTime) {
-          const diff = currentTime - lastTime;
-          if (diff > GAP_THRESHOLD_MS) {
-            // Új szakaszt nyitunk
-            segments.push([]);
-            segmentTimes.push({ start: currentTime, end: currentTime });
-          }
-        }
-
-        // 3. Pont hozzáadása az aktuális szakaszhoz
-        const currentSegment = segments[segments.length - 1];
-        currentSegment.push([lat, lng]);
-
-        // Idők frissítése
-        const currentTimes = segmentTimes[segmentTimes.length - 1];
-        if (isFirstPoint || currentSegment.length === 1) {
-             currentTimes.start = currentTime;
-             isFirstPoint = false;
-        }
-        currentTimes.end = currentTime;
-
-        lastTime = currentTime;
-      });
-
-      // Csak akkor mentjük, ha van érvényes pont
-      if (segments[0].length > 0) {
-        tracksByUser[userId] = {
-          segments: segments,
-          segmentTimes: segmentTimes,
-          // A View közvetlenül adja vissza a nevet és telefonszámot
-          userInfo: {
-            full_name: row.user_name || 'Ismeretlen',
-            phone_number: row.user_phone || 'N/A'
-          },
-          lastTime: lastTime
-        };
-      }
+      const track = buildUserTrack(row);
+      if (track) tracksByUser[row.user_id] = track;
+      if (row.user_id) trackRows[row.user_id] = row;
     });
 
     tracksByUserRef.current = tracksByUser;
+    trackRowsRef.current = trackRows;
     setUserTracks(Object.values(tracksByUser));
   };
 
@@ -514,7 +609,7 @@ const SearchManager = () => {
       });
       if (error) throw error;
       alert(t('event-create-success'));
-      cache.current.delete('events');
+      queryCache.invalidate('events');
       loadEvents();
       resetEventForm();
     } catch (err) {
@@ -539,7 +634,7 @@ const SearchManager = () => {
         .eq('id', editingEvent.id);
       if (error) throw error;
       alert(t('event-update-success'));
-      cache.current.delete('events');
+      queryCache.invalidate('events');
       loadEvents();
       resetEventForm();
     } catch (err) {
@@ -550,63 +645,22 @@ const SearchManager = () => {
     }
   };
 
-  const deleteEvent = async (id) => {
+  const deleteEvent = async (id, mode = 'delete') => {
     if (!['admin', 'coordinator'].includes(currentUserRole)) {
       alert(t('permission-denied'));
       return;
     }
    
-    if (window.confirm(t('confirm-delete'))) {
+    const question = mode === 'archive' ? t('confirm-archive') : t('confirm-delete');
+    if (window.confirm(question)) {
       try {
         setLoading(true);
-       
-        const { error: missingError } = await supabase
-          .from('missing_persons')
-          .delete()
-          .eq('event_id', id);
-       
-        if (missingError && missingError.code !== '42P01') {
-          console.error('Error deleting missing persons:', missingError);
-        }
-       
-        const { error: participantsError } = await supabase
-          .from('event_participants')
-          .delete()
-          .eq('event_id', id);
-       
-        if (participantsError && participantsError.code !== '42P01') {
-          console.error('Error deleting participants:', participantsError);
-        }
-       
-        try {
-          const [
-            { error: mapMarkersError },
-            { error: polygonsError },
-            { error: gpsTracksError }
-          ] = await Promise.all([
-            supabase.from('map_markers').delete().eq('event_id', id),
-            supabase.from('polygons').delete().eq('event_id', id),
-            supabase.from('gps_tracks').delete().eq('event_id', id)
-          ]);
-         
-          if (mapMarkersError && mapMarkersError.code !== '42P01') {
-            console.error('Error deleting map markers:', mapMarkersError);
-          }
-          if (polygonsError && polygonsError.code !== '42P01') {
-            console.error('Error deleting polygons:', polygonsError);
-          }
-          if (gpsTracksError && gpsTracksError.code !== '42P01') {
-            console.error('Error deleting GPS tracks:', gpsTracksError);
-          }
-        } catch (markersErr) {
-          console.warn('Marker tables might not exist:', markersErr);
-        }
-       
-        const { error } = await supabase
-          .from('search_events')
-          .delete()
-          .eq('id', id);
-       
+
+        // A sorok törlése a szerveren fut kötegekben (rescue_purge.py); az
+        // esemény azonnal eltűnik a listákból, és a törlés a lap bezárása
+        // után is befejeződik
+        const { error } = await supabase.rpc('request_event_purge', { p_event_id: id, p_mode: mode });
+
         if (error) {
           if (error.code === '42501') {
             alert(t('permission-denied-delete'));
@@ -614,14 +668,22 @@ const SearchManager = () => {
             throw error;
           }
         } else {
-          alert(t('event-delete-success'));
-          cache.current.delete('events');
-          loadEvents();
+          alert(mode === 'archive'
+            ? t('event-archive-started')
+            : t('event-delete-success'));
+          setEvents((current) => current.filter((event) => event.id !== id));
+          queryCache.invalidate('events');
+          queryCache.invalidateEvent(id);
           if (selectedEvent?.id === id) {
             setSelectedEvent(null);
+            currentEventId.current = null;
+            snapshotRef.current = null;
+            tracksByUserRef.current = {};
+            trackRowsRef.current = {};
             setMissingPersons([]);
             setEventParticipants([]);
             setMarkers([]);
+            setUserTracks([]);
           }
         }
       } catch (err) {
@@ -639,7 +701,7 @@ const SearchManager = () => {
       
       const { data: existingParticipants, error: checkError } = await supabase
         .from('event_participants')
-        .select('*')
+        .select('id')
         .eq('event_id', eventId)
         .eq('user_id', currentUserId);
       
@@ -670,7 +732,7 @@ const SearchManager = () => {
         alert(t('event-join-success'));
       }
       
-      cache.current.delete(`event-participants-${eventId}`);
+      queryCache.invalidate(`event-participants-${eventId}`);
       loadEventParticipants(eventId);
     } catch (err) {
       console.error('Error joining event:', err);
@@ -691,7 +753,7 @@ const SearchManager = () => {
       
       if (error) throw error;
       alert(t('event-leave-success'));
-      cache.current.delete(`event-participants-${eventId}`);
+      queryCache.invalidate(`event-participants-${eventId}`);
       loadEventParticipants(eventId);
     } catch (err) {
       console.error('Error leaving event:', err);
@@ -730,7 +792,7 @@ const SearchManager = () => {
       
       if (error) throw error;
       alert(t('participant-status-update-success'));
-      cache.current.delete(`event-participants-${selectedEvent.id}`);
+      queryCache.invalidate(`event-participants-${selectedEvent.id}`);
       loadEventParticipants(selectedEvent.id);
     } catch (err) {
       console.error('Error updating participant status:', err);
@@ -791,7 +853,7 @@ const SearchManager = () => {
       });
       if (error) throw error;
       alert(t('missing-create-success'));
-      cache.current.delete(`missing-persons-${selectedEvent.id}`);
+      queryCache.invalidate(`missing-persons-${selectedEvent.id}`);
       loadMissingPersons(selectedEvent.id);
       resetPersonForm();
     } catch (err) {
@@ -903,7 +965,7 @@ const SearchManager = () => {
       if (error) throw error;
       
       alert(t('missing-update-success'));
-      cache.current.delete(`missing-persons-${selectedEvent.id}`);
+      queryCache.invalidate(`missing-persons-${selectedEvent.id}`);
       loadMissingPersons(selectedEvent.id);
       resetPersonForm();
       
@@ -926,7 +988,7 @@ const SearchManager = () => {
         const { error } = await supabase.from('missing_persons').delete().eq('id', id);
         if (error) throw error;
         alert(t('missing-delete-success'));
-        cache.current.delete(`missing-persons-${selectedEvent.id}`);
+        queryCache.invalidate(`missing-persons-${selectedEvent.id}`);
         loadMissingPersons(selectedEvent.id);
         resetPersonForm();
       } catch (err) {
@@ -941,9 +1003,11 @@ const SearchManager = () => {
   const selectEvent = (event) => {
     console.log('Selected event:', event);
     setSelectedEvent(event);
-    loadMissingPersons(event.id);
-    loadEventParticipants(event.id);
-    loadMarkers(event.id);
+    currentEventId.current = event.id;
+    // az előző esemény nyomvonalaihoz nem fűzhetünk pontot
+    tracksByUserRef.current = {};
+    trackRowsRef.current = {};
+    loadSnapshot(event.id, [loadMissingPersons(event.id), loadEventParticipants(event.id), loadMarkers(event.id)]);
     resetPersonForm();
   };
 
@@ -1178,6 +1242,12 @@ const SearchManager = () => {
                           >
                             {t('update-event-btn')}
                           </button>
+                          <button
+                            className="bg-gray-500 text-white px-2 py-1 rounded mr-2 mb-1"
+                            onClick={() => deleteEvent(event.id, 'archive')}
+                          >
+                            {t('archive-event-btn')}
+                          </button>
                           <button
                             className="bg-red-500 text-white px-2 py-1 rounded mb-1"
                             onClick={() => deleteEvent(event.id)}
@@ -1268,10 +1338,9 @@ const SearchManager = () => {
                   className="px-3 py-1 rounded bg-blue-500 text-white hover:bg-blue-600"
                   onClick={() => {
                     if (selectedEvent) {
-                      cache.current.delete(`markers-${selectedEvent.id}`);
-                      cache.current.delete(`event-participants-${selectedEvent.id}`);
-                      loadMarkers(selectedEvent.id);
-                      loadEventParticipants(selectedEvent.id);
+                      queryCache.invalidate(`markers-${selectedEvent.id}`);
+                      queryCache.invalidate(`event-participants-${selectedEvent.id}`);
+                      loadSnapshot(selectedEvent.id, [loadMarkers(selectedEvent.id), loadEventParticipants(selectedEvent.id)]);
                     }
                   }}
                   disabled={loading || !selectedEvent}
@@ -1288,7 +1357,7 @@ const SearchManager = () => {
                   <LayersControl.BaseLayer checked={mapLayers.openstreetmap} name={t('openstreetmap-layer') || 'OpenStreetMap'}>
                     <TileLayer
                       attribution='&copy; <a href="https://www.openstreetmap.org/copyright">OpenStreetMap</a> contributors'
-                      url="https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png"
+                      url={BASEMAP_URL}
                       maxZoom={19}
                     />
                   </LayersControl.BaseLayer>
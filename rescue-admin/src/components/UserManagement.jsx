@@ -1,10 +1,12 @@
 import { useState, useEffect } from 'react';
 import { useTranslation } from 'react-i18next';
 import { supabase } from '../supabase';
+import useKeysetPage from '../useKeysetPage';
+
+const COLUMNS = 'id, active, email, full_name, phone_number, role';
 
 const UserManagement = () => {
   const { t } = useTranslation();
-  const [users, setUsers] = useState([]);
   const [selectedUser, setSelectedUser] = useState(null);
   const [fullName, setFullName] = useState('');
   const [phone, setPhone] = useState('');
@@ -16,6 +18,15 @@ const UserManagement = () => {
   const [loading, setLoading] = useState(true);
   const [editingRow, setEditingRow] = useState(null); // Track which row is being edited
   const [editValues, setEditValues] = useState({}); // Store temporary edit values
+  // Lapozott lista: szerver oldali keresés, szűrés, rendezés, kulcsos lapozás
+  const list = useKeysetPage({
+    table: 'users',
+    columns: COLUMNS,
+    searchColumns: ['full_name', 'email', 'phone_number'],
+    initialSort: 'full_name',
+    enabled: ['admin', 'coordinator'].includes(currentUserRole)
+  });
+  const users = list.rows;
 
   useEffect(() => {
     checkCurrentUserRole();
@@ -26,23 +37,10 @@ const UserManagement = () => {
   if (user) {
     const role = user.user_metadata?.role;
     setCurrentUserRole(role);
-    if (['admin', 'coordinator'].includes(role)) {
-      loadUsers();
-    }
   }
   setLoading(false);
 };
 
-  const loadUsers = async () => {
-    try {
-      const { data, error } = await supabase.from('users').select('*');
-      if (error) throw error;
-      setUsers(data || []);
-    } catch (err) {
-      alert('Error: ' + err.message);
-    }
-  };
-
   const createUser = async (e) => {
     e.preventDefault();
     if (!['admin', 'coordinator'].includes(currentUserRole)) {
@@ -58,17 +56,17 @@ const UserManagement = () => {
         }
       });
       if (authError) throw authError;
-      const { error } = await supabase.from('users').insert({
+      const { data, error } = await supabase.from('users').insert({
         id: authData.user.id,
         full_name: fullName,
         phone_number: phone,
         role,
         email,
         active
-      });
+      }).select(COLUMNS).single();
       if (error) throw error;
       alert(t('user-create-success'));
-      loadUsers();
+      list.addRow(data);
       resetForm();
     } catch (err) {
       alert(`${t('user-create-fail')} ${err.message}`);
@@ -87,10 +85,10 @@ const UserManagement = () => {
         const { error: pwError } = await supabase.auth.updateUser({ password });
         if (pwError) throw pwError;
       }
-      const { error } = await supabase.from('users').update(updates).eq('id', selectedUser.id);
+      const { data, error } = await supabase.from('users').update(updates).eq('id', selectedUser.id).select(COLUMNS).single();
       if (error) throw error;
       alert(t('user-update-success'));
-      loadUsers();
+      list.replaceRow(data);
       resetForm();
     } catch (err) {
       alert(`${t('user-update-fail')} ${err.message}`);
@@ -109,10 +107,10 @@ const UserManagement = () => {
         role: editValues[userId]?.role || users.find(u => u.id === userId).role,
         active: editValues[userId]?.active ?? users.find(u => u.id === userId).active
       };
-      const { error } = await supabase.from('users').update(updates).eq('id', userId);
+      const { data, error } = await supabase.from('users').update(updates).eq('id', userId).select(COLUMNS).single();
       if (error) throw error;
       alert(t('user-update-success'));
-      loadUsers();
+      list.replaceRow(data);
       setEditingRow(null); // Exit edit mode
       setEditValues(prev => {
         const newValues = { ...prev };
@@ -134,7 +132,7 @@ const UserManagement = () => {
         const { error } = await supabase.from('users').delete().eq('id', id);
         if (error) throw error;
         alert(t('user-delete-success'));
-        loadUsers();
+        list.removeRow(id);
       } catch (err) {
         alert(`${t('user-delete-fail')} ${err.message}`);
       }
@@ -184,6 +182,8 @@ const UserManagement = () => {
     });
   };
 
+  const sortMark = (column) => (list.sort.column === column ? (list.sort.ascending ? ' ▲' : ' ▼') : '');
+
   if (loading) {
     return <div>{t('loading')}</div>;
   }
@@ -195,14 +195,34 @@ const UserManagement = () => {
   return (
     <section>
       <h2>{t('users-manager-h2')}</h2>
+      <div className="list-filters">
+        <input
+          type="search"
+          value={list.search}
+          onChange={(e) => list.setSearch(e.target.value)}
+          placeholder={t('search-placeholder')}
+        />
+        <select value={list.filters.role || ''} onChange={(e) => list.setFilter('role', e.target.value)}>
+          <option value="">{t('all-roles')}</option>
+          <option value="searcher">{t('role-searcher')}</option>
+          <option value="coordinator">{t('role-coordinator')}</option>
+          <option value="admin">{t('role-admin')}</option>
+        </select>
+        <select value={list.filters.active ?? ''} onChange={(e) => list.setFilter('active', e.target.value)}>
+          <option value="">{t('user-table-active')}: –</option>
+          <option value="true">{t('yes')}</option>
+          <option value="false">{t('no')}</option>
+        </select>
+      </div>
+      {list.error && <p style={{ color: 'red' }}>{t('error-loading-list')} {list.error.message}</p>}
       <table>
         <thead>
           <tr>
             <th>{t('user-table-id')}</th>
-            <th>{t('user-table-email')}</th>
-            <th>{t('user-table-fullname')}</th>
+            <th onClick={() => list.toggleSort('email')}>{t('user-table-email')}{sortMark('email')}</th>
+            <th onClick={() => list.toggleSort('full_name')}>{t('user-table-fullname')}{sortMark('full_name')}</th>
             <th>{t('user-table-phone')}</th>
-            <th>{t('user-table-role')}</th>
+            <th onClick={() => list.toggleSort('role')}>{t('user-table-role')}{sortMark('role')}</th>
             <th>{t('user-table-active')}</th>
             <th>{t('actions-label')}</th>
           </tr>
@@ -277,6 +297,11 @@ const UserManagement = () => {
           ))}
         </tbody>
       </table>
+      <div className="pager">
+        <button type="button" onClick={list.prev} disabled={!list.hasPrev || list.loading}>{t('prev-page')}</button>
+        <span>{t('page-label')} {list.page}</span>
+        <button type="button" onClick={list.next} disabled={!list.hasNext || list.loading}>{t('next-page')}</button>
+      </div>
       <h3>{selectedUser ? t('update-user-h3') : t('create-user-h3')}</h3>
       <form onSubmit={selectedUser ? updateUser : createUser}>
         <label>{t('full-name-label')}</label>
@@ -0,0 +1,106 @@
+import { useEffect } from 'react';
+import { useMap } from 'react-leaflet';
+import L from 'leaflet';
+import { supabase } from '../supabase';
+
+// A rescue_tiles.py csempéit rajzolja canvasra: csak a látható csempék jönnek
+// le, és nem keletkezik elemenként külön Leaflet réteg. A csempe szerver a
+// bejelentkezett felhasználó access tokenjét kéri (Authorization: Bearer).
+
+const userColor = (userId) => {
+  let hash = 0;
+  for (let i = 0; i < userId.length; i++) hash = (hash * 31 + userId.charCodeAt(i)) | 0;
+  return `hsl(${Math.abs(hash) % 360}, 80%, 40%)`;
+};
+
+// A vonalak/poligonok részeinek első pontja abszolút, a többi eltérés
+const drawParts = (ctx, layer, scale, style) => {
+  const { coords, offsets } = layer;
+  for (let part = 0; part < offsets.length - 1; part++) {
+    let x = 0;
+    let y = 0;
+    ctx.beginPath();
+    for (let i = offsets[part]; i < offsets[part + 1]; i++) {
+      x += coords[2 * i];
+      y += coords[2 * i + 1];
+      if (i === offsets[part]) ctx.moveTo(x * scale, y * scale);
+      else ctx.lineTo(x * scale, y * scale);
+    }
+    style(ctx, part);
+  }
+};
+
+const drawTile = (canvas, tile, size) => {
+  const ctx = canvas.getContext('2d');
+  const scale = size / tile.extent;
+  const { markers, polygons, tracks } = tile.layers;
+  if (polygons) {
+    drawParts(ctx, polygons, scale, () => {
+      ctx.closePath();
+      ctx.fillStyle = 'rgba(51, 136, 255, 0.2)';
+      ctx.fill();
+      ctx.strokeStyle = '#3388ff';
+      ctx.lineWidth = 2;
+      ctx.stroke();
+    });
+  }
+  if (tracks) {
+    drawParts(ctx, tracks, scale, (c, part) => {
+      c.strokeStyle = userColor(tile.users[tracks.user[part]]);
+      c.lineWidth = 3;
+      c.stroke();
+    });
+  }
+  if (markers) {
+    ctx.fillStyle = '#e53935';
+    ctx.strokeStyle = '#ffffff';
+    ctx.lineWidth = 1.5;
+    for (let i = 0; i < markers.coords.length; i += 2) {
+      ctx.beginPath();
+      ctx.arc(markers.coords[i] * scale, markers.coords[i + 1] * scale, 5, 0, 2 * Math.PI);
+      ctx.fill();
+      ctx.stroke();
+    }
+  }
+};
+
+const VectorGridLayer = L.GridLayer.extend({
+  createTile(coords, done) {
+    const size = this.getTileSize();
+    const canvas = L.DomUtil.create('canvas', 'leaflet-tile');
+    canvas.width = size.x;
+    canvas.height = size.y;
+    const url = L.Util.template(this.options.url, coords);
+    supabase.auth.getSession()
+      .then(({ data: { session } }) => fetch(url, {
+        headers: session ? { Authorization: `Bearer ${session.access_token}` } : {}
+      }))
+      .then(response => {
+        if (!response.ok) throw new Error(`HTTP ${response.status}`);
+        return response.json();
+      })
+      .then(tile => {
+        drawTile(canvas, tile, size.x);
+        done(null, canvas);
+      })
+      .catch(err => done(err, canvas));
+    return canvas;
+  }
+});
+
+const VectorTileLayer = ({ url, onError }) => {
+  const map = useMap();
+
+  useEffect(() => {
+    const layer = new VectorGridLayer({ url, maxZoom: 22 });
+    if (onError) layer.on('tileerror', onError);
+    layer.addTo(map);
+    return () => {
+      layer.remove();
+    };
+  }, [map, url, onError]);
+
+  return null;
+};
+
+export default VectorTileLayer;
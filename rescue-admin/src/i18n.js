@@ -39,6 +39,7 @@ const resources = {
       'event-update-success': 'Esemény sikeresen frissítve',
       'event-update-fail': 'Nem sikerült frissíteni az eseményt:',
       'event-delete-success': 'Esemény sikeresen törölve',
+      'event-archive-started': 'Az esemény archiválása elindult.',
       'event-delete-fail': 'Nem sikerült törölni az eseményt:',
       'select-event-btn': 'Esemény kiválasztása',
       'join-event-btn': 'Csatlakozás az eseményhez',
@@ -51,6 +52,7 @@ const resources = {
       'status-completed': 'Befejezve',
       'update-event-btn': 'Esemény szerkesztése',
       'delete-event-btn': 'Esemény törlése',
+      'archive-event-btn': 'Archiválás',
       'users-manager-h2': 'Felhasználók Kezelése',
       'create-user-btn': 'Felhasználó Létrehozása',
       'delete-user-btn': 'Törlés',
@@ -140,12 +142,19 @@ const resources = {
       'error-login-error': 'Bejelentkezési hiba',
       'error-email-not-confirmed': 'Email nincs megerősítve',
       'error-loading-markers': 'Nem sikerült betölteni a markereket:',
+      'search-placeholder': 'Keresés…',
+      'all-roles': 'Minden szerepkör',
+      'prev-page': '‹ Előző',
+      'next-page': 'Következő ›',
+      'page-label': 'Oldal',
+      'error-loading-list': 'Nem sikerült betölteni a listát:',
       'location-label': 'Válassz helyszínt a térképen',
       'location-lat-label': 'Szélesség',
       'location-lng-label': 'Hosszúság',
       'photo-label': 'Fotó',
       'uploading': 'Feltöltés...',
       'confirm-delete': 'Biztosan törölni szeretnéd?',
+      'confirm-archive': 'Biztosan archiválod az eseményt?',
       'cancel-btn': 'Mégse',
       'actions-label': 'Műveletek',
       'missing-table-location': 'Helyszín',
@@ -269,6 +278,7 @@ const resources = {
       'event-update-success': 'Event updated successfully',
       'event-update-fail': 'Failed to update event:',
       'event-delete-success': 'Event deleted successfully',
+      'event-archive-started': 'Event archiving has started.',
       'event-delete-fail': 'Failed to delete event:',
       'select-event-btn': 'Select Event',
       'join-event-btn': 'Join Event',
@@ -281,6 +291,7 @@ const resources = {
       'status-completed': 'Completed',
       'update-event-btn': 'Update Event',
       'delete-event-btn': 'Delete Event',
+      'archive-event-btn': 'Archive',
       'users-manager-h2': 'Users Manager',
       'create-user-btn': 'Create User',
       'delete-user-btn': 'Delete',
@@ -370,12 +381,19 @@ const resources = {
       'error-login-error': 'Login error',
       'error-email-not-confirmed': 'Email not confirmed',
       'error-loading-markers': 'Failed to load markers:',
+      'search-placeholder': 'Search…',
+      'all-roles': 'All roles',
+      'prev-page': '‹ Previous',
+      'next-page': 'Next ›',
+      'page-label': 'Page',
+      'error-loading-list': 'Failed to load the list:',
       'location-label': 'Select location on map',
       'location-lat-label': 'Latitude',
       'location-lng-label': 'Longitude',
       'photo-label': 'Photo',
       'uploading': 'Uploading...',
       'confirm-delete': 'Are you sure you want to delete?',
+      'confirm-archive': 'Are you sure you want to archive this event?',
       'cancel-btn': 'Cancel',
       'actions-label': 'Actions',
       'missing-table-location': 'Location',
@@ -499,6 +517,7 @@ const resources = {
       'event-update-success': 'Udalosť úspešne aktualizovaná',
       'event-update-fail': 'Nepodarilo sa aktualizovať udalosť:',
       'event-delete-success': 'Udalosť úspešne odstránená',
+      'event-archive-started': 'Archivácia udalosti sa začala.',
       'event-delete-fail': 'Nepodarilo sa odstrániť udalosť:',
       'select-event-btn': 'Vybrať udalosť',
       'join-event-btn': 'Pripojiť sa k udalosti',
@@ -511,6 +530,7 @@ const resources = {
       'status-completed': 'Dokončená',
       'update-event-btn': 'Aktualizovať udalosť',
       'delete-event-btn': 'Odstrániť udalosť',
+      'archive-event-btn': 'Archivovať',
       'users-manager-h2': 'Správa používateľov',
       'create-user-btn': 'Vytvoriť používateľa',
       'delete-user-btn': 'Odstrániť',
@@ -600,12 +620,19 @@ const resources = {
       'error-login-error': 'Chyba prihlásenia',
       'error-email-not-confirmed': 'Email nepotvrdený',
       'error-loading-markers': 'Nepodarilo sa načítať značky:',
+      'search-placeholder': 'Hľadať…',
+      'all-roles': 'Všetky roly',
+      'prev-page': '‹ Predchádzajúca',
+      'next-page': 'Ďalšia ›',
+      'page-label': 'Strana',
+      'error-loading-list': 'Nepodarilo sa načítať zoznam:',
       'location-label': 'Vyberte miesto na mape',
       'location-lat-label': 'Zemepisná šírka',
       'location-lng-label': 'Zemepisná dĺžka',
       'photo-label': 'Fotografia',
       'uploading': 'Nahrávanie...',
       'confirm-delete': 'Ste si istý, že chcete odstrániť?',
+      'confirm-archive': 'Ste si istý, že chcete archivovať udalosť?',
       'cancel-btn': 'Zrušiť',
       'actions-label': 'Akcie',
       'missing-table-location': 'Umiestnenie',
@@ -729,6 +756,7 @@ const resources = {
       'event-update-success': 'Eveniment actualizat cu succes',
       'event-update-fail': 'Nu s-a putut actualiza evenimentul:',
       'event-delete-success': 'Eveniment șters cu succes',
+      'event-archive-started': 'Arhivarea evenimentului a început.',
       'event-delete-fail': 'Nu s-a putut șterge evenimentul:',
       'select-event-btn': 'Selectați evenimentul',
       'join-event-btn': 'Alăturați-vă evenimentului',
@@ -741,6 +769,7 @@ const resources = {
       'status-completed': 'Finalizat',
       'update-event-btn': 'Actualizați evenimentul',
       'delete-event-btn': 'Ștergeți evenimentul',
+      'archive-event-btn': 'Arhivare',
       'users-manager-h2': 'Manager utilizatori',
       'create-user-btn': 'Creați utilizator',
       'delete-user-btn': 'Ștergeți',
@@ -830,12 +859,19 @@ const resources = {
       'error-login-error': 'Eroare de autentificare',
       'error-email-not-confirmed': 'Email neconfirmat',
       'error-loading-markers': 'Nu s-a putut încărca marcajele:',
+      'search-placeholder': 'Căutare…',
+      'all-roles': 'Toate rolurile',
+      'prev-page': '‹ Anterioara',
+      'next-page': 'Următoarea ›',
+      'page-label': 'Pagina',
+      'error-loading-list': 'Nu s-a putut încărca lista:',
       'location-label': 'Selectați locația pe hartă',
       'location-lat-label': 'Latitudine',
       'location-lng-label': 'Longitudine',
       'photo-label': 'Fotografie',
       'uploading': 'Încărcare...',
       'confirm-delete': 'Sunteți sigur că doriți să ștergeți?',
+      'confirm-archive': 'Sunteți sigur că doriți să arhivați evenimentul?',
       'cancel-btn': 'Anulare',
       'actions-label': 'Acțiuni',
       'missing-table-location': 'Locație',
@@ -959,6 +995,7 @@ const resources = {
       'event-update-success': 'Wydarzenie zaktualizowane pomyślnie',
       'event-update-fail': 'Nie udało się zaktualizować wydarzenia:',
       'event-delete-success': 'Wydarzenie usunięte pomyślnie',
+      'event-archive-started': 'Rozpoczęto archiwizację wydarzenia.',
       'event-delete-fail': 'Nie udało się usunąć wydarzenia:',
       'select-event-btn': 'Wybierz wydarzenie',
       'join-event-btn': 'Dołącz do wydarzenia',
@@ -971,6 +1008,7 @@ const resources = {
       'status-completed': 'Zakończone',
       'update-event-btn': 'Zaktualizuj wydarzenie',
       'delete-event-btn': 'Usuń wydarzenie',
+      'archive-event-btn': 'Archiwizuj',
       'users-manager-h2': 'Manager użytkowników',
       'create-user-btn': 'Utwórz użytkownika',
       'delete-user-btn': 'Usuń',
@@ -1060,12 +1098,19 @@ const resources = {
       'error-login-error': 'Błąd logowania',
       'error-email-not-confirmed': 'Email niepotwierdzony',
       'error-loading-markers': 'Nie udało się załadować znaczników:',
+      'search-placeholder': 'Szukaj…',
+      'all-roles': 'Wszystkie role',
+      'prev-page': '‹ Poprzednia',
+      'next-page': 'Następna ›',
+      'page-label': 'Strona',
+      'error-loading-list': 'Nie udało się załadować listy:',
       'location-label': 'Wybierz lokalizację na mapie',
       'location-lat-label': 'Szerokość geograficzna',
       'location-lng-label': 'Długość geograficzna',
       'photo-label': 'Zdjęcie',
       'uploading': 'Wgrywanie...',
       'confirm-delete': 'Czy na pewno chcesz usunąć?',
+      'confirm-archive': 'Czy na pewno chcesz zarchiwizować wydarzenie?',
       'cancel-btn': 'Anuluj',
       'actions-label': 'Akcje',
       'missing-table-location': 'Lokalizacja',
@@ -1189,6 +1234,7 @@ const resources = {
       'event-update-success': 'Подію успішно оновлено',
       'event-update-fail': 'Не вдалося оновити подію:',
       'event-delete-success': 'Подію успішно видалено',
+      'event-archive-started': 'Архівування події розпочато.',
       'event-delete-fail': 'Не вдалося видалити подію:',
       'select-event-btn': 'Вибрати подію',
       'join-event-btn': 'Приєднатися до події',
@@ -1201,6 +1247,7 @@ const resources = {
       'status-completed': 'Завершено',
       'update-event-btn': 'Оновити подію',
       'delete-event-btn': 'Видалити подію',
+      'archive-event-btn': 'Архівувати',
       'users-manager-h2': 'Менеджер користувачів',
       'create-user-btn': 'Створити користувача',
       'delete-user-btn': 'Видалити',
@@ -1290,12 +1337,19 @@ const resources = {
       'error-login-error': 'Помилка входу',
       'error-email-not-confirmed': 'Email не підтверджено',
       'error-loading-markers': 'Не вдалося завантажити маркери:',
+      'search-placeholder': 'Пошук…',
+      'all-roles': 'Усі ролі',
+      'prev-page': '‹ Попередня',
+      'next-page': 'Наступна ›',
+      'page-label': 'Сторінка',
+      'error-loading-list': 'Не вдалося завантажити список:',
       'location-label': 'Виберіть місце на карті',
       'location-lat-label': 'Широта',
       'location-lng-label': 'Довгота',
       'photo-label': 'Фото',
       'uploading': 'Завантаження...',
       'confirm-delete': 'Ви впевнені, що хочете видалити?',
+      'confirm-archive': 'Ви впевнені, що хочете архівувати подію?',
       'cancel-btn': 'Скасувати',
       'actions-label': 'Дії',
       'missing-table-location': 'Місцезнаходження',
@@ -0,0 +1,33 @@
+// Encoded polyline dekódolás (a rescue_polygons.py által írt coordinates_polyline mezőhöz)
+
+// A pontosság: 1e-6 fok (polyline6), a Python oldallal egyezően
+const PRECISION = 1e6;
+
+// Encoded polyline -> [[lat, lng], ...] (Leaflet sorrend), regex nélkül
+export const decodePolyline = (encoded) => {
+  const points = [];
+  let index = 0;
+  let lat = 0;
+  let lng = 0;
+  while (index < encoded.length) {
+    let shift = 0;
+    let result = 0;
+    let byte;
+    do {
+      byte = encoded.charCodeAt(index++) - 63;
+      result |= (byte & 0x1f) << shift;
+      shift += 5;
+    } while (byte >= 0x20);
+    lat += result & 1 ? ~(result >>> 1) : result >>> 1;
+    shift = 0;
+    result = 0;
+    do {
+      byte = encoded.charCodeAt(index++) - 63;
+      result |= (byte & 0x1f) << shift;
+      shift += 5;
+    } while (byte >= 0x20);
+    lng += result & 1 ? ~(result >>> 1) : result >>> 1;
+    points.push([lat / PRECISION, lng / PRECISION]);
+  }
+  return points;
+};
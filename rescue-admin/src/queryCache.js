@@ -0,0 +1,158 @@
+// Korlátos lekérdezés cache (LRU + TTL + stale-while-revalidate)
+//
+// A bejegyzések kulcs szerint, legutóbbi használat sorrendjében vannak (a Map
+// beszúrási sorrendje: az olvasás a végére teszi). A méretet bejegyzésszámban
+// és becsült bájtban is korlátozzuk; a legrégebben használt megy ki először.
+// Minden bejegyzés megjegyzi, melyik eseményhez és mely táblákhoz tartozik,
+// így a realtime változások eseményenként és táblánként érvénytelenítenek.
+
+export const MAX_ENTRIES = 100;
+export const MAX_BYTES = 96 * 1024 * 1024;
+export const TTL_MS = 60 * 1000; // eddig friss
+export const STALE_MS = 10 * 60 * 1000; // utána még ennyi ideig kiszolgálható, háttérben frissül
+export const REFRESH_TIMEOUT_MS = 30 * 1000; // ennyi után a be nem fejeződött frissítést újra kiadjuk
+
+// Nagy tömböknél ennyi elemből becsülünk (a teljes bejárás helyett)
+const SAMPLE = 16;
+
+// Egy JSON-szerű érték becsült memóriamérete bájtban (V8 közelítés: a mezők
+// és tömbelemek 8 bájtos helyei, a tört számok és a szövegek külön objektumok)
+export const estimateSize = (value, depth = 0) => {
+  if (value === null || value === undefined) return 0;
+  switch (typeof value) {
+    case 'string':
+      return 16 + Math.ceil(value.length / 8) * 8;
+    case 'number':
+      return Number.isInteger(value) && Math.abs(value) < 2 ** 30 ? 0 : 16;
+    case 'object':
+      break;
+    default:
+      return 0;
+  }
+  if (depth > 8) return 64;
+  if (Array.isArray(value)) {
+    const slots = 16 + value.length * 8;
+    if (value.length <= SAMPLE) {
+      return value.reduce((sum, item) => sum + estimateSize(item, depth + 1), slots);
+    }
+    const step = value.length / SAMPLE;
+    let sample = 0;
+    for (let i = 0; i < SAMPLE; i += 1) sample += estimateSize(value[Math.floor(i * step)], depth + 1);
+    return slots + Math.round((sample / SAMPLE) * value.length);
+  }
+  const keys = Object.keys(value);
+  return keys.reduce((sum, key) => sum + estimateSize(value[key], depth + 1), 24 + keys.length * 8);
+};
+
+export const createQueryCache = ({
+  maxEntries = MAX_ENTRIES,
+  maxBytes = MAX_BYTES,
+  ttlMs = TTL_MS,
+  staleMs = STALE_MS,
+  refreshTimeoutMs = REFRESH_TIMEOUT_MS,
+  now = () => Date.now()
+} = {}) => {
+  const entries = new Map();
+  const counters = { hits: 0, staleHits: 0, misses: 0, evictions: 0, expired: 0, invalidations: 0 };
+  let bytes = 0;
+
+  const drop = (key) => {
+    const entry = entries.get(key);
+    if (!entry) return false;
+    entries.delete(key);
+    bytes -= entry.size;
+    return true;
+  };
+
+  // A legrégebben használt bejegyzések kidobása, amíg a korlátok alá nem érünk
+  const evict = () => {
+    while (entries.size && (entries.size > maxEntries || bytes > maxBytes)) {
+      drop(entries.keys().next().value);
+      counters.evictions += 1;
+    }
+  };
+
+  // { value, stale } vagy undefined. A stale: true csak az első olvasónak jár
+  // (ő tölti újra a háttérben), a többiek addig a régi értéket kapják. Ha a
+  // frissítés elakad vagy hibával ér véget (release), a következő olvasó
+  // újra stale: true-t kap.
+  const read = (key) => {
+    const entry = entries.get(key);
+    if (!entry) {
+      counters.misses += 1;
+      return undefined;
+    }
+    const age = now() - entry.time;
+    if (age > ttlMs + staleMs) {
+      drop(key);
+      counters.expired += 1;
+      counters.misses += 1;
+      return undefined;
+    }
+    entries.delete(key);
+    entries.set(key, entry);
+    if (age <= ttlMs) {
+      counters.hits += 1;
+      return { value: entry.value, stale: false };
+    }
+    counters.staleHits += 1;
+    const time = now();
+    const stale = !entry.refreshing || time - entry.refreshing > refreshTimeoutMs;
+    if (stale) entry.refreshing = time;
+    return { value: entry.value, stale };
+  };
+
+  // eventId: az esemény azonosítója (globális adatnál null), tables: a
+  // táblák, amelyek változása érvényteleníti a bejegyzést
+  const write = (key, value, { eventId = null, tables = [] } = {}) => {
+    drop(key);
+    const size = estimateSize(value);
+    if (size > maxBytes) return value; // egyetlen bejegyzés sem töltheti ki az egészet
+    entries.set(key, { value, size, time: now(), eventId, tables, refreshing: 0 });
+    bytes += size;
+    evict();
+    return value;
+  };
+
+  // A háttérfrissítés nem sikerült: a bejegyzés marad, a következő olvasó újrapróbálja
+  const release = (key) => {
+    const entry = entries.get(key);
+    if (entry) entry.refreshing = 0;
+  };
+
+  const invalidate = (key) => {
+    if (drop(key)) counters.invalidations += 1;
+  };
+
+  // Realtime változás után: az esemény (és a globális) bejegyzései, amelyek
+  // a megadott táblák valamelyikéből épültek
+  const invalidateTables = (eventId, tables) => {
+    Array.from(entries.entries()).forEach(([key, entry]) => {
+      const sameEvent = entry.eventId === null || String(entry.eventId) === String(eventId);
+      if (sameEvent && entry.tables.some((table) => tables.includes(table))) invalidate(key);
+    });
+  };
+
+  // Egy esemény összes bejegyzése (pl. az esemény törlésekor)
+  const invalidateEvent = (eventId) => {
+    Array.from(entries.entries()).forEach(([key, entry]) => {
+      if (entry.eventId !== null && String(entry.eventId) === String(eventId)) invalidate(key);
+    });
+  };
+
+  const clear = () => {
+    entries.clear();
+    bytes = 0;
+  };
+
+  const stats = () => ({ ...counters, entries: entries.size, bytes, maxEntries, maxBytes });
+
+  return { read, write, release, invalidate, invalidateTables, invalidateEvent, clear, stats };
+};
+
+// Az alkalmazás közös cache-e: a komponens újracsatolása után is megmarad.
+// Kijelentkezéskor és felhasználóváltáskor az App üríti (az adat RLS szerint
+// felhasználónként más, és a cache-ből nem megy kérés).
+export const queryCache = createQueryCache();
+
+export default queryCache;
@@ -0,0 +1,95 @@
+import { useEffect, useRef } from 'react';
+import { supabase } from './supabase';
+
+// Ennyi ideig gyűjtjük a változásokat egy rendereléshez (az első változás indítja)
+export const FLUSH_MS = 250;
+
+// Az esemény saját táblái: event_id szerint szűrt feliratkozás
+export const EVENT_TABLES = ['missing_persons', 'event_participants', 'map_markers', 'polygons'];
+
+// A GPS fogadó (rescue_ingest.py) kötegenként egy broadcast üzenetet küld az
+// esemény privát topicjára; a pontok nem egyenként, postgres_changes-ként jönnek
+export const GPS_BATCH_EVENT = 'gps_tracks_batch';
+
+// Egy köteg üzenet -> gps_tracks INSERT payloadok, ahogy az onChanges várja
+export const batchPayloads = ({ event_id: eventId, rows = [] }) =>
+  rows.map(([userId, lat, lng, acc, time]) => ({
+    table: 'gps_tracks',
+    eventType: 'INSERT',
+    new: { event_id: eventId, user_id: userId, lat, lng, acc, time }
+  }));
+
+// Sor szintű változások (INSERT/UPDATE/DELETE) alkalmazása egy listára, id szerint.
+// A `prepare` az új sort alakítja (pl. az előző sor join mezőinek megtartása).
+export const applyRowChanges = (rows, changes, prepare = (row) => row) => {
+  if (!changes || !changes.length) return rows;
+  const byId = new Map(rows.map((row) => [row.id, row]));
+  let changed = false;
+  changes.forEach(({ eventType, new: row, old }) => {
+    if (eventType === 'DELETE') {
+      changed = byId.delete(old?.id) || changed;
+    } else if (row && row.id !== undefined) {
+      byId.set(row.id, prepare(row, byId.get(row.id)));
+      changed = true;
+    }
+  });
+  return changed ? Array.from(byId.values()) : rows;
+};
+
+// Egyetlen realtime csatorna a keresés kezelőnek: a search_events tábla és a
+// kiválasztott esemény táblái (event_id szűrővel) egy feliratkozáson. A
+// változások nem egyenként mennek tovább: FLUSH_MS-en belül összegyűlnek, és
+// az `onChanges` táblánként csoportosítva egyszerre kapja meg őket
+// ({ tábla: [payload, ...] }), így egy löketből egy renderelés lesz.
+// A csatorna csak az esemény azonosítójának változásakor épül újra; a GPS
+// pontok a fogadó összevont broadcast üzeneteiből jönnek (event-<id> topic).
+const useEventChanges = (eventId, onChanges, delay = FLUSH_MS) => {
+  const handler = useRef(onChanges);
+  handler.current = onChanges;
+
+  useEffect(() => {
+    let pending = [];
+    let timer = null;
+
+    const flush = () => {
+      timer = null;
+      const byTable = {};
+      pending.forEach((payload) => {
+        (byTable[payload.table] = byTable[payload.table] || []).push(payload);
+      });
+      pending = [];
+      handler.current(byTable);
+    };
+
+    const push = (payload) => {
+      pending.push(payload);
+      if (!timer) timer = setTimeout(flush, delay);
+    };
+
+    const channel = supabase
+      .channel(eventId ? `event-${eventId}` : 'search-manager', eventId ? { config: { private: true } } : undefined)
+      .on('postgres_changes', { event: '*', schema: 'public', table: 'search_events' }, push);
+    if (eventId) {
+      channel.on('broadcast', { event: GPS_BATCH_EVENT }, ({ payload }) => {
+        batchPayloads(payload || {}).forEach(push);
+      });
+      const filter = `event_id=eq.${eventId}`;
+      EVENT_TABLES.forEach((table) => {
+        channel
+          .on('postgres_changes', { event: 'INSERT', schema: 'public', table, filter }, push)
+          .on('postgres_changes', { event: 'UPDATE', schema: 'public', table, filter }, push);
+        // A törlés nem szűrhető (csak az id jön), az ismeretlen id-ket a lista
+        // figyelmen kívül hagyja
+        channel.on('postgres_changes', { event: 'DELETE', schema: 'public', table }, push);
+      });
+    }
+    channel.subscribe();
+
+    return () => {
+      clearTimeout(timer);
+      supabase.removeChannel(channel);
+    };
+  }, [eventId, delay]);
+};
+
+export default useEventChanges;
@@ -0,0 +1,133 @@
+import { useState, useEffect, useRef } from 'react';
+import { supabase } from './supabase';
+
+export const PAGE_SIZE = 50;
+
+// PostgREST szűrő értéke idézőjelben (vessző, pont, zárójel is lehet benne)
+const quote = (value) => `"${String(value).replace(/\\/g, '\\\\').replace(/"/g, '\\"')}"`;
+
+// A (rendezési oszlop, id) kurzor utáni sorok feltétele. A null értékek a
+// lista végén vannak (nullslast), egyező értéknél az id dönt.
+const afterCursor = (sort, ascending, cursor) => {
+  if (cursor.value === null || cursor.value === undefined) {
+    return `and(${sort}.is.null,id.gt.${quote(cursor.id)})`;
+  }
+  const value = quote(cursor.value);
+  return `${sort}.${ascending ? 'gt' : 'lt'}.${value},and(${sort}.eq.${value},id.gt.${quote(cursor.id)}),${sort}.is.null`;
+};
+
+// Kulcsos (keyset) lapozás szerver oldali szűréssel és rendezéssel: offset
+// nélkül, így a sokadik lap is annyiba kerül, mint az első, és írás után nem
+// kell a teljes táblát újratölteni (replaceRow / removeRow / addRow).
+const useKeysetPage = ({ table, columns, searchColumns = [], pageSize = PAGE_SIZE, initialSort = 'id', enabled = true }) => {
+  const [rows, setRows] = useState([]);
+  const [sort, setSort] = useState({ column: initialSort, ascending: true });
+  const [search, setSearch] = useState('');
+  const [filters, setFilters] = useState({});
+  const [cursors, setCursors] = useState([null]); // az egyes lapok kezdő kurzora
+  const [hasNext, setHasNext] = useState(false);
+  const [loading, setLoading] = useState(false);
+  const [error, setError] = useState(null);
+  const requestId = useRef(0);
+
+  const load = async (cursor) => {
+    const current = ++requestId.current;
+    setLoading(true);
+    let query = supabase.from(table).select(columns);
+    Object.entries(filters).forEach(([column, value]) => {
+      if (value !== '' && value !== null && value !== undefined) query = query.eq(column, value);
+    });
+    const groups = [];
+    const term = search.trim();
+    if (term && searchColumns.length) {
+      groups.push(searchColumns.map((column) => `${column}.ilike.${quote(`*${term}*`)}`).join(','));
+    }
+    if (sort.column === 'id') {
+      query = query.order('id', { ascending: sort.ascending });
+      if (cursor) query = sort.ascending ? query.gt('id', cursor.id) : query.lt('id', cursor.id);
+    } else {
+      query = query.order(sort.column, { ascending: sort.ascending, nullsFirst: false }).order('id', { ascending: true });
+      if (cursor) groups.push(afterCursor(sort.column, sort.ascending, cursor));
+    }
+    // Egy or= paraméterbe: több csoport esetén and(or(...),or(...))
+    if (groups.length === 1) query = query.or(groups[0]);
+    else if (groups.length > 1) query = query.or(`and(${groups.map((group) => `or(${group})`).join(',')})`);
+
+    const { data, error } = await query.limit(pageSize + 1);
+    if (current !== requestId.current) return; // közben újabb kérés indult
+    setLoading(false);
+    if (error) {
+      setError(error);
+      return;
+    }
+    setError(null);
+    setHasNext(data.length > pageSize);
+    setRows(data.slice(0, pageSize));
+  };
+
+  // Szűrő, keresés vagy rendezés változásakor vissza az első lapra (a keresés
+  // gépelés közben 300 ms-ig vár)
+  useEffect(() => {
+    if (!enabled) return undefined;
+    const timer = setTimeout(() => {
+      setCursors([null]);
+      load(null);
+    }, 300);
+    return () => clearTimeout(timer);
+  }, [enabled, table, columns, search, sort.column, sort.ascending, JSON.stringify(filters)]);
+
+  const next = () => {
+    if (!hasNext || !rows.length) return;
+    const last = rows[rows.length - 1];
+    const cursor = { value: last[sort.column], id: last.id };
+    setCursors([...cursors, cursor]);
+    load(cursor);
+  };
+
+  const prev = () => {
+    if (cursors.length < 2) return;
+    const previous = cursors.slice(0, -1);
+    setCursors(previous);
+    load(previous[previous.length - 1]);
+  };
+
+  const toggleSort = (column) => {
+    setSort((current) => ({
+      column,
+      ascending: current.column === column ? !current.ascending : true
+    }));
+  };
+
+  const setFilter = (column, value) => setFilters((current) => ({ ...current, [column]: value }));
+
+  // Írás után az aktuális lapot frissítjük a visszakapott sorral
+  const replaceRow = (row) => setRows((current) => current.map((item) => (item.id === row.id ? { ...item, ...row } : item)));
+  const removeRow = (id) => setRows((current) => current.filter((item) => item.id !== id));
+  // Új sor: az első lap tetejére (a következő betöltéskor a helyére kerül)
+  const addRow = (row) => {
+    if (cursors.length === 1) setRows((current) => [row, ...current].slice(0, pageSize));
+  };
+
+  return {
+    rows,
+    loading,
+    error,
+    page: cursors.length,
+    hasNext,
+    hasPrev: cursors.length > 1,
+    next,
+    prev,
+    reload: () => load(cursors[cursors.length - 1]),
+    sort,
+    toggleSort,
+    search,
+    setSearch,
+    filters,
+    setFilter,
+    replaceRow,
+    removeRow,
+    addRow
+  };
+};
+
+export default useKeysetPage;
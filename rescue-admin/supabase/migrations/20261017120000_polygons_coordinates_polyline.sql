@@ -0,0 +1,38 @@
+-- polygons.coordinates normalizált, tömör alakja (rescue_polygons.py tölti ki)
+--   coordinates_polyline: encoded polyline, lat/lng sorrend, 1e-6 fok pontosság
+--   bbox_*: befoglaló téglalap a nézet szerinti szűréshez
+
+alter table public.polygons
+  add column if not exists coordinates_polyline text,
+  add column if not exists bbox_min_lng double precision,
+  add column if not exists bbox_min_lat double precision,
+  add column if not exists bbox_max_lng double precision,
+  add column if not exists bbox_max_lat double precision;
+
+create index if not exists polygons_event_bbox_idx
+  on public.polygons (event_id, bbox_min_lng, bbox_max_lng, bbox_min_lat, bbox_max_lat);
+
+-- Ha a coordinates úgy változik, hogy a normalizált mezőket nem írják vele
+-- együtt (pl. a mobil alkalmazás), a régi kódolás elavult: töröljük, és a
+-- kliens a coordinates szövegre esik vissza, amíg az eszköz újra nem fut.
+create or replace function public.polygons_invalidate_polyline()
+returns trigger
+language plpgsql
+as $$
+begin
+  if new.coordinates is distinct from old.coordinates
+     and new.coordinates_polyline is not distinct from old.coordinates_polyline then
+    new.coordinates_polyline := null;
+    new.bbox_min_lng := null;
+    new.bbox_min_lat := null;
+    new.bbox_max_lng := null;
+    new.bbox_max_lat := null;
+  end if;
+  return new;
+end;
+$$;
+
+drop trigger if exists polygons_invalidate_polyline on public.polygons;
+create trigger polygons_invalidate_polyline
+  before update of coordinates on public.polygons
+  for each row execute function public.polygons_invalidate_polyline();
@@ -0,0 +1,217 @@
+-- Esemény törlése vagy archiválása szerver oldalon, kötegekben
+--   request_event_purge(event_id, mode): a kliens egyetlen RPC hívása, feladatot vesz fel
+--   purge_event_batch(job_id, batch): egy köteg egy tranzakcióban (rescue_purge.py hívja,
+--     csak service_role); a haladás az event_purge_jobs sorában van, így a feladat
+--     bármikor megszakítható és folytatható
+--   skip_purged_event_rows: a kijelölt eseménybe nem kerülhet új gyerek sor
+-- Az event_id itt bigint, mint a search_events.id.
+
+alter table public.search_events
+  add column if not exists purge_requested_at timestamptz;
+
+create index if not exists gps_tracks_event_id_idx on public.gps_tracks (event_id);
+create index if not exists map_markers_event_id_idx on public.map_markers (event_id);
+create index if not exists polygons_event_id_idx on public.polygons (event_id);
+create index if not exists event_participants_event_id_idx on public.event_participants (event_id);
+create index if not exists missing_persons_event_id_idx on public.missing_persons (event_id);
+
+create table if not exists public.event_purge_jobs (
+  id bigint generated always as identity primary key,
+  event_id bigint not null,
+  mode text not null default 'delete' check (mode in ('delete', 'archive')),
+  status text not null default 'pending' check (status in ('pending', 'running', 'done', 'failed')),
+  current_table text,
+  total jsonb not null default '{}'::jsonb,   -- táblánként a sorok száma induláskor
+  done jsonb not null default '{}'::jsonb,    -- táblánként a már törölt/archivált sorok
+  error text,
+  requested_by uuid,
+  created_at timestamptz not null default now(),
+  updated_at timestamptz not null default now(),
+  finished_at timestamptz
+);
+
+-- Eseményenként legfeljebb egy futó feladat; a hibás feladat helyett új kérhető,
+-- az onnan folytatja, ahol az előző abbamaradt
+create unique index if not exists event_purge_jobs_active_idx
+  on public.event_purge_jobs (event_id) where status in ('pending', 'running');
+
+alter table public.event_purge_jobs enable row level security;
+drop policy if exists event_purge_jobs_read on public.event_purge_jobs;
+create policy event_purge_jobs_read on public.event_purge_jobs
+  for select to authenticated
+  using (exists (select 1 from public.users u where u.id = auth.uid() and u.role in ('admin', 'coordinator')));
+
+-- A kijelölt (purge_requested_at) eseménybe nem kerülhet új sor: a feladat a
+-- már végigsöpört táblához magától nem térne vissza, a késve beszúrt sor árván
+-- maradna, vagy a search_events törlése bukna el a külső kulcson. Hiba helyett
+-- a sort kihagyjuk, hogy a több eseményt vegyesen tartalmazó COPY köteg
+-- (rescue_ingest.py) a többi esemény pontjaival együtt ne bukjon el.
+create or replace function public.skip_purged_event_rows()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+begin
+  if exists (select 1 from public.search_events where id = new.event_id and purge_requested_at is not null) then
+    return null;
+  end if;
+  return new;
+end;
+$$;
+
+do $$
+declare
+  target text;
+begin
+  foreach target in array array['gps_tracks', 'map_markers', 'polygons', 'event_participants', 'missing_persons'] loop
+    execute format('drop trigger if exists %1$I on public.%2$I', target || '_skip_purged', target);
+    execute format('create trigger %1$I before insert or update of event_id on public.%2$I
+                    for each row execute function public.skip_purged_event_rows()', target || '_skip_purged', target);
+  end loop;
+end;
+$$;
+
+-- Archívum: ugyanazok az oszlopok (like), a végén az archiválás ideje
+create schema if not exists archive;
+create table if not exists archive.search_events (like public.search_events, archived_at timestamptz default now());
+create table if not exists archive.missing_persons (like public.missing_persons, archived_at timestamptz default now());
+create table if not exists archive.event_participants (like public.event_participants, archived_at timestamptz default now());
+create table if not exists archive.map_markers (like public.map_markers, archived_at timestamptz default now());
+create table if not exists archive.polygons (like public.polygons, archived_at timestamptz default now());
+create table if not exists archive.gps_tracks (like public.gps_tracks, archived_at timestamptz default now());
+create index if not exists archive_gps_tracks_event_id_idx on archive.gps_tracks (event_id);
+revoke all on schema archive from public, anon, authenticated;
+
+create or replace function public.request_event_purge(p_event_id bigint, p_mode text default 'delete')
+returns public.event_purge_jobs
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+  job public.event_purge_jobs;
+begin
+  if not exists (select 1 from public.users where id = auth.uid() and role in ('admin', 'coordinator')) then
+    raise exception 'permission denied' using errcode = '42501';
+  end if;
+  if p_mode not in ('delete', 'archive') then
+    raise exception 'invalid purge mode: %', p_mode using errcode = '22023';
+  end if;
+
+  select * into job from public.event_purge_jobs
+   where event_id = p_event_id and status in ('pending', 'running');
+  if found then
+    return job;
+  end if;
+
+  -- a listákból azonnal eltűnik, a sorok törlése a háttérben fut
+  update public.search_events set purge_requested_at = now() where id = p_event_id;
+  if not found and not exists (select 1 from public.event_purge_jobs where event_id = p_event_id) then
+    raise exception 'event % not found', p_event_id using errcode = 'P0002';
+  end if;
+
+  insert into public.event_purge_jobs (event_id, mode, requested_by)
+  values (p_event_id, p_mode, auth.uid())
+  returning * into job;
+  perform pg_notify('event_purge', job.id::text);
+  return job;
+end;
+$$;
+
+revoke all on function public.request_event_purge(bigint, text) from public, anon;
+grant execute on function public.request_event_purge(bigint, text) to authenticated;
+
+-- Egy köteg: legfeljebb p_batch sor az aktuális táblából (a gyerek táblák
+-- előbb, a search_events sor utoljára). Ha a köteg nem telt meg, a tábla
+-- elfogyott, és a feladat a következőre lép. A search_events lépés előtt a
+-- gyerek táblákat újra megnézzük: a kijelölés előtt indult tranzakció sora a
+-- tábla lépése után is beérkezhetett, ilyenkor a feladat oda tér vissza.
+create or replace function public.purge_event_batch(p_job_id bigint, p_batch integer default 20000)
+returns public.event_purge_jobs
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+  tables constant text[] := array['gps_tracks', 'map_markers', 'polygons', 'event_participants',
+                                  'missing_persons', 'search_events'];
+  job public.event_purge_jobs;
+  target text;
+  key text;
+  child text;
+  leftover boolean;
+  moved bigint;
+begin
+  -- a feladat sora zárolva: két futtató nem dolgozhat ugyanazon
+  select * into job from public.event_purge_jobs where id = p_job_id for update;
+  if not found then
+    raise exception 'purge job % not found', p_job_id using errcode = 'P0002';
+  end if;
+  if job.status in ('done', 'failed') then
+    return job;
+  end if;
+
+  if job.status = 'pending' then
+    -- kiinduló sorszámok a haladás kijelzéséhez
+    foreach target in array tables loop
+      key := case when target = 'search_events' then 'id' else 'event_id' end;
+      execute format('select count(*) from public.%I where %I = $1', target, key)
+        into moved using job.event_id;
+      job.total := job.total || jsonb_build_object(target, moved);
+    end loop;
+    job.status := 'running';
+    job.current_table := tables[1];
+  end if;
+
+  target := job.current_table;
+  if target = 'search_events' then
+    foreach child in array tables[1:array_length(tables, 1) - 1] loop
+      execute format('select exists (select 1 from public.%I where event_id = $1)', child)
+        into leftover using job.event_id;
+      if leftover then
+        target := child;
+        job.current_table := child;
+        exit;
+      end if;
+    end loop;
+  end if;
+  key := case when target = 'search_events' then 'id' else 'event_id' end;
+  if job.mode = 'archive' then
+    execute format(
+      'with moved as (
+         delete from public.%1$I
+          where ctid = any(array(select ctid from public.%1$I where %2$I = $1 limit $2))
+         returning *)
+       insert into archive.%1$I select * from moved', target, key)
+      using job.event_id, p_batch;
+  else
+    execute format(
+      'delete from public.%1$I
+        where ctid = any(array(select ctid from public.%1$I where %2$I = $1 limit $2))', target, key)
+      using job.event_id, p_batch;
+  end if;
+  get diagnostics moved = row_count;
+
+  job.done := jsonb_set(job.done, array[target], to_jsonb(coalesce((job.done ->> target)::bigint, 0) + moved));
+  if moved < p_batch then
+    if target = tables[array_length(tables, 1)] then
+      job.status := 'done';
+      job.current_table := null;
+      job.finished_at := now();
+    else
+      job.current_table := tables[array_position(tables, target) + 1];
+    end if;
+  end if;
+
+  update public.event_purge_jobs
+     set status = job.status, current_table = job.current_table, total = job.total, done = job.done,
+         finished_at = job.finished_at, updated_at = now()
+   where id = job.id
+  returning * into job;
+  return job;
+end;
+$$;
+
+revoke all on function public.purge_event_batch(bigint, integer) from public, anon, authenticated;
+grant execute on function public.purge_event_batch(bigint, integer) to service_role;
@@ -0,0 +1,22 @@
+-- A GPS fogadó (rescue_ingest.py) kötegenként és eseményenként egyetlen
+-- Realtime broadcast üzenetet küld a beszúrás tranzakciójában:
+--   realtime.send(payload, 'gps_tracks_batch', 'event-<event_id>', true)
+-- A topic privát: csak az esemény résztvevői és az admin/koordinátorok
+-- iratkozhatnak fel rá (useEventChanges.js), a gps_tracks soronkénti
+-- postgres_changes feliratkozása megszűnik.
+
+drop policy if exists event_topic_read on realtime.messages;
+create policy event_topic_read on realtime.messages
+  for select to authenticated
+  using (
+    realtime.messages.extension = 'broadcast'
+    and realtime.topic() ~ '^event-[0-9]+$'
+    and (
+      exists (select 1 from public.users u where u.id = auth.uid() and u.role in ('admin', 'coordinator'))
+      or exists (select 1 from public.event_participants p
+                  where p.user_id = auth.uid()
+                    and p.event_id = substring(realtime.topic() from 7)::bigint)
+    )
+  );
+
+create index if not exists event_participants_user_event_idx on public.event_participants (user_id, event_id);
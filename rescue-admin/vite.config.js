@@ -4,5 +4,8 @@ import react from '@vitejs/plugin-react'
 // https://vitejs.dev/config/
 export default defineConfig({
   plugins: [react()],
+  // Sourcemap csak a méret elemzőhöz (rescue_bundle.py, BUNDLE_SOURCEMAP=1), ami
+  // az elemzés után törli; a telepített dist-be nem kerül .map
+  build: { sourcemap: process.env.BUNDLE_SOURCEMAP ? 'hidden' : false },
   base: '/'  // Cseréld a repo nevedre, pl. '/repo-name/' GitHub Pages-hez
 })
\ No newline at end of file
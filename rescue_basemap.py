@@ -0,0 +1,611 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Offline alaptérkép csempe cache az esemény műveleti területére.
+
+A térkép nézetek (Map.jsx, SearchManager.jsx) minden mozgatásnál a
+tile.openstreetmap.org-ról töltenek; a vezetési pontokon gyakran alig van
+net. Ez az eszköz az esemény befoglaló téglalapjára és egy zoom
+tartományra előre letölti a csempéket (korlátozott párhuzamossággal), egy
+memory-mapelt csomag fájlba teszi, és helyben kiszolgálja őket
+(ETag/Cache-Control). A kliens a VITE_BASEMAP_URL-lel állítható át rá
+(src/basemap.js).
+
+A csomag (MBTiles-hoz hasonló, de SQLite nélkül) hozzáfűzéses:
+
+    RBMT\\x01 | rekordok: fejléc (z, x, y, méret, letöltés ideje, sha1) | adat
+
+Megnyitáskor csak a rekord fejléceket olvassuk végig (index), a csempe
+adatok az mmap-ből jönnek. Egy csempe újabb változata a végére kerül, az
+index a legutolsóra mutat; a `compact` kidobja a régieket. A félbeszakadt
+utolsó rekordot figyelmen kívül hagyjuk.
+
+Figyelem: a tile.openstreetmap.org felhasználási feltételei tiltják a
+tömeges letöltést; a --origin saját vagy erre engedélyt adó szolgáltatóra
+mutasson.
+
+    python rescue_basemap.py prefetch --bbox 20.1,47.7,20.6,48.0 --zooms 10-16 \\
+        --origin 'https://tiles.example.org/{z}/{x}/{y}.png' basemap.pack
+    python rescue_basemap.py prefetch --event 42 --zooms 10-16 --origin ... basemap.pack
+    python rescue_basemap.py serve basemap.pack --port 8766 [--origin ...]
+    python rescue_basemap.py bench
+"""
+
+import hashlib
+import json
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+
+MAGIC = b'RBMT\x01'
+# z, x, y, méret, letöltés ideje (unix s), sha1
+_RECORD = struct.Struct('<BIIIQ20s')
+USER_AGENT = 'rescue-admin-basemap/1.0'
+MAX_AGE_S = 7 * 24 * 3600
+EARTH_RADIUS_KM = 6371.0088
+
+
+def tile_range(min_lng, min_lat, max_lng, max_lat, zoom):
+    """(x0, y0, x1, y1) a téglalapot lefedő csempék (zárt) tartománya."""
+    def to_tile(lng, lat):
+        lat = max(min(lat, 85.05112878), -85.05112878)
+        scale = 2 ** zoom
+        x = int((lng + 180.0) / 360.0 * scale)
+        s = math.sin(math.radians(lat))
+        y = int((0.5 - math.log((1 + s) / (1 - s)) / (4 * math.pi)) * scale)
+        return min(max(x, 0), scale - 1), min(max(y, 0), scale - 1)
+
+    x0, y0 = to_tile(min_lng, max_lat)
+    x1, y1 = to_tile(max_lng, min_lat)
+    return x0, y0, x1, y1
+
+
+def tiles_for_bbox(bbox, min_zoom, max_zoom):
+    """A téglalap csempéi zoom szerint növekvő sorrendben (generátor)."""
+    for zoom in range(min_zoom, max_zoom + 1):
+        x0, y0, x1, y1 = tile_range(*bbox, zoom)
+        for x in range(x0, x1 + 1):
+            for y in range(y0, y1 + 1):
+                yield zoom, x, y
+
+
+def tile_count(bbox, min_zoom, max_zoom):
+    total = 0
+    for zoom in range(min_zoom, max_zoom + 1):
+        x0, y0, x1, y1 = tile_range(*bbox, zoom)
+        total += (x1 - x0 + 1) * (y1 - y0 + 1)
+    return total
+
+
+def bbox_area_km2(bbox):
+    """A lng/lat téglalap területe a gömbön (km²)."""
+    min_lng, min_lat, max_lng, max_lat = bbox
+    return (EARTH_RADIUS_KM ** 2 * math.radians(max_lng - min_lng)
+            * abs(math.sin(math.radians(max_lat)) - math.sin(math.radians(min_lat))))
+
+
+def expand_bbox(bbox, margin_km):
+    min_lng, min_lat, max_lng, max_lat = bbox
+    d_lat = margin_km / 111.32
+    d_lng = margin_km / (111.32 * max(math.cos(math.radians((min_lat + max_lat) / 2)), 0.01))
+    return min_lng - d_lng, min_lat - d_lat, max_lng + d_lng, max_lat + d_lat
+
+
+class TilePack:
+    """Hozzáfűzéses, memory-mapelt csempe tár. Olvasni több szálból is
+    lehet; az írás egy zárral sorosított."""
+
+    def __init__(self, path):
+        self.path = path
+        self._index = {}
+        self._lock = threading.Lock()
+        self._mm = None
+        if not os.path.exists(path):
+            with open(path, 'wb') as f:
+                f.write(MAGIC)
+        self._file = open(path, 'r+b')
+        if self._file.read(len(MAGIC)) != MAGIC:
+            self._file.close()
+            raise ValueError(f"Nem csempe csomag: {path}")
+        self._end = self._scan()
+        # Egy esetleges csonka rekord helyére írunk tovább
+        self._file.truncate(self._end)
+        self._remap()
+
+    def _scan(self):
+        size = os.fstat(self._file.fileno()).st_size
+        pos = len(MAGIC)
+        self._file.seek(pos)
+        while pos + _RECORD.size <= size:
+            z, x, y, length, fetched, digest = _RECORD.unpack(self._file.read(_RECORD.size))
+            if pos + _RECORD.size + length > size:
+                break
+            self._index[(z, x, y)] = (pos + _RECORD.size, length, fetched, digest.hex())
+            pos += _RECORD.size + length
+            self._file.seek(pos)
+        return pos
+
+    def _remap(self):
+        # A régi mmap-et nem zárjuk: egy másik szál épp olvashat belőle, a
+        # referencia elengedésekor záródik
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self._end > len(MAGIC) else None
+
+    def __contains__(self, tile):
+        return tile in self._index
+
+    def __len__(self):
+        return len(self._index)
+
+    def get(self, tile):
+        """(adat, etag, letöltés ideje) vagy None."""
+        entry = self._index.get(tile)
+        if entry is None:
+            return None
+        offset, length, fetched, digest = entry
+        mm = self._mm
+        if mm is None or offset + length > len(mm):
+            with self._lock:
+                if self._mm is None or offset + length > len(self._mm):
+                    self._remap()
+                mm = self._mm
+        return mm[offset:offset + length], digest, fetched
+
+    def put(self, tile, data, fetched=None):
+        digest = hashlib.sha1(data).digest()
+        fetched = int(fetched or time.time())
+        with self._lock:
+            current = self._index.get(tile)
+            if current is not None and current[3] == digest.hex():
+                return False
+            z, x, y = tile
+            self._file.seek(self._end)
+            self._file.write(_RECORD.pack(z, x, y, len(data), fetched, digest))
+            self._file.write(data)
+            self._file.flush()
+            self._index[tile] = (self._end + _RECORD.size, len(data), fetched, digest.hex())
+            self._end += _RECORD.size + len(data)
+        return True
+
+    def stats(self):
+        """Zoomonként (csempe szám, bájt)."""
+        per_zoom = {}
+        for (z, _, _), (_, length, _, _) in self._index.items():
+            count, size = per_zoom.get(z, (0, 0))
+            per_zoom[z] = (count + 1, size + length)
+        return dict(sorted(per_zoom.items()))
+
+    def compact(self):
+        """A felülírt rekordok kidobása (atomikus csere)."""
+        tmp_path = self.path + '.tmp'
+        with self._lock, open(tmp_path, 'wb') as out:
+            out.write(MAGIC)
+            self._remap()
+            for (z, x, y), (offset, length, fetched, digest) in sorted(self._index.items()):
+                out.write(_RECORD.pack(z, x, y, length, fetched, bytes.fromhex(digest)))
+                out.write(self._mm[offset:offset + length])
+        self.close()
+        os.replace(tmp_path, self.path)
+        self.__init__(self.path)
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# --- Letöltés --------------------------------------------------------------------
+
+def tile_url(template, tile):
+    z, x, y = tile
+    return template.format(s='abc'[(x + y) % 3], z=z, x=x, y=y)
+
+
+def fetch_tile(template, tile, retries=3, timeout=20):
+    """Egy csempe letöltése; 429/5xx és hálózati hiba esetén visszalépéssel újrapróbál.
+    404-re None (a szolgáltatónak nincs ilyen csempéje)."""
+    import urllib.error
+    import urllib.request
+
+    request = urllib.request.Request(tile_url(template, tile), headers={'User-Agent': USER_AGENT})
+    for attempt in range(retries + 1):
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                return response.read()
+        except urllib.error.HTTPError as err:
+            if err.code == 404:
+                return None
+            if err.code != 429 and err.code < 500 or attempt == retries:
+                raise
+        except OSError:
+            if attempt == retries:
+                raise
+        time.sleep(0.5 * 2 ** attempt)
+
+
+def prefetch(pack, tiles, template, max_workers=8, refresh=False, progress=None):
+    """A hiányzó (vagy `refresh`-nél minden) csempe letöltése legfeljebb
+    max_workers párhuzamos kéréssel. A bejárás lusta: egyszerre csak
+    2 * max_workers feladat van függőben."""
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+    report = {'fetched': 0, 'present': 0, 'missing': 0, 'failed': [], 'bytes': 0}
+    pending = {}
+
+    def collect(done):
+        for future in done:
+            tile = pending.pop(future)
+            try:
+                data = future.result()
+            except OSError as err:
+                report['failed'].append((tile, str(err)))
+                continue
+            if data is None:
+                report['missing'] += 1
+                continue
+            pack.put(tile, data)
+            report['fetched'] += 1
+            report['bytes'] += len(data)
+        if progress:
+            progress(report)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for tile in tiles:
+            if not refresh and tile in pack:
+                report['present'] += 1
+                continue
+            if len(pending) >= 2 * max_workers:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+            pending[pool.submit(fetch_tile, template, tile)] = tile
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            collect(done)
+    report['seconds'] = time.perf_counter() - started
+    return report
+
+
+def event_bbox(client, event_id):
+    """Az esemény elemeinek befoglaló téglalapja PostgREST-ről (markerek és
+    a rescue_polygons által kitöltött bbox_* oszlopok); a nyolc szélsőérték
+    lekérdezés egyszerre megy ki."""
+    queries, targets = [], []
+    for table, column, desc in (('map_markers', 'longitude', False), ('map_markers', 'longitude', True),
+                                ('map_markers', 'latitude', False), ('map_markers', 'latitude', True),
+                                ('polygons', 'bbox_min_lng', False), ('polygons', 'bbox_max_lng', True),
+                                ('polygons', 'bbox_min_lat', False), ('polygons', 'bbox_max_lat', True)):
+        queries.append(client.table(table).select(column).eq('event_id', event_id)
+                       .not_(column, 'is', None).order(column, desc=desc).limit(1))
+        targets.append(column)
+    lngs, lats = [], []
+    for column, result in zip(targets, client.gather(*queries)):
+        values = lngs if column.endswith('lng') or column == 'longitude' else lats
+        values.extend(float(row[column]) for row in result.data)
+    if not lngs or not lats:
+        return None
+    return min(lngs), min(lats), max(lngs), max(lats)
+
+
+# --- Kiszolgálás -----------------------------------------------------------------
+
+class BasemapServer:
+    """Csempék kiszolgálása a csomagból. Ha van `origin`, a hiányzó csempét
+    letölti és elteszi (read-through), különben 404."""
+
+    def __init__(self, pack, origin=None, max_age=MAX_AGE_S):
+        self.pack = pack
+        self.origin = origin
+        self.max_age = max_age
+        self.hits = self.misses = self.not_modified = 0
+        self._lock = threading.Lock()
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def lookup(self, tile):
+        """(adat, etag) vagy None; számolja a találatokat."""
+        entry = self.pack.get(tile)
+        if entry is not None:
+            self._count('hits')
+            return entry[0], entry[1]
+        self._count('misses')
+        if not self.origin:
+            return None
+        try:
+            data = fetch_tile(self.origin, tile, retries=1, timeout=10)
+        except OSError:
+            return None
+        if data is None:
+            return None
+        self.pack.put(tile, data)
+        return data, hashlib.sha1(data).hexdigest()
+
+    def make_handler(self):
+        from http.server import BaseHTTPRequestHandler
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def _send(self, status, body=b'', headers=()):
+                self.send_response(status)
+                self.send_header('Access-Control-Allow-Origin', '*')
+                for name, value in headers:
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                path = self.path.split('?')[0].strip('/')
+                if path == 'stats':
+                    body = json.dumps({'tiles': len(server.pack), 'hits': server.hits, 'misses': server.misses,
+                                       'not_modified': server.not_modified,
+                                       'hit_rate': round(server.hit_rate(), 4)}).encode('utf-8')
+                    self._send(200, body, [('Content-Type', 'application/json')])
+                    return
+                parts = path.split('/')
+                try:
+                    z, x, y = int(parts[-3]), int(parts[-2]), int(parts[-1].split('.')[0])
+                except (IndexError, ValueError):
+                    self._send(404, b'not found')
+                    return
+                if len(parts) != 3 or not (0 <= z <= 22 and 0 <= x < 2 ** z and 0 <= y < 2 ** z):
+                    self._send(404, b'not found')
+                    return
+                entry = server.lookup((z, x, y))
+                if entry is None:
+                    self._send(404, b'not found', [('Cache-Control', 'no-store')])
+                    return
+                data, etag = entry
+                headers = [('ETag', f'"{etag}"'), ('Cache-Control', f'public, max-age={server.max_age}')]
+                if self.headers.get('If-None-Match') == f'"{etag}"':
+                    server._count('not_modified')
+                    self._send(304, headers=headers)
+                    return
+                content_type = 'image/png' if data[:4] == b'\x89PNG' else \
+                    'image/jpeg' if data[:2] == b'\xff\xd8' else 'image/webp' if data[8:12] == b'WEBP' \
+                    else 'application/octet-stream'
+                self._send(200, data, headers + [('Content-Type', content_type)])
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def start_server(handler, host='127.0.0.1', port=0):
+    """ThreadingHTTPServer háttérszálon; visszaadja a szervert (server_port)."""
+    from http.server import ThreadingHTTPServer
+
+    httpd = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd
+
+
+def stand_in_origin(latency_s=0.02, fail_every=0):
+    """Helyi csempe szolgáltató a méréshez/kipróbáláshoz: determinisztikus,
+    a zoommal növő méretű „csempe” bájtokat ad, opcionális késleltetéssel és
+    minden `fail_every`-edik kérésre 503-mal."""
+    from http.server import BaseHTTPRequestHandler
+
+    counter = {'requests': 0}
+    lock = threading.Lock()
+
+    class Origin(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            with lock:
+                counter['requests'] += 1
+                number = counter['requests']
+            time.sleep(latency_s)
+            if fail_every and number % fail_every == 0:
+                self.send_response(503)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            z, x, y = (int(part.split('.')[0]) for part in self.path.strip('/').split('/')[-3:])
+            seed = hashlib.sha256(f'{z}/{x}/{y}'.encode()).digest()
+            body = b'\x89PNG\r\n\x1a\n' + seed * (200 + 40 * z)
+            self.send_response(200)
+            self.send_header('Content-Type', 'image/png')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    httpd = start_server(Origin)
+    httpd.requests = counter
+    return httpd
+
+
+def print_report(pack, bbox, server=None):
+    area = bbox_area_km2(bbox)
+    total = 0
+    print(f"Terület: {area:.1f} km², {len(pack)} csempe")
+    for zoom, (count, size) in pack.stats().items():
+        total += size
+        print(f"  z{zoom:<3}{count:>8} csempe {size / 2 ** 20:>9.1f} MiB {size / 1024 / area:>9.1f} KiB/km²")
+    print(f"  összesen {total / 2 ** 20:.1f} MiB, {total / 1024 / area:.1f} KiB/km²")
+    if server is not None:
+        print(f"Cache találati arány: {server.hit_rate() * 100:.1f}% "
+              f"({server.hits} találat, {server.misses} hiány, {server.not_modified} 304)")
+
+
+# --- Benchmark ---------------------------------------------------------------
+
+def bench(bbox=(20.2, 47.8, 20.6, 48.1), zooms=(10, 14), workers=(2, 8, 32)):
+    """Előtöltés a helyi stand-in szolgáltatóról különböző párhuzamossággal,
+    majd egy szimulált térkép bejárás a helyi szerveren (részben a
+    területen kívül is, hogy a találati arány ne legyen triviálisan 100%)."""
+    import random
+    import shutil
+    import tempfile
+    import urllib.error
+    import urllib.request
+
+    origin = stand_in_origin(latency_s=0.02, fail_every=97)
+    template = f'http://127.0.0.1:{origin.server_port}/{{z}}/{{x}}/{{y}}.png'
+    work_dir = tempfile.mkdtemp(prefix='rescue_basemap_bench_')
+    count = tile_count(bbox, *zooms)
+    print(f"{count} csempe, z{zooms[0]}-{zooms[1]}, {bbox_area_km2(bbox):.0f} km²")
+    try:
+        for max_workers in workers:
+            path = os.path.join(work_dir, f'w{max_workers}.pack')
+            with TilePack(path) as pack:
+                report = prefetch(pack, tiles_for_bbox(bbox, *zooms), template, max_workers)
+            print(f"  {max_workers:>3} szál: {report['seconds']:.2f} s, {report['fetched']} letöltve, "
+                  f"{len(report['failed'])} hiba")
+        pack = TilePack(path)
+        started = time.perf_counter()
+        report = prefetch(pack, tiles_for_bbox(bbox, *zooms), template, max_workers)
+        print(f"  újrafuttatás: {report['present']} már megvan, {report['fetched']} letöltve, "
+              f"{(time.perf_counter() - started) * 1000:.0f} ms")
+        started = time.perf_counter()
+        reopened = TilePack(path)
+        print(f"  csomag megnyitása (index): {(time.perf_counter() - started) * 1000:.1f} ms")
+        reopened.close()
+
+        server = BasemapServer(pack)
+        httpd = start_server(server.make_handler())
+        rng = random.Random(1)
+        wide = expand_bbox(bbox, 3)
+        etags = {}
+        started = time.perf_counter()
+        for _ in range(3000):
+            zoom = rng.randint(zooms[0], zooms[1] + 1)
+            x0, y0, x1, y1 = tile_range(*wide, zoom)
+            tile = (zoom, rng.randint(x0, x1), rng.randint(y0, y1))
+            headers = {'If-None-Match': etags[tile]} if tile in etags else {}
+            request = urllib.request.Request(f'http://127.0.0.1:{httpd.server_port}/{tile[0]}/{tile[1]}/{tile[2]}.png',
+                                             headers=headers)
+            try:
+                with urllib.request.urlopen(request) as response:
+                    etags[tile] = response.headers['ETag']
+                    response.read()
+            except urllib.error.HTTPError as err:
+                err.read()
+        elapsed = time.perf_counter() - started
+        print(f"  3000 kérés a helyi szerveren: {elapsed / 3000 * 1000:.2f} ms/kérés")
+        print_report(pack, bbox, server)
+        httpd.shutdown()
+        pack.close()
+    finally:
+        origin.shutdown()
+        shutil.rmtree(work_dir)
+
+
+def _parse_zooms(value):
+    low, _, high = value.partition('-')
+    return int(low), int(high or low)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Offline alaptérkép csempe cache')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p_prefetch = sub.add_parser('prefetch', help='csempék előtöltése egy területre')
+    p_prefetch.add_argument('pack_path')
+    area = p_prefetch.add_mutually_exclusive_group(required=True)
+    area.add_argument('--bbox', help='min_lng,min_lat,max_lng,max_lat')
+    area.add_argument('--event', help='esemény id (SUPABASE_URL/SUPABASE_SERVICE_KEY)')
+    p_prefetch.add_argument('--margin-km', type=float, default=2.0)
+    p_prefetch.add_argument('--zooms', default='10-16')
+    p_prefetch.add_argument('--origin', required=True, help='pl. https://tiles.example.org/{z}/{x}/{y}.png')
+    p_prefetch.add_argument('--workers', type=int, default=8)
+    p_prefetch.add_argument('--refresh', action='store_true', help='a meglévő csempéket is újratölti')
+    p_serve = sub.add_parser('serve', help='csempék kiszolgálása a csomagból')
+    p_serve.add_argument('pack_path')
+    p_serve.add_argument('--host', default='127.0.0.1')
+    p_serve.add_argument('--port', type=int, default=8766)
+    p_serve.add_argument('--origin', help='hiányzó csempék letöltése innen (ha van net)')
+    p_stats = sub.add_parser('stats', help='csomag tartalma és tárhely / km²')
+    p_stats.add_argument('pack_path')
+    p_stats.add_argument('--bbox', required=True)
+    p_compact = sub.add_parser('compact', help='felülírt csempék kidobása')
+    p_compact.add_argument('pack_path')
+    sub.add_parser('bench')
+    args = parser.parse_args(argv)
+
+    if args.command == 'bench':
+        bench()
+    elif args.command == 'prefetch':
+        if args.bbox:
+            bbox = tuple(float(value) for value in args.bbox.split(','))
+        else:
+            from rescue_data import DataClient
+
+            url, key = os.environ.get('SUPABASE_URL'), os.environ.get('SUPABASE_SERVICE_KEY')
+            if not url or not key:
+                parser.error('--event-hez SUPABASE_URL és SUPABASE_SERVICE_KEY kell')
+            with DataClient(url, key) as client:
+                bbox = event_bbox(client, args.event)
+            if bbox is None:
+                parser.error(f'Az eseménynek ({args.event}) nincsenek helyhez kötött elemei')
+        bbox = expand_bbox(bbox, args.margin_km)
+        zooms = _parse_zooms(args.zooms)
+        total = tile_count(bbox, *zooms)
+        print(f"{total} csempe (z{zooms[0]}-{zooms[1]}), {bbox_area_km2(bbox):.1f} km²")
+
+        def progress(report):
+            done = report['fetched'] + report['present'] + report['missing'] + len(report['failed'])
+            if done % 500 == 0:
+                print(f"  {done}/{total}")
+
+        with TilePack(args.pack_path) as pack:
+            report = prefetch(pack, tiles_for_bbox(bbox, *zooms), args.origin, args.workers,
+                              args.refresh, progress)
+            print(f"{report['fetched']} letöltve ({report['bytes'] / 2 ** 20:.1f} MiB), "
+                  f"{report['present']} már megvolt, {report['missing']} nincs a szolgáltatónál, "
+                  f"{len(report['failed'])} hiba, {report['seconds']:.1f} s")
+            for tile, error in report['failed'][:20]:
+                print(f"  HIBA {tile}: {error}")
+            print_report(pack, bbox)
+    elif args.command == 'stats':
+        with TilePack(args.pack_path) as pack:
+            print_report(pack, tuple(float(value) for value in args.bbox.split(',')))
+    elif args.command == 'compact':
+        pack = TilePack(args.pack_path)
+        before = os.path.getsize(args.pack_path)
+        pack.compact()
+        print(f"{before / 2 ** 20:.1f} MiB -> {os.path.getsize(args.pack_path) / 2 ** 20:.1f} MiB")
+        pack.close()
+    else:
+        pack = TilePack(args.pack_path)
+        server = BasemapServer(pack, args.origin)
+        from http.server import ThreadingHTTPServer
+
+        httpd = ThreadingHTTPServer((args.host, args.port), server.make_handler())
+        print(f"Alaptérkép: http://{args.host}:{args.port}/{{z}}/{{x}}/{{y}}.png ({len(pack)} csempe)")
+        try:
+            httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            httpd.server_close()
+            print(f"Találati arány: {server.hit_rate() * 100:.1f}% ({server.hits}/{server.hits + server.misses})")
+            pack.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,558 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Build kimenet méret elemző (Vite dist + sourcemap).
+
+Minden .js/.css fájl bájtjait a mellette lévő .map alapján a forrás
+modulokhoz és npm csomagokhoz rendeli (nyers és gzip méret). A bundle-t és a
+sourcemap `mappings` mezőjét darabonként olvassa, a sourcesContent-et át sem
+lépi a memóriába, így nagy bundle-nél sem kell egyszerre mindent betölteni.
+
+A gzip méret fájlonként és csomagonként pontos (csomagonként egy-egy
+folyamatos tömörítő); modulonként a csomag tömörítési arányával becsült,
+mert a gzip nem additív.
+
+    python rescue_bundle.py analyze rescue-admin/dist --json build.json
+    python rescue_bundle.py analyze rescue-admin/dist --budgets bundle_budgets.json
+    python rescue_bundle.py diff regi.json uj.json
+
+A vite.config.js csak BUNDLE_SOURCEMAP=1 mellett ír (rejtett) sourcemap-ot,
+így a telepített dist-be (npm run deploy) nem kerül .map fájl. Elemzéshez:
+
+    BUNDLE_SOURCEMAP=1 npm run build
+    python rescue_bundle.py analyze rescue-admin/dist --remove-maps
+
+A --remove-maps az elemzés után törli a .map fájlokat. Budget túllépésnél a
+kilépési kód 1.
+
+A generátor (rescue02webp.py) a fájlok kiírása után a `build_and_check`-kel
+le is buildeli a projektet (sourcemap-pal, amit az elemzés után töröl), és
+budget túllépésnél BudgetError-ral megáll.
+"""
+
+import fnmatch
+import json
+import os
+import re
+import sys
+import zlib
+
+CHUNK_SIZE = 1 << 16
+SOURCEMAP_ENV = 'BUNDLE_SOURCEMAP'
+BUDGETS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bundle_budgets.json')
+APP_PACKAGE = '(app)'
+UNMAPPED = '(unmapped)'
+_B64 = {c: i for i, c in enumerate('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/')}
+_NODE_MODULES_RE = re.compile(r'node_modules/((?:@[^/]+/)?[^/]+)')
+
+
+def _gzip_compressor():
+    return zlib.compressobj(9, zlib.DEFLATED, 31)
+
+
+def package_of(source):
+    matches = _NODE_MODULES_RE.findall(source.replace('\\', '/'))
+    return matches[-1] if matches else APP_PACKAGE
+
+
+# --- Sourcemap streamelve ----------------------------------------------------
+
+_STRING_SPECIAL_RE = re.compile(r'[\\"]')
+
+
+class _JsonStream:
+    """Minimális, darabonként olvasó JSON szkenner a sourcemap felső
+    szintjéhez; a nagy stringeket (sourcesContent) tárolás nélkül lépi át."""
+
+    def __init__(self, f):
+        self.f = f
+        self.buf = ''
+        self.pos = 0
+
+    def _fill(self):
+        chunk = self.f.read(CHUNK_SIZE)
+        if not chunk:
+            raise ValueError("Váratlan fájlvég a sourcemap-ban")
+        # Az escape miatt a pos túlléphet a pufferen
+        skip = max(0, self.pos - len(self.buf))
+        self.buf = self.buf[min(self.pos, len(self.buf)):] + chunk[skip:]
+        self.pos = 0
+
+    def next_nonspace(self):
+        while True:
+            while self.pos < len(self.buf):
+                c = self.buf[self.pos]
+                self.pos += 1
+                if not c.isspace():
+                    return c
+            self._fill()
+
+    def string(self, keep=True):
+        """A nyitó idézőjel utáni string; keep=False esetén csak átlépi."""
+        out = []
+        while True:
+            match = _STRING_SPECIAL_RE.search(self.buf, self.pos)
+            if match is None:
+                if keep:
+                    out.append(self.buf[self.pos:])
+                self.pos = len(self.buf)
+                self._fill()
+                continue
+            i = match.start()
+            if keep:
+                out.append(self.buf[self.pos:i])
+            if match.group() == '"':
+                self.pos = i + 1
+                return json.loads('"' + ''.join(out) + '"') if keep else None
+            while i + 1 >= len(self.buf):
+                # Az escape-elt karakter a következő darabban van
+                self.buf, self.pos = self.buf[i:], 0
+                i = 0
+                self.buf += self.f.read(CHUNK_SIZE) or '"'
+            if keep:
+                out.append(self.buf[i:i + 2])
+            self.pos = i + 2
+
+    def value(self, keep=True):
+        """Egy JSON érték; visszaadja az értéket (vagy None-t)."""
+        c = self.next_nonspace()
+        if c == '"':
+            return self.string(keep)
+        if c in '[{':
+            close = ']' if c == '[' else '}'
+            items = []
+            while True:
+                c = self.next_nonspace()
+                if c == close:
+                    break
+                if c == ',':
+                    continue
+                self.pos -= 1
+                if close == '}':
+                    self.next_nonspace()
+                    key = self.string()
+                    self.next_nonspace()  # ':'
+                    items.append((key, self.value(keep)))
+                else:
+                    items.append(self.value(keep))
+            if not keep:
+                return None
+            return dict(items) if close == '}' else items
+        # Szám, true/false/null
+        start = self.pos - 1
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] not in ',}] \t\r\n':
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return json.loads(self.buf[start:self.pos]) if keep else None
+            self.buf, self.pos, start = self.buf[start:], self.pos - start, 0
+            self.buf += self.f.read(CHUNK_SIZE) or ' '
+
+
+def read_sourcemap_meta(map_path):
+    """A sourcemap mezői a `mappings` és a `sourcesContent` nélkül."""
+    meta = {}
+    with open(map_path, 'r', encoding='utf-8') as f:
+        stream = _JsonStream(f)
+        if stream.next_nonspace() != '{':
+            raise ValueError(f"Nem sourcemap: {map_path}")
+        while True:
+            c = stream.next_nonspace()
+            if c == '}':
+                break
+            if c == ',':
+                continue
+            key = stream.string()
+            stream.next_nonspace()  # ':'
+            keep = key not in ('mappings', 'sourcesContent')
+            value = stream.value(keep)
+            if keep:
+                meta[key] = value
+    return meta
+
+
+def _mapping_chunks(f):
+    """A felső szintű `mappings` string darabjai (escape nincs benne, csak
+    base64 , ;). A többi kulcs értékét a szkenner lépi át, így a `names`
+    vagy a `sourcesContent` "mappings" szövege nem téveszti meg."""
+    stream = _JsonStream(f)
+    if stream.next_nonspace() != '{':
+        return
+    while True:
+        c = stream.next_nonspace()
+        if c == '}':
+            return
+        if c == ',':
+            continue
+        key = stream.string()
+        stream.next_nonspace()  # ':'
+        if key != 'mappings':
+            stream.value(keep=False)
+            continue
+        if stream.next_nonspace() != '"':
+            return
+        buf = stream.buf[stream.pos:]
+        while True:
+            end = buf.find('"')
+            if end != -1:
+                yield buf[:end]
+                return
+            yield buf
+            buf = f.read(CHUNK_SIZE)
+            if not buf:
+                return
+
+
+_SEGMENT_RE = re.compile(r'([A-Za-z0-9+/]*)([,;])')
+
+
+def iter_mapping_segments(map_path):
+    """(generált sor, oszlop, forrás index vagy None) a `mappings` mezőből,
+    darabonként olvasva és dekódolva."""
+    line = column = source = 0
+    pending = ''
+    with open(map_path, 'r', encoding='utf-8') as f:
+        for chunk in _mapping_chunks(f):
+            data = pending + chunk
+            end = 0
+            for match in _SEGMENT_RE.finditer(data):
+                segment, separator = match.groups()
+                end = match.end()
+                if segment:
+                    values = _decode_vlq(segment)
+                    column += values[0]
+                    if len(values) >= 4:
+                        source += values[1]
+                        yield line, column, source
+                    else:
+                        yield line, column, None
+                if separator == ';':
+                    line += 1
+                    column = 0
+            # Az utolsó, még csonka szegmens a következő darabhoz kerül
+            pending = data[end:]
+    if pending:
+        values = _decode_vlq(pending)
+        column += values[0]
+        if len(values) >= 4:
+            yield line, column, source + values[1]
+        else:
+            yield line, column, None
+
+
+def _decode_vlq(segment):
+    values = []
+    shift = value = 0
+    for c in segment:
+        digit = _B64[c]
+        value += (digit & 31) << shift
+        if digit & 32:
+            shift += 5
+            continue
+        values.append(-(value >> 1) if value & 1 else value >> 1)
+        shift = value = 0
+    return values
+
+
+# --- Attribúció --------------------------------------------------------------
+
+class _GeneratedReader:
+    """A generált fájl szövege (sor, oszlop) pozíciókig darabolva."""
+
+    def __init__(self, f):
+        self.f = f
+        self.buf = ''
+        self.pos = 0
+        self.line = 0
+        self.column = 0
+        self.eof = False
+
+    def _fill(self):
+        if self.pos:
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+        chunk = self.f.read(CHUNK_SIZE)
+        if not chunk:
+            self.eof = True
+        self.buf += chunk
+
+    def take_until(self, line, column):
+        out = []
+        while (self.line, self.column) < (line, column):
+            if self.pos >= len(self.buf):
+                self._fill()
+                if self.eof and self.pos >= len(self.buf):
+                    break
+            if self.line < line:
+                nl = self.buf.find('\n', self.pos)
+                if nl == -1:
+                    out.append(self.buf[self.pos:])
+                    self.column += len(self.buf) - self.pos
+                    self.pos = len(self.buf)
+                    continue
+                out.append(self.buf[self.pos:nl + 1])
+                self.pos = nl + 1
+                self.line += 1
+                self.column = 0
+                continue
+            # Azonos sor: az oszlopig, de legfeljebb a sor végéig
+            end = min(len(self.buf), self.pos + (column - self.column))
+            nl = self.buf.find('\n', self.pos, end)
+            if nl != -1:
+                end = nl
+            out.append(self.buf[self.pos:end])
+            self.column += end - self.pos
+            self.pos = end
+            if nl != -1:
+                break
+        return ''.join(out)
+
+    def rest(self):
+        out = [self.buf[self.pos:]]
+        while True:
+            chunk = self.f.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            out.append(chunk)
+        self.pos = len(self.buf)
+        return ''.join(out)
+
+
+class _Totals:
+    def __init__(self):
+        self.raw = {}
+        self.compressors = {}
+        self.gzip = {}
+
+    def add(self, key, data, compress=True):
+        self.raw[key] = self.raw.get(key, 0) + len(data)
+        if compress:
+            comp = self.compressors.get(key)
+            if comp is None:
+                comp = self.compressors[key] = _gzip_compressor()
+                self.gzip[key] = 0
+            self.gzip[key] += len(comp.compress(data))
+
+    def finish(self):
+        for key, comp in self.compressors.items():
+            self.gzip[key] += len(comp.flush())
+        self.compressors = {}
+        return {key: {'raw': raw, 'gzip': self.gzip.get(key, 0)} for key, raw in self.raw.items()}
+
+
+def analyze_file(path):
+    """Egy build fájl (js/css) attribúciója a sourcemap alapján."""
+    map_path = path + '.map'
+    file_total = _Totals()
+    packages = _Totals()
+    modules = _Totals()
+    name = os.path.basename(path)
+
+    def account(source, text):
+        data = text.encode('utf-8')
+        if not data:
+            return
+        file_total.add(name, data)
+        package = package_of(source) if source is not None else UNMAPPED
+        packages.add(package, data)
+        modules.add(source if source is not None else UNMAPPED, data, compress=False)
+
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        reader = _GeneratedReader(f)
+        if os.path.exists(map_path):
+            sources = read_sourcemap_meta(map_path).get('sources', [])
+            current = None
+            for line, column, source in iter_mapping_segments(map_path):
+                source = sources[source] if source is not None else None
+                # Az azonos modulhoz tartozó egymás utáni szegmensek egy darabban
+                if source != current:
+                    account(current, reader.take_until(line, column))
+                    current = source
+            account(current, reader.rest())
+        else:
+            account(None, reader.rest())
+
+    packages = packages.finish()
+    modules = modules.finish()
+    for source, entry in modules.items():
+        package = packages[package_of(source) if source != UNMAPPED else UNMAPPED]
+        entry['gzip'] = round(entry['raw'] * package['gzip'] / package['raw']) if package['raw'] else 0
+    return {'file': file_total.finish().get(name, {'raw': 0, 'gzip': 0}), 'packages': packages, 'modules': modules,
+            'sourcemap': os.path.exists(map_path)}
+
+
+def _merge(target, entries):
+    for key, entry in entries.items():
+        slot = target.setdefault(key, {'raw': 0, 'gzip': 0})
+        slot['raw'] += entry['raw']
+        slot['gzip'] += entry['gzip']
+
+
+def analyze(paths):
+    """Egy dist mappa vagy fájlok listája -> összesített jelentés."""
+    if isinstance(paths, str):
+        paths = [paths]
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files.extend(os.path.join(root, n) for n in sorted(names) if n.endswith(('.js', '.css')))
+        else:
+            files.append(path)
+    report = {'files': {}, 'packages': {}, 'modules': {}, 'total': {'raw': 0, 'gzip': 0}, 'unmapped_files': []}
+    for path in files:
+        result = analyze_file(path)
+        name = os.path.basename(path)
+        report['files'][name] = result['file']
+        report['total']['raw'] += result['file']['raw']
+        report['total']['gzip'] += result['file']['gzip']
+        _merge(report['packages'], result['packages'])
+        _merge(report['modules'], result['modules'])
+        if not result['sourcemap']:
+            report['unmapped_files'].append(name)
+    return report
+
+
+def remove_sourcemaps(paths):
+    """A .map fájlok törlése a megadott mappákból (vagy a megadott fájlok
+    mellől), hogy a dist telepíthető maradjon; a törölt fájlok száma."""
+    if isinstance(paths, str):
+        paths = [paths]
+    removed = 0
+    for path in paths:
+        if os.path.isdir(path):
+            targets = [os.path.join(root, n) for root, _, names in os.walk(path) for n in names if n.endswith('.map')]
+        else:
+            targets = [path + '.map'] if os.path.exists(path + '.map') else []
+        for target in targets:
+            os.remove(target)
+            removed += 1
+    return removed
+
+
+# --- Budget és diff -------------------------------------------------------------
+
+class BudgetError(ValueError):
+    pass
+
+
+def check_budgets(report, budgets):
+    """Budget formátum: {"total": {"gzip": n}, "files": {"index-*.js": {"raw": n}},
+    "packages": {"leaflet": {"gzip": n}}, "modules": {"src/*": {...}}}.
+    A files/packages/modules kulcsai fnmatch minták."""
+    violations = []
+    for metric, limit in budgets.get('total', {}).items():
+        if report['total'][metric] > limit:
+            violations.append(f"összesen {metric}: {report['total'][metric]} > {limit}")
+    for section in ('files', 'packages', 'modules'):
+        for pattern, limits in budgets.get(section, {}).items():
+            for key, entry in report[section].items():
+                if not fnmatch.fnmatchcase(key, pattern):
+                    continue
+                for metric, limit in limits.items():
+                    if entry[metric] > limit:
+                        violations.append(f"{section} {key} {metric}: {entry[metric]} > {limit}")
+    return violations
+
+
+def build_and_check(project_dir, budgets_path=BUDGETS_PATH, build_command=('npm', 'run', 'build')):
+    """A generált projekt buildje és a dist budget ellenőrzése. Túllépésnél
+    (vagy ha a build nem sikerül) BudgetError. npm install előtt nincs mit
+    buildelni: ilyenkor None, különben a jelentés. A build sourcemap-pal fut
+    (SOURCEMAP_ENV), a .map fájlokat az elemzés után töröljük a dist-ből."""
+    import subprocess
+
+    if not os.path.isdir(os.path.join(project_dir, 'node_modules')):
+        return None
+    dist = os.path.join(project_dir, 'dist')
+    result = subprocess.run(build_command, cwd=project_dir, capture_output=True, text=True,
+                            env=dict(os.environ, **{SOURCEMAP_ENV: '1'}))
+    if result.returncode != 0:
+        raise BudgetError(f"A build nem sikerült ({' '.join(build_command)}):\n{result.stdout}{result.stderr}")
+    try:
+        report = analyze(dist)
+    finally:
+        remove_sourcemaps(dist)
+    with open(budgets_path, encoding='utf-8') as f:
+        violations = check_budgets(report, json.load(f))
+    if violations:
+        raise BudgetError("Budget túllépés:\n  " + "\n  ".join(violations))
+    return report
+
+
+def diff_reports(old, new, section='packages'):
+    rows = []
+    for key in set(old[section]) | set(new[section]):
+        a = old[section].get(key, {'raw': 0, 'gzip': 0})
+        b = new[section].get(key, {'raw': 0, 'gzip': 0})
+        if a != b:
+            rows.append((key, b['raw'] - a['raw'], b['gzip'] - a['gzip'], b['raw'], b['gzip']))
+    rows.sort(key=lambda row: abs(row[2]), reverse=True)
+    return rows
+
+
+def print_report(report, top=15):
+    print(f"Összesen: {report['total']['raw']} B, {report['total']['gzip']} B gzip")
+    for name, entry in sorted(report['files'].items(), key=lambda item: -item[1]['raw']):
+        print(f"  {entry['raw']:>9} {entry['gzip']:>8}  {name}")
+    for section in ('packages', 'modules'):
+        print(f"{'Csomagok' if section == 'packages' else 'Modulok'} (nyers / gzip):")
+        for key, entry in sorted(report[section].items(), key=lambda item: -item[1]['raw'])[:top]:
+            print(f"  {entry['raw']:>9} {entry['gzip']:>8}  {key}")
+    for name in report['unmapped_files']:
+        print(f"  Figyelem: nincs sourcemap: {name}")
+
+
+def main(argv=None):
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description='Build méret elemzés sourcemap alapján')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p_analyze = sub.add_parser('analyze')
+    p_analyze.add_argument('paths', nargs='+')
+    p_analyze.add_argument('--json', help='jelentés mentése (diff-hez)')
+    p_analyze.add_argument('--budgets', help='budget JSON fájl')
+    p_analyze.add_argument('--top', type=int, default=15)
+    p_analyze.add_argument('--remove-maps', action='store_true', help='a .map fájlok törlése az elemzés után')
+    p_diff = sub.add_parser('diff')
+    p_diff.add_argument('old')
+    p_diff.add_argument('new')
+    p_diff.add_argument('--section', default='packages', choices=('files', 'packages', 'modules'))
+    args = parser.parse_args(argv)
+
+    if args.command == 'diff':
+        with open(args.old, encoding='utf-8') as f:
+            old = json.load(f)
+        with open(args.new, encoding='utf-8') as f:
+            new = json.load(f)
+        print(f"Összesen: {new['total']['raw'] - old['total']['raw']:+} B, "
+              f"{new['total']['gzip'] - old['total']['gzip']:+} B gzip")
+        for key, d_raw, d_gzip, raw, gz in diff_reports(old, new, args.section):
+            print(f"  {d_raw:>+9} {d_gzip:>+8}  ({raw} / {gz})  {key}")
+        return 0
+
+    start = time.perf_counter()
+    try:
+        report = analyze(args.paths)
+    finally:
+        if args.remove_maps:
+            print(f"{remove_sourcemaps(args.paths)} .map fájl törölve")
+    elapsed = time.perf_counter() - start
+    print_report(report, args.top)
+    print(f"Elemzés: {elapsed * 1000:.0f} ms")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=1, sort_keys=True)
+    if args.budgets:
+        with open(args.budgets, encoding='utf-8') as f:
+            violations = check_budgets(report, json.load(f))
+        for violation in violations:
+            print(f"Budget túllépés: {violation}")
+        if violations:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Átkutatott terület (lefedettség) rács a GPS nyomvonalakból.
+
+Eseményenként egy négyzetrács (alapból 5 m-es cellák) jelzi, hol járt már
+kereső. A nyomvonal minden szakaszát a kereső pásztázási szélességével
+(alapból 20 m) "kenjük" a rácsra, és szektoronként (polygons) számoljuk a
+lefedett cellák arányát.
+
+A rács növekményes: az új gps_tracks pontok csak a felhasználó utolsó
+pontjától rajzolnak tovább (ugyanazzal az 50 m-es pontosság szűréssel és
+120 s-os szünet bontással, mint a rescue_tracks), és a szektor számlálók
+csak az újonnan lefedett cellákkal nőnek. A rács 256×256-os uint8 darabokból
+áll, csak ott foglal memóriát, ahol járt valaki; a kliensnek bitre tömörítve
+(packbits) adható át.
+
+    python rescue_coverage.py bench --searchers 300
+"""
+
+import math
+
+import numpy as np
+
+from rescue_tracks import ACCURACY_THRESHOLD, GAP_THRESHOLD_MS, parse_times
+
+EARTH_RADIUS = 6378137.0
+CHUNK = 256
+DEFAULT_CELL_SIZE = 5.0  # méter
+DEFAULT_SWEEP_WIDTH = 20.0  # méter
+# A cellaindexek eltolása, hogy két 32 bites félből egy int64 kulcs legyen
+_BIAS = 1 << 31
+
+
+def _cell_keys(ix, iy):
+    return ((ix.astype(np.int64) + _BIAS) << 32) | (iy.astype(np.int64) + _BIAS)
+
+
+def _stencil(radius_cells):
+    """A kör alakú ecset cella eltolásai."""
+    r = int(math.ceil(radius_cells))
+    dx, dy = np.meshgrid(np.arange(-r, r + 1), np.arange(-r, r + 1))
+    inside = dx * dx + dy * dy <= radius_cells * radius_cells + 1e-9
+    return dx[inside].astype(np.int64), dy[inside].astype(np.int64)
+
+
+class CoverageGrid:
+    """Egy esemény lefedettségi rácsa."""
+
+    def __init__(self, origin_lat, origin_lng, cell_size=DEFAULT_CELL_SIZE, sweep_width=DEFAULT_SWEEP_WIDTH,
+                 accuracy_threshold=ACCURACY_THRESHOLD, gap_ms=GAP_THRESHOLD_MS):
+        self.origin_lat = origin_lat
+        self.origin_lng = origin_lng
+        self.cell_size = cell_size
+        self.sweep_width = sweep_width
+        self.accuracy_threshold = accuracy_threshold
+        self.gap_ms = gap_ms
+        self._cos = math.cos(math.radians(origin_lat))
+        self._stencil = _stencil(max(sweep_width / 2 / cell_size, 0.5))
+        self.chunks = {}
+        # felhasználó -> (x, y, time_ms) az utolsó elfogadott pontból
+        self.last_points = {}
+        # szektor -> (rendezett cellakulcsok, lefedett darab)
+        self.sectors = {}
+        self.covered_cells = 0
+
+    # --- vetítés ---
+
+    def to_grid(self, lat, lng):
+        """Fokból rácskoordináta (cella egységben, lebegőpontos)."""
+        lat = np.asarray(lat, dtype=np.float64)
+        lng = np.asarray(lng, dtype=np.float64)
+        y = np.radians(lat - self.origin_lat) * EARTH_RADIUS / self.cell_size
+        x = np.radians(lng - self.origin_lng) * EARTH_RADIUS * self._cos / self.cell_size
+        return x, y
+
+    # --- rajzolás ---
+
+    def _mark(self, ix, iy):
+        """Cellák beállítása; visszaadja az újonnan lefedett cellák kulcsait."""
+        if not len(ix):
+            return np.empty(0, dtype=np.int64)
+        keys = np.unique(_cell_keys(ix, iy))
+        ix = (keys >> 32) - _BIAS
+        iy = (keys & 0xFFFFFFFF) - _BIAS
+        chunk_x, chunk_y = ix // CHUNK, iy // CHUNK
+        chunk_keys = _cell_keys(chunk_x, chunk_y)
+        order = np.argsort(chunk_keys, kind='stable')
+        chunk_keys, ix, iy, keys = chunk_keys[order], ix[order], iy[order], keys[order]
+        bounds = np.flatnonzero(np.r_[True, chunk_keys[1:] != chunk_keys[:-1], True])
+        fresh = []
+        for a, b in zip(bounds[:-1], bounds[1:]):
+            key = (int(ix[a] // CHUNK), int(iy[a] // CHUNK))
+            chunk = self.chunks.get(key)
+            if chunk is None:
+                chunk = self.chunks[key] = np.zeros((CHUNK, CHUNK), dtype=np.uint8)
+            local_y, local_x = iy[a:b] % CHUNK, ix[a:b] % CHUNK
+            new = chunk[local_y, local_x] == 0
+            chunk[local_y[new], local_x[new]] = 1
+            fresh.append(keys[a:b][new])
+        fresh = np.concatenate(fresh)
+        self.covered_cells += len(fresh)
+        return fresh
+
+    def _stroke(self, x0, y0, x1, y1):
+        """Szakaszok (x0,y0)->(x1,y1) rácscellái az ecsettel. A szakaszokat
+        fél cellánként mintavételezzük, és minden mintára rányomjuk az ecsetet."""
+        length = np.hypot(x1 - x0, y1 - y0)
+        steps = np.maximum(np.ceil(length * 2).astype(np.int64), 1)
+        first = np.cumsum(steps) - steps
+        owner = np.repeat(np.arange(len(steps)), steps)
+        t = (np.arange(steps.sum()) - first[owner] + 1) / steps[owner]
+        # A szakasz első pontja is kell (egyedülálló pont, szakasz eleje)
+        sx = np.concatenate((x0, x0[owner] + (x1 - x0)[owner] * t))
+        sy = np.concatenate((y0, y0[owner] + (y1 - y0)[owner] * t))
+        cx = np.floor(sx + 0.5).astype(np.int64)
+        cy = np.floor(sy + 0.5).astype(np.int64)
+        # Az ecsetet csak a különböző középcellákra kell rányomni
+        centers = np.unique(_cell_keys(cx, cy))
+        cx = (centers >> 32) - _BIAS
+        cy = (centers & 0xFFFFFFFF) - _BIAS
+        dx, dy = self._stencil
+        return (cx[:, None] + dx[None, :]).ravel(), (cy[:, None] + dy[None, :]).ravel()
+
+    def add_points(self, user_ids, lat, lng, time_ms, acc=None):
+        """Új pontok (tetszőleges sorrendben, több felhasználótól).
+        Visszatérés: ennyi cella lett újonnan lefedett."""
+        user_ids = np.asarray(user_ids)
+        lat = np.asarray(lat, dtype=np.float64)
+        lng = np.asarray(lng, dtype=np.float64)
+        time_ms = np.asarray(time_ms, dtype=np.int64)
+        keep = np.isfinite(lat) & np.isfinite(lng) & (time_ms != np.iinfo(np.int64).min)
+        if acc is not None:
+            keep &= ~(np.asarray(acc, dtype=np.float64) > self.accuracy_threshold)
+        user_ids, lat, lng, time_ms = user_ids[keep], lat[keep], lng[keep], time_ms[keep]
+        if not len(lat):
+            return 0
+        x, y = self.to_grid(lat, lng)
+
+        # Felhasználónként időrendben; az előző hívás utolsó pontja az első "előző"
+        order = np.lexsort((time_ms, user_ids))
+        user_ids, x, y, time_ms = user_ids[order], x[order], y[order], time_ms[order]
+        new_user = np.r_[True, user_ids[1:] != user_ids[:-1]]
+        prev_x, prev_y, prev_t = np.r_[np.nan, x[:-1]], np.r_[np.nan, y[:-1]], np.r_[0, time_ms[:-1]]
+        for index in np.flatnonzero(new_user):
+            last = self.last_points.get(user_ids[index].item())
+            prev_x[index], prev_y[index], prev_t[index] = last if last is not None else (np.nan, np.nan, 0)
+        last_index = np.r_[np.flatnonzero(new_user)[1:] - 1, len(x) - 1]
+        for index in last_index:
+            last = self.last_points.get(user_ids[index].item())
+            # Késve érkező régi pont nem írja felül a frissebbet
+            if last is None or time_ms[index] >= last[2]:
+                self.last_points[user_ids[index].item()] = (x[index], y[index], int(time_ms[index]))
+
+        # Szünet után (vagy előzmény nélkül) csak maga a pont kerül a rácsra
+        connected = np.isfinite(prev_x) & (time_ms - prev_t <= self.gap_ms) & (time_ms >= prev_t)
+        x0 = np.where(connected, prev_x, x)
+        y0 = np.where(connected, prev_y, y)
+        fresh = self._mark(*self._stroke(x0, y0, x, y))
+        self._update_sectors(fresh)
+        return len(fresh)
+
+    def add_rows(self, rows):
+        """gps_tracks jellegű sorok: {user_id, lat, lng, acc, time} (a nézet
+        track_points kulcsaival)."""
+        rows = [row for row in rows if row and row.get('lat') and row.get('lng') and row.get('time')]
+        if not rows:
+            return 0
+        return self.add_points([str(row['user_id']) for row in rows],
+                               [float(row['lat']) for row in rows], [float(row['lng']) for row in rows],
+                               parse_times([row['time'] for row in rows]),
+                               [float(row['acc']) if row.get('acc') else np.nan for row in rows])
+
+    # --- szektorok ---
+
+    def add_sector(self, sector_id, coordinates):
+        """Szektor a polygons.coordinates alakjában: [[lng, lat], ...]."""
+        ring = np.asarray(coordinates, dtype=np.float64)
+        x, y = self.to_grid(ring[:, 1], ring[:, 0])
+        min_x, max_x = int(math.floor(x.min())), int(math.ceil(x.max()))
+        min_y, max_y = int(math.floor(y.min())), int(math.ceil(y.max()))
+        gx, gy = np.meshgrid(np.arange(min_x, max_x + 1), np.arange(min_y, max_y + 1))
+        gx, gy = gx.ravel(), gy.ravel()
+        # Páros–páratlan szabály a cellaközéppontokra, élenként vektorosan
+        inside = np.zeros(len(gx), dtype=bool)
+        for x1, y1, x2, y2 in zip(x, y, np.roll(x, -1), np.roll(y, -1)):
+            if y1 == y2:
+                continue
+            crosses = (y1 > gy) != (y2 > gy)
+            at_x = x1 + (gy - y1) * (x2 - x1) / (y2 - y1)
+            inside ^= crosses & (gx < at_x)
+        cells = np.sort(_cell_keys(gx[inside], gy[inside]))
+        self.sectors[sector_id] = [cells, int(self._covered_mask(cells).sum())]
+
+    def remove_sector(self, sector_id):
+        self.sectors.pop(sector_id, None)
+
+    def _covered_mask(self, keys):
+        ix = (keys >> 32) - _BIAS
+        iy = (keys & 0xFFFFFFFF) - _BIAS
+        result = np.zeros(len(keys), dtype=bool)
+        chunk_x, chunk_y = ix // CHUNK, iy // CHUNK
+        for key in set(zip(chunk_x.tolist(), chunk_y.tolist())):
+            chunk = self.chunks.get(key)
+            if chunk is None:
+                continue
+            mask = (chunk_x == key[0]) & (chunk_y == key[1])
+            result[mask] = chunk[iy[mask] % CHUNK, ix[mask] % CHUNK] != 0
+        return result
+
+    def _update_sectors(self, fresh):
+        if not len(fresh) or not self.sectors:
+            return
+        for sector in self.sectors.values():
+            cells = sector[0]
+            if not len(cells):
+                continue
+            position = np.searchsorted(cells, fresh)
+            position[position == len(cells)] = 0
+            sector[1] += int(np.count_nonzero(cells[position] == fresh))
+
+    def sector_coverage(self):
+        """{szektor: {'cells', 'covered', 'percent'}}"""
+        return {sector_id: {'cells': len(cells), 'covered': covered,
+                            'percent': round(100.0 * covered / len(cells), 1) if len(cells) else 0.0}
+                for sector_id, (cells, covered) in self.sectors.items()}
+
+    def covered_area(self):
+        """A lefedett terület négyzetméterben."""
+        return self.covered_cells * self.cell_size * self.cell_size
+
+    def dense(self, ix0, iy0, width, height):
+        """A rács egy téglalapja sűrű uint8 tömbként ([sor = y, oszlop = x])."""
+        result = np.zeros((height, width), dtype=np.uint8)
+        for chunk_y in range(iy0 // CHUNK, (iy0 + height - 1) // CHUNK + 1):
+            for chunk_x in range(ix0 // CHUNK, (ix0 + width - 1) // CHUNK + 1):
+                chunk = self.chunks.get((chunk_x, chunk_y))
+                if chunk is None:
+                    continue
+                x0, y0 = max(ix0, chunk_x * CHUNK), max(iy0, chunk_y * CHUNK)
+                x1, y1 = min(ix0 + width, (chunk_x + 1) * CHUNK), min(iy0 + height, (chunk_y + 1) * CHUNK)
+                result[y0 - iy0:y1 - iy0, x0 - ix0:x1 - ix0] = \
+                    chunk[y0 - chunk_y * CHUNK:y1 - chunk_y * CHUNK, x0 - chunk_x * CHUNK:x1 - chunk_x * CHUNK]
+        return result
+
+    def packed_chunks(self):
+        """{(chunk_x, chunk_y): bitre tömörített bájtok} a kliensnek (8 cella/bájt)."""
+        return {key: np.packbits(chunk).tobytes() for key, chunk in self.chunks.items()}
+
+
+def bench(searchers=300, minutes=60, refresh_s=5, seed=1):
+    import time
+
+    rng = np.random.default_rng(seed)
+    lat0, lng0 = 47.9, 20.4
+    grid = CoverageGrid(lat0, lng0)
+    for index in range(8):
+        # 8 szektor 1×1 km-es négyzetekként
+        a, b = lat0 + (index // 4) * 0.009, lng0 + (index % 4) * 0.0134
+        grid.add_sector(index, [[b, a], [b + 0.0134, a], [b + 0.0134, a + 0.009], [b, a + 0.009]])
+    users = np.array([f'user-{i}' for i in range(searchers)])
+    position = np.column_stack((rng.uniform(lat0, lat0 + 0.018, searchers), rng.uniform(lng0, lng0 + 0.054, searchers)))
+    heading = rng.uniform(0, 2 * np.pi, searchers)
+    start_ms = 1_715_000_000_000
+    timings = []
+    for step in range(int(minutes * 60 / refresh_s)):
+        # Frissítésenként searchers × refresh_s új pont (1 Hz)
+        batch_lat, batch_lng, batch_t = [], [], []
+        for second in range(refresh_s):
+            heading += rng.normal(0, 0.2, searchers)
+            position[:, 0] += np.sin(heading) * 1.4 / 111_320
+            position[:, 1] += np.cos(heading) * 1.4 / (111_320 * math.cos(math.radians(lat0)))
+            batch_lat.append(position[:, 0].copy())
+            batch_lng.append(position[:, 1].copy())
+            batch_t.append(np.full(searchers, start_ms + (step * refresh_s + second) * 1000))
+        started = time.perf_counter()
+        grid.add_points(np.tile(users, refresh_s), np.concatenate(batch_lat), np.concatenate(batch_lng),
+                        np.concatenate(batch_t), rng.uniform(3, 30, searchers * refresh_s))
+        grid.sector_coverage()
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    print(f"{searchers} kereső, {minutes} perc, {refresh_s} s-onként {searchers * refresh_s} új pont")
+    print(f"Frissítés: medián {timings[len(timings) // 2] * 1000:.1f} ms, "
+          f"legrosszabb {timings[-1] * 1000:.1f} ms")
+    packed = sum(len(data) for data in grid.packed_chunks().values())
+    print(f"Lefedett terület: {grid.covered_area() / 1e6:.2f} km², {len(grid.chunks)} darab, "
+          f"{len(grid.chunks) * CHUNK * CHUNK // 1024} KiB (tömörítve {packed // 1024} KiB)")
+    for sector_id, coverage in grid.sector_coverage().items():
+        print(f"  szektor {sector_id}: {coverage['percent']}%")
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Lefedettségi rács')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p_bench = sub.add_parser('bench')
+    p_bench.add_argument('--searchers', type=int, default=300)
+    p_bench.add_argument('--minutes', type=int, default=60)
+    p_bench.add_argument('--refresh', type=int, default=5, help='frissítési időköz (s)')
+    args = parser.parse_args(argv)
+    if args.command == 'bench':
+        bench(args.searchers, args.minutes, args.refresh)
+
+
+if __name__ == '__main__':
+    main()
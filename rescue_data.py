@@ -0,0 +1,978 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Közös adatelérés a Supabase (PostgREST) táblákhoz a háttér eszközöknek.
+
+Eddig minden eszköz és komponens maga építette a PostgREST kéréseit,
+egyenként, új kapcsolattal. Itt:
+
+  - kapcsolat készlet: keep-alive HTTP kapcsolatok (http.client), a
+    készlet méretéig párhuzamosan,
+  - `gather`: a független lekérdezések egyszerre mennek ki (külön
+    kapcsolatokon; a PostgREST HTTP/1.1 pipeliningra nem építhetünk),
+  - az azonos, épp futó GET kérések összevonása: a második hívó az első
+    válaszát kapja (a visszakapott adatot csak olvasni szabad),
+  - újrapróbálás véletlen visszalépéssel (full jitter) 429/5xx és
+    kapcsolati hiba esetén, csak idempotens kéréseknél (GET/HEAD/PATCH/DELETE),
+  - a supabase-js-hez hasonló lekérdezés építő, kulcsos lapozással.
+
+Helyi kipróbáláshoz és méréshez van egy PostgREST-szerű stand-in is
+(SQLite, a sorok JSON-ban), a szükséges szűrőkkel és Prefer fejlécekkel.
+
+    client = DataClient.from_env()          # SUPABASE_URL, SUPABASE_SERVICE_KEY
+    events, count = client.gather(
+        client.table('search_events').select('id,name').eq('status', 'active'),
+        client.table('users').select('id', count='exact', head=True))
+
+    python rescue_data.py serve --port 8768           # stand-in
+    python rescue_data.py bench --latency-ms 20
+"""
+
+import http.client
+import json
+import os
+import queue
+import random
+import re
+import threading
+import time
+import urllib.parse
+from concurrent.futures import Future, ThreadPoolExecutor
+
+TABLES = ('users', 'search_events', 'event_participants', 'missing_persons', 'map_markers', 'polygons',
+          'gps_tracks', 'help_content', 'event_purge_jobs')
+VIEWS = ('optimized_user_tracks',)
+POOL_SIZE = 8
+RETRIES = 3
+BACKOFF_BASE_S = 0.2
+BACKOFF_MAX_S = 5.0
+_IDEMPOTENT = ('GET', 'HEAD', 'PATCH', 'DELETE')
+_RETRY_STATUS = (429, 502, 503, 504)
+
+
+class DataError(Exception):
+    """PostgREST hibaválasz (status, és ha van: code, message, details)."""
+
+    def __init__(self, status, body):
+        self.status = status
+        try:
+            payload = json.loads(body) if body else {}
+        except ValueError:
+            payload = {'message': body.decode('utf-8', 'replace') if isinstance(body, bytes) else str(body)}
+        if not isinstance(payload, dict):
+            payload = {'message': str(payload)}
+        self.code = payload.get('code')
+        self.details = payload.get('details')
+        super().__init__(f"{status}: {payload.get('message') or 'PostgREST hiba'}")
+
+
+class Result:
+    """Egy kérés eredménye: data (lista/dict/None) és count (ha kértük)."""
+
+    __slots__ = ('data', 'count', 'status')
+
+    def __init__(self, data, count=None, status=200):
+        self.data = data
+        self.count = count
+        self.status = status
+
+    def __iter__(self):
+        # `data, count = result` kibontáshoz
+        return iter((self.data, self.count))
+
+
+class ConnectionPool:
+    """Legfeljebb `size` keep-alive kapcsolat egy hosthoz; szálbiztos."""
+
+    def __init__(self, url, size=POOL_SIZE, timeout=30):
+        parsed = urllib.parse.urlsplit(url)
+        self.scheme = parsed.scheme or 'http'
+        self.host = parsed.hostname
+        self.port = parsed.port
+        self.prefix = parsed.path.rstrip('/')
+        self.timeout = timeout
+        self.opened = 0
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        cls = http.client.HTTPSConnection if self.scheme == 'https' else http.client.HTTPConnection
+        with self._lock:
+            self.opened += 1
+        return cls(self.host, self.port, timeout=self.timeout)
+
+    def request(self, method, path, body=None, headers=None):
+        """(status, fejlécek, törzs). Egy elhalt keep-alive kapcsolat miatti
+        hibát egyszer új kapcsolattal megismétel."""
+        self._slots.acquire()
+        try:
+            try:
+                connection = self._idle.get_nowait()
+                reused = True
+            except queue.Empty:
+                connection, reused = self._connect(), False
+            while True:
+                try:
+                    connection.request(method, self.prefix + path, body=body, headers=headers or {})
+                    response = connection.getresponse()
+                    data = response.read()
+                except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError,
+                        http.client.CannotSendRequest):
+                    connection.close()
+                    if not reused:
+                        raise
+                    connection, reused = self._connect(), False
+                    continue
+                except Exception:
+                    connection.close()
+                    raise
+                if response.will_close:
+                    connection.close()
+                else:
+                    self._idle.put(connection)
+                return response.status, response.headers, data
+        finally:
+            self._slots.release()
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class Query:
+    """Lekérdezés építő (supabase-js jellegű). Végrehajtás: execute(),
+    vagy több független egyszerre: client.gather(q1, q2, ...)."""
+
+    def __init__(self, client, table):
+        self.client = client
+        self.table = table
+        self.method = 'GET'
+        self.params = []
+        self.body = None
+        self.prefer = []
+        self.head = False
+        self.single_row = False
+        self.as_csv = False
+
+    def _copy(self):
+        query = Query(self.client, self.table)
+        query.method, query.body, query.head, query.single_row = self.method, self.body, self.head, self.single_row
+        query.as_csv = self.as_csv
+        query.params, query.prefer = list(self.params), list(self.prefer)
+        return query
+
+    # --- olvasás ---
+
+    def select(self, columns='*', count=None, head=False):
+        query = self._copy()
+        query.params.append(('select', columns))
+        if count:
+            query.prefer.append(f'count={count}')
+        query.head = head
+        return query
+
+    def _filter(self, column, operator, value):
+        query = self._copy()
+        query.params.append((column, f'{operator}.{value}'))
+        return query
+
+    def eq(self, column, value):
+        return self._filter(column, 'eq', _literal(value))
+
+    def neq(self, column, value):
+        return self._filter(column, 'neq', _literal(value))
+
+    def gt(self, column, value):
+        return self._filter(column, 'gt', _literal(value))
+
+    def gte(self, column, value):
+        return self._filter(column, 'gte', _literal(value))
+
+    def lt(self, column, value):
+        return self._filter(column, 'lt', _literal(value))
+
+    def lte(self, column, value):
+        return self._filter(column, 'lte', _literal(value))
+
+    def like(self, column, pattern):
+        return self._filter(column, 'like', pattern)
+
+    def ilike(self, column, pattern):
+        return self._filter(column, 'ilike', pattern)
+
+    def is_(self, column, value):
+        return self._filter(column, 'is', 'null' if value is None else str(value).lower())
+
+    def in_(self, column, values):
+        quoted = ','.join(_quote_list_item(value) for value in values)
+        return self._filter(column, 'in', f'({quoted})')
+
+    def not_(self, column, operator, value):
+        """Tagadott szűrő, pl. not_('latitude', 'is', None) -> latitude=not.is.null"""
+        value = 'null' if value is None and operator == 'is' else _literal(value)
+        return self._filter(column, f'not.{operator}', value)
+
+    def or_(self, expression):
+        """Logikai fa, pl. or_('a.gt.1,and(a.eq.1,id.gt.5)') -> or=(...)"""
+        query = self._copy()
+        query.params.append(('or', f'({expression})'))
+        return query
+
+    def order(self, column, desc=False, nulls_last=None):
+        query = self._copy()
+        spec = f"{column}.{'desc' if desc else 'asc'}"
+        if nulls_last is not None:
+            spec += '.nullslast' if nulls_last else '.nullsfirst'
+        existing = [value for name, value in query.params if name == 'order']
+        query.params = [(name, value) for name, value in query.params if name != 'order']
+        query.params.append(('order', ','.join(existing + [spec])))
+        return query
+
+    def limit(self, count):
+        query = self._copy()
+        query.params.append(('limit', str(int(count))))
+        return query
+
+    def offset(self, count):
+        query = self._copy()
+        query.params.append(('offset', str(int(count))))
+        return query
+
+    def single(self):
+        query = self._copy()
+        query.single_row = True
+        return query
+
+    def csv(self):
+        """A válasz text/csv (fejléc + sorok, a null üres mező): a data a
+        nyers bájtok. Nagy, lapos táblákhoz (gps_tracks), ahol a JSON sorok
+        dict-jei helyett oszlopokat építünk."""
+        query = self._copy()
+        query.as_csv = True
+        return query
+
+    # --- írás ---
+
+    def _write(self, method, body, returning, extra=()):
+        query = self._copy()
+        query.method, query.body = method, body
+        query.prefer += [f'return={returning}', *extra]
+        return query
+
+    def insert(self, rows, returning='minimal'):
+        return self._write('POST', rows, returning)
+
+    def upsert(self, rows, on_conflict=None, returning='minimal'):
+        query = self._write('POST', rows, returning, ['resolution=merge-duplicates'])
+        if on_conflict:
+            query.params.append(('on_conflict', on_conflict))
+        return query
+
+    def update(self, values, returning='minimal'):
+        return self._write('PATCH', values, returning)
+
+    def delete(self, returning='minimal'):
+        return self._write('DELETE', None, returning)
+
+    # --- végrehajtás ---
+
+    def path(self):
+        return f'/rest/v1/{self.table}?' + urllib.parse.urlencode(self.params, safe=',.()*:"')
+
+    def execute(self):
+        return self.client.execute(self)
+
+    def pages(self, batch=1000, key='id'):
+        """Kulcsos lapozás a `key` oszlop szerint (nem offsettel): az összes
+        sor generátorként, lapról lapra."""
+        base = self.order(key).limit(batch)
+        last = None
+        while True:
+            query = base if last is None else base.gt(key, last)
+            rows = query.execute().data
+            yield from rows
+            if len(rows) < batch:
+                return
+            last = rows[-1][key]
+
+    def csv_pages(self, batch=10000, key='id'):
+        """Mint a pages(), de text/csv lapokkal: lapról lapra a nyers CSV
+        (mindegyik a saját fejlécével). A `key` oszlopnak a select-ben is
+        szerepelnie kell; a következő lap az utolsó sor kulcsa után indul.
+        Az első üres lapnál áll meg, így a szerver max-rows korlátja (ha
+        kisebb a `batch`-nél) sem csonkol."""
+        base = self.csv().order(key).limit(batch)
+        last = None
+        while True:
+            query = base if last is None else base.gt(key, last)
+            page = query.execute().data or b''
+            header, _, body = page.rstrip(b'\n').partition(b'\n')
+            lines = body.count(b'\n') + 1 if body else 0
+            if not lines:
+                return
+            yield page
+            position = header.decode('ascii').strip().split(',').index(key)
+            last = body.rsplit(b'\n', 1)[-1].split(b',')[position].strip(b'"').decode('utf-8')
+
+
+def _quote_value(value):
+    return '"' + str(value).replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def keyset_filter(sort, value, row_id, descending=False):
+    """A (sort, id) szerinti következő lap feltétele or_()-hoz: a null
+    értékek a végén vannak (nullslast), egyezésnél az id dönt."""
+    if value is None:
+        return f'and({sort}.is.null,id.gt.{_quote_value(row_id)})'
+    operator = 'lt' if descending else 'gt'
+    quoted = _quote_value(value)
+    return f'{sort}.{operator}.{quoted},and({sort}.eq.{quoted},id.gt.{_quote_value(row_id)}),{sort}.is.null'
+
+
+def keyset_page(query, size, sort='id', descending=False, cursor=None):
+    """Egy lap (sort, id) szerinti kulcsos lapozással: (sorok, következő
+    kurzor vagy None). A kurzor (érték, id); a `sort` oszlopnak a select-ben
+    is szerepelnie kell. Ugyanaz a feltétel, mint a komponensek
+    useKeysetPage hookjában."""
+    if sort == 'id':
+        query = query.order('id', desc=descending)
+        if cursor is not None:
+            query = (query.lt if descending else query.gt)('id', cursor[1])
+    else:
+        query = query.order(sort, desc=descending, nulls_last=True).order('id')
+        if cursor is not None:
+            query = query.or_(keyset_filter(sort, cursor[0], cursor[1], descending))
+    rows = query.limit(size + 1).execute().data
+    if len(rows) <= size:
+        return rows, None
+    rows = rows[:size]
+    return rows, (rows[-1][sort], rows[-1]['id'])
+
+
+def _literal(value):
+    if value is None:
+        return 'null'
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return str(value)
+
+
+def _quote_list_item(value):
+    text = _literal(value)
+    if any(char in text for char in ',()"\\ '):
+        return '"' + text.replace('\\', '\\\\').replace('"', '\\"') + '"'
+    return text
+
+
+class DataClient:
+    """Kapcsolat készlet + újrapróbálás + GET összevonás a PostgREST fölött."""
+
+    def __init__(self, url, key, pool_size=POOL_SIZE, retries=RETRIES, timeout=30):
+        self.url = url.rstrip('/')
+        self.key = key
+        self.retries = retries
+        self.pool = ConnectionPool(self.url, pool_size, timeout)
+        self.stats = {'requests': 0, 'coalesced': 0, 'retries': 0}
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix='rescue-data')
+
+    @classmethod
+    def from_env(cls, **options):
+        url, key = os.environ.get('SUPABASE_URL'), os.environ.get('SUPABASE_SERVICE_KEY')
+        if not url or not key:
+            raise RuntimeError('SUPABASE_URL és SUPABASE_SERVICE_KEY kell')
+        return cls(url, key, **options)
+
+    def table(self, name):
+        if name not in TABLES and name not in VIEWS:
+            raise ValueError(f'Ismeretlen tábla: {name}')
+        return Query(self, name)
+
+    def rpc(self, name, args=None):
+        """Tárolt függvény hívása (POST /rest/v1/rpc/<név>)."""
+        status, headers, data = self._send('POST', f'/rest/v1/rpc/{name}', args or {}, [])
+        return Result(json.loads(data) if data else None, status=status)
+
+    def execute(self, query):
+        prefer = list(query.prefer)
+        method = 'HEAD' if query.head else query.method
+        if query.method == 'GET' and not query.head:
+            key = (query.path(), tuple(prefer), query.single_row, query.as_csv)
+            return self._coalesced(key, lambda: self._execute(query, method, prefer))
+        return self._execute(query, method, prefer)
+
+    def _execute(self, query, method, prefer):
+        headers = {'Accept': 'application/vnd.pgrst.object+json'} if query.single_row else {}
+        if query.as_csv:
+            headers = {'Accept': 'text/csv'}
+        status, response_headers, data = self._send(method, query.path(), query.body, prefer, headers)
+        count = None
+        content_range = response_headers.get('Content-Range')
+        if content_range and '/' in content_range:
+            total = content_range.rsplit('/', 1)[1]
+            count = int(total) if total.isdigit() else None
+        if query.as_csv:
+            return Result(data, count, status)
+        return Result(json.loads(data) if data else None, count, status)
+
+    def _coalesced(self, key, run):
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+            else:
+                self.stats['coalesced'] += 1
+        if not owner:
+            return future.result()
+        try:
+            result = run()
+        except BaseException as err:
+            future.set_exception(err)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def _send(self, method, path, body, prefer, extra_headers=None):
+        headers = {'apikey': self.key, 'Authorization': f'Bearer {self.key}', 'Accept-Encoding': 'identity'}
+        if extra_headers:
+            headers.update(extra_headers)
+        if prefer:
+            headers['Prefer'] = ','.join(prefer)
+        payload = None
+        if body is not None:
+            payload = json.dumps(body, separators=(',', ':')).encode('utf-8')
+            headers['Content-Type'] = 'application/json'
+        attempts = self.retries + 1 if method in _IDEMPOTENT else 1
+        for attempt in range(attempts):
+            with self._lock:
+                self.stats['requests'] += 1
+            try:
+                status, response_headers, data = self.pool.request(method, path, payload, headers)
+            except (OSError, http.client.HTTPException):
+                if attempt == attempts - 1:
+                    raise
+                self._backoff(attempt)
+                continue
+            if status in _RETRY_STATUS and attempt < attempts - 1:
+                self._backoff(attempt, response_headers.get('Retry-After'))
+                continue
+            if status >= 400:
+                raise DataError(status, data)
+            return status, response_headers, data
+
+    def _backoff(self, attempt, retry_after=None):
+        with self._lock:
+            self.stats['retries'] += 1
+        delay = random.uniform(0, min(BACKOFF_MAX_S, BACKOFF_BASE_S * 2 ** attempt))
+        if retry_after and retry_after.isdigit():
+            delay = max(delay, min(float(retry_after), BACKOFF_MAX_S))
+        time.sleep(delay)
+
+    def gather(self, *queries):
+        """Független lekérdezések egyszerre; az eredmények a megadott sorrendben."""
+        if len(queries) == 1:
+            return [queries[0].execute()]
+        futures = [self._executor.submit(query.execute) for query in queries]
+        return [future.result() for future in futures]
+
+    def submit(self, fn, *args):
+        """Tetszőleges munka (pl. egy lapozás) a kliens szálkészletén; Future.
+        A munka ne hívjon gather-t, mert az ugyanerre a készletre vár."""
+        return self._executor.submit(fn, *args)
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        self.pool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# --- PostgREST-szerű stand-in ------------------------------------------------------
+
+_OPERATORS = {'eq': '=', 'neq': '<>', 'gt': '>', 'gte': '>=', 'lt': '<', 'lte': '<=', 'like': 'like',
+              'ilike': 'like'}
+_RESERVED = ('select', 'order', 'limit', 'offset', 'on_conflict')
+
+
+def _split_logic(text):
+    """Vessző mentén a legfelső szinten; idézőjelen és zárójelen belül nem."""
+    parts, depth, quoted, start, index = [], 0, False, 0, 0
+    while index < len(text):
+        char = text[index]
+        if char == '\\' and quoted:
+            index += 2
+            continue
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char == '(':
+            depth += 1
+        elif not quoted and char == ')':
+            depth -= 1
+        elif not quoted and char == ',' and depth == 0:
+            parts.append(text[start:index])
+            start = index + 1
+        index += 1
+    parts.append(text[start:])
+    return [part.strip() for part in parts if part.strip()]
+
+
+def _csv_value(value):
+    """Egy mező a PostgREST CSV-jében (a Postgres record szöveges alakja):
+    a null üres, a speciális karaktert tartalmazó szöveg idézőjelben."""
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value, separators=(',', ':'))
+    text = str(value)
+    if text == '' or any(char in text for char in ',"\\() \n'):
+        return '"' + text.replace('\\', '\\\\').replace('"', '""') + '"'
+    return text
+
+
+def _unquote(value):
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        return re.sub(r'\\(.)', r'\1', value[1:-1])
+    return value
+
+
+class StandIn:
+    """A PostgREST egy részhalmaza SQLite fölött, a sorok JSON-ban tárolva:
+    select oszlop lista (beágyazás nélkül), eq/neq/gt/gte/lt/lte/like/ilike/
+    is/in szűrők, order, limit/offset, Prefer return=/count=exact,
+    insert/upsert (id szerint)/update/delete, or=/and= logikai fák.
+    `latency_s` kérésenként, `connect_latency_s` kapcsolatonként (TCP+TLS
+    kézfogás helyett) késleltet; `bytes_per_s` a válasz átvitelét lassítja."""
+
+    def __init__(self, latency_s=0.0, connect_latency_s=0.0, bytes_per_s=None):
+        import sqlite3
+
+        self.latency_s = latency_s
+        self.connect_latency_s = connect_latency_s
+        self.bytes_per_s = bytes_per_s
+        self.requests = 0
+        self._db = sqlite3.connect(':memory:', check_same_thread=False)
+        self._lock = threading.Lock()
+        self._text_ids = set()  # táblák, ahol az id nem egész (uuid): ott is a JSON-ból
+        for table in TABLES + VIEWS:
+            self._db.execute(f'create table {table} (id integer primary key, data text not null)')
+
+    def seed(self, table, rows):
+        with self._lock, self._db:
+            for row in rows:
+                self._insert(table, dict(row))
+
+    def index(self, table, *columns):
+        """Kifejezés index (column, ..., id) a rendezéshez és kulcsos lapozáshoz,
+        ahogy éles adatbázisban is lenne."""
+        with self._lock, self._db:
+            self._db.execute(f"create index if not exists ix_{table}_{'_'.join(columns)} on {table} "
+                             f"({', '.join(self._column(table, column) for column in columns)}, id)")
+
+    def _column(self, table, name):
+        if name == 'id' and table not in self._text_ids:
+            return 'id'
+        return f"json_extract(data, '$.{name}')"
+
+    def _insert(self, table, row):
+        if row.get('id') is not None and not isinstance(row['id'], int):
+            self._text_ids.add(table)
+        if row.get('id') is None:
+            cursor = self._db.execute(f'insert into {table} (data) values (?)', ('{}',))
+            row['id'] = cursor.lastrowid
+        self._db.execute(f'insert or replace into {table} (id, data) values (?, ?)',
+                         (row['id'] if isinstance(row['id'], int) else None, json.dumps(row)))
+        return row
+
+    @staticmethod
+    def _value(text):
+        for cast in (int, float):
+            try:
+                return cast(text)
+            except ValueError:
+                pass
+        return text
+
+    def _condition(self, table, name, raw):
+        """Egy `oszlop=operátor.érték` szűrő SQL-je és paraméterei."""
+        negate = raw.startswith('not.')
+        if negate:
+            raw = raw[4:]
+        operator, _, operand = raw.partition('.')
+        column = self._column(table, name)
+        values = []
+        if operator == 'is':
+            clause = f"{column} is {'null' if operand == 'null' else operand}"
+        elif operator == 'in':
+            items = [self._value(_unquote(item)) for item in _split_logic(operand.strip()[1:-1])]
+            clause = f"{column} in ({','.join('?' * len(items))})"
+            values += items
+        elif operator in _OPERATORS:
+            operand = _unquote(operand)
+            if operator in ('like', 'ilike'):
+                # az SQLite like ASCII-ra eleve kis/nagybetű érzéketlen
+                operand = operand.replace('*', '%')
+                clause = f'{column} like ?'
+            else:
+                clause = f'{column} {_OPERATORS[operator]} ?'
+            values.append(self._value(operand))
+        else:
+            raise ValueError(f'nem támogatott szűrő: {operator}')
+        return f'not ({clause})' if negate else clause, values
+
+    def _logic(self, table, operator, text):
+        """or=(a.eq.1,and(b.gt.2,c.is.null)) jellegű logikai fa."""
+        parts, values = [], []
+        for item in _split_logic(text.strip()[1:-1]):
+            negate = item.startswith('not.')
+            inner = item[4:] if negate else item
+            nested = re.match(r'(and|or)(\(.*\))$', inner, re.DOTALL)
+            if nested:
+                clause, nested_values = self._logic(table, nested.group(1), nested.group(2))
+                clause = f'not {clause}' if negate else clause
+            else:
+                name, _, raw = item.partition('.')
+                clause, nested_values = self._condition(table, name, raw)
+            parts.append(clause)
+            values += nested_values
+        return '(' + f' {operator} '.join(parts) + ')', values
+
+    def _where(self, table, params):
+        clauses, values = [], []
+        for name, raw in params:
+            if name in _RESERVED:
+                continue
+            if name in ('or', 'and'):
+                clause, clause_values = self._logic(table, name, raw)
+            else:
+                clause, clause_values = self._condition(table, name, raw)
+            clauses.append(clause)
+            values += clause_values
+        return (' where ' + ' and '.join(clauses)) if clauses else '', values
+
+    def _order(self, table, spec):
+        """order=a.desc.nullslast,id.asc -> SQL (PostgreSQL alapértelmezés:
+        növekvőben a null a végén, csökkenőben az elején)."""
+        terms = []
+        for term in spec.split(','):
+            column, *modifiers = term.strip().split('.')
+            descending = 'desc' in modifiers
+            nulls_last = 'nullslast' in modifiers or ('nullsfirst' not in modifiers and not descending)
+            expression = self._column(table, column)
+            terms.append(f"{expression} {'desc' if descending else 'asc'}" +
+                         ('' if expression == 'id' else f" nulls {'last' if nulls_last else 'first'}"))
+        return ' order by ' + ', '.join(terms)
+
+    def handle(self, method, path, headers, body):
+        """(status, fejlécek, törzs)"""
+        parsed = urllib.parse.urlsplit(path)
+        parts = parsed.path.strip('/').split('/')
+        if len(parts) != 3 or parts[:2] != ['rest', 'v1'] or parts[2] not in TABLES + VIEWS:
+            return 404, {}, json.dumps({'message': 'not found'}).encode()
+        table = parts[2]
+        params = urllib.parse.parse_qsl(parsed.query, keep_blank_values=True)
+        options = dict(params)
+        prefer = headers.get('Prefer', '')
+        try:
+            where, values = self._where(table, params)
+        except ValueError as err:
+            return 400, {}, json.dumps({'message': str(err)}).encode()
+        with self._lock, self._db:
+            if method in ('GET', 'HEAD'):
+                order = self._order(table, options['order']) if 'order' in options else ''
+                page = ''
+                if 'limit' in options:
+                    page = f" limit {int(options['limit'])} offset {int(options.get('offset', 0))}"
+                rows = [json.loads(data) for (data,) in
+                        self._db.execute(f'select data from {table}{where}{order}{page}', values)]
+                columns = options.get('select', '*')
+                if columns != '*':
+                    names = [name.strip() for name in columns.split(',')]
+                    if any('(' in name or ':' in name for name in names):
+                        return 400, {}, json.dumps({'message': 'a stand-in nem támogat beágyazást'}).encode()
+                    rows = [{name: row.get(name) for name in names} for row in rows]
+                response_headers = {}
+                if 'count=exact' in prefer:
+                    total = self._db.execute(f'select count(*) from {table}{where}', values).fetchone()[0]
+                    response_headers['Content-Range'] = f'0-{max(len(rows) - 1, 0)}/{total}'
+                if 'text/csv' in headers.get('Accept', ''):
+                    if columns == '*':
+                        names = list(rows[0]) if rows else []
+                    lines = [','.join(names)] + [','.join(_csv_value(row.get(name)) for name in names) for row in rows]
+                    return 200, response_headers, b'' if method == 'HEAD' else '\n'.join(lines).encode()
+                if 'vnd.pgrst.object' in headers.get('Accept', ''):
+                    if len(rows) != 1:
+                        return 406, {}, json.dumps({'message': 'JSON object requested, multiple (or no) rows returned'}).encode()
+                    rows = rows[0]
+                return 200, response_headers, b'' if method == 'HEAD' else json.dumps(rows).encode()
+            payload = json.loads(body) if body else None
+            if method == 'POST':
+                items = payload if isinstance(payload, list) else [payload]
+                stored = [self._insert(table, dict(item)) for item in items]
+                return self._written(201, prefer, stored)
+            matched = [(row_id, json.loads(data)) for row_id, data in
+                       self._db.execute(f'select id, data from {table}{where}', values)]
+            if method == 'PATCH':
+                for row_id, row in matched:
+                    row.update(payload or {})
+                    self._db.execute(f'update {table} set data = ? where id = ?', (json.dumps(row), row_id))
+                return self._written(200, prefer, [row for _, row in matched])
+            if method == 'DELETE':
+                self._db.executemany(f'delete from {table} where id = ?', [(row_id,) for row_id, _ in matched])
+                return self._written(200, prefer, [row for _, row in matched])
+        return 405, {}, b''
+
+    @staticmethod
+    def _written(status, prefer, rows):
+        if 'return=representation' in prefer:
+            return status, {}, json.dumps(rows).encode()
+        return 204 if status != 201 else 201, {}, b''
+
+    def make_handler(self):
+        from http.server import BaseHTTPRequestHandler
+
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def setup(self):
+                super().setup()
+                if stand_in.connect_latency_s:
+                    time.sleep(stand_in.connect_latency_s)
+
+            def _handle(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length) if length else b''
+                if stand_in.latency_s:
+                    time.sleep(stand_in.latency_s)
+                with stand_in._lock:
+                    stand_in.requests += 1
+                status, headers, data = stand_in.handle(self.command, self.path, self.headers, body)
+                if stand_in.bytes_per_s and self.command != 'HEAD':
+                    time.sleep(len(data) / stand_in.bytes_per_s)
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                if self.command != 'HEAD':
+                    self.wfile.write(data)
+
+            do_GET = do_HEAD = do_POST = do_PATCH = do_DELETE = _handle
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self, host='127.0.0.1', port=0):
+        """Háttérszálon indítja; visszaadja a szervert (server_port)."""
+        from http.server import ThreadingHTTPServer
+
+        server = ThreadingHTTPServer((host, port), self.make_handler())
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+# --- Benchmark ---------------------------------------------------------------
+
+def _naive(url, key, method, path, body=None, prefer=None):
+    """Összehasonlításhoz: kérésenként új kapcsolat (urllib), ahogy eddig."""
+    import urllib.request
+
+    headers = {'apikey': key, 'Authorization': f'Bearer {key}', 'Content-Type': 'application/json'}
+    if prefer:
+        headers['Prefer'] = prefer
+    request = urllib.request.Request(url + path, method=method, headers=headers,
+                                     data=None if body is None else json.dumps(body).encode('utf-8'))
+    with urllib.request.urlopen(request, timeout=30) as response:
+        data = response.read()
+        return json.loads(data) if data else None, response.headers.get('Content-Range')
+
+
+def _seed(stand_in, events=20, users=300, markers=2000):
+    stand_in.seed('users', [{'id': i, 'full_name': f'Kereső {i}', 'role': 'searcher', 'active': True}
+                            for i in range(1, users + 1)])
+    stand_in.seed('search_events', [{'id': i, 'name': f'Esemény {i}', 'status': 'active' if i % 4 == 0 else 'closed'}
+                                    for i in range(1, events + 1)])
+    stand_in.seed('map_markers', [{'id': i, 'event_id': 1 + i % events, 'latitude': 47.5, 'longitude': 19.0,
+                                   'description': 'x' * 40} for i in range(1, markers + 1)])
+    stand_in.seed('polygons', [{'id': i, 'event_id': 1 + i % events, 'coordinates_polyline': 'abc'}
+                               for i in range(1, markers // 4 + 1)])
+
+
+def bench(latency_ms=20, connect_ms=40, repeat=20):
+    stand_in = StandIn(latency_ms / 1000, connect_ms / 1000)
+    _seed(stand_in)
+    server = stand_in.start()
+    url = f'http://127.0.0.1:{server.server_port}'
+    key = 'bench'
+    client = DataClient(url, key)
+    print(f"Stand-in: {latency_ms} ms kérésenként, {connect_ms} ms új kapcsolatonként")
+
+    def measure(label, naive, pooled):
+        timings = {'naive': [], 'pooled': []}
+        for _ in range(repeat):
+            for name, run in (('naive', naive), ('pooled', pooled)):
+                started = time.perf_counter()
+                run()
+                timings[name].append(time.perf_counter() - started)
+        naive_ms = sorted(timings['naive'])[repeat // 2] * 1000
+        pooled_ms = sorted(timings['pooled'])[repeat // 2] * 1000
+        print(f"  {label:<46}{naive_ms:>8.0f} ms -> {pooled_ms:>5.0f} ms")
+
+    print(f"  {'eset (medián)':<46}{'sorban, új kapcsolattal':>10} -> készlet")
+
+    # Dashboard.fetchDashboardData: két egymás utáni lekérdezés
+    measure('Dashboard (users count + aktív események)',
+            lambda: (_naive(url, key, 'HEAD', '/rest/v1/users?select=*', prefer='count=exact'),
+                     _naive(url, key, 'GET', '/rest/v1/search_events?select=id,name&status=eq.active')),
+            lambda: client.gather(client.table('users').select('id', count='exact', head=True),
+                                  client.table('search_events').select('id,name').eq('status', 'active')))
+
+    # SearchManager.loadMarkers: három lekérdezés
+    measure('loadMarkers (markerek, poligonok, nyomvonalak)',
+            lambda: (_naive(url, key, 'GET', '/rest/v1/map_markers?select=*&event_id=eq.4'),
+                     _naive(url, key, 'GET', '/rest/v1/polygons?select=*&event_id=eq.4'),
+                     _naive(url, key, 'GET', '/rest/v1/optimized_user_tracks?select=*&event_id=eq.4')),
+            lambda: client.gather(
+                client.table('map_markers').select('id,latitude,longitude,description').eq('event_id', 4),
+                client.table('polygons').select('id,coordinates_polyline').eq('event_id', 4),
+                client.table('optimized_user_tracks').select('user_id,track_points').eq('event_id', 4)))
+
+    # UserManagement: írás után a teljes lista újratöltése
+    measure('UserManagement (update + teljes újratöltés)',
+            lambda: (_naive(url, key, 'PATCH', '/rest/v1/users?id=eq.7', {'active': False}),
+                     _naive(url, key, 'GET', '/rest/v1/users?select=*')),
+            lambda: client.table('users').update({'active': False}, returning='representation')
+            .eq('id', 7).execute())
+
+    # Azonos olvasások egyszerre (pl. több nézet ugyanarra az eseményre)
+    def concurrent_reads():
+        client.gather(*[client.table('search_events').select('id,name').eq('status', 'active')
+                        for _ in range(8)])
+
+    before = stand_in.requests
+    concurrent_reads()
+    print(f"  8 azonos egyidejű olvasás: {stand_in.requests - before} kérés ment ki "
+          f"(összevonva eddig: {client.stats['coalesced']})")
+    print(f"  kapcsolatok a készletben: {client.pool.opened}, kérések: {client.stats['requests']}, "
+          f"újrapróbálás: {client.stats['retries']}")
+    client.close()
+    server.shutdown()
+
+
+def _user_rows(count, seed=1):
+    rng = random.Random(seed)
+    first = ('Anna', 'Béla', 'Csaba', 'Dóra', 'Erik', 'Flóra', 'Gábor', 'Hanna', 'István', 'Judit')
+    last = ('Kovács', 'Nagy', 'Szabó', 'Tóth', 'Horváth', 'Varga', 'Kiss', 'Molnár', 'Németh', 'Farkas')
+    for index in range(1, count + 1):
+        name = f'{rng.choice(last)} {rng.choice(first)} {index}'
+        yield {'id': index, 'email': f'onkentes{index}@example.org', 'full_name': name,
+               'phone_number': f'+3620{rng.randint(1000000, 9999999)}', 'role': rng.choice(('searcher',) * 9 + ('coordinator',)),
+               'active': rng.random() < 0.9, 'language': 'hu', 'created_at': '2026-03-01T10:00:00+00:00',
+               'updated_at': '2026-03-02T10:00:00+00:00'}
+
+
+def page_bench(sizes=(10000, 100000), page_size=50, latency_ms=20, mbit_per_s=50, repeat=5):
+    """Felhasználó lista: első megjelenés és írás utáni frissítés a teljes tábla
+    betöltésével, illetve egy kulcsos lappal (useKeysetPage), a stand-in-en."""
+    columns = 'id,email,full_name,phone_number,role,active'
+    print(f"Stand-in: {latency_ms} ms kérésenként, {mbit_per_s} Mbit/s, lap: {page_size} sor (medián, ms)")
+    print(f"  {'sorok':>7} {'eset':<34}{'teljes *':>10}{'teljes, szűkítve':>18}{'kulcsos lap':>13}")
+    for size in sizes:
+        stand_in = StandIn(latency_ms / 1000, bytes_per_s=mbit_per_s * 125000)
+        stand_in.seed('users', _user_rows(size))
+        stand_in.index('users', 'full_name')
+        server = stand_in.start()
+        client = DataClient(f'http://127.0.0.1:{server.server_port}', 'bench')
+        users = client.table('users')
+        client.table('users').select('id').limit(1).execute()  # kapcsolat felépítése
+
+        def median(run):
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                run()
+                timings.append(time.perf_counter() - started)
+            return sorted(timings)[repeat // 2] * 1000
+
+        def first_page():
+            return keyset_page(users.select(columns), page_size, 'full_name')
+
+        cursor = first_page()[1]
+        update = {'role': 'coordinator'}
+        results = {
+            'első megjelenés': (
+                median(lambda: users.select('*').execute()),
+                median(lambda: users.select(columns).execute()),
+                median(first_page)),
+            'következő lap': (None, None,
+                              median(lambda: keyset_page(users.select(columns), page_size, 'full_name', cursor=cursor))),
+            'írás + frissítés': (
+                median(lambda: (users.update(update).eq('id', 7).execute(), users.select('*').execute())),
+                median(lambda: (users.update(update).eq('id', 7).execute(), users.select(columns).execute())),
+                median(lambda: users.update(update, returning='representation').eq('id', 7).execute())),
+        }
+        for label, (full, narrow, page) in results.items():
+            full, narrow = ('-' if value is None else f'{value:.0f}' for value in (full, narrow))
+            print(f"  {size:>7} {label:<34}{full:>10}{narrow:>18}{page:>13.0f}")
+        client.close()
+        server.shutdown()
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Közös PostgREST adatelérés és stand-in')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p_serve = sub.add_parser('serve', help='PostgREST-szerű stand-in szerver szintetikus adattal')
+    p_serve.add_argument('--port', type=int, default=8768)
+    p_serve.add_argument('--latency-ms', type=float, default=0)
+    p_bench = sub.add_parser('bench')
+    p_bench.add_argument('--latency-ms', type=float, default=20)
+    p_bench.add_argument('--connect-ms', type=float, default=40)
+    p_bench.add_argument('--repeat', type=int, default=20)
+    p_pages = sub.add_parser('bench-pages', help='teljes lista vs. kulcsos lapozás')
+    p_pages.add_argument('--rows', type=int, nargs='+', default=[10000, 100000])
+    p_pages.add_argument('--page-size', type=int, default=50)
+    p_pages.add_argument('--latency-ms', type=float, default=20)
+    p_pages.add_argument('--mbit', type=float, default=50)
+    args = parser.parse_args(argv)
+
+    if args.command == 'bench':
+        bench(args.latency_ms, args.connect_ms, args.repeat)
+        return
+    if args.command == 'bench-pages':
+        page_bench(args.rows, args.page_size, args.latency_ms, args.mbit)
+        return
+    stand_in = StandIn(args.latency_ms / 1000)
+    _seed(stand_in)
+    server = stand_in.start(port=args.port)
+    print(f"Stand-in: http://127.0.0.1:{server.server_port}/rest/v1/<tábla>")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
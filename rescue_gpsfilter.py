@@ -0,0 +1,612 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+GPS pont szűrés: lehetetlen sebességű ugrások, álló helyzeti „csillag”
+zaj és opcionális Kalman/RTS simítás.
+
+Most csak a processUserTracks fix ACCURACY_THRESHOLD szűrése van, így a
+teleport tüskék, a beltéri többutas terjedés és a zsebben/autóban hagyott
+telefon is vad vonalként jelenik meg a koordinátor térképén. A lépések:
+
+  1. pontosság szűrés (mint eddig),
+  2. sebesség: az a pont, amelybe és amelyből is MAX_SPEED-nél gyorsabb
+     mozgás vezet (a két pont pontosságával csökkentett távolságon), tüske;
+     a kiszűrés után újra nézzük, amíg van ilyen (egymás utáni tüskék),
+  3. álló helyzet: ha a STILL_WINDOW_S időablak pontjai JITTER_RADIUS-nál
+     szorosabban vannak együtt, és az ablak két felének súlypontja között
+     STILL_SPEED-nél lassabb az elmozdulás, a pont állónak számít (a szórás
+     önmagában kevés: a lassú séta egy perc alatt is 15 m-en belül marad);
+     az egymás utáni álló pontok sorozatából az első és az utolsó pont a
+     mért helyén marad, közöttük legalább STILL_KEEP_S-enként egy pont, a
+     sorozat súlypontjára téve (a rövid sorozatban a középső), így a
+     GAP_THRESHOLD_MS szerinti szakaszolás és a pillanatnyi pozíció (a
+     megállt, esetleg sérült kereső is) nem változik,
+  4. opcionálisan: a tartósan VEHICLE_SPEED fölötti (járműves) pontok
+     kihagyása,
+  5. opcionálisan: állandó sebességű Kalman szűrő + RTS simítás, a mért
+     pontosság szerinti mérési zajjal, minden felhasználóra egyszerre.
+
+A `filter_columns` egy egész eseményt dolgoz fel vektorosan (TrackColumns
+-> TrackColumns, utána jöhet a rescue_tracks/rescue_timeline/
+rescue_coverage). A `StreamFilter` ugyanezeket a szabályokat pontonként,
+felhasználónként kis állapottal alkalmazza a beérkező pontokra (az álló
+helyzetet horgonyponttal: STILL_WINDOW_S/2 álló idő után, amíg a horgony
+nem sodródik, csak STILL_KEEP_S-enként ad ki egy pontot, a horgony
+súlypontját; a `flush` a visszatartott pontokat adja ki; a simítást csak
+előre irányuló Kalmannal).
+
+    python rescue_gpsfilter.py filter nezet.json > szurt.json
+    python rescue_gpsfilter.py bench --users 200 --hours 4
+"""
+
+import json
+import math
+
+import numpy as np
+
+from rescue_tracks import ACCURACY_THRESHOLD, GAP_THRESHOLD_MS, TrackColumns
+
+MAX_SPEED = 30.0  # m/s, gyalog, kerékpárral és terepjáróval is bőven elég
+JITTER_RADIUS = 15.0  # m
+STILL_WINDOW_S = 60
+STILL_SPEED = 0.25  # m/s, az álló ablak két fele közti legnagyobb sodródás
+STILL_KEEP_S = GAP_THRESHOLD_MS / 2000  # álló sorozatban legalább ennyi s-onként marad pont
+VEHICLE_SPEED = 6.0  # m/s, tartósan (STILL_WINDOW_S alatt átlagolva)
+DEFAULT_ACC = 10.0  # m, ha a pontnak nincs acc értéke
+PROCESS_NOISE = 0.5  # m/s² gyorsulás szórás a Kalman modellben
+RELOCATE_POINTS = 3  # ennyi egymással összeillő „túl gyors” pont után elfogadjuk az új helyet
+_HEAD_S = STILL_WINDOW_S / 4  # a horgony sodródásának mérése: ennyi s eleje, ennyi s-os mozgó átlag
+_MAX_PASSES = 8
+_EARTH_RADIUS = 6371008.8
+
+
+def _local_xy(lat, lng, lat0):
+    scale = math.pi / 180 * _EARTH_RADIUS
+    return lng * scale * math.cos(math.radians(lat0)), lat * scale
+
+
+def _sorted_by_user_time(columns, accuracy_threshold):
+    keep = ~(columns.acc > accuracy_threshold)
+    keep &= np.isfinite(columns.lat) & np.isfinite(columns.lng)
+    keep &= columns.time_ms != np.iinfo(np.int64).min
+    index = np.flatnonzero(keep)
+    order = index[np.lexsort((columns.time_ms[index], columns.user[index]))]
+    return order, int(len(columns) - len(index))
+
+
+def speed_outliers(user, x, y, t_ms, acc, max_speed=MAX_SPEED):
+    """A tüskék maszkja (felhasználó/idő szerint rendezett pontokon).
+    Ismételt menetekben: a kiszűrt tüske után a szomszédok újra
+    összehasonlíthatók."""
+    count = len(user)
+    alive = np.ones(count, dtype=bool)
+    slack = np.where(np.isfinite(acc), acc, DEFAULT_ACC)
+    for _ in range(_MAX_PASSES):
+        idx = np.flatnonzero(alive)
+        if len(idx) < 2:
+            break
+        same = user[idx[1:]] == user[idx[:-1]]
+        dt = np.maximum((t_ms[idx[1:]] - t_ms[idx[:-1]]) / 1000.0, 1e-3)
+        dist = np.hypot(x[idx[1:]] - x[idx[:-1]], y[idx[1:]] - y[idx[:-1]])
+        speed = np.where(same, np.maximum(dist - slack[idx[1:]] - slack[idx[:-1]], 0) / dt, 0.0)
+        fast = speed > max_speed
+        incoming = np.r_[False, fast]
+        outgoing = np.r_[fast, False]
+        # A felhasználó utolsó pontjánál a kimenő él hiányzik: csak a bejövő számít
+        last = np.r_[~same, True]
+        first = np.r_[True, ~same]
+        bad = incoming & (outgoing | last)
+        # Első pontnál: ha belőle túl gyors, de a következőből tovább már nem
+        next_ok = np.r_[~fast[1:] & same[1:], False, False]
+        bad |= first & outgoing & next_ok
+        if not bad.any():
+            break
+        alive[idx[bad]] = False
+    return ~alive
+
+
+def still_runs(user, x, y, t_ms, jitter_radius=JITTER_RADIUS, window_s=STILL_WINDOW_S,
+               still_speed=STILL_SPEED):
+    """Az álló pontok maszkja: a pont körüli ±window_s/2 időablak pontjainak
+    szórása (RMS távolság a súlyponttól) jitter_radius alatt, az ablak két
+    felének (a pont előtti és utáni pontok) súlypontja között az elmozdulás
+    still_speed-nél lassabb, és az ablak legalább 3 pontot tartalmaz.
+    Kumulatív összegekkel, O(n)."""
+    count = len(user)
+    if not count:
+        return np.zeros(0, dtype=bool)
+    base = int(t_ms.min())
+    keys = (user.astype(np.int64) << 40) | (t_ms - base)
+    half = window_s * 500
+    lo = np.searchsorted(keys, (user.astype(np.int64) << 40) | np.maximum(t_ms - base - half, 0), 'left')
+    hi = np.searchsorted(keys, (user.astype(np.int64) << 40) | (t_ms - base + half), 'right')
+    # Numerikus stabilitás: a felhasználó első pontjához képesti koordináták
+    first = np.r_[0, np.flatnonzero(user[1:] != user[:-1]) + 1]
+    counts = np.diff(np.r_[first, count])
+    rx = x - np.repeat(x[first], counts)
+    ry = y - np.repeat(y[first], counts)
+    rt = (t_ms - base) / 1000.0
+    sums = [np.r_[0.0, np.cumsum(values)] for values in (rx, ry, rx * rx, ry * ry, rt)]
+    n = (hi - lo).astype(np.float64)
+    mean_x = (sums[0][hi] - sums[0][lo]) / n
+    mean_y = (sums[1][hi] - sums[1][lo]) / n
+    variance = (sums[2][hi] - sums[2][lo]) / n - mean_x ** 2 + (sums[3][hi] - sums[3][lo]) / n - mean_y ** 2
+    # Sodródás: az ablak eleje [lo, i] és vége [i, hi) súlypontjának távolsága
+    # a két fél átlagos időpontja közti időhöz képest
+    index = np.arange(count)
+    mid = index + 1
+    head_n, tail_n = mid - lo, hi - index
+    head = [(sums[k][mid] - sums[k][lo]) / head_n for k in (0, 1, 4)]
+    tail = [(sums[k][hi] - sums[k][index]) / tail_n for k in (0, 1, 4)]
+    drift = np.hypot(tail[0] - head[0], tail[1] - head[1]) / np.maximum(tail[2] - head[2], 1.0)
+    return (n >= 3) & (np.maximum(variance, 0) < jitter_radius ** 2) & (drift < still_speed)
+
+
+def fast_moving(user, x, y, t_ms, speed=VEHICLE_SPEED, window_s=STILL_WINDOW_S):
+    """A tartósan `speed` fölött mozgó pontok: az ablakon belüli átlagsebesség
+    (útvonal hossz / idő) nagyobb."""
+    count = len(user)
+    if count < 2:
+        return np.zeros(count, dtype=bool)
+    same = np.r_[False, user[1:] == user[:-1]]
+    step = np.where(same, np.hypot(np.diff(x, prepend=x[0]), np.diff(y, prepend=y[0])), 0.0)
+    path = np.r_[0.0, np.cumsum(step)]
+    base = int(t_ms.min())
+    keys = (user.astype(np.int64) << 40) | (t_ms - base)
+    half = window_s * 500
+    lo = np.searchsorted(keys, (user.astype(np.int64) << 40) | np.maximum(t_ms - base - half, 0), 'left')
+    hi = np.searchsorted(keys, (user.astype(np.int64) << 40) | (t_ms - base + half), 'right')
+    # Az ablak első pontjához vezető lépés nem tartozik az ablakhoz
+    length = path[hi] - path[lo + 1].clip(max=path[hi])
+    duration = (t_ms[hi - 1] - t_ms[lo]) / 1000.0
+    return (duration >= window_s / 2) & (length / np.maximum(duration, 1e-3) > speed)
+
+
+def kalman_smooth(user, x, y, t_ms, acc, process_noise=PROCESS_NOISE, smooth=True):
+    """Állandó sebességű modell tengelyenként, a felhasználók egyszerre
+    (lépésenként egy vektoros frissítés). A két tengely kovarianciája azonos
+    (ugyanaz a mérési és folyamat zaj), így csak egyszer számoljuk.
+    smooth=False: csak az előre irányuló szűrő (mint a streamben)."""
+    count = len(user)
+    if not count:
+        return x.copy(), y.copy()
+    first = np.r_[0, np.flatnonzero(user[1:] != user[:-1]) + 1]
+    lengths = np.diff(np.r_[first, count])
+    steps = int(lengths.max())
+    users = len(first)
+    r = np.where(np.isfinite(acc), acc, DEFAULT_ACC) ** 2
+    q = process_noise ** 2
+
+    filtered = np.empty((2, 2, count))  # tengely, (hely, sebesség), pont
+    pred_state = np.empty((2, 2, count))
+    cov_f = np.empty((3, count))  # P00, P01, P11 a frissítés után
+    cov_p = np.empty((3, count))  # ... az előrejelzés után
+    dt_all = np.r_[0.0, np.diff(t_ms) / 1000.0]
+
+    position = np.stack([x[first], y[first]])
+    velocity = np.zeros((2, users))
+    p00, p01, p11 = r[first].copy(), np.zeros(users), np.full(users, 25.0)
+    for k in range(steps):
+        active = np.flatnonzero(lengths > k)
+        point = first[active] + k
+        if k:
+            dt = dt_all[point]
+            pos, vel = position[:, active] + velocity[:, active] * dt, velocity[:, active]
+            a00, a01, a11 = p00[active], p01[active], p11[active]
+            a00 = a00 + 2 * dt * a01 + dt * dt * a11 + q * dt ** 3 / 3
+            a01 = a01 + dt * a11 + q * dt ** 2 / 2
+            a11 = a11 + q * dt
+        else:
+            pos, vel = position[:, active], velocity[:, active]
+            a00, a01, a11 = p00[active], p01[active], p11[active]
+        pred_state[:, 0, point], pred_state[:, 1, point] = pos, vel
+        cov_p[:, point] = a00, a01, a11
+        s = a00 + r[point]
+        k0, k1 = a00 / s, a01 / s
+        innovation = np.stack([x[point], y[point]]) - pos
+        pos = pos + k0 * innovation
+        vel = vel + k1 * innovation
+        b00, b01, b11 = (1 - k0) * a00, (1 - k0) * a01, a11 - k1 * a01
+        position[:, active], velocity[:, active] = pos, vel
+        p00[active], p01[active], p11[active] = b00, b01, b11
+        filtered[:, 0, point], filtered[:, 1, point] = pos, vel
+        cov_f[:, point] = b00, b01, b11
+    if not smooth:
+        return filtered[0, 0].copy(), filtered[1, 0].copy()
+
+    smoothed = filtered.copy()
+    for k in range(steps - 2, -1, -1):
+        active = np.flatnonzero(lengths > k + 1)
+        point = first[active] + k
+        following = point + 1
+        dt = dt_all[following]
+        f00, f01, f11 = cov_f[:, point]
+        n00, n01, n11 = cov_p[:, following]
+        # C = P_f · Fᵀ · P_pred⁻¹
+        m00, m01, m10, m11 = f00 + dt * f01, f01, f01 + dt * f11, f11
+        det = n00 * n11 - n01 * n01
+        i00, i01, i11 = n11 / det, -n01 / det, n00 / det
+        c00, c01 = m00 * i00 + m01 * i01, m00 * i01 + m01 * i11
+        c10, c11 = m10 * i00 + m11 * i01, m10 * i01 + m11 * i11
+        d_pos = smoothed[:, 0, following] - pred_state[:, 0, following]
+        d_vel = smoothed[:, 1, following] - pred_state[:, 1, following]
+        smoothed[:, 0, point] = filtered[:, 0, point] + c00 * d_pos + c01 * d_vel
+        smoothed[:, 1, point] = filtered[:, 1, point] + c10 * d_pos + c11 * d_vel
+    return smoothed[0, 0], smoothed[1, 0]
+
+
+def filter_columns(columns, accuracy_threshold=ACCURACY_THRESHOLD, max_speed=MAX_SPEED,
+                   jitter_radius=JITTER_RADIUS, still_window_s=STILL_WINDOW_S, vehicle_speed=None,
+                   smooth=False, still_speed=STILL_SPEED, still_keep_s=STILL_KEEP_S):
+    """Egy esemény összes pontja -> (szűrt TrackColumns, jelentés).
+    A kimenet felhasználónként idő szerint rendezett."""
+    order, inaccurate = _sorted_by_user_time(columns, accuracy_threshold)
+    report = {'input': len(columns), 'inaccurate': inaccurate}
+    user, t_ms = columns.user[order], columns.time_ms[order]
+    lat, lng, acc = columns.lat[order], columns.lng[order], columns.acc[order]
+    lat0 = float(np.mean(lat)) if len(lat) else 0.0
+    x, y = _local_xy(lat, lng, lat0)
+
+    spikes = speed_outliers(user, x, y, t_ms, acc, max_speed)
+    report['speed'] = int(spikes.sum())
+    keep = ~spikes
+    user, t_ms, x, y, acc = user[keep], t_ms[keep], x[keep], y[keep], acc[keep]
+
+    if vehicle_speed:
+        vehicle = fast_moving(user, x, y, t_ms, vehicle_speed, still_window_s)
+        report['vehicle'] = int(vehicle.sum())
+        keep = ~vehicle
+        user, t_ms, x, y, acc = user[keep], t_ms[keep], x[keep], y[keep], acc[keep]
+
+    if smooth:
+        x, y = kalman_smooth(user, x, y, t_ms, acc)
+
+    still = still_runs(user, x, y, t_ms, jitter_radius, still_window_s, still_speed)
+    # Álló sorozatok: felhasználón belül egymás utáni álló pontok
+    boundary = np.r_[True, (user[1:] != user[:-1]) | (still[1:] != still[:-1])]
+    run_id = np.cumsum(boundary) - 1
+    run_start = np.flatnonzero(boundary)
+    run_length = np.diff(np.r_[run_start, len(user)])
+    run_still = still[run_start]
+    sum_x = np.add.reduceat(x, run_start) if len(x) else x
+    sum_y = np.add.reduceat(y, run_start) if len(y) else y
+    point_run = run_id
+    in_still = run_still[point_run]
+    position_in_run = np.arange(len(user)) - run_start[point_run]
+    endpoint = (position_in_run == 0) | (position_in_run == run_length[point_run] - 1)
+    # A két szélső pont a mért helyén marad; közöttük still_keep_s-es
+    # rekeszenként az első pont a sorozat súlypontjára kerül, hogy a
+    # megálló kereső ne tűnjön el (szakaszolás, pillanatnyi pozíció). A
+    # still_keep_s-nél rövidebb sorozatban a középső pont a súlypont.
+    bucket = (t_ms - t_ms[run_start][point_run]) // int(still_keep_s * 1000)
+    bucket_first = np.r_[True, bucket[1:] != bucket[:-1]] | (position_in_run == 0)
+    centroid = in_still & bucket_first & ~endpoint
+    interior = np.add.reduceat(centroid.astype(np.int64), run_start) if len(user) else np.zeros(0, np.int64)
+    middle = in_still & (run_length[point_run] >= 3) & (position_in_run == run_length[point_run] // 2) \
+        & (interior[point_run] == 0)
+    centroid |= middle
+    keep = ~in_still | endpoint | centroid
+    x = np.where(centroid, (sum_x / run_length)[point_run], x)
+    y = np.where(centroid, (sum_y / run_length)[point_run], y)
+    report['still_collapsed'] = int((~keep).sum())
+    user, t_ms, x, y, acc = user[keep], t_ms[keep], x[keep], y[keep], acc[keep]
+
+    scale = math.pi / 180 * _EARTH_RADIUS
+    out_lat = y / scale
+    out_lng = x / (scale * math.cos(math.radians(lat0)))
+    report['output'] = int(len(user))
+    return TrackColumns(columns.user_ids, columns.user_info, user, out_lat, out_lng, acc, t_ms), report
+
+
+class StreamFilter:
+    """Pontonkénti szűrés beérkező pontokra, felhasználónkénti kis
+    állapottal. A `push` a kiadandó pontok listáját adja vissza
+    ([(lat, lng, time_ms), ...]); álló helyzetben legalább still_keep_s-enként
+    kimegy a horgony súlypontja, a szakasz végén a visszatartott pontok
+    súlypontja és az utolsó visszatartott pont (a mért helyén). Ha a pontok
+    elmaradnak (a kereső kikapcsolta a telefont), a `flush` adja ki a
+    visszatartott pontokat."""
+
+    def __init__(self, accuracy_threshold=ACCURACY_THRESHOLD, max_speed=MAX_SPEED,
+                 jitter_radius=JITTER_RADIUS, smooth=False, process_noise=PROCESS_NOISE,
+                 still_speed=STILL_SPEED, still_keep_s=STILL_KEEP_S):
+        self.accuracy_threshold = accuracy_threshold
+        self.max_speed = max_speed
+        self.jitter_radius = jitter_radius
+        self.still_speed = still_speed
+        self.still_keep_ms = still_keep_s * 1000
+        self.smooth = smooth
+        self.q = process_noise ** 2
+        self.stats = {'input': 0, 'inaccurate': 0, 'speed': 0, 'still_collapsed': 0, 'output': 0}
+        self._users = {}
+
+    def push(self, user_id, lat, lng, acc, time_ms):
+        self.stats['input'] += 1
+        if acc is not None and acc > self.accuracy_threshold:
+            self.stats['inaccurate'] += 1
+            return []
+        slack = DEFAULT_ACC if acc is None or not math.isfinite(acc) else acc
+        state = self._users.get(user_id)
+        if state is None:
+            x, y = _local_xy(lat, lng, lat)
+            state = self._users[user_id] = {
+                'lat0': lat, 'last': (x, y, time_ms, slack), 'candidates': [],
+                'anchor': _anchor(x, y, time_ms), 'kalman': None, 'emitted': time_ms}
+            return self._emit(state, x, y, time_ms, slack)
+        x, y = _local_xy(lat, lng, state['lat0'])
+        last_x, last_y, last_t, last_slack = state['last']
+        if time_ms <= last_t:
+            return []
+        speed = max(math.hypot(x - last_x, y - last_y) - slack - last_slack, 0) / ((time_ms - last_t) / 1000)
+        if speed > self.max_speed:
+            # Tüske, vagy valódi áthelyezés (pl. autóval): ha több, egymással
+            # összeillő pont jön az új helyről, elfogadjuk
+            candidates = state['candidates']
+            if candidates:
+                cx, cy, ct, cs = candidates[-1]
+                if max(math.hypot(x - cx, y - cy) - slack - cs, 0) / max((time_ms - ct) / 1000, 1e-3) \
+                        > self.max_speed:
+                    self.stats['speed'] += len(candidates)
+                    candidates.clear()
+            candidates.append((x, y, time_ms, slack))
+            if len(candidates) < RELOCATE_POINTS:
+                return []
+            self.stats['speed'] += len(candidates) - 1
+            candidates.clear()
+            emitted = self._release(state)
+            state['anchor'] = _anchor(x, y, time_ms)
+            state['kalman'] = None
+            state['last'] = (x, y, time_ms, slack)
+            return emitted + self._emit(state, x, y, time_ms, slack)
+        self.stats['speed'] += len(state['candidates'])
+        state['candidates'].clear()
+        state['last'] = (x, y, time_ms, slack)
+
+        # Álló helyzet: amíg a pont a horgony súlypontjától jitter_radius-on
+        # belül marad, a horgonyhoz adjuk; STILL_WINDOW_S/2 után már nem adjuk
+        # ki a pontokat, ha a horgony nem sodródik (a friss pontok mozgó
+        # átlaga az első STILL_WINDOW_S/4 súlypontjától still_speed-nél
+        # lassabban távolodik). A kilépéskor a súlypont és az utolsó
+        # visszatartott pont zárja le a szakaszt.
+        anchor = state['anchor']
+        mean_x, mean_y = anchor['sum_x'] / anchor['n'], anchor['sum_y'] / anchor['n']
+        if math.hypot(x - mean_x, y - mean_y) < self.jitter_radius:
+            anchor['sum_x'] += x
+            anchor['sum_y'] += y
+            anchor['n'] += 1
+            elapsed = (time_ms - anchor['start']) / 1000
+            if elapsed < _HEAD_S:
+                anchor['head'] = [value + part for value, part in zip(anchor['head'], (x, y, elapsed, 1))]
+            alpha = 1 - math.exp(-(time_ms - anchor['recent'][2]) / 1000 / _HEAD_S)
+            recent_x = anchor['recent'][0] + alpha * (x - anchor['recent'][0])
+            recent_y = anchor['recent'][1] + alpha * (y - anchor['recent'][1])
+            anchor['recent'] = (recent_x, recent_y, time_ms)
+            if elapsed >= STILL_WINDOW_S / 2:
+                head_x, head_y, head_t, head_n = anchor['head']
+                # a mozgó átlag kb. _HEAD_S-mal késik
+                drift = math.hypot(recent_x - head_x / head_n, recent_y - head_y / head_n) \
+                    / max(elapsed - _HEAD_S - head_t / head_n, 1.0)
+                if drift < self.still_speed:
+                    if time_ms - state['emitted'] < self.still_keep_ms:
+                        self.stats['still_collapsed'] += 1
+                        anchor['held'].append((x, y, time_ms))
+                        return []
+                    # a megálló kereső se tűnjön el: a horgony súlypontja
+                    # a pont idejével, a visszatartott pontok helyett
+                    anchor['held'] = []
+                    return self._emit(state, mean_x, mean_y, time_ms, slack, use_kalman=False)
+            return self._release(state) + self._emit(state, x, y, time_ms, slack)
+        emitted = self._release(state)
+        state['anchor'] = _anchor(x, y, time_ms)
+        return emitted + self._emit(state, x, y, time_ms, slack)
+
+    def _release(self, state):
+        """A visszatartott álló pontok helyett a súlypontjuk (az idejük
+        közepén) és az utolsó pont a mért helyén."""
+        held = state['anchor']['held']
+        if not held:
+            return []
+        state['anchor']['held'] = []
+        last_x, last_y, last_t = held[-1]
+        slack = state['last'][3]
+        if len(held) == 1:
+            self.stats['still_collapsed'] -= 1
+            return self._emit(state, last_x, last_y, last_t, slack, use_kalman=False)
+        self.stats['still_collapsed'] -= 2
+        mean_x = sum(point[0] for point in held) / len(held)
+        mean_y = sum(point[1] for point in held) / len(held)
+        middle_t = (held[0][2] + last_t) // 2
+        return (self._emit(state, mean_x, mean_y, middle_t, slack, use_kalman=False)
+                + self._emit(state, last_x, last_y, last_t, slack, use_kalman=False))
+
+    def flush(self):
+        """A visszatartott álló pontok kiadása minden felhasználóra
+        ({user_id: [(lat, lng, time_ms), ...]}), pl. a folyam végén vagy ha
+        egy kereső STILL_KEEP_S óta nem küldött pontot."""
+        return {user_id: emitted for user_id, state in self._users.items()
+                for emitted in [self._release(state)] if emitted}
+
+    def _emit(self, state, x, y, time_ms, slack, use_kalman=True):
+        if self.smooth and use_kalman:
+            x, y = self._kalman(state, x, y, time_ms, slack)
+        state['emitted'] = time_ms
+        self.stats['output'] += 1
+        scale = math.pi / 180 * _EARTH_RADIUS
+        return [(y / scale, x / (scale * math.cos(math.radians(state['lat0']))), time_ms)]
+
+    def _kalman(self, state, x, y, time_ms, slack):
+        kalman = state['kalman']
+        r = slack * slack
+        if kalman is None:
+            state['kalman'] = [x, y, 0.0, 0.0, r, 0.0, 25.0, time_ms]
+            return x, y
+        px, py, vx, vy, p00, p01, p11, last_t = kalman
+        dt = (time_ms - last_t) / 1000
+        px, py = px + vx * dt, py + vy * dt
+        p00 = p00 + 2 * dt * p01 + dt * dt * p11 + self.q * dt ** 3 / 3
+        p01 = p01 + dt * p11 + self.q * dt ** 2 / 2
+        p11 = p11 + self.q * dt
+        s = p00 + r
+        k0, k1 = p00 / s, p01 / s
+        ix, iy = x - px, y - py
+        px, py, vx, vy = px + k0 * ix, py + k0 * iy, vx + k1 * ix, vy + k1 * iy
+        p00, p01, p11 = (1 - k0) * p00, (1 - k0) * p01, p11 - k1 * p01
+        state['kalman'] = [px, py, vx, vy, p00, p01, p11, time_ms]
+        return px, py
+
+
+def _anchor(x, y, time_ms):
+    """Új álló horgony: összegek, az első _HEAD_S pontjai (x, y, idő, db), a
+    friss pontok mozgó átlaga és a visszatartott pontok."""
+    return {'sum_x': x, 'sum_y': y, 'n': 1, 'start': time_ms, 'head': [x, y, 0.0, 1],
+            'recent': (x, y, time_ms), 'held': []}
+
+
+# --- Benchmark ---------------------------------------------------------------
+
+def synthetic_truth(users=200, hours=4, seed=1):
+    """(valós pályák, mért TrackColumns): 1.2 m/s séta irányváltásokkal,
+    álló szakaszok, 4 m zaj, 1% teleport tüske (300 m - 3 km)."""
+    rng = np.random.default_rng(seed)
+    per_user = int(hours * 3600)
+    count = users * per_user
+    heading = np.cumsum(rng.normal(0, 0.05, (users, per_user)), axis=1)
+    moving = (np.cumsum(rng.random((users, per_user)) < 1 / 600, axis=1) % 2) == 0
+    step = np.where(moving, 1.2, 0.0)
+    true_x = np.cumsum(step * np.cos(heading), axis=1) + rng.uniform(-5000, 5000, (users, 1))
+    true_y = np.cumsum(step * np.sin(heading), axis=1) + rng.uniform(-5000, 5000, (users, 1))
+    noise = rng.normal(0, 4, (2, users, per_user))
+    spikes = rng.random((users, per_user)) < 0.01
+    jump = rng.uniform(300, 3000, (users, per_user)) * spikes
+    angle = rng.uniform(0, 2 * math.pi, (users, per_user))
+    meas_x = true_x + noise[0] + jump * np.cos(angle)
+    meas_y = true_y + noise[1] + jump * np.sin(angle)
+    lat0 = 47.9
+    scale = math.pi / 180 * _EARTH_RADIUS
+    lat = lat0 + meas_y.ravel() / scale
+    lng = 20.4 + meas_x.ravel() / (scale * math.cos(math.radians(lat0)))
+    acc = np.where(spikes, 8.0, rng.uniform(3, 12, (users, per_user))).ravel()
+    time_ms = np.tile(1_715_000_000_000 + np.arange(per_user) * 1000, users)
+    columns = TrackColumns([f'user-{i}' for i in range(users)], [{} for _ in range(users)],
+                           np.repeat(np.arange(users), per_user), lat, lng, acc, time_ms)
+    return columns, true_x.ravel(), true_y.ravel(), spikes.ravel()
+
+
+def slow_walker(speed=0.6, minutes=10, noise=4.0, seed=2):
+    """Regressziós eset: egyenletes lassú séta (a 15 m-es álló sugáron belül
+    marad egy perc alatt), 1 Hz, zajjal. (TrackColumns, valós x, y)."""
+    rng = np.random.default_rng(seed)
+    count = int(minutes * 60)
+    true_x = np.arange(count) * speed
+    true_y = np.zeros(count)
+    lat0 = 47.9
+    scale = math.pi / 180 * _EARTH_RADIUS
+    lat = lat0 + (true_y + rng.normal(0, noise, count)) / scale
+    lng = 20.4 + (true_x + rng.normal(0, noise, count)) / (scale * math.cos(math.radians(lat0)))
+    columns = TrackColumns(['walker'], [{}], np.zeros(count, dtype=np.int64), lat, lng,
+                           np.full(count, noise), 1_715_000_000_000 + np.arange(count, dtype=np.int64) * 1000)
+    return columns, true_x, true_y
+
+
+def _errors(columns, true_x, true_y, per_user):
+    """Pontonkénti távolság a valós pályától (az adott időpontban)."""
+    lat0 = 47.9
+    x, y = _local_xy(columns.lat, columns.lng, lat0)
+    x = x - _local_xy(0, 20.4, lat0)[0]
+    y = y - _local_xy(lat0, 0, lat0)[1]
+    index = columns.user.astype(np.int64) * per_user + (columns.time_ms - 1_715_000_000_000) // 1000
+    return np.hypot(x - true_x[index], y - true_y[index])
+
+
+def bench(users=200, hours=4):
+    import time
+
+    columns, true_x, true_y, spikes = synthetic_truth(users, hours)
+    per_user = int(hours * 3600)
+    print(f"{users} kereső x {hours} óra, 1 Hz: {len(columns)} pont, {int(spikes.sum())} tüske")
+    raw = _errors(columns, true_x, true_y, per_user)
+    print(f"  nyers: medián hiba {np.median(raw):.1f} m, p99 {np.percentile(raw, 99):.0f} m")
+    for label, options in (('szűrés', {}), ('szűrés + RTS simítás', {'smooth': True})):
+        started = time.perf_counter()
+        result, report = filter_columns(columns, **options)
+        elapsed = time.perf_counter() - started
+        error = _errors(result, true_x, true_y, per_user)
+        print(f"  {label}: {len(columns) / elapsed / 1e6:.1f} M pont/s ({elapsed * 1000:.0f} ms), "
+              f"{report['speed']} sebesség miatt kiszűrve, {report['still_collapsed']} álló pont összevonva, "
+              f"medián hiba {np.median(error):.1f} m, p99 {np.percentile(error, 99):.0f} m")
+
+    # A szórás alapú álló szűrés régen a lassú sétát is összevonta
+    for speed in (0.3, 0.6):
+        walk, walk_x, walk_y = slow_walker(speed)
+        result, report = filter_columns(walk)
+        error = _errors(result, walk_x, walk_y, len(walk))
+        stream = StreamFilter()
+        for values in zip(['walker'] * len(walk), walk.lat.tolist(), walk.lng.tolist(), walk.acc.tolist(),
+                          walk.time_ms.tolist()):
+            stream.push(*values)
+        print(f"  lassú séta {speed} m/s, 10 perc: {report['still_collapsed']} álló pont összevonva, "
+              f"{report['output']}/{len(walk)} pont marad, medián hiba {np.median(error):.1f} m; "
+              f"stream: {stream.stats['still_collapsed']} összevonva")
+
+    sample = min(len(columns), 200_000)
+    stream = StreamFilter()
+    order = np.argsort(columns.time_ms[:sample], kind='stable')
+    user_ids = [columns.user_ids[i] for i in columns.user[:sample][order].tolist()]
+    lat, lng = columns.lat[:sample][order].tolist(), columns.lng[:sample][order].tolist()
+    acc, times = columns.acc[:sample][order].tolist(), columns.time_ms[:sample][order].tolist()
+    started = time.perf_counter()
+    for values in zip(user_ids, lat, lng, acc, times):
+        stream.push(*values)
+    elapsed = time.perf_counter() - started
+    print(f"  stream ({sample} pont, időrendben): {sample / elapsed / 1000:.0f} k pont/s, "
+          f"{stream.stats['speed']} sebesség miatt kiszűrve, {stream.stats['output']} kiadott pont")
+
+
+def main(argv=None):
+    import argparse
+    import sys
+
+    from rescue_tracks import columns_from_rows
+
+    parser = argparse.ArgumentParser(description='GPS ugrás/zaj szűrés és simítás')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p_filter = sub.add_parser('filter', help='optimized_user_tracks JSON -> szűrt sorok ugyanabban az alakban')
+    p_filter.add_argument('path', help="a nézet sorai JSON-ban ('-': stdin)")
+    p_filter.add_argument('--max-speed', type=float, default=MAX_SPEED)
+    p_filter.add_argument('--jitter-radius', type=float, default=JITTER_RADIUS)
+    p_filter.add_argument('--vehicle-speed', type=float, help='a tartósan ennél gyorsabb pontok kihagyása (m/s)')
+    p_filter.add_argument('--smooth', action='store_true', help='Kalman/RTS simítás')
+    p_bench = sub.add_parser('bench')
+    p_bench.add_argument('--users', type=int, default=200)
+    p_bench.add_argument('--hours', type=float, default=4)
+    args = parser.parse_args(argv)
+
+    if args.command == 'bench':
+        bench(args.users, args.hours)
+        return
+    if args.path == '-':
+        rows = json.load(sys.stdin)
+    else:
+        with open(args.path, encoding='utf-8') as f:
+            rows = json.load(f)
+    columns = columns_from_rows(rows)
+    result, report = filter_columns(columns, max_speed=args.max_speed, jitter_radius=args.jitter_radius,
+                                    vehicle_speed=args.vehicle_speed, smooth=args.smooth)
+    print(json.dumps(report, ensure_ascii=False), file=sys.stderr)
+    out = []
+    bounds = np.r_[0, np.cumsum(np.bincount(result.user, minlength=len(result.user_ids)))]
+    lat, lng, acc = result.lat.tolist(), result.lng.tolist(), result.acc.tolist()
+    times = result.time_ms.astype('datetime64[ms]').astype(str).tolist()
+    for index, user_id in enumerate(result.user_ids):
+        if bounds[index] == bounds[index + 1]:
+            continue
+        info = result.user_info[index]
+        out.append({'user_id': user_id, 'user_name': info.get('full_name'), 'user_phone': info.get('phone_number'),
+                    'track_points': [{'lat': lat[i], 'lng': lng[i], 'acc': None if math.isnan(acc[i]) else acc[i],
+                                      'time': times[i] + '+00:00'}
+                                     for i in range(bounds[index], bounds[index + 1])]})
+    json.dump(out, sys.stdout, ensure_ascii=False, separators=(',', ':'))
+
+
+if __name__ == '__main__':
+    main()
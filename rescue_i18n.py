@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+i18n fordító lépés a generátorhoz.
+
+A sablonok src/i18n.js fájlja egyetlen `resources` objektumban tartalmazza
+az összes nyelvet, amit minden látogató letölt és feldolgoz az első
+renderelés előtt. Ez a lépés:
+
+  - kiolvassa a `resources` objektumot (egyszerű JS literál elemző),
+  - megkeresi, mely kulcsokat használják a komponensek (t('kulcs'),
+    t(`elotag-${...}`)), a nem használtakat elhagyja,
+  - a fallback nyelvből pótolja a hiányzó kulcsokat, így futásidőben nem kell
+    egy második nyelvet is letölteni,
+  - nyelvenként egy tömör src/locales/<nyelv>.json fájlt ír (a Vite külön
+    chunkba teszi őket),
+  - az src/i18n.js helyére egy betöltőt tesz, ami csak az aktív nyelvet
+    tölti le (localStorage 'language', illetve a users.language oszlop).
+
+Kézi futtatás egy projekt src mappáján (pl. az élő alkalmazáson):
+    python rescue_i18n.py report rescue-admin/src
+    python rescue_i18n.py measure rescue-admin/src
+"""
+
+import gzip
+import json
+import os
+import re
+
+SOURCE_PATH = 'src/i18n.js'
+MAIN_PATH = 'src/main.jsx'
+LOCALES_DIR = 'src/locales'
+DEFAULT_LANGUAGE = 'hu'
+FALLBACK_LANGUAGE = 'en'
+SOURCE_EXTENSIONS = ('.js', '.jsx', '.ts', '.tsx')
+
+# Lassított profil a becsléshez (kb. a Chrome DevTools "Slow 4G" beállítása)
+THROTTLED_KBPS = 1600
+THROTTLED_RTT_MS = 150
+
+
+class I18nCompileError(ValueError):
+    pass
+
+
+# --- JS objektum literál elemzés ---------------------------------------------
+
+_TOKEN_RE = re.compile(r'''
+    (?P<ws>\s+|//[^\n]*|/\*.*?\*/)
+  | (?P<str>'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")
+  | (?P<ident>[A-Za-z_$][\w$]*)
+  | (?P<num>-?\d+(?:\.\d+)?)
+  | (?P<punct>[{}:,])
+''', re.VERBOSE | re.DOTALL)
+
+_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f', 'v': '\v', '0': '\0'}
+
+
+def _unescape(literal):
+    body = literal[1:-1]
+
+    def repl(match):
+        seq = match.group(1)
+        if seq[0] == 'u':
+            return chr(int(seq[1:], 16))
+        if seq[0] == 'x':
+            return chr(int(seq[1:], 16))
+        return _ESCAPES.get(seq, seq)
+
+    return re.sub(r'\\(u[0-9a-fA-F]{4}|x[0-9a-fA-F]{2}|.)', repl, body, flags=re.DOTALL)
+
+
+def _tokens(source, pos):
+    while pos < len(source):
+        match = _TOKEN_RE.match(source, pos)
+        if not match:
+            raise I18nCompileError(f"Nem értelmezhető karakter a(z) {pos}. pozíción: {source[pos]!r}")
+        pos = match.end()
+        if match.lastgroup != 'ws':
+            yield match.lastgroup, match.group()
+
+
+def _parse_value(tokens, kind, text):
+    if kind == 'str':
+        return _unescape(text)
+    if kind == 'num':
+        return float(text) if '.' in text else int(text)
+    if kind == 'ident' and text in ('true', 'false', 'null'):
+        return {'true': True, 'false': False, 'null': None}[text]
+    if text != '{':
+        raise I18nCompileError(f"Váratlan token: {text!r}")
+    result = {}
+    while True:
+        kind, text = next(tokens)
+        if text == '}':
+            return result
+        if kind not in ('str', 'ident'):
+            raise I18nCompileError(f"Kulcsot vártunk, ez jött: {text!r}")
+        key = _unescape(text) if kind == 'str' else text
+        if next(tokens)[1] != ':':
+            raise I18nCompileError(f"Hiányzó ':' a(z) {key!r} kulcs után")
+        result[key] = _parse_value(tokens, *next(tokens))
+        kind, text = next(tokens)
+        if text == '}':
+            return result
+        if text != ',':
+            raise I18nCompileError(f"',' vagy '}}' kellett volna, ez jött: {text!r}")
+
+
+def parse_resources(js_source):
+    """Az i18n.js `const resources = {...}` objektuma Python dict-ként:
+    {nyelv: {kulcs: szöveg}} (a `translation` névtér kibontva)."""
+    match = re.search(r'\bresources\s*=\s*(?={)', js_source)
+    if not match:
+        raise I18nCompileError("Nem található 'resources' objektum")
+    tokens = _tokens(js_source, match.end())
+    resources = _parse_value(tokens, *next(tokens))
+    return {language: namespaces.get('translation', {}) for language, namespaces in resources.items()}
+
+
+# --- Kulcs használat ---------------------------------------------------------
+
+_STATIC_KEY_RE = re.compile(r'''\bt\(\s*(['"])((?:(?!\1)[^\\]|\\.)*)\1''')
+_TEMPLATE_KEY_RE = re.compile(r'\bt\(\s*`([^`$]*)(\$\{)?')
+_DYNAMIC_KEY_RE = re.compile(r'''\bt\(\s*(?![\s'"`)])''')
+
+
+def find_used_keys(sources):
+    """A komponensek forrásaiból: (kulcsok, dinamikus előtagok,
+    fel nem oldható hívások listája [(fájl, sor)])."""
+    keys, prefixes, unresolved = set(), set(), []
+    for rel_path, source in sources.items():
+        for match in _STATIC_KEY_RE.finditer(source):
+            keys.add(_unescape(match.group(1) + match.group(2) + match.group(1)))
+        for match in _TEMPLATE_KEY_RE.finditer(source):
+            (prefixes if match.group(2) else keys).add(match.group(1))
+        for match in _DYNAMIC_KEY_RE.finditer(source):
+            unresolved.append((rel_path, source.count('\n', 0, match.start()) + 1))
+    return keys, prefixes, unresolved
+
+
+# --- Fordítás ------------------------------------------------------------------
+
+LOADER_TEMPLATE = '''import i18n from 'i18next';
+import { initReactI18next } from 'react-i18next';
+import { supabase } from './supabase';
+
+// A fordítások nyelvenként külön chunkban vannak (rescue_i18n.py generálja),
+// mindig csak az aktív nyelvet töltjük le
+const loaders = {
+__LOADERS__
+};
+
+export const supportedLanguages = Object.keys(loaders);
+
+const lazyBackend = {
+  type: 'backend',
+  init() {},
+  read(language, namespace, callback) {
+    const load = loaders[language];
+    if (!load) {
+      callback(null, {});
+      return;
+    }
+    load().then((module) => callback(null, module.default), (error) => callback(error, null));
+  }
+};
+
+const storedLanguage = localStorage.getItem('language');
+
+i18n.use(lazyBackend).use(initReactI18next).init({
+  lng: loaders[storedLanguage] ? storedLanguage : '__DEFAULT__',
+  supportedLngs: supportedLanguages,
+  // A hiányzó kulcsokat a fordító már pótolta, nem kell második nyelvet letölteni
+  fallbackLng: false,
+  load: 'currentOnly',
+  interpolation: { escapeValue: false }
+});
+
+// Bejelentkezett felhasználónál a users.language oszlop az irányadó
+supabase.auth.getUser().then(async ({ data: { user } }) => {
+  if (!user) return;
+  const { data } = await supabase.from('users').select('language').eq('id', user.id).single();
+  if (data && loaders[data.language] && data.language !== i18n.language) {
+    localStorage.setItem('language', data.language);
+    i18n.changeLanguage(data.language);
+  }
+});
+
+export default i18n;'''
+
+
+def _render_loader(languages, default_language):
+    lines = ',\n'.join(f"  {language}: () => import('./locales/{language}.json')" for language in languages)
+    return LOADER_TEMPLATE.replace('__LOADERS__', lines).replace('__DEFAULT__', default_language)
+
+
+def _wrap_suspense(main_source):
+    """A main.jsx-ben az <App /> Suspense-be kerül, amíg az első nyelv betölt."""
+    if 'Suspense' in main_source:
+        return main_source
+    if "import React from 'react';" not in main_source or '<App />' not in main_source:
+        raise I18nCompileError("A main.jsx nem a várt formátumú, a Suspense nem illeszthető be")
+    main_source = main_source.replace("import React from 'react';", "import React, { Suspense } from 'react';", 1)
+    return main_source.replace('<App />', '<Suspense fallback={null}>\n      <App />\n    </Suspense>', 1)
+
+
+def _flatten(table, prefix=''):
+    flat = {}
+    for key, value in table.items():
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f'{prefix}{key}.'))
+        else:
+            flat[prefix + key] = value
+    return flat
+
+
+def _unflatten(flat):
+    table = {}
+    for key, value in flat.items():
+        node = table
+        *parents, leaf = key.split('.')
+        for parent in parents:
+            node = node.setdefault(parent, {})
+        node[leaf] = value
+    return table
+
+
+def compile_i18n(files, default_language=DEFAULT_LANGUAGE, fallback_language=FALLBACK_LANGUAGE,
+                 drop_unused=True):
+    """A `files` (rel_path -> str/bytes) fából az új/módosított fájlok
+    szótára és a jelentés."""
+
+    def text(rel_path):
+        content = files[rel_path]
+        return content.decode('utf-8') if isinstance(content, (bytes, bytearray)) else content
+
+    resources = parse_resources(text(SOURCE_PATH))
+    if fallback_language not in resources:
+        raise I18nCompileError(f"A fallback nyelv ({fallback_language}) hiányzik a resources-ból")
+    sources = {rel_path: text(rel_path) for rel_path in files
+               if rel_path.startswith('src/') and rel_path.endswith(SOURCE_EXTENSIONS) and rel_path != SOURCE_PATH}
+    used, prefixes, unresolved = find_used_keys(sources)
+
+    # A beágyazott objektumok (pl. dashboard.title) pontozott kulcsokként
+    resources = {language: _flatten(table) for language, table in resources.items()}
+    all_keys = {}
+    for table in resources.values():
+        all_keys.update(dict.fromkeys(table))
+    # Fel nem oldható t(valtozo) hívásnál nem tudjuk, mi kell: semmit sem dobunk el
+    keep_all = not drop_unused or bool(unresolved)
+    kept = [key for key in all_keys
+            if keep_all or key in used or any(key.startswith(prefix) for prefix in prefixes)]
+
+    report = {
+        'languages': list(resources),
+        'keys_total': len(all_keys),
+        'keys_kept': len(kept),
+        'dropped': [key for key in all_keys if key not in kept],
+        'missing': {},
+        'undefined': sorted(key for key in used if key not in all_keys),
+        'unresolved': unresolved,
+        'sizes': {},
+    }
+    output = {}
+    fallback = resources[fallback_language]
+    for language, table in resources.items():
+        compiled = {}
+        missing = []
+        for key in kept:
+            if key in table:
+                compiled[key] = table[key]
+            elif key in fallback:
+                compiled[key] = fallback[key]
+                missing.append(key)
+        if missing:
+            report['missing'][language] = missing
+        data = json.dumps(_unflatten(compiled), ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        output[f'{LOCALES_DIR}/{language}.json'] = data
+        report['sizes'][language] = (len(data), len(gzip.compress(data, 9)))
+
+    default_language = default_language if default_language in resources else fallback_language
+    output[SOURCE_PATH] = _render_loader(list(resources), default_language)
+    if MAIN_PATH in files:
+        output[MAIN_PATH] = _wrap_suspense(text(MAIN_PATH))
+    return output, report
+
+
+def print_report(report):
+    print(f"i18n: {len(report['languages'])} nyelv, {report['keys_kept']}/{report['keys_total']} kulcs megtartva")
+    for language, (raw, packed) in report['sizes'].items():
+        missing = len(report['missing'].get(language, []))
+        print(f"  {language}: {raw} B ({packed} B gzip)" + (f", {missing} kulcs a fallbackből" if missing else ''))
+    if report['dropped']:
+        print(f"  Elhagyott (nem használt) kulcsok: {', '.join(report['dropped'])}")
+    if report['undefined']:
+        print(f"  Használt, de nem fordított kulcsok: {', '.join(report['undefined'])}")
+    for rel_path, line in report['unresolved']:
+        print(f"  Fel nem oldható t() hívás: {rel_path}:{line} (minden kulcs megmarad)")
+
+
+# --- Mérés -------------------------------------------------------------------
+
+def _read_tree(src_dir):
+    files = {}
+    root_dir = os.path.dirname(os.path.abspath(src_dir))
+    for root, _, names in os.walk(src_dir):
+        for name in names:
+            if name.endswith(SOURCE_EXTENSIONS):
+                full_path = os.path.join(root, name)
+                rel_path = os.path.relpath(full_path, root_dir).replace(os.sep, '/')
+                with open(full_path, encoding='utf-8') as f:
+                    files[rel_path] = f.read()
+    return files
+
+
+def _transfer_ms(gzip_bytes, requests):
+    return gzip_bytes * 8 / THROTTLED_KBPS + requests * THROTTLED_RTT_MS
+
+
+def measure(src_dir, language=DEFAULT_LANGUAGE):
+    """Az i18n-ből az első renderelésig letöltendő bájtok és a becsült
+    letöltési idő a lassított profilon, előtte és utána."""
+    files = _read_tree(src_dir)
+    before = files[SOURCE_PATH].encode('utf-8')
+    output, report = compile_i18n(files)
+    loader = output[SOURCE_PATH].encode('utf-8')
+    chunk = output[f'{LOCALES_DIR}/{language}.json']
+    before_gz = len(gzip.compress(before, 9))
+    after_gz = len(gzip.compress(loader, 9)) + len(gzip.compress(chunk, 9))
+    print_report(report)
+    print(f"Lassított profil: {THROTTLED_KBPS} kbit/s, {THROTTLED_RTT_MS} ms RTT, nyelv: {language}")
+    print(f"  előtte: {len(before):>8} B, {before_gz:>7} B gzip, ~{_transfer_ms(before_gz, 0):7.1f} ms "
+          "(a fő bundle része)")
+    print(f"  utána:  {len(loader) + len(chunk):>8} B, {after_gz:>7} B gzip, ~{_transfer_ms(after_gz, 1):7.1f} ms "
+          "(+1 kérés a nyelvi chunkért)")
+    print(f"  a fő bundle {before_gz - len(gzip.compress(loader, 9))} B gzip-pel kisebb, "
+          f"{len(before) - len(loader)} B-tal kevesebb JS-t kell értelmezni")
+    # A JS parse idő a böngészőben mérendő (DevTools Performance, CPU 4x lassítás);
+    # arányosan csökken a kódba ágyazott fordítások méretével
+    return {'before_gzip': before_gz, 'after_gzip': after_gz}
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='i18n fordítások nyelvenkénti szétbontása')
+    parser.add_argument('command', choices=('report', 'measure'))
+    parser.add_argument('src_dir')
+    parser.add_argument('--language', default=DEFAULT_LANGUAGE)
+    args = parser.parse_args(argv)
+    if args.command == 'report':
+        print_report(compile_i18n(_read_tree(args.src_dir))[1])
+    else:
+        measure(args.src_dir, args.language)
+
+
+if __name__ == '__main__':
+    main()
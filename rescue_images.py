@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+WebP kép pipeline a generátorhoz.
+
+A fa minden src/ alatti PNG/JPEG képéből több szélességű WebP változat készül
+tartalom-hash-es névvel (src/assets/generated/<név>-<szélesség>w-<hash>.webp),
+az eredeti kép marad a fallback. Mellé kerül:
+
+  - src/assets/images.js: képenként { srcSet, fallback, width, height },
+  - src/components/ResponsiveImage.jsx: <picture> + WebP <source> + <img>.
+
+A kódolás CPU-igényes, ezért process poolon fut; az eredményeket a forrás
+hash-e (és a beállítások) szerint cache-eljük, így az újrafuttatás azonnali.
+Pillow szükséges hozzá (pip install pillow).
+
+Kézi futtatás egy projekten (pl. az élő alkalmazáson):
+    python rescue_images.py rescue-admin
+"""
+
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+DEFAULT_WIDTHS = (80, 160, 320, 640, 1280)
+DEFAULT_QUALITY = 80
+GENERATED_DIR = 'src/assets/generated'
+IMAGES_MODULE = 'src/assets/images.js'
+COMPONENT_PATH = 'src/components/ResponsiveImage.jsx'
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'rescue-images')
+# Az önálló futtatás saját manifestje: a generátor .rescue-manifest.json-jához
+# nem nyúl, így a generátor fájljait sem törli
+MANIFEST_NAME = '.rescue-images-manifest.json'
+
+COMPONENT_SOURCE = '''// rescue_images.py generálja: WebP srcset, az eredeti kép a fallback
+const ResponsiveImage = ({ image, alt, sizes, ...props }) => (
+  <picture>
+    <source type="image/webp" srcSet={image.srcSet} sizes={sizes} />
+    <img
+      src={image.fallback}
+      width={image.width}
+      height={image.height}
+      alt={alt}
+      loading="lazy"
+      decoding="async"
+      {...props}
+    />
+  </picture>
+);
+
+export default ResponsiveImage;'''
+
+
+def _variant_widths(source_width, widths):
+    return sorted({w for w in widths if w < source_width} | {source_width})
+
+
+def encode_variants(data, widths, quality):
+    """Process pool worker: [(szélesség, magasság, webp bájtok)]."""
+    import io
+
+    from PIL import Image
+
+    with Image.open(io.BytesIO(data)) as image:
+        image.load()
+        source_width, source_height = image.size
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if 'transparency' in image.info or image.mode.endswith('A') else 'RGB')
+        variants = []
+        for width in _variant_widths(source_width, widths):
+            height = max(1, round(source_height * width / source_width))
+            resized = image if width == source_width else image.resize((width, height), Image.LANCZOS)
+            out = io.BytesIO()
+            resized.save(out, 'WEBP', quality=quality, method=6)
+            variants.append((width, height, out.getvalue()))
+    return source_width, source_height, variants
+
+
+def _cache_key(digest, widths, quality):
+    params = json.dumps({'widths': list(widths), 'quality': quality}, sort_keys=True)
+    return f"{digest}-{hashlib.sha256(params.encode('utf-8')).hexdigest()[:12]}"
+
+
+def _cache_load(cache_dir, key):
+    entry_dir = os.path.join(cache_dir, key)
+    try:
+        with open(os.path.join(entry_dir, 'index.json'), encoding='utf-8') as f:
+            index = json.load(f)
+        variants = []
+        for width, height in index['variants']:
+            with open(os.path.join(entry_dir, f'{width}.webp'), 'rb') as f:
+                variants.append((width, height, f.read()))
+    except (FileNotFoundError, ValueError, KeyError):
+        return None
+    return index['width'], index['height'], variants
+
+
+def _cache_store(cache_dir, key, result):
+    source_width, source_height, variants = result
+    entry_dir = os.path.join(cache_dir, key)
+    tmp_dir = entry_dir + f'.tmp{os.getpid()}'
+    os.makedirs(tmp_dir, exist_ok=True)
+    for width, _, data in variants:
+        with open(os.path.join(tmp_dir, f'{width}.webp'), 'wb') as f:
+            f.write(data)
+    with open(os.path.join(tmp_dir, 'index.json'), 'w', encoding='utf-8') as f:
+        json.dump({'width': source_width, 'height': source_height,
+                   'variants': [[w, h] for w, h, _ in variants]}, f)
+    try:
+        os.replace(tmp_dir, entry_dir)
+    except OSError:
+        # Párhuzamos futás már beírta
+        import shutil
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def export_name(rel_path):
+    stem = os.path.splitext(os.path.basename(rel_path))[0]
+    parts = [p for p in re.split(r'[^0-9A-Za-z]+', stem) if p]
+    name = parts[0].lower() + ''.join(p[:1].upper() + p[1:] for p in parts[1:]) if parts else 'image'
+    return '_' + name if name[0].isdigit() else name
+
+
+def find_images(files):
+    return [rel_path for rel_path in files
+            if rel_path.startswith('src/') and rel_path.lower().endswith(IMAGE_EXTENSIONS)
+            and not rel_path.startswith(GENERATED_DIR + '/')]
+
+
+def build_images(files, widths=DEFAULT_WIDTHS, quality=DEFAULT_QUALITY, cache_dir=CACHE_DIR, max_workers=None):
+    """A `files` fa képeiből az új fájlok szótára és a jelentés."""
+    images = sorted(find_images(files))
+    report = {'images': {}, 'encoded': [], 'cached': []}
+    if not images:
+        return {}, report
+
+    results = {}
+    jobs = {}
+    for rel_path in images:
+        data = bytes(files[rel_path])
+        digest = hashlib.sha256(data).hexdigest()
+        key = _cache_key(digest, widths, quality)
+        cached = _cache_load(cache_dir, key)
+        if cached is not None:
+            results[rel_path] = (digest, cached)
+            report['cached'].append(rel_path)
+        else:
+            jobs[rel_path] = (digest, key, data)
+    if jobs:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = {rel_path: pool.submit(encode_variants, data, tuple(widths), quality)
+                       for rel_path, (_, _, data) in jobs.items()}
+            for rel_path, future in futures.items():
+                digest, key, _ = jobs[rel_path]
+                result = future.result()
+                _cache_store(cache_dir, key, result)
+                results[rel_path] = (digest, result)
+                report['encoded'].append(rel_path)
+
+    output = {}
+    imports = []
+    exports = []
+    module_dir = os.path.dirname(IMAGES_MODULE)
+    for rel_path in images:
+        digest, (source_width, source_height, variants) = results[rel_path]
+        name = export_name(rel_path)
+        stem = os.path.splitext(os.path.basename(rel_path))[0]
+        fallback_var = f'{name}Fallback'
+        imports.append(f"import {fallback_var} from './{os.path.relpath(rel_path, module_dir)}';")
+        srcset = []
+        original = len(files[rel_path])
+        largest = 0
+        for width, _, data in variants:
+            out_name = f'{stem}-{width}w-{hashlib.sha256(data).hexdigest()[:8]}.webp'
+            output[f'{GENERATED_DIR}/{out_name}'] = data
+            var = f'{name}W{width}'
+            imports.append(f"import {var} from './{os.path.relpath(GENERATED_DIR, module_dir)}/{out_name}';")
+            srcset.append(f'${{{var}}} {width}w')
+            largest = len(data)
+        exports.append(
+            f"export const {name} = {{\n"
+            f"  srcSet: `{', '.join(srcset)}`,\n"
+            f"  fallback: {fallback_var},\n"
+            f"  width: {source_width},\n"
+            f"  height: {source_height}\n"
+            f"}};")
+        # A legnagyobb WebP változat mérete az eredetihez képest
+        report['images'][rel_path] = (original, largest, [w for w, _, _ in variants])
+
+    output[IMAGES_MODULE] = ('// rescue_images.py generálja, ne szerkeszd kézzel\n'
+                             + '\n'.join(imports) + '\n\n' + '\n\n'.join(exports) + '\n')
+    output[COMPONENT_PATH] = COMPONENT_SOURCE
+    return output, report
+
+
+def print_report(report):
+    if not report['images']:
+        return
+    print(f"Képek: {len(report['encoded'])} kódolva, {len(report['cached'])} cache-ből")
+    for rel_path, (original, webp, widths) in report['images'].items():
+        print(f"  {rel_path}: {original} B -> {webp} B WebP ({', '.join(f'{w}w' for w in widths)})")
+
+
+def _read_project_images(project_dir):
+    files = {}
+    src_dir = os.path.join(project_dir, 'src')
+    for root, _, names in os.walk(src_dir):
+        for name in names:
+            full_path = os.path.join(root, name)
+            rel_path = os.path.relpath(full_path, project_dir).replace(os.sep, '/')
+            if rel_path.lower().endswith(IMAGE_EXTENSIONS) and not rel_path.startswith(GENERATED_DIR + '/'):
+                with open(full_path, 'rb') as f:
+                    files[rel_path] = f.read()
+    return files
+
+
+def main(argv=None):
+    import argparse
+
+    from rescue_writer import print_report as print_write_report
+    from rescue_writer import sync_files
+
+    parser = argparse.ArgumentParser(description='WebP változatok egy projekt képeiből')
+    parser.add_argument('project_dir')
+    parser.add_argument('--widths', default=','.join(map(str, DEFAULT_WIDTHS)))
+    parser.add_argument('--quality', type=int, default=DEFAULT_QUALITY)
+    parser.add_argument('--cache-dir', default=CACHE_DIR)
+    args = parser.parse_args(argv)
+    widths = tuple(int(w) for w in args.widths.split(','))
+    output, report = build_images(_read_project_images(args.project_dir), widths, args.quality, args.cache_dir)
+    print_report(report)
+    # Csak a kép kimeneteket írjuk, saját manifesttel: törölni is csak a
+    # korábbi önálló futtatások már nem generált kimeneteit töröljük
+    write_report = sync_files(args.project_dir, output, manifest_name=MANIFEST_NAME)
+    print_write_report(write_report)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,627 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+asyncio GPS fogadó: a keresők pozíció jelentéseit időablakonként
+kötegelve írja a gps_tracks táblába.
+
+Most minden eszköz soronként szúr be, soronként egy commit-tal. Itt:
+
+  - a hívó a Supabase munkamenet JWT-jével azonosít (Authorization:
+    Bearer), a user_id a token `sub` mezőjéből jön, nem a jelentésből,
+    és csak olyan eseménybe írhat, amelynek résztvevője (event_participants,
+    MEMBER_TTL_S-ig cache-elve): a sorokat a szolgáltatás DSN-je írja, az
+    RLS nem véd,
+  - a jelentések egy sorba kerülnek; egy író task WINDOW_MS-enként
+    (vagy MAX_BATCH soronként) egy tranzakcióban, tömegesen szúr be,
+  - a sorban és az írás alatt legfeljebb MAX_PENDING sor lehet (sorok, nem
+    kérések); ha az adatbázis lemarad, a kérés legfeljebb ACCEPT_TIMEOUT_S-ig
+    vár helyre, utána 503 + Retry-After (backpressure),
+  - a válasz csak a sikeres commit után megy ki, így az eszköz biztosan
+    tudja, mikor kell újraküldenie.
+
+  - kötegenként és eseményenként egyetlen összevont értesítés megy ki
+    ugyanabban a tranzakcióban: Supabase Realtime broadcast (realtime.send,
+    BATCH_EVENT esemény, event-<id> privát topic, legfeljebb
+    MAX_MESSAGE_ROWS sor üzenetenként). A SearchManager (useEventChanges.js)
+    ezt hallgatja a gps_tracks soronkénti postgres_changes helyett; a topic
+    olvasási joga a *_gps_batch_broadcast.sql migrációban van.
+
+CORS: alapból nincs Access-Control-Allow-Origin (az eszközök nem
+böngészőből küldenek); böngészős klienshez az --allow-origin adja meg az
+engedélyezett origint.
+
+A gps_tracks oszlopai a COLUMNS-ban vannak (a nézet track_points kulcsai
+szerint). Helyi kipróbáláshoz SQLite tár is van.
+
+    SUPABASE_JWT_SECRET=... python rescue_ingest.py serve --sqlite tracks.db --port 8767
+    SUPABASE_JWT_SECRET=... python rescue_ingest.py serve --postgres postgresql://...   # psycopg kell
+    python rescue_ingest.py bench --rate 1000 --seconds 10
+
+A jelentés (POST /reports, egy objektum vagy lista; a user_id elhagyható,
+ha megvan, egyeznie kell a tokennel):
+    {"event_id": 1, "lat": 47.5, "lng": 19.0,
+     "acc": 12.5, "time": "2026-05-06T14:32:00+00:00"}
+
+A token a projekt JWT secretjével (HS256) aláírt Supabase access token; az
+aszimmetrikus (JWKS) kulcsokhoz külön könyvtár kellene, ezeket elutasítjuk.
+"""
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import math
+import os
+import time
+from datetime import datetime, timezone
+
+COLUMNS = ('event_id', 'user_id', 'lat', 'lng', 'acc', 'time')
+JWT_AUDIENCE = 'authenticated'
+BATCH_EVENT = 'gps_tracks_batch'
+MAX_MESSAGE_ROWS = 1000
+MEMBER_TTL_S = 60.0
+MAX_MEMBER_ENTRIES = 65536
+MAX_EVENT_ID = 2 ** 63 - 1
+WINDOW_MS = 200
+MAX_BATCH = 5000
+MAX_PENDING = 20000
+ACCEPT_TIMEOUT_S = 2.0
+MAX_BODY = 1024 * 1024
+
+
+class ReportError(ValueError):
+    pass
+
+
+class AuthError(ValueError):
+    pass
+
+
+def _b64url_decode(part):
+    return base64.urlsafe_b64decode(part + '=' * (-len(part) % 4))
+
+
+def verify_jwt(token, secret, audience=JWT_AUDIENCE, now=None):
+    """Supabase access token (HS256) ellenőrzése -> a claims dict; aláírás,
+    lejárat, audience és a `sub` hiánya esetén AuthError."""
+    try:
+        header_b64, payload_b64, signature_b64 = token.split('.')
+        header = json.loads(_b64url_decode(header_b64))
+        claims = json.loads(_b64url_decode(payload_b64))
+        signature = _b64url_decode(signature_b64)
+    except (ValueError, AttributeError):
+        raise AuthError('hibás token') from None
+    if not isinstance(header, dict) or header.get('alg') != 'HS256':
+        raise AuthError('nem támogatott token algoritmus')
+    expected = hmac.new(secret.encode('utf-8'), f'{header_b64}.{payload_b64}'.encode('ascii'),
+                        hashlib.sha256).digest()
+    if not hmac.compare_digest(expected, signature):
+        raise AuthError('hibás token aláírás')
+    if not isinstance(claims, dict):
+        raise AuthError('hibás token')
+    now = time.time() if now is None else now
+    if not isinstance(claims.get('exp'), (int, float)) or claims['exp'] <= now:
+        raise AuthError('lejárt token')
+    aud = claims.get('aud')
+    if audience and audience != aud and not (isinstance(aud, list) and audience in aud):
+        raise AuthError('a token nem ehhez a szolgáltatáshoz szól')
+    if not claims.get('sub'):
+        raise AuthError('a tokenben nincs felhasználó')
+    return claims
+
+
+def parse_report(report, user_id=None):
+    """Egy jelentés -> a COLUMNS sorrendű tuple; hibás jelentésre ReportError.
+    A user_id (a tokenből) felülírja a jelentését; ha az mást mond, hiba."""
+    if not isinstance(report, dict):
+        raise ReportError('a jelentés nem objektum')
+    try:
+        event_id = report['event_id']
+        lat, lng = float(report['lat']), float(report['lng'])
+    except (KeyError, TypeError, ValueError) as err:
+        raise ReportError(f'hiányzó vagy hibás mező: {err}') from None
+    # a search_events.id bigint: egy rossz típusú érték a COPY-ban az egész
+    # köteget (a többi eszköz sorait is) elbuktatná
+    if isinstance(event_id, str) and event_id.isdigit() and event_id.isascii():
+        event_id = int(event_id)
+    if isinstance(event_id, bool) or not isinstance(event_id, int) or not 0 < event_id <= MAX_EVENT_ID:
+        raise ReportError('hibás event_id')
+    if user_id is None:
+        user_id = report.get('user_id')
+    elif report.get('user_id') not in (None, '') and str(report['user_id']) != str(user_id):
+        raise ReportError('a user_id nem egyezik a tokennel')
+    if user_id in (None, ''):
+        raise ReportError('üres user_id')
+    if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+        raise ReportError('koordináta a tartományon kívül')
+    acc = report.get('acc')
+    if acc is not None:
+        try:
+            acc = float(acc)
+        except (TypeError, ValueError):
+            raise ReportError('hibás acc') from None
+        if not math.isfinite(acc) or acc < 0:
+            raise ReportError('hibás acc')
+    stamp = report.get('time')
+    if stamp is None:
+        stamp = datetime.now(timezone.utc).isoformat()
+    else:
+        try:
+            parsed = datetime.fromisoformat(str(stamp).replace('Z', '+00:00'))
+        except ValueError:
+            raise ReportError('hibás time') from None
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        stamp = parsed.astimezone(timezone.utc).isoformat()
+    return event_id, user_id, lat, lng, acc, stamp
+
+
+def batch_messages(rows):
+    """Egy köteg összevont értesítései: (topic, payload) eseményenként,
+    legfeljebb MAX_MESSAGE_ROWS soronként; a sorok [user_id, lat, lng, acc, time]."""
+    by_event = {}
+    for event_id, user_id, lat, lng, acc, stamp in rows:
+        by_event.setdefault(event_id, []).append([user_id, lat, lng, acc, stamp])
+    return [(f'event-{event_id}', {'event_id': event_id, 'rows': points[start:start + MAX_MESSAGE_ROWS]})
+            for event_id, points in by_event.items()
+            for start in range(0, len(points), MAX_MESSAGE_ROWS)]
+
+
+# --- Tárak (szinkron, az író task executorban hívja) -------------------------
+
+class SqliteStore:
+    """Helyi stand-in: a gps_tracks tábla SQLite-ban (WAL)."""
+
+    def __init__(self, path, delay_s=0.0):
+        import sqlite3
+
+        self.delay_s = delay_s
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute('pragma journal_mode=wal')
+        self._db.execute('pragma synchronous=normal')
+        self._db.execute('create table if not exists gps_tracks (id integer primary key, event_id, user_id, '
+                         'lat real, lng real, acc real, time text)')
+        self._db.execute('create table if not exists event_participants (event_id, user_id)')
+        # a realtime.send megfelelője: az elküldött összevont értesítések
+        self._db.execute('create table if not exists batch_messages (topic text, payload text)')
+        self._db.commit()
+
+    def insert_many(self, rows):
+        if self.delay_s:
+            time.sleep(self.delay_s)
+        with self._db:
+            self._db.executemany(f"insert into gps_tracks ({', '.join(COLUMNS)}) values (?, ?, ?, ?, ?, ?)", rows)
+            self._db.executemany('insert into batch_messages values (?, ?)',
+                                 [(topic, json.dumps(payload)) for topic, payload in batch_messages(rows)])
+
+    def is_member(self, user_id, event_id):
+        return self._db.execute('select 1 from event_participants where event_id = ? and user_id = ?',
+                                (event_id, user_id)).fetchone() is not None
+
+    def messages(self):
+        return self._db.execute('select count(*) from batch_messages').fetchone()[0]
+
+    def insert_one(self, row):
+        """Összehasonlításhoz: soronkénti beszúrás, soronkénti commit."""
+        with self._db:
+            self._db.execute(f"insert into gps_tracks ({', '.join(COLUMNS)}) values (?, ?, ?, ?, ?, ?)", row)
+
+    def count(self):
+        return self._db.execute('select count(*) from gps_tracks').fetchone()[0]
+
+    def close(self):
+        self._db.close()
+
+
+class PostgresStore:
+    """Postgres/Supabase: COPY egy tranzakcióban, a végén eseményenként egy
+    realtime.send broadcast. A résztvevő ellenőrzés külön (autocommit)
+    kapcsolaton fut, hogy ne kerüljön az író tranzakciójába. psycopg (3) kell
+    hozzá."""
+
+    def __init__(self, dsn):
+        try:
+            import psycopg
+        except ImportError:
+            raise SystemExit('A Postgres tárhoz a psycopg csomag kell: pip install psycopg') from None
+        self._db = psycopg.connect(dsn)
+        self._lookup = psycopg.connect(dsn, autocommit=True)
+
+    def insert_many(self, rows):
+        with self._db.transaction(), self._db.cursor() as cursor:
+            with cursor.copy(f"copy public.gps_tracks ({', '.join(COLUMNS)}) from stdin") as copy:
+                for row in rows:
+                    copy.write_row(row)
+            for topic, payload in batch_messages(rows):
+                cursor.execute('select realtime.send(%s::jsonb, %s, %s, true)',
+                               (json.dumps(payload), BATCH_EVENT, topic))
+
+    def is_member(self, user_id, event_id):
+        with self._lookup.cursor() as cursor:
+            cursor.execute('select 1 from public.event_participants where event_id = %s and user_id = %s limit 1',
+                           (event_id, user_id))
+            return cursor.fetchone() is not None
+
+    def close(self):
+        self._lookup.close()
+        self._db.close()
+
+
+# --- Gateway -------------------------------------------------------------------
+
+class IngestGateway:
+    """Sor + egyetlen író task. A függő (még nem commitolt) sorok száma
+    legfeljebb max_pending; a `submit` a commit után tér vissza."""
+
+    def __init__(self, store, window_ms=WINDOW_MS, max_batch=MAX_BATCH, max_pending=MAX_PENDING,
+                 accept_timeout=ACCEPT_TIMEOUT_S):
+        self.store = store
+        self.window_s = window_ms / 1000
+        self.max_batch = max_batch
+        self.max_pending = max_pending
+        self.accept_timeout = accept_timeout
+        self.stats = {'accepted': 0, 'rejected': 0, 'invalid': 0, 'committed': 0, 'batches': 0, 'failed': 0,
+                      'unauthorized': 0, 'forbidden': 0}
+        self._queue = asyncio.Queue()
+        self._members = {}
+        self._pending_rows = 0
+        self._space = None
+        self._writer = None
+
+    def start(self):
+        self._space = asyncio.Condition()
+        self._writer = asyncio.get_running_loop().create_task(self._write_loop())
+
+    async def stop(self):
+        """A sorban maradt jelentések kiírása, majd leállás."""
+        await self._queue.join()
+        self._writer.cancel()
+        try:
+            await self._writer
+        except asyncio.CancelledError:
+            pass
+
+    async def is_member(self, user_id, event_id):
+        """Résztvevője-e a felhasználó az eseménynek (MEMBER_TTL_S-ig cache-elve)."""
+        key = (user_id, event_id)
+        now = time.monotonic()
+        cached = self._members.get(key)
+        if cached is not None and now - cached[1] < MEMBER_TTL_S:
+            return cached[0]
+        result = await asyncio.get_running_loop().run_in_executor(None, self.store.is_member, user_id, event_id)
+        if len(self._members) >= MAX_MEMBER_ENTRIES:
+            self._members.clear()
+        self._members[key] = (result, now)
+        return result
+
+    @property
+    def pending(self):
+        return self._pending_rows
+
+    def _fits(self, count):
+        # Egy max_pending-nél nagyobb kérés is átmegy, ha épp semmi sem függ
+        return self._pending_rows + count <= self.max_pending or not self._pending_rows
+
+    async def submit(self, rows):
+        """Már ellenőrzött sorok; True a commit után, False ha accept_timeout-ig
+        sem lett hely max_pending alatt (backpressure), kivételt dob, ha a tár
+        hibázott."""
+        if not self._fits(len(rows)):
+            try:
+                async with self._space:
+                    await asyncio.wait_for(self._space.wait_for(lambda: self._fits(len(rows))),
+                                           self.accept_timeout)
+            except asyncio.TimeoutError:
+                self.stats['rejected'] += len(rows)
+                return False
+        done = asyncio.get_running_loop().create_future()
+        self._pending_rows += len(rows)
+        self._queue.put_nowait((rows, done))
+        self.stats['accepted'] += len(rows)
+        await done
+        return True
+
+    async def _write_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            items = [await self._queue.get()]
+            size = len(items[0][0])
+            deadline = loop.time() + self.window_s
+            while size < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                items.append(item)
+                size += len(item[0])
+            rows = [row for batch, _ in items for row in batch]
+            try:
+                await loop.run_in_executor(None, self.store.insert_many, rows)
+            except Exception as err:  # a tár hibáját minden várakozó megkapja
+                self.stats['failed'] += len(rows)
+                for _, done in items:
+                    if not done.done():
+                        done.set_exception(err)
+            else:
+                self.stats['committed'] += len(rows)
+                self.stats['batches'] += 1
+                for _, done in items:
+                    if not done.done():
+                        done.set_result(None)
+            self._pending_rows -= len(rows)
+            async with self._space:
+                self._space.notify_all()
+            for _ in items:
+                self._queue.task_done()
+
+
+# --- HTTP ------------------------------------------------------------------------
+
+_REASONS = {200: 'OK', 202: 'Accepted', 204: 'No Content', 400: 'Bad Request', 401: 'Unauthorized',
+            403: 'Forbidden', 404: 'Not Found', 413: 'Payload Too Large', 500: 'Internal Server Error', 503: 'Service Unavailable'}
+
+
+def _cors_headers(origin, allow_origins):
+    """CORS fejlécek csak az engedélyezett originnek (alapból senkinek)."""
+    if not origin or origin not in allow_origins:
+        return []
+    return [f'Access-Control-Allow-Origin: {origin}', 'Vary: Origin']
+
+
+async def _respond(writer, status, payload, headers=()):
+    body = json.dumps(payload).encode('utf-8') if payload is not None else b''
+    head = [f'HTTP/1.1 {status} {_REASONS[status]}', 'Content-Type: application/json',
+            f'Content-Length: {len(body)}', *headers]
+    writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + body)
+    await writer.drain()
+
+
+def make_handler(gateway, jwt_secret, allow_origins=()):
+    """asyncio.start_server kezelő: keep-alive HTTP/1.1, POST /reports (Bearer
+    tokennel) és GET /health."""
+
+    async def handle(reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                    return
+                lines = head.decode('latin-1').split('\r\n')
+                method, path, _ = (lines[0].split(' ') + ['', ''])[:3]
+                headers = {}
+                for line in lines[1:]:
+                    name, _, value = line.partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get('content-length') or 0)
+                if length > MAX_BODY:
+                    await _respond(writer, 413, {'error': 'túl nagy kérés'})
+                    return
+                body = await reader.readexactly(length) if length else b''
+                path = path.split('?')[0]
+                cors = _cors_headers(headers.get('origin'), allow_origins)
+                if method == 'GET' and path == '/health':
+                    await _respond(writer, 200, dict(gateway.stats, pending=gateway.pending))
+                elif method == 'OPTIONS' and path == '/reports' and cors:
+                    await _respond(writer, 204, None, cors + [
+                        'Access-Control-Allow-Methods: POST', 'Access-Control-Allow-Headers: authorization, content-type',
+                        'Access-Control-Max-Age: 600'])
+                elif method == 'POST' and path == '/reports':
+                    scheme, _, token = headers.get('authorization', '').partition(' ')
+                    try:
+                        if scheme.lower() != 'bearer':
+                            raise AuthError('hiányzó Bearer token')
+                        claims = verify_jwt(token.strip(), jwt_secret)
+                    except AuthError as err:
+                        gateway.stats['unauthorized'] += 1
+                        await _respond(writer, 401, {'error': str(err)}, cors + ['WWW-Authenticate: Bearer'])
+                    else:
+                        await _handle_reports(gateway, writer, body, claims['sub'], cors)
+                else:
+                    await _respond(writer, 404, {'error': 'nincs ilyen végpont'})
+                if headers.get('connection', '').lower() == 'close':
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    return handle
+
+
+async def _handle_reports(gateway, writer, body, user_id, cors=()):
+    cors = list(cors)
+    try:
+        payload = json.loads(body or b'null')
+    except ValueError:
+        await _respond(writer, 400, {'error': 'hibás JSON'}, cors)
+        return
+    reports = payload if isinstance(payload, list) else [payload]
+    rows, errors, forbidden = [], [], 0
+    for index, report in enumerate(reports):
+        try:
+            row = parse_report(report, user_id)
+            if not await gateway.is_member(user_id, row[0]):
+                forbidden += 1
+                raise ReportError('nem résztvevője az eseménynek')
+            rows.append(row)
+        except ReportError as err:
+            errors.append({'index': index, 'error': str(err)})
+        except Exception as err:  # a résztvevő lekérdezés hibája
+            await _respond(writer, 503, {'error': f'adatbázis hiba: {err}'}, cors + ['Retry-After: 5'])
+            return
+    gateway.stats['invalid'] += len(errors) - forbidden
+    gateway.stats['forbidden'] += forbidden
+    if not rows:
+        await _respond(writer, 403 if forbidden == len(errors) else 400, {'accepted': 0, 'errors': errors}, cors)
+        return
+    try:
+        stored = await gateway.submit(rows)
+    except Exception as err:
+        await _respond(writer, 500, {'error': f'adatbázis hiba: {err}'}, cors + ['Retry-After: 5'])
+        return
+    if not stored:
+        await _respond(writer, 503, {'error': 'túlterhelés, próbáld újra'}, cors + ['Retry-After: 1'])
+        return
+    await _respond(writer, 200, {'accepted': len(rows), 'errors': errors}, cors)
+
+
+async def serve(store, jwt_secret, host='127.0.0.1', port=8767, allow_origins=(), **options):
+    gateway = IngestGateway(store, **options)
+    gateway.start()
+    server = await asyncio.start_server(make_handler(gateway, jwt_secret, allow_origins), host, port)
+    print(f"GPS fogadó: http://{host}:{port}/reports")
+    async with server:
+        try:
+            await server.serve_forever()
+        finally:
+            await gateway.stop()
+
+
+# --- Benchmark ---------------------------------------------------------------
+
+def _percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else float('nan')
+
+
+async def _drive(gateway, rate, seconds, users=300):
+    """Egyenletes terhelés: `rate` egyedi jelentés másodpercenként, mint
+    `users` darab eszköz; visszaadja a jelentésenkénti késleltetéseket."""
+    latencies = []
+    rejected = 0
+
+    async def one(index, started):
+        nonlocal rejected
+        row = (1, f'user-{index % users}', 47.9 + index * 1e-7, 20.4, 10.0,
+               datetime.now(timezone.utc).isoformat())
+        if await gateway.submit([row]):
+            latencies.append(time.perf_counter() - started)
+        else:
+            rejected += 1
+
+    loop = asyncio.get_running_loop()
+    tasks = []
+    start = loop.time()
+    for index in range(int(rate * seconds)):
+        # Pontos ütemezés: a késés nem halmozódik
+        delay = start + index / rate - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(loop.create_task(one(index, time.perf_counter())))
+    await asyncio.gather(*tasks)
+    return latencies, rejected, loop.time() - start
+
+
+def bench(rate=1000, seconds=10, window_ms=WINDOW_MS):
+    import os
+    import tempfile
+
+    work_dir = tempfile.mkdtemp(prefix='rescue_ingest_bench_')
+
+    async def scenario(store, **options):
+        gateway = IngestGateway(store, window_ms=window_ms, **options)
+        gateway.start()
+        latencies, rejected, elapsed = await _drive(gateway, rate, seconds)
+        await gateway.stop()
+        return gateway, latencies, rejected, elapsed
+
+    try:
+        store = SqliteStore(os.path.join(work_dir, 'batched.db'))
+        gateway, latencies, rejected, elapsed = asyncio.run(scenario(store))
+        print(f"Kötegelt ({window_ms} ms ablak), {rate}/s x {seconds} s, SQLite:")
+        print(f"  {len(latencies) / elapsed:.0f} jelentés/s, {gateway.stats['batches']} köteg "
+              f"({int(rate * seconds)} soronkénti commit helyett), {store.messages()} összevont értesítés "
+              f"({len(latencies)} soronkénti helyett)")
+        print(f"  késleltetés (commitig): p50 {_percentile(latencies, 0.5) * 1000:.0f} ms, "
+              f"p99 {_percentile(latencies, 0.99) * 1000:.0f} ms, max {max(latencies) * 1000:.0f} ms")
+        assert store.count() == len(latencies)
+        store.close()
+
+        # Lassú tár: kötegenként 1 s írás; a függő sorok korlátja miatt visszautasítás lesz
+        store = SqliteStore(os.path.join(work_dir, 'slow.db'), delay_s=1.0)
+        gateway, latencies, rejected, elapsed = asyncio.run(
+            scenario(store, max_pending=500, max_batch=200, accept_timeout=0.5))
+        print(f"Lemaradó tár (1 s/köteg, max 500 függő sor): {len(latencies)} tárolva, {rejected} visszautasítva "
+              f"(503), p99 {_percentile(latencies, 0.99) * 1000:.0f} ms")
+        store.close()
+
+        # Nagy kérések (100 sor/kérés): a korlát sorokban értendő, nem kérésekben
+        store = SqliteStore(os.path.join(work_dir, 'bulk.db'), delay_s=0.2)
+        peak = 0
+
+        async def bulk():
+            nonlocal peak
+            gateway = IngestGateway(store, max_pending=1000, accept_timeout=0.3)
+            gateway.start()
+            rows = [(1, 'user-1', 47.9, 20.4, 10.0, datetime.now(timezone.utc).isoformat())] * 100
+            tasks = [asyncio.get_running_loop().create_task(gateway.submit(rows)) for _ in range(100)]
+            while not all(task.done() for task in tasks):
+                peak = max(peak, gateway.pending)
+                await asyncio.sleep(0.01)
+            await gateway.stop()
+            return sum(task.result() for task in tasks)
+
+        stored = asyncio.run(bulk())
+        print(f"Nagy kérések (100 x 100 sor, max 1000 függő sor): {stored} kérés tárolva, "
+              f"legtöbb függő sor {peak}")
+        store.close()
+
+        # Összehasonlítás: soronkénti commit, mint most az eszközök
+        store = SqliteStore(os.path.join(work_dir, 'rows.db'))
+        count = min(int(rate * seconds), 5000)
+        started = time.perf_counter()
+        for index in range(count):
+            store.insert_one((1, f'user-{index % 300}', 47.9, 20.4, 10.0, datetime.now(timezone.utc).isoformat()))
+        elapsed = time.perf_counter() - started
+        print(f"Soronkénti commit: legfeljebb {count / elapsed:.0f} sor/s")
+        store.close()
+    finally:
+        import shutil
+        shutil.rmtree(work_dir)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Kötegelt GPS fogadó a gps_tracks táblához')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p_serve = sub.add_parser('serve')
+    target = p_serve.add_mutually_exclusive_group(required=True)
+    target.add_argument('--sqlite', help='SQLite fájl (helyi kipróbáláshoz)')
+    target.add_argument('--postgres', help='Postgres DSN')
+    p_serve.add_argument('--host', default='127.0.0.1')
+    p_serve.add_argument('--port', type=int, default=8767)
+    p_serve.add_argument('--window-ms', type=int, default=WINDOW_MS)
+    p_serve.add_argument('--max-pending', type=int, default=MAX_PENDING, help='függő sorok legfeljebb')
+    p_serve.add_argument('--jwt-secret', default=os.environ.get('SUPABASE_JWT_SECRET'),
+                         help='a Supabase projekt JWT secretje (alapból SUPABASE_JWT_SECRET)')
+    p_serve.add_argument('--allow-origin', action='append', default=[],
+                         help='CORS: engedélyezett böngészős origin (többször is megadható)')
+    p_bench = sub.add_parser('bench')
+    p_bench.add_argument('--rate', type=int, default=1000)
+    p_bench.add_argument('--seconds', type=float, default=10)
+    p_bench.add_argument('--window-ms', type=int, default=WINDOW_MS)
+    args = parser.parse_args(argv)
+
+    if args.command == 'bench':
+        bench(args.rate, args.seconds, args.window_ms)
+        return
+    if not args.jwt_secret:
+        raise SystemExit('A hívók azonosításához kell a JWT secret: --jwt-secret vagy SUPABASE_JWT_SECRET')
+    store = SqliteStore(args.sqlite) if args.sqlite else PostgresStore(args.postgres)
+    try:
+        asyncio.run(serve(store, args.jwt_secret, args.host, args.port, tuple(args.allow_origin),
+                          window_ms=args.window_ms, max_pending=args.max_pending))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        store.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Rétegzett (overlay) sablonok a generátor scriptekhez.
+
+Minden revízió egy réteg a templates/<név>/ mappában, az alatta lévő
+réteghez képesti különbséggel:
+
+    layer.json          {"base": "rescue01", "removed": ["src/Regi.jsx"]}
+    files/<rel_path>    új vagy teljesen lecserélt fájl
+    patches/<rel_path>.patch
+                        unified diff az alsó réteg azonos fájljához képest
+
+A legalsó rétegnek nincs "base"-e (vagy nincs layer.json-ja). Minden
+rétegből rescue_pack csomag épül, amelynek fejlécébe a teljes feloldott fa
+is bekerül (rel_path -> [forrás réteg, sha256]). Így a legfelső réteg
+feloldásához csak a saját fejlécét kell beolvasni, az alsó rétegekhez csak
+akkor nyúlunk, ha egy ténylegesen kiírandó fájl tartalma onnan jön.
+
+Új réteg készítése egy teljes fából:
+    python rescue_layers.py delta rescue02 /út/a/teljes/fához rescue03
+
+Mérés sok réteggel:
+    python rescue_layers.py bench --layers 40
+"""
+
+import difflib
+import hashlib
+import json
+import os
+from collections.abc import Mapping
+
+from rescue_pack import TemplatePack, build_pack, pack_is_stale
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+LAYER_META = 'layer.json'
+FILES_PREFIX = 'files/'
+PATCHES_PREFIX = 'patches/'
+PATCH_SUFFIX = '.patch'
+_NO_NEWLINE = '\\ No newline at end of file\n'
+
+
+class PatchError(ValueError):
+    pass
+
+
+# --- Unified diff -----------------------------------------------------------
+
+def make_patch(old, new, context=3):
+    a = old.splitlines(keepends=True)
+    b = new.splitlines(keepends=True)
+    out = []
+
+    def emit(prefix, line):
+        out.append(prefix + line)
+        if not line.endswith('\n'):
+            out.append('\n' + _NO_NEWLINE)
+
+    for group in difflib.SequenceMatcher(None, a, b, autojunk=False).get_grouped_opcodes(context):
+        i1, i2, j1, j2 = group[0][1], group[-1][2], group[0][3], group[-1][4]
+        # Üres tartománynál a sorszám a beszúrási pont előtti sor (mint a diff-nél)
+        old_start = i1 + 1 if i2 > i1 else i1
+        new_start = j1 + 1 if j2 > j1 else j1
+        out.append(f'@@ -{old_start},{i2 - i1} +{new_start},{j2 - j1} @@\n')
+        for tag, a1, a2, b1, b2 in group:
+            if tag == 'equal':
+                for line in a[a1:a2]:
+                    emit(' ', line)
+                continue
+            for line in a[a1:a2]:
+                emit('-', line)
+            for line in b[b1:b2]:
+                emit('+', line)
+    return ''.join(out)
+
+
+def _parse_hunks(patch):
+    hunks = []
+    for line in patch.splitlines(keepends=True):
+        if line.startswith('@@'):
+            start, _, length = line.split()[1][1:].partition(',')
+            start, length = int(start), int(length or 1)
+            hunks.append((start if length == 0 else start - 1, []))
+        elif line == _NO_NEWLINE or line == _NO_NEWLINE.rstrip('\n'):
+            op, text = hunks[-1][1][-1]
+            hunks[-1][1][-1] = (op, text[:-1])
+        elif hunks and line[:1] in ' -+':
+            hunks[-1][1].append((line[0], line[1:]))
+        elif line.startswith(('---', '+++')) and not hunks:
+            continue
+        else:
+            raise PatchError(f"Érvénytelen patch sor: {line!r}")
+    return hunks
+
+
+def apply_patch(old, patch):
+    a = old.splitlines(keepends=True)
+    out = []
+    pos = 0
+    for start, lines in _parse_hunks(patch):
+        if start < pos:
+            raise PatchError("Átfedő hunkok a patch-ben")
+        out.extend(a[pos:start])
+        pos = start
+        for op, text in lines:
+            if op == '+':
+                out.append(text)
+                continue
+            if pos >= len(a) or a[pos] != text:
+                raise PatchError(f"A patch nem illeszkedik a(z) {pos + 1}. sornál")
+            if op == ' ':
+                out.append(text)
+            pos += 1
+    out.extend(a[pos:])
+    return ''.join(out)
+
+
+# --- Rétegek ----------------------------------------------------------------
+
+def layer_dir(name, templates_dir=TEMPLATES_DIR):
+    return os.path.join(templates_dir, name)
+
+
+def layer_pack_path(name, templates_dir=TEMPLATES_DIR):
+    return os.path.join(templates_dir, name + '.pack')
+
+
+def read_layer_meta(name, templates_dir=TEMPLATES_DIR):
+    path = os.path.join(layer_dir(name, templates_dir), LAYER_META)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+    except FileNotFoundError:
+        meta = {}
+    return {'base': meta.get('base'), 'removed': list(meta.get('removed', []))}
+
+
+def _sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def build_layer(name, templates_dir=TEMPLATES_DIR):
+    """A réteg csomagjának felépítése, a feloldott fával a fejlécben."""
+    meta = read_layer_meta(name, templates_dir)
+    src_dir = layer_dir(name, templates_dir)
+    base = LayerStack(meta['base'], templates_dir) if meta['base'] else None
+    pack_path = layer_pack_path(name, templates_dir)
+    # Először a fa nélkül, hogy a saját bejegyzéseket hash-elni lehessen
+    build_pack(src_dir, pack_path, {'layer': meta}, exclude=(LAYER_META,))
+    tree = dict(base.tree) if base else {}
+    with TemplatePack(pack_path) as pack:
+        for rel_path in meta['removed']:
+            tree.pop(rel_path, None)
+        for entry in pack:
+            if entry.startswith(FILES_PREFIX):
+                tree[entry[len(FILES_PREFIX):]] = [name, pack.digest(entry)]
+            elif entry.startswith(PATCHES_PREFIX) and entry.endswith(PATCH_SUFFIX):
+                rel_path = entry[len(PATCHES_PREFIX):-len(PATCH_SUFFIX)]
+                if base is None or rel_path not in base:
+                    raise PatchError(f"{name}: nincs alap a patch-hez: {rel_path}")
+                result = apply_patch(base[rel_path].decode('utf-8'), pack.text(entry))
+                tree[rel_path] = [name, _sha256(result.encode('utf-8'))]
+            else:
+                raise PatchError(f"{name}: ismeretlen bejegyzés: {entry}")
+    if base:
+        base.close()
+    build_pack(src_dir, pack_path, {'layer': meta, 'tree': tree}, exclude=(LAYER_META,))
+    return pack_path
+
+
+def ensure_layer(name, templates_dir=TEMPLATES_DIR):
+    """Újraépíti a réteg csomagját, ha a forrása vagy az alatta lévő
+    csomag újabb nála. Csak stat-ol, csomag fejlécet nem olvas."""
+    meta = read_layer_meta(name, templates_dir)
+    base_mtime = ensure_layer(meta['base'], templates_dir) if meta['base'] else 0
+    pack_path = layer_pack_path(name, templates_dir)
+    if pack_is_stale(layer_dir(name, templates_dir), pack_path) or \
+            os.stat(pack_path).st_mtime_ns < base_mtime:
+        build_layer(name, templates_dir)
+    return os.stat(pack_path).st_mtime_ns
+
+
+class LayerStack(Mapping):
+    """A `name` rétegig feloldott fa, rel_path -> bytes leképezésként.
+
+    Csak a legfelső csomag fejlécét olvassa be; az alsó rétegek csomagjait
+    akkor nyitja meg, amikor egy onnan származó fájl tartalmára szükség van.
+    """
+
+    def __init__(self, name, templates_dir=TEMPLATES_DIR):
+        self.name = name
+        self.templates_dir = templates_dir
+        self._packs = {}
+        self.tree = self._pack(name).header['tree']
+
+    def _pack(self, name):
+        if name not in self._packs:
+            self._packs[name] = TemplatePack(layer_pack_path(name, self.templates_dir))
+        return self._packs[name]
+
+    def _content(self, layer, rel_path):
+        pack = self._pack(layer)
+        entry = FILES_PREFIX + rel_path
+        if entry in pack:
+            return pack[entry]
+        base = pack.header['layer']['base']
+        base_layer = self._pack(base).header['tree'][rel_path][0]
+        old = self._content(base_layer, rel_path).decode('utf-8')
+        patch = pack.text(PATCHES_PREFIX + rel_path + PATCH_SUFFIX)
+        return apply_patch(old, patch).encode('utf-8')
+
+    def __getitem__(self, rel_path):
+        layer, digest = self.tree[rel_path]
+        data = self._content(layer, rel_path)
+        if _sha256(data) != digest:
+            raise PatchError(f"Hash eltérés a feloldott fájlnál: {rel_path}")
+        return data
+
+    def __contains__(self, rel_path):
+        return rel_path in self.tree
+
+    def __iter__(self):
+        return iter(self.tree)
+
+    def __len__(self):
+        return len(self.tree)
+
+    def digests(self):
+        return {rel_path: entry[1] for rel_path, entry in self.tree.items()}
+
+    def close(self):
+        for pack in self._packs.values():
+            pack.close()
+        self._packs = {}
+
+
+class DerivedTree(Mapping):
+    """Egy feloldott fa generátor lépések (pl. rescue_i18n) által felülírt
+    vagy hozzáadott fájlokkal; a hash-ek a felülírásokra is elérhetők."""
+
+    def __init__(self, base, overrides):
+        self.base = base
+        self.overrides = {rel_path: content.encode('utf-8') if isinstance(content, str) else content
+                          for rel_path, content in overrides.items()}
+
+    def __getitem__(self, rel_path):
+        if rel_path in self.overrides:
+            return self.overrides[rel_path]
+        return self.base[rel_path]
+
+    def __contains__(self, rel_path):
+        return rel_path in self.overrides or rel_path in self.base
+
+    def __iter__(self):
+        yield from self.base
+        yield from (rel_path for rel_path in self.overrides if rel_path not in self.base)
+
+    def __len__(self):
+        return len(self.base) + sum(1 for rel_path in self.overrides if rel_path not in self.base)
+
+    def digests(self):
+        digests = self.base.digests()
+        digests.update((rel_path, _sha256(data)) for rel_path, data in self.overrides.items())
+        return digests
+
+    def close(self):
+        self.base.close()
+
+
+def resolve(name, templates_dir=TEMPLATES_DIR):
+    """A generátorok belépési pontja: friss csomagok, feloldott fa."""
+    ensure_layer(name, templates_dir)
+    return LayerStack(name, templates_dir)
+
+
+def write_delta(base_name, tree_dir, name, templates_dir=TEMPLATES_DIR):
+    """Új réteg (`name`) a `tree_dir` teljes fa és a `base_name` réteg
+    különbségéből. A patch-et csak akkor használjuk, ha rövidebb a fájlnál."""
+    base = resolve(base_name, templates_dir)
+    out_dir = layer_dir(name, templates_dir)
+    seen = set()
+    for root, _, names in os.walk(tree_dir):
+        for file_name in names:
+            full_path = os.path.join(root, file_name)
+            rel_path = os.path.relpath(full_path, tree_dir).replace(os.sep, '/')
+            seen.add(rel_path)
+            with open(full_path, 'rb') as f:
+                data = f.read()
+            if rel_path in base and base.tree[rel_path][1] == _sha256(data):
+                continue
+            target = os.path.join(out_dir, FILES_PREFIX + rel_path)
+            if rel_path in base:
+                patch = make_patch(base[rel_path].decode('utf-8'), data.decode('utf-8'))
+                if len(patch.encode('utf-8')) < len(data):
+                    target = os.path.join(out_dir, PATCHES_PREFIX + rel_path + PATCH_SUFFIX)
+                    data = patch.encode('utf-8')
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, 'wb') as f:
+                f.write(data)
+    meta = {'base': base_name, 'removed': sorted(set(base) - seen)}
+    base.close()
+    with open(os.path.join(out_dir, LAYER_META), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2)
+        f.write('\n')
+    return out_dir
+
+
+def bench(layers=40, templates_dir=TEMPLATES_DIR, base_name='rescue01'):
+    """`layers` darab szintetikus réteg a `base_name` fölött; mindegyik egy
+    fájlt patch-el és egyet hozzáad. A legfelső réteg feloldását mérjük."""
+    import shutil
+    import tempfile
+    import time
+
+    work_dir = tempfile.mkdtemp(prefix='rescue_layers_bench_')
+    try:
+        shutil.copytree(layer_dir(base_name, templates_dir), layer_dir(base_name, work_dir))
+        prev = base_name
+        for i in range(layers):
+            name = f'bench{i:03d}'
+            out_dir = layer_dir(name, work_dir)
+            os.makedirs(os.path.join(out_dir, FILES_PREFIX, 'src', 'generated'))
+            with open(os.path.join(out_dir, FILES_PREFIX, 'src', 'generated', f'Layer{i}.jsx'), 'w') as f:
+                f.write(f'export default function Layer{i}() {{ return null; }}\n')
+            if i == 0:
+                with open(os.path.join(out_dir, FILES_PREFIX, 'src', 'generated', 'stamp.js'), 'w') as f:
+                    f.write(f'// {name}\n')
+            else:
+                os.makedirs(os.path.join(out_dir, PATCHES_PREFIX, 'src', 'generated'))
+                with open(os.path.join(out_dir, PATCHES_PREFIX, 'src', 'generated', 'stamp.js.patch'), 'w') as f:
+                    f.write(make_patch(f'// {prev}\n', f'// {name}\n'))
+            with open(os.path.join(out_dir, LAYER_META), 'w') as f:
+                json.dump({'base': prev}, f)
+            prev = name
+
+        start = time.perf_counter()
+        ensure_layer(prev, work_dir)
+        cold = time.perf_counter() - start
+        start = time.perf_counter()
+        stack = resolve(prev, work_dir)
+        digests = stack.digests()
+        warm = time.perf_counter() - start
+        opened = len(stack._packs)
+        start = time.perf_counter()
+        stack[f'src/generated/Layer{layers - 1}.jsx']
+        delta = time.perf_counter() - start
+        start = time.perf_counter()
+        stack['src/generated/stamp.js']
+        chain = time.perf_counter() - start
+        stack.close()
+    finally:
+        shutil.rmtree(work_dir)
+    print(f"{layers} réteg, {len(digests)} fájl a feloldott fában")
+    print(f"  csomagok építése (cold):        {cold * 1000:8.2f} ms")
+    print(f"  feloldás + hash-ek (warm):      {warm * 1000:8.2f} ms, megnyitott csomag: {opened}")
+    print(f"  legfelső réteg új fájlja:       {delta * 1000:8.2f} ms")
+    print(f"  {layers} rétegen át patch-elt fájl: {chain * 1000:8.2f} ms")
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Rétegzett sablonok kezelése')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p_delta = sub.add_parser('delta', help='új réteg egy teljes fa és az alap különbségéből')
+    p_delta.add_argument('base')
+    p_delta.add_argument('tree_dir')
+    p_delta.add_argument('name')
+    p_tree = sub.add_parser('tree', help='feloldott fa listázása')
+    p_tree.add_argument('name')
+    p_export = sub.add_parser('export', help='feloldott fa kiírása egy mappába')
+    p_export.add_argument('name')
+    p_export.add_argument('out_dir')
+    p_bench = sub.add_parser('bench', help='sok réteg feloldásának mérése')
+    p_bench.add_argument('--layers', type=int, default=40)
+    args = parser.parse_args(argv)
+
+    if args.command == 'bench':
+        bench(args.layers)
+    elif args.command == 'delta':
+        print(write_delta(args.base, args.tree_dir, args.name))
+    elif args.command == 'tree':
+        stack = resolve(args.name)
+        for rel_path, (layer, digest) in sorted(stack.tree.items()):
+            print(f"{digest[:12]}  {layer:<12} {rel_path}")
+        stack.close()
+    else:
+        stack = resolve(args.name)
+        for rel_path in stack:
+            target = os.path.join(args.out_dir, rel_path)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, 'wb') as f:
+                f.write(stack[rel_path])
+        stack.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Eltűnt személyek fotóinak előfeldolgozása és feltöltése (photos bucket).
+
+A telefonos fotókat (több MB) nem nyersen töltjük fel: process poolon
+elforgatjuk az EXIF szerint, eldobjuk a metaadatokat (GPS is!), és három
+WebP változatot készítünk (thumb, medium, full). Az objektumok neve a forrás
+tartalom-hash-e, így ugyanaz a fotó másodszor feltöltve nem hoz létre
+duplikátumot, a feltöltés no-op:
+
+    missing_persons/<hash[:2]>/<hash>-<változat>.webp
+
+A feltöltés korlátos szálkészleten párhuzamos. A tároló cserélhető: a
+SupabaseStorage a Storage REST API-t hívja, a LocalStorage egy mappába ír
+(teszteléshez, Supabase nélkül).
+
+    python rescue_photos.py foto1.jpg foto2.jpg --local /tmp/photos
+    SUPABASE_URL=... SUPABASE_SERVICE_KEY=... python rescue_photos.py foto.jpg --person-id 12
+
+Pillow szükséges hozzá (pip install pillow).
+"""
+
+import hashlib
+import os
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+BUCKET = 'photos'
+PREFIX = 'missing_persons'
+# változat -> a hosszabbik oldal maximuma pixelben
+VARIANTS = {'thumb': 256, 'medium': 1024, 'full': 2048}
+QUALITY = {'thumb': 70, 'medium': 80, 'full': 85}
+MAX_UPLOADS = 4
+
+
+class StorageError(Exception):
+    pass
+
+
+# --- Előfeldolgozás (process pool) -------------------------------------------
+
+def source_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def object_path(digest, variant):
+    return f'{PREFIX}/{digest[:2]}/{digest}-{variant}.webp'
+
+
+def preprocess(data, variants=VARIANTS, quality=QUALITY):
+    """Process pool worker: {változat: webp bájtok}. EXIF szerinti forgatás,
+    metaadatok nélkül; kisebb képet nem nagyítunk."""
+    import io
+
+    from PIL import Image, ImageOps
+
+    with Image.open(io.BytesIO(data)) as image:
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if 'transparency' in image.info or image.mode.endswith('A') else 'RGB')
+        result = {}
+        for variant, max_side in variants.items():
+            resized = image.copy()
+            resized.thumbnail((max_side, max_side), Image.LANCZOS)
+            out = io.BytesIO()
+            # Az exif/icc nem kerül át: a save csak a megadott metaadatot írja
+            resized.save(out, 'WEBP', quality=quality[variant], method=6)
+            result[variant] = out.getvalue()
+    return result
+
+
+# --- Tárolók -----------------------------------------------------------------
+
+class LocalStorage:
+    """Supabase Storage helyettesítő egy helyi mappában, teszteléshez."""
+
+    def __init__(self, root, bucket=BUCKET, base_url=None):
+        self.root = root
+        self.bucket = bucket
+        self.base_url = base_url or 'file://' + os.path.abspath(root)
+
+    def _path(self, path):
+        return os.path.join(self.root, self.bucket, *path.split('/'))
+
+    def exists(self, path):
+        return os.path.exists(self._path(path))
+
+    def upload(self, path, data, content_type):
+        full_path = self._path(path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        tmp_path = f'{full_path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, full_path)
+
+    def public_url(self, path):
+        return f'{self.base_url}/{self.bucket}/{path}'
+
+
+class SupabaseStorage:
+    """A Supabase Storage REST API (storage/v1) minimális kliense."""
+
+    def __init__(self, url, key, bucket=BUCKET, timeout=30):
+        self.url = url.rstrip('/')
+        self.key = key
+        self.bucket = bucket
+        self.timeout = timeout
+
+    def _request(self, method, path, data=None, headers=None):
+        request = urllib.request.Request(
+            f'{self.url}/storage/v1/object/{self.bucket}/{urllib.parse.quote(path)}',
+            data=data, method=method,
+            headers={'Authorization': f'Bearer {self.key}', 'apikey': self.key, **(headers or {})})
+        return urllib.request.urlopen(request, timeout=self.timeout)
+
+    def exists(self, path):
+        try:
+            with self._request('HEAD', path):
+                return True
+        except urllib.error.HTTPError as error:
+            if error.code in (400, 404):
+                return False
+            raise StorageError(f"HEAD {path}: {error.code}") from error
+
+    def upload(self, path, data, content_type):
+        try:
+            with self._request('POST', path, data, {'Content-Type': content_type, 'x-upsert': 'false',
+                                                    'Cache-Control': 'max-age=31536000'}):
+                pass
+        except urllib.error.HTTPError as error:
+            # Már létezik (párhuzamos feltöltés): a tartalom-hash miatt ugyanaz
+            if error.code == 409 or (error.code == 400 and b'Duplicate' in error.read()):
+                return
+            raise StorageError(f"Feltöltés {path}: {error.code}") from error
+
+    def public_url(self, path):
+        return f'{self.url}/storage/v1/object/public/{self.bucket}/{urllib.parse.quote(path)}'
+
+
+def storage_from_env():
+    url = os.environ.get('SUPABASE_URL')
+    key = os.environ.get('SUPABASE_SERVICE_KEY')
+    if not url or not key:
+        raise StorageError("SUPABASE_URL és SUPABASE_SERVICE_KEY kell (vagy --local MAPPA)")
+    return SupabaseStorage(url, key)
+
+
+# --- Ingest --------------------------------------------------------------------
+
+def _upload_if_missing(storage, path, data):
+    if storage.exists(path):
+        return False
+    storage.upload(path, data, 'image/webp')
+    return True
+
+
+def ingest(paths, storage, max_workers=None, max_uploads=MAX_UPLOADS):
+    """Fájlok feldolgozása és feltöltése.
+
+    Visszatérés: {forrás útvonal: {'hash', 'urls': {változat: url},
+    'uploaded': [...], 'skipped': [...], 'bytes': (eredeti, full webp)}}
+    """
+    sources = {}
+    for path in paths:
+        with open(path, 'rb') as f:
+            data = f.read()
+        sources[path] = (source_hash(data), data)
+
+    results = {}
+    # Egy fotó többször is szerepelhet a listában: csak egyszer dolgozzuk fel
+    pending = {}
+    with ThreadPoolExecutor(max_workers=max_uploads) as uploads:
+        for path, (digest, _) in sources.items():
+            results[path] = {'hash': digest, 'urls': {variant: storage.public_url(object_path(digest, variant))
+                                                      for variant in VARIANTS},
+                             'uploaded': [], 'skipped': [], 'bytes': (len(sources[path][1]), None)}
+        # Ha minden változat megvan már, nem is dolgozzuk fel újra a képet
+        present = {digest: all(uploads.map(storage.exists, [object_path(digest, v) for v in VARIANTS]))
+                   for digest, _ in sources.values()}
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            for path, (digest, data) in sources.items():
+                if present[digest]:
+                    results[path]['skipped'] = list(VARIANTS)
+                elif digest in pending:
+                    results[path]['skipped'] = list(VARIANTS)
+                else:
+                    pending[digest] = (path, pool.submit(preprocess, data))
+            upload_futures = []
+            for digest, (path, future) in pending.items():
+                for variant, data in future.result().items():
+                    upload_futures.append((path, variant, len(data), uploads.submit(
+                        _upload_if_missing, storage, object_path(digest, variant), data)))
+        for path, variant, size, future in upload_futures:
+            result = results[path]
+            result['uploaded' if future.result() else 'skipped'].append(variant)
+            if variant == 'full':
+                result['bytes'] = (result['bytes'][0], size)
+    return results
+
+
+def set_person_photo(person_id, photo_url, client=None):
+    """A missing_persons.photo_url frissítése PostgREST-en át."""
+    from rescue_data import DataClient
+
+    client = client or DataClient.from_env()
+    client.table('missing_persons').update({'photo_url': photo_url}).eq('id', person_id).execute()
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Eltűnt személyek fotóinak feltöltése WebP változatokkal')
+    parser.add_argument('paths', nargs='+')
+    parser.add_argument('--local', help='helyi mappa a Supabase Storage helyett')
+    parser.add_argument('--person-id', help='a missing_persons sor, amelynek photo_url-je a medium változat lesz')
+    parser.add_argument('--uploads', type=int, default=MAX_UPLOADS, help='párhuzamos feltöltések száma')
+    args = parser.parse_args(argv)
+
+    storage = LocalStorage(args.local) if args.local else storage_from_env()
+    results = ingest(args.paths, storage, max_uploads=args.uploads)
+    for path, result in results.items():
+        original, full = result['bytes']
+        size = f"{original} B -> {full} B (full)" if full else f"{original} B, már feltöltve"
+        print(f"{path}: {size}, feltöltve: {len(result['uploaded'])}, kihagyva: {len(result['skipped'])}")
+        print(f"  {result['urls']['medium']}")
+    if args.person_id:
+        if len(results) != 1:
+            parser.error('--person-id csak egy fotóval használható')
+        set_person_photo(args.person_id, next(iter(results.values()))['urls']['medium'])
+
+
+if __name__ == '__main__':
+    main()
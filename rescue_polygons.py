@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+A polygons.coordinates mező normalizálása tömör, kanonikus alakra.
+
+A coordinates szabad szöveg ([[lng, lat], ...] JSON, néha szóközökkel,
+sortörésekkel, vagy JSON-nak nem is érvényes formában). A kliens minden
+betöltéskor szóköz-törlést és JSON.parse-t futtat rá, hiba esetén regexszel
+próbálja kibányászni a számpárokat.
+
+Ez az eszköz soronként végigmegy a poligonokon, és mindegyikhez kiszámolja:
+
+  - coordinates_polyline: encoded polyline (lat, lng sorrend, 1e-6 fok
+    pontosság, ~0.1 m; a záró ismétlődő pont nélkül),
+  - bbox_min_lng, bbox_min_lat, bbox_max_lng, bbox_max_lat.
+
+A kliens (src/polyline.js) regex nélkül, egy menetben dekódolja. A nem
+értelmezhető sorokat a jelentés felsorolja; a regexes tartalékkal olvasható
+sorokat is külön jelzi, mert azoknál adatvesztés lehet (pl. egész számok).
+
+A séma: rescue-admin/supabase/migrations/*_polygons_coordinates_polyline.sql
+
+    python rescue_polygons.py migrate --dry-run            # SUPABASE_URL/SUPABASE_SERVICE_KEY
+    python rescue_polygons.py migrate --input polygons.json --output frissites.jsonl
+    python rescue_polygons.py bench --count 10000
+"""
+
+import json
+import math
+import os
+import re
+
+import numpy as np
+
+PRECISION = 6
+_WHITESPACE = re.compile(r'\s+')
+_PAIR = re.compile(r'\[[^\]]+\]')
+_NUMBER = re.compile(r'-?\d+\.\d+')
+
+
+class PolygonError(ValueError):
+    pass
+
+
+# --- Értelmezés ----------------------------------------------------------------
+
+def parse_coordinates(value):
+    """(gyűrű [[lng, lat]] float64 tömb, mód). A mód 'json' vagy 'fallback'
+    (a kliens regexes tartaléka); értelmezhetetlen érték esetén PolygonError."""
+    if value is None or value == '':
+        raise PolygonError('üres coordinates')
+    mode = 'json'
+    if isinstance(value, str):
+        try:
+            value = json.loads(_WHITESPACE.sub('', value))
+        except ValueError:
+            mode = 'fallback'
+            value = [[float(n) for n in _NUMBER.findall(pair)] for pair in _PAIR.findall(value)]
+            value = [pair for pair in value if len(pair) == 2]
+    try:
+        ring = np.asarray(value, dtype=np.float64)
+    except (TypeError, ValueError):
+        raise PolygonError('nem számpárok listája') from None
+    if ring.ndim != 2 or ring.shape[1] != 2:
+        raise PolygonError(f'nem [[lng, lat], ...] alakú ({ring.shape})')
+    return ring, mode
+
+
+def validate_ring(ring):
+    """Kanonikus gyűrű: véges számok, érvényes tartomány, záró pont nélkül,
+    legalább 3 különböző csúcs."""
+    if not np.isfinite(ring).all():
+        raise PolygonError('nem véges koordináta')
+    if (np.abs(ring[:, 0]) > 180).any() or (np.abs(ring[:, 1]) > 90).any():
+        raise PolygonError('tartományon kívüli koordináta (lng, lat sorrend?)')
+    if len(ring) > 1 and (ring[0] == ring[-1]).all():
+        ring = ring[:-1]
+    if len(np.unique(ring, axis=0)) < 3:
+        raise PolygonError(f'kevesebb mint 3 különböző csúcs ({len(ring)})')
+    return ring
+
+
+# --- Encoded polyline ------------------------------------------------------------
+
+def encode_polyline(lat, lng, precision=PRECISION):
+    """Google encoded polyline (lat, lng párok), vektorosan."""
+    scale = 10 ** precision
+    values = np.empty(2 * len(lat), dtype=np.int64)
+    values[0::2] = np.round(np.asarray(lat, dtype=np.float64) * scale)
+    values[1::2] = np.round(np.asarray(lng, dtype=np.float64) * scale)
+    deltas = values.copy()
+    deltas[2:] -= values[:-2]
+    zigzag = np.where(deltas < 0, ~(deltas << 1), deltas << 1)
+    # Értékenként legfeljebb 7 db 5 bites csoport (a 180° * 1e6 * 2 is belefér)
+    shifts = np.arange(7) * 5
+    rest = zigzag[:, None] >> shifts[None, :]
+    used = rest > 0
+    used[:, 0] = True
+    more = np.zeros_like(used)
+    more[:, :-1] = used[:, 1:]
+    chars = ((rest & 31) | np.where(more, 0x20, 0)) + 63
+    return chars[used].astype(np.uint8).tobytes().decode('ascii')
+
+
+def decode_polyline(text, precision=PRECISION):
+    """(lat, lng) float64 tömbök; a kliens src/polyline.js párja."""
+    values = []
+    result = shift = 0
+    for char in text.encode('ascii'):
+        byte = char - 63
+        if byte < 0:
+            raise PolygonError('hibás polyline')
+        result |= (byte & 31) << shift
+        shift += 5
+        if byte < 32:
+            values.append(~(result >> 1) if result & 1 else result >> 1)
+            result = shift = 0
+    if shift or len(values) % 2:
+        raise PolygonError('csonka polyline')
+    deltas = np.array(values, dtype=np.int64).reshape(-1, 2)
+    points = np.cumsum(deltas, axis=0) / 10 ** precision
+    return points[:, 0], points[:, 1]
+
+
+# --- Normalizálás ----------------------------------------------------------------
+
+def normalize_row(row):
+    """Egy polygons sorból a frissítendő mezők (PolygonError, ha nem megy)."""
+    ring, mode = parse_coordinates(row.get('coordinates'))
+    ring = validate_ring(ring)
+    lng, lat = ring[:, 0], ring[:, 1]
+    return {
+        'id': row['id'],
+        'coordinates_polyline': encode_polyline(lat, lng),
+        'bbox_min_lng': float(lng.min()), 'bbox_min_lat': float(lat.min()),
+        'bbox_max_lng': float(lng.max()), 'bbox_max_lat': float(lat.max()),
+    }, mode
+
+
+def normalize_rows(rows):
+    """Generátor: (sor, frissítés vagy None, mód vagy hibaüzenet) soronként."""
+    for row in rows:
+        try:
+            update, mode = normalize_row(row)
+        except PolygonError as error:
+            yield row, None, str(error)
+        else:
+            yield row, update, mode
+
+
+def fetch_polygons(client, batch=1000):
+    """Az összes polygons sor id szerinti kulcsos lapozással (nem offsettel)."""
+    return client.table('polygons').select('id,coordinates').pages(batch)
+
+
+def migrate(rows, apply=None, max_workers=8):
+    """Normalizálás + opcionális mentés; `apply(update)` szálkészleten fut."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    report = {'total': 0, 'json': 0, 'fallback': [], 'invalid': [], 'bytes_before': 0, 'bytes_after': 0}
+    futures = []
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for row, update, mode in normalize_rows(rows):
+            report['total'] += 1
+            if update is None:
+                report['invalid'].append((row.get('id'), mode))
+                continue
+            if mode == 'fallback':
+                report['fallback'].append(row['id'])
+            else:
+                report['json'] += 1
+            report['bytes_before'] += len(str(row['coordinates']).encode('utf-8'))
+            report['bytes_after'] += len(update['coordinates_polyline']) + 4 * 8
+            if apply is not None:
+                futures.append(pool.submit(apply, update))
+        for future in futures:
+            future.result()
+    return report
+
+
+def print_report(report, limit=20):
+    valid = report['json'] + len(report['fallback'])
+    print(f"Poligonok: {report['total']}, rendben: {report['json']}, "
+          f"csak regexszel: {len(report['fallback'])}, hibás: {len(report['invalid'])}")
+    if valid:
+        print(f"Átlagos méret: {report['bytes_before'] / valid:.0f} B -> {report['bytes_after'] / valid:.0f} B "
+              f"(polyline + 4 bbox szám)")
+    for row_id in report['fallback'][:limit]:
+        print(f"  [regex] id={row_id}: ellenőrizd, a tartalék elhagyhat számokat")
+    for row_id, message in report['invalid'][:limit]:
+        print(f"  [hiba]  id={row_id}: {message}")
+    hidden = max(len(report['fallback']) - limit, 0) + max(len(report['invalid']) - limit, 0)
+    if hidden:
+        print(f"  ... és még {hidden} sor")
+
+
+# --- Benchmark ---------------------------------------------------------------
+
+_JS_BENCH = r'''
+const fs = require('fs');
+const { texts, polylines } = JSON.parse(fs.readFileSync(0, 'utf8'));
+const PRECISION = 1e6;
+const decodePolyline = DECODER;
+const parseOld = (text) => {
+  try { return JSON.parse(text.trim().replace(/\s+/g, '')); }
+  catch (e) {
+    const pairs = text.match(/\[[^\]]+\]/g) || [];
+    return pairs.map(p => { const n = p.match(/-?\d+\.\d+/g); return n && n.length === 2 ? [parseFloat(n[0]), parseFloat(n[1])] : null; }).filter(Boolean);
+  }
+};
+const time = (fn, items) => {
+  let best = Infinity;
+  for (let r = 0; r < 5; r++) {
+    const t0 = process.hrtime.bigint();
+    for (const item of items) fn(item);
+    best = Math.min(best, Number(process.hrtime.bigint() - t0) / 1e6);
+  }
+  return best;
+};
+console.log(JSON.stringify({ before: time(parseOld, texts), after: time(decodePolyline, polylines) }));
+'''
+
+
+def synthetic_polygons(count, seed=1):
+    """Kézzel rajzolt jellegű szektorok, vegyes formázással (tördelve,
+    szóközökkel, néhány hibás JSON-nal)."""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for i in range(count):
+        n = int(rng.integers(4, 40))
+        angle = np.sort(rng.uniform(0, 2 * math.pi, n))
+        radius = rng.uniform(0.002, 0.01) * rng.uniform(0.6, 1.0, n)
+        lat0, lng0 = 47.8 + rng.random() * 0.3, 20.2 + rng.random() * 0.4
+        ring = [[round(lng0 + r * math.cos(a) * 1.5, 14), round(lat0 + r * math.sin(a), 14)]
+                for r, a in zip(radius, angle)]
+        ring.append(ring[0])
+        style = i % 10
+        if style < 5:
+            text = json.dumps(ring)
+        elif style < 9:
+            text = json.dumps(ring, indent=2)
+        else:
+            # Hibás JSON (záró vessző): csak a regexes tartalék olvassa
+            text = json.dumps(ring)[:-1] + ',]'
+        rows.append({'id': i, 'coordinates': text})
+    return rows
+
+
+def bench(count=10000):
+    import shutil
+    import subprocess
+    import time
+
+    rows = synthetic_polygons(count)
+    texts = [row['coordinates'] for row in rows]
+
+    def old_parse(text):
+        try:
+            return json.loads(_WHITESPACE.sub('', text.strip()))
+        except ValueError:
+            return [[float(n) for n in _NUMBER.findall(p)] for p in _PAIR.findall(text)]
+
+    started = time.perf_counter()
+    report = migrate(rows)
+    migrate_ms = (time.perf_counter() - started) * 1000
+    polylines = [normalize_row(row)[0]['coordinates_polyline'] for row in rows]
+
+    started = time.perf_counter()
+    for text in texts:
+        old_parse(text)
+    before_ms = (time.perf_counter() - started) * 1000
+    started = time.perf_counter()
+    for text in polylines:
+        decode_polyline(text)
+    after_ms = (time.perf_counter() - started) * 1000
+
+    print_report(report, limit=0)
+    print(f"Normalizálás: {migrate_ms:.0f} ms / {count}")
+    print(f"Python értelmezés {count} poligon: előtte {before_ms:.0f} ms, utána {after_ms:.0f} ms")
+
+    node = shutil.which('node')
+    if node:
+        decoder = _js_decoder()
+        result = subprocess.run([node, '-e', _JS_BENCH.replace('DECODER', decoder)],
+                                input=json.dumps({'texts': texts, 'polylines': polylines}),
+                                capture_output=True, text=True, check=True)
+        js = json.loads(result.stdout)
+        print(f"Kliens (node) {count} poligon: előtte {js['before']:.1f} ms, utána {js['after']:.1f} ms")
+
+
+def _js_decoder():
+    """A src/polyline.js decodePolyline függvénye a benchmarkhoz."""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'rescue-admin', 'src', 'polyline.js')
+    with open(path, encoding='utf-8') as f:
+        source = f.read()
+    body = source[source.index('export const decodePolyline = ') + len('export const decodePolyline = '):]
+    return '(' + body[:body.index('\n};') + 2] + ')'
+
+
+def main(argv=None):
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description='polygons.coordinates normalizálás')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p_migrate = sub.add_parser('migrate')
+    p_migrate.add_argument('--input', help='JSON tömb vagy JSONL (id, coordinates); alapból Supabase')
+    p_migrate.add_argument('--output', help='a frissítések JSONL-ben (a Supabase helyett)')
+    p_migrate.add_argument('--dry-run', action='store_true', help='csak jelentés, nem ír')
+    p_bench = sub.add_parser('bench')
+    p_bench.add_argument('--count', type=int, default=10000)
+    args = parser.parse_args(argv)
+
+    if args.command == 'bench':
+        bench(args.count)
+        return
+
+    url, key = os.environ.get('SUPABASE_URL'), os.environ.get('SUPABASE_SERVICE_KEY')
+    client = None
+    if url and key:
+        from rescue_data import DataClient
+
+        client = DataClient(url, key)
+    if args.input:
+        with open(args.input, encoding='utf-8') as f:
+            text = f.read()
+        rows = json.loads(text) if text.lstrip().startswith('[') else \
+            [json.loads(line) for line in text.splitlines() if line.strip()]
+    elif client:
+        rows = fetch_polygons(client)
+    else:
+        parser.error('--input kell, vagy SUPABASE_URL és SUPABASE_SERVICE_KEY')
+
+    output = None
+    apply = None
+    if args.dry_run:
+        pass
+    elif args.output:
+        output = open(args.output, 'w', encoding='utf-8')
+        apply = lambda update: output.write(json.dumps(update) + '\n')  # noqa: E731
+    elif client:
+        def apply(update):
+            fields = {k: v for k, v in update.items() if k != 'id'}
+            client.table('polygons').update(fields).eq('id', update['id']).execute()
+    try:
+        # A fájlba írás nem szálbiztos: ott egy szálon megy
+        report = migrate(rows, apply, max_workers=1 if output else 8)
+    finally:
+        if output:
+            output.close()
+    print_report(report)
+    sys.exit(1 if report['invalid'] else 0)
+
+
+if __name__ == '__main__':
+    main()
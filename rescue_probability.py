@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Valószínűségi zónák (missing_persons.prob_zones) raszterizálása, POA és POS.
+
+A prob_zones kézzel szerkesztett JSON: {zone25, zone50, zone75, zone95}, mind
+[{lat, lng}, ...] poligon. A zónák egymásba ágyazottak: a zone50 a
+valószínűség 50%-át tartalmazza (benne a zone25 25%-ával), és így tovább; a
+zone95-ön kívülre 5% esik (erre nincs rács).
+
+Egy esemény összes eltűnt személyének zónái egy közös rácsra kerülnek
+(alapból 10 m). Sávonként (zone50 \\ zone25, ...) a sáv valószínűsége
+egyenletesen oszlik el a cellákon: ez a cellák POA-ja (probability of area).
+A lefedettségi rácsból (rescue_coverage) cellánként a lefedett hányad jön,
+ebből POD = pod × hányad, és POS = POA × POD (probability of success).
+
+A rács a lefedettségi rács vetületét és cellahatárait használja, így a
+lefedettség egy blokkátlag, nem kell pontonként mintavételezni. A poligonokat
+soronkénti páros–páratlan kitöltés raszterizálja (élek × sorok, nem élek ×
+cellák).
+
+    python rescue_probability.py bench --area 50 --cell 10
+"""
+
+import json
+import math
+
+import numpy as np
+
+from rescue_coverage import CoverageGrid
+
+ZONE_KEYS = ('zone25', 'zone50', 'zone75', 'zone95')
+ZONE_PROBABILITY = {'zone25': 0.25, 'zone50': 0.50, 'zone75': 0.75, 'zone95': 0.95}
+DEFAULT_CELL_SIZE = 10.0  # méter
+# Egyszer átkutatott cella észlelési valószínűsége (1 - e^-1: egységnyi lefedettség)
+DEFAULT_POD = 1 - math.exp(-1)
+# A kliens ellenőrzésével egyezően
+MAX_ZONE_AREA_KM2 = 100
+
+
+class ProbZoneError(ValueError):
+    pass
+
+
+def parse_prob_zones(value):
+    """prob_zones (JSON szöveg vagy dict) -> {zóna: [[lat, lng], ...] tömb}.
+    Ugyanazt ellenőrzi, mint a SearchManager mentése: legalább 3 pont,
+    szám koordináták tartományon belül, legfeljebb 100 km² terület."""
+    if not value:
+        return {}
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError as error:
+            raise ProbZoneError(f'nem JSON: {error}') from None
+    if not isinstance(value, dict):
+        raise ProbZoneError('a prob_zones nem objektum')
+    zones = {}
+    for key in ZONE_KEYS:
+        zone = value.get(key)
+        if zone is None:
+            continue
+        if not isinstance(zone, list) or len(zone) < 3:
+            raise ProbZoneError(f'{key}: legalább 3 pont kell')
+        try:
+            ring = np.array([[point['lat'], point['lng']] for point in zone], dtype=np.float64)
+        except (TypeError, KeyError, ValueError):
+            raise ProbZoneError(f'{key}: a pontok {{lat, lng}} alakúak legyenek') from None
+        if not np.isfinite(ring).all() or (np.abs(ring[:, 0]) > 90).any() or (np.abs(ring[:, 1]) > 180).any():
+            raise ProbZoneError(f'{key}: érvénytelen koordináta')
+        lat, lng = ring[:, 0], ring[:, 1]
+        area = abs(np.dot(lng, np.roll(lat, -1)) - np.dot(lat, np.roll(lng, -1))) / 2 * 111.32 ** 2
+        if area > MAX_ZONE_AREA_KM2:
+            raise ProbZoneError(f'{key}: túl nagy terület ({area:.0f} km², max {MAX_ZONE_AREA_KM2})')
+        zones[key] = ring
+    return zones
+
+
+class ProbabilityGrid:
+    """Közös rács az esemény zónáira. A cella `factor` × `factor` lefedettségi
+    cellából áll; a (0, 0) cella bal alsó lefedettségi cellája (ix0, iy0)."""
+
+    def __init__(self, frame, ix0, iy0, factor, cols, rows):
+        self.frame = frame
+        self.ix0 = ix0
+        self.iy0 = iy0
+        self.factor = factor
+        self.cols = cols
+        self.rows = rows
+
+    @property
+    def cell_size(self):
+        return self.frame.cell_size * self.factor
+
+    @classmethod
+    def covering(cls, rings, cell_size=DEFAULT_CELL_SIZE, coverage=None, margin=1):
+        """A gyűrűket (és egy cella peremet) lefedő rács; ha van lefedettségi
+        rács, annak vetületében és cellahatárain."""
+        points = np.concatenate(rings)
+        if coverage is None:
+            frame = CoverageGrid(float(points[:, 0].mean()), float(points[:, 1].mean()), cell_size=cell_size)
+        else:
+            frame = coverage
+        factor = max(1, int(round(cell_size / frame.cell_size)))
+        x, y = frame.to_grid(points[:, 0], points[:, 1])
+        ix0 = (math.floor(x.min() + 0.5) // factor - margin) * factor
+        iy0 = (math.floor(y.min() + 0.5) // factor - margin) * factor
+        cols = (math.floor(x.max() + 0.5) - ix0) // factor + 1 + margin
+        rows = (math.floor(y.max() + 0.5) - iy0) // factor + 1 + margin
+        return cls(frame, ix0, iy0, factor, cols, rows)
+
+    def to_cells(self, lat, lng):
+        """Fokból rács egységbe: a (c, r) cella középpontja (c, r)."""
+        x, y = self.frame.to_grid(lat, lng)
+        return (x - self.ix0 + 0.5) / self.factor - 0.5, (y - self.iy0 + 0.5) / self.factor - 0.5
+
+    def rasterize(self, ring):
+        """[[lat, lng]] gyűrű -> bool maszk (sor, oszlop); a cella akkor
+        tartozik bele, ha a középpontja benne van."""
+        u, v = self.to_cells(ring[:, 0], ring[:, 1])
+        u1, v1, u2, v2 = u, v, np.roll(u, -1), np.roll(v, -1)
+        row_min = max(int(math.ceil(v.min())), 0)
+        row_max = min(int(math.floor(v.max())), self.rows - 1)
+        mask = np.zeros((self.rows, self.cols), dtype=bool)
+        if row_min > row_max:
+            return mask
+        rows = np.arange(row_min, row_max + 1, dtype=np.float64)[:, None]
+        crosses = (v1 > rows) != (v2 > rows)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            at = u1 + (rows - v1) * (u2 - u1) / (v2 - v1)
+        row_index, edge_index = np.nonzero(crosses)
+        # A metszéstől jobbra eső első cellaközéppont; a paritás soronként összegezve
+        column = np.clip(np.floor(at[row_index, edge_index]).astype(np.int64) + 1, 0, self.cols)
+        toggles = np.zeros((row_max - row_min + 1, self.cols + 1), dtype=np.int32)
+        np.add.at(toggles, (row_index, column), 1)
+        mask[row_min:row_max + 1] = (np.cumsum(toggles, axis=1)[:, :self.cols] & 1).astype(bool)
+        return mask
+
+    def coverage_fraction(self, coverage):
+        """Cellánként a lefedett lefedettségi cellák aránya (0..1, float32)."""
+        if coverage is None:
+            return np.zeros((self.rows, self.cols), dtype=np.float32)
+        if coverage is not self.frame:
+            raise ValueError('a lefedettségi rácsnak a rács vetületének kell lennie (ProbabilityGrid.covering)')
+        factor = self.factor
+        dense = coverage.dense(self.ix0, self.iy0, self.cols * factor, self.rows * factor)
+        blocks = dense.reshape(self.rows, factor, self.cols, factor)
+        return blocks.sum(axis=(1, 3), dtype=np.float32) / (factor * factor)
+
+
+def person_poa(grid, zones):
+    """Egy személy POA rácsa és a sávok maszkjai. A hiányzó zóna sávja a
+    következővel összeolvad; a nem egymásba ágyazott zónáknál a sáv az előző
+    zónák uniója nélküli rész."""
+    poa = np.zeros((grid.rows, grid.cols), dtype=np.float64)
+    bands = []
+    covered = np.zeros((grid.rows, grid.cols), dtype=bool)
+    previous = 0.0
+    for key in ZONE_KEYS:
+        if key not in zones:
+            continue
+        mask = grid.rasterize(zones[key])
+        band = mask & ~covered
+        covered |= mask
+        mass = ZONE_PROBABILITY[key] - previous
+        cells = int(band.sum())
+        if cells:
+            poa[band] = mass / cells
+            previous = ZONE_PROBABILITY[key]
+        bands.append((key, band, mass if cells else 0.0))
+    return poa, bands
+
+
+def compute_event(persons, coverage=None, cell_size=DEFAULT_CELL_SIZE, pod=DEFAULT_POD):
+    """Az esemény eltűnt személyeinek ({id, prob_zones}) POA/POS számítása.
+
+    Visszatérés: {'grid', 'poa', 'pos', 'persons': {id: {'zones': {zóna:
+    {area_km2, poa, pos, coverage, poa_after}}, 'pos', 'outside'}},
+    'errors': {id: üzenet}}. A poa_after a sikertelen keresés utáni
+    (Bayes) frissített POA."""
+    parsed, errors = {}, {}
+    for person in persons:
+        try:
+            zones = parse_prob_zones(person.get('prob_zones'))
+        except ProbZoneError as error:
+            errors[person.get('id')] = str(error)
+            continue
+        if zones:
+            parsed[person['id']] = zones
+    if not parsed:
+        return {'grid': None, 'poa': None, 'pos': None, 'persons': {}, 'errors': errors}
+
+    grid = ProbabilityGrid.covering([ring for zones in parsed.values() for ring in zones.values()],
+                                    cell_size, coverage)
+    pod_grid = pod * grid.coverage_fraction(coverage)
+    cell_km2 = (grid.cell_size / 1000) ** 2
+    event_poa = np.zeros((grid.rows, grid.cols), dtype=np.float64)
+    results = {}
+    for person_id, zones in parsed.items():
+        poa, bands = person_poa(grid, zones)
+        event_poa += poa
+        pos = poa * pod_grid
+        total_pos = float(pos.sum())
+        zone_stats = {}
+        for key, band, mass in bands:
+            band_pos = float(pos[band].sum())
+            zone_stats[key] = {
+                'area_km2': round(int(band.sum()) * cell_km2, 3),
+                'poa': round(mass, 4),
+                'pos': round(band_pos, 4),
+                'coverage': round(float(pod_grid[band].mean() / pod) if band.any() and pod else 0.0, 4),
+                'poa_after': round((mass - band_pos) / (1 - total_pos), 4) if total_pos < 1 else 0.0,
+            }
+        outside = 1 - sum(mass for _, _, mass in bands)
+        results[person_id] = {'zones': zone_stats, 'pos': round(total_pos, 4), 'outside': round(outside, 4),
+                              'outside_after': round(outside / (1 - total_pos), 4) if total_pos < 1 else 0.0}
+    # Több eltűnt személynél a rács POA-ja a személyek átlaga
+    event_poa /= len(parsed)
+    return {'grid': grid, 'poa': event_poa, 'pos': event_poa * pod_grid, 'persons': results, 'errors': errors}
+
+
+def synthetic_zones(lat0, lng0, radius_m, seed=1, vertices=64):
+    """Egymásba ágyazott, szabálytalan zónák egy pont körül."""
+    rng = np.random.default_rng(seed)
+    angle = np.linspace(0, 2 * math.pi, vertices, endpoint=False)
+    wobble = rng.uniform(0.8, 1.2, vertices)
+    zones = {}
+    for key, fraction in zip(ZONE_KEYS, (0.25, 0.5, 0.75, 1.0)):
+        r = radius_m * fraction * wobble
+        zones[key] = [{'lat': lat0 + r_i * math.sin(a) / 111_320,
+                       'lng': lng0 + r_i * math.cos(a) / (111_320 * math.cos(math.radians(lat0)))}
+                      for r_i, a in zip(r, angle)]
+    return zones
+
+
+def bench(area_km2=50, cell_size=10, repeat=5):
+    import time
+
+    from rescue_coverage import DEFAULT_CELL_SIZE as COVERAGE_CELL
+
+    lat0, lng0 = 47.9, 20.4
+    # A zone95 nagyjából `area_km2` területű, szabálytalan kör
+    radius = math.sqrt(area_km2 * 1e6 / math.pi) * 1.0
+    persons = [{'id': 1, 'prob_zones': synthetic_zones(lat0, lng0, radius)},
+               {'id': 2, 'prob_zones': synthetic_zones(lat0 + 0.005, lng0 - 0.005, radius * 0.7, seed=2)}]
+    coverage = CoverageGrid(lat0, lng0, cell_size=COVERAGE_CELL)
+    rng = np.random.default_rng(3)
+    # 300 kereső egy órányi nyoma
+    users = np.repeat(np.arange(300), 3600)
+    heading = np.cumsum(rng.normal(0, 0.15, (300, 3600)), axis=1)
+    steps = np.stack((np.sin(heading), np.cos(heading) / math.cos(math.radians(lat0))), axis=-1) * 1.4 / 111_320
+    steps[:, 0] = rng.uniform(-0.03, 0.03, (300, 2))
+    walk = np.cumsum(steps, axis=1).reshape(-1, 2)
+    coverage.add_points(users.astype(str), lat0 + walk[:, 0], lng0 + walk[:, 1],
+                        1_715_000_000_000 + np.tile(np.arange(3600) * 1000, 300))
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = compute_event(persons, coverage, cell_size)
+        timings.append(time.perf_counter() - started)
+    grid = result['grid']
+    print(f"Rács: {grid.cols}×{grid.rows} cella ({grid.cell_size:.0f} m), "
+          f"{grid.cols * grid.rows * (grid.cell_size / 1000) ** 2:.1f} km², 2 személy, "
+          f"lefedett {coverage.covered_area() / 1e6:.1f} km²")
+    print(f"Újraszámolás: legjobb {min(timings) * 1000:.0f} ms, medián {sorted(timings)[repeat // 2] * 1000:.0f} ms")
+    for person_id, stats in result['persons'].items():
+        print(f"  személy {person_id}: POS {stats['pos'] * 100:.1f}%, zónán kívül {stats['outside'] * 100:.0f}%")
+        for key, zone in stats['zones'].items():
+            print(f"    {key}: {zone['area_km2']:.1f} km², POA {zone['poa']:.2f}, POS {zone['pos']:.3f}, "
+                  f"lefedve {zone['coverage'] * 100:.0f}%, új POA {zone['poa_after']:.3f}")
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='prob_zones raszterizálás, POA/POS')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p_bench = sub.add_parser('bench')
+    p_bench.add_argument('--area', type=float, default=50, help='a zone95 területe km²-ben')
+    p_bench.add_argument('--cell', type=float, default=DEFAULT_CELL_SIZE)
+    args = parser.parse_args(argv)
+    if args.command == 'bench':
+        bench(args.area, args.cell)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,791 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+select('*') lekérdezések szűkítése a generátorhoz.
+
+A komponensek többsége `supabase.from(tábla).select('*')`-gal tölti a
+listákat, aztán a sorokból néhány mezőt olvas (user.full_name,
+event.start_time, ...). Ez a lépés komponensenként végigköveti, hová kerül a
+lekérdezés eredménye:
+
+  const { data } = await ...select('*')  ->  setUsers(data || [])
+  users.map(user => ...)  ->  user.full_name, selectUser(user)  ->  ...
+
+(state-ek, .map/.filter/.find/... visszahívások, helyi függvények
+paraméterei, const változók), és a '*' helyére az olvasott oszlopok listáját
+írja. Ha az eredmény olyan helyre kerül, amit nem tudunk követni (prop egy
+gyerek komponensnek, spread, return, ismeretlen függvény, számított index),
+vagy olyan mezőt olvas, ami nem ismert oszlop, a lekérdezés marad, és a
+jelentésben megjelenik az okkal együtt.
+
+Az ismert oszlopok a forrásokból jönnek: insert/update/upsert objektumok
+kulcsai, explicit select listák, .eq/.order/... oszlopnevei (és az id).
+
+Kézi futtatás egy projekt src mappáján, a bájt megtakarítás egy fixture
+adatbázison (alapból szintetikus, vagy --fixture tábla -> sorok JSON):
+    python rescue_projection.py report rescue-admin/src
+    python rescue_projection.py measure rescue-admin/src [--fixture dump.json]
+    python rescue_projection.py apply rescue-admin/src
+"""
+
+import gzip
+import json
+import os
+import re
+import time
+
+SOURCE_EXTENSIONS = ('.js', '.jsx', '.ts', '.tsx')
+BASE_COLUMNS = ('id',)
+# Tömbmetódusok, amelyek visszahívása sorokat kap; az érték: mit ad vissza
+ROW_CALLBACKS = {'map': None, 'forEach': None, 'some': None, 'every': None, 'findIndex': None, 'flatMap': None,
+                 'filter': 'rows', 'sort': 'rows', 'find': 'row'}
+ROW_PASSTHROUGH = ('slice', 'reverse')
+FILTER_METHODS = ('eq', 'neq', 'gt', 'gte', 'lt', 'lte', 'like', 'ilike', 'is', 'in', 'contains', 'order')
+WRITE_METHODS = ('insert', 'update', 'upsert')
+_BENIGN_CALLEES = ('if', 'while', 'switch', 'console.log', 'console.warn', 'console.error', 'console.info',
+                   'console.debug', 'Boolean')
+
+_QUERY_RE = re.compile(r'''\.from\(\s*(['"])(\w+)\1\s*\)\s*\.select\(\s*(['"`])\*\3\s*''')
+_FROM_RE = re.compile(r'''\.from\(\s*(['"])(\w+)\1\s*\)''')
+_BINDING_RE = re.compile(r'(?:const|let|var)\s*\{([^{}]*)\}\s*=\s*await\s*(?:[\w$.]+\s*)?$')
+_STATE_RE = re.compile(r'(?:const|let)\s*\[\s*([A-Za-z_$][\w$]*)\s*,\s*(set[\w$]+)\s*\]\s*=\s*(?:React\.)?useState\b')
+_ARROW_FN_RE = re.compile(r'(?:const|let)\s+([A-Za-z_$][\w$]*)\s*=\s*(?:async\s*)?'
+                          r'(?:\(([^()]*)\)|([A-Za-z_$][\w$]*))\s*=>')
+_FUNCTION_RE = re.compile(r'function\s+([A-Za-z_$][\w$]*)\s*\(([^()]*)\)\s*\{')
+_CALLBACK_RE = re.compile(r'\s*(?:async\s*)?(?:\(([^()]*)\)|([A-Za-z_$][\w$]*))\s*=>'
+                          r'|\s*(?:async\s*)?function\s*[\w$]*\s*\(([^()]*)\)')
+_HOOKS = ('useEffect', 'useLayoutEffect', 'useMemo', 'useCallback')
+_IDENT = r'[A-Za-z_$][\w$]*'
+
+
+# --- Forrás előkészítés --------------------------------------------------------
+
+def _mask(source):
+    """A forrás ugyanolyan hosszú másolata, amelyben a string, template
+    szöveg, regex és komment tartalma szóközre van cserélve (a ${...}
+    kifejezések megmaradnak). Így a zárójelezés és az azonosítók keresése
+    nem akad el szövegben."""
+    out = list(source)
+    length = len(source)
+    stack = []  # nyitott template literálok: a ${ kifejezés zárójel mélysége
+    depth = 0
+    i = 0
+    previous = ''  # az utolsó nem szóköz kód karakter (regex felismeréshez)
+
+    def blank(start, end):
+        for index in range(start, end):
+            if out[index] != '\n':
+                out[index] = ' '
+
+    def template_text(i):
+        # template szöveg a következő `-ig vagy ${-ig
+        start = i
+        while i < length:
+            char = source[i]
+            if char == '\\':
+                i += 2
+                continue
+            if char == '`':
+                blank(start, i)
+                return i + 1, False
+            if char == '$' and i + 1 < length and source[i + 1] == '{':
+                blank(start, i)
+                return i + 2, True
+            i += 1
+        blank(start, length)
+        return length, False
+
+    while i < length:
+        char = source[i]
+        if char == '/' and source.startswith('//', i):
+            end = source.find('\n', i)
+            end = length if end < 0 else end
+            blank(i, end)
+            i = end
+            continue
+        if char == '/' and source.startswith('/*', i):
+            end = source.find('*/', i + 2)
+            end = length if end < 0 else end + 2
+            blank(i, end)
+            i = end
+            continue
+        if char in '\'"' and not (i and (source[i - 1].isalnum() or source[i - 1] == '_')):
+            # a betű utáni aposztróf JSX szöveg (pl. Don't), nem string
+            end = i + 1
+            while end < length and source[end] != char and source[end] != '\n':
+                end += 2 if source[end] == '\\' else 1
+            blank(i + 1, min(end, length))
+            i = end + 1
+            previous = char
+            continue
+        if char == '`':
+            i, opened = template_text(i + 1)
+            if opened:
+                stack.append(depth)
+                depth += 1
+            previous = '`'
+            continue
+        if char == '/' and (previous in '(,=:[!&|?{};' or previous == '') and not source.startswith('/>', i):
+            end = i + 1
+            in_class = False
+            while end < length and source[end] != '\n':
+                if source[end] == '\\':
+                    end += 2
+                    continue
+                if source[end] == '[':
+                    in_class = True
+                elif source[end] == ']':
+                    in_class = False
+                elif source[end] == '/' and not in_class:
+                    break
+                end += 1
+            blank(i + 1, end)
+            i = end + 1
+            previous = '/'
+            continue
+        if char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if stack and depth == stack[-1]:
+                # a ${...} vége: vissza a template szövegbe
+                stack.pop()
+                i, opened = template_text(i + 1)
+                if opened:
+                    stack.append(depth)
+                    depth += 1
+                previous = '`'
+                continue
+        if not char.isspace():
+            previous = char
+        i += 1
+    return ''.join(out)
+
+
+_PAIRS = {'(': ')', '[': ']', '{': '}'}
+
+
+def _match_close(masked, open_index):
+    """Az open_index-en lévő zárójel párja (vagy -1)."""
+    stack = []
+    for index in range(open_index, len(masked)):
+        char = masked[index]
+        if char in _PAIRS:
+            stack.append(_PAIRS[char])
+        elif char in ')]}':
+            if not stack or stack.pop() != char:
+                return -1
+            if not stack:
+                return index
+    return -1
+
+
+def _balanced(masked):
+    stack = []
+    for char in masked:
+        if char in _PAIRS:
+            stack.append(_PAIRS[char])
+        elif char in ')]}':
+            if not stack or stack.pop() != char:
+                return False
+    return not stack
+
+
+def _enclosing_block(masked, pos):
+    """A pos-t tartalmazó legbelső {...} blokk (kezdet, vég)."""
+    depth = 0
+    for index in range(pos - 1, -1, -1):
+        char = masked[index]
+        if char == '}':
+            depth += 1
+        elif char == '{':
+            if depth == 0:
+                return index, _match_close(masked, index)
+            depth -= 1
+    return 0, len(masked)
+
+
+def _innermost_open(masked, pos):
+    depth = 0
+    for index in range(pos - 1, -1, -1):
+        char = masked[index]
+        if char in ')]}':
+            depth += 1
+        elif char in '([{':
+            if depth == 0:
+                return index
+            depth -= 1
+    return None
+
+
+def _in_parameters(masked, pos):
+    """A pos egy arrow függvény paraméter listájában van-e (destrukturálva is)."""
+    bracket = _innermost_open(masked, pos)
+    while bracket is not None and masked[bracket] in '{[':
+        bracket = _innermost_open(masked, bracket)
+    if bracket is None:
+        return False
+    close = _match_close(masked, bracket)
+    return bool(re.match(r'\s*=>', masked[close + 1:])) and \
+        all(masked[index] in '{[' for index in _open_chain(masked, pos, bracket))
+
+
+def _open_chain(masked, pos, stop):
+    index = _innermost_open(masked, pos)
+    while index is not None and index > stop:
+        yield index
+        index = _innermost_open(masked, index)
+
+
+def _enclosing_call(masked, pos):
+    """(nyitó zárójel indexe, argumentum sorszám, hívott név) a pos-t
+    közvetlenül tartalmazó hívásra, vagy None."""
+    depth = 0
+    commas = 0
+    for index in range(pos - 1, -1, -1):
+        char = masked[index]
+        if char in ')]}':
+            depth += 1
+        elif char in '([{':
+            if depth == 0:
+                if char != '(':
+                    return None
+                match = re.search(r'([\w$.]+)\s*$', masked[:index])
+                return index, commas, match.group(1) if match else ''
+            depth -= 1
+        elif char == ',' and depth == 0:
+            commas += 1
+    return None
+
+
+def _split_top(text):
+    """Vessző mentén, csak a legfelső szinten."""
+    parts, depth, start = [], 0, 0
+    for index, char in enumerate(text):
+        if char in '([{':
+            depth += 1
+        elif char in ')]}':
+            depth -= 1
+        elif char == ',' and depth == 0:
+            parts.append(text[start:index])
+            start = index + 1
+    parts.append(text[start:])
+    return [part.strip() for part in parts if part.strip()]
+
+
+def _object_keys(masked, open_index):
+    """Egy {...} literál legfelső szintű kulcsai (a spread-et kihagyja)."""
+    close = _match_close(masked, open_index)
+    keys = []
+    for part in _split_top(masked[open_index + 1:close]):
+        match = re.match(rf'({_IDENT})\s*(?::|$)', part)
+        if match:
+            keys.append(match.group(1))
+    return keys
+
+
+def _line(source, pos):
+    return source.count('\n', 0, pos) + 1
+
+
+# --- Ismert oszlopok -------------------------------------------------------------
+
+def _chain(masked, pos):
+    """A pos utáni .metódus(...) lánc: [(név, nyitó, záró)]."""
+    calls = []
+    while True:
+        match = re.match(rf'\s*\.\s*({_IDENT})\s*\(', masked[pos:])
+        if not match:
+            return calls
+        open_index = pos + match.end() - 1
+        close = _match_close(masked, open_index)
+        if close < 0:
+            return calls
+        calls.append((match.group(1), open_index, close))
+        pos = close + 1
+
+
+def _string_arg(source, masked, open_index):
+    match = re.match(r'''\s*(['"`])''', masked[open_index + 1:])
+    if not match:
+        return None
+    start = open_index + 1 + match.end()
+    end = source.find(match.group(1), start)
+    return source[start:end] if end >= 0 else None
+
+
+def _select_columns(table, text, schema):
+    for item in _split_top(text):
+        embedded = re.match(rf'(?:{_IDENT}\s*:\s*)?({_IDENT})(?:!\w+)?\s*\((.*)\)$', item, re.DOTALL)
+        if embedded:
+            _select_columns(embedded.group(1), embedded.group(2), schema)
+        elif re.fullmatch(_IDENT, item):
+            schema.setdefault(table, set()).add(item)
+
+
+def infer_schema(sources):
+    """Tábla -> ismert oszlopok a forrásokból."""
+    schema = {}
+    for source in sources.values():
+        masked = _mask(source)
+        objects = {match.group(1): match.end() - 1 for match in
+                   re.finditer(rf'(?:const|let)\s+({_IDENT})\s*=\s*\{{', masked)}
+        for match in _FROM_RE.finditer(source):
+            if masked[match.start()] != '.':
+                continue
+            table = match.group(2)
+            columns = schema.setdefault(table, set())
+            columns.update(BASE_COLUMNS)
+            for method, open_index, close in _chain(masked, match.end()):
+                if method == 'select':
+                    text = _string_arg(source, masked, open_index)
+                    if text and text.strip() != '*':
+                        _select_columns(table, text, schema)
+                elif method in FILTER_METHODS:
+                    column = _string_arg(source, masked, open_index)
+                    if column and re.fullmatch(_IDENT, column):
+                        columns.add(column)
+                elif method in WRITE_METHODS:
+                    argument = masked[open_index + 1:close].strip()
+                    if argument.startswith('{'):
+                        columns.update(_object_keys(masked, masked.index('{', open_index)))
+                    elif argument.startswith('['):
+                        inner = masked.index('[', open_index)
+                        for item in re.finditer(r'\{', masked[inner:_match_close(masked, inner)]):
+                            if _enclosing_call(masked, inner + item.start()) is None:
+                                columns.update(_object_keys(masked, inner + item.start()))
+                    elif re.fullmatch(_IDENT, argument) and argument in objects:
+                        columns.update(_object_keys(masked, objects[argument]))
+    return schema
+
+
+# --- Adatfolyam követés ----------------------------------------------------------
+
+class _Trace:
+    """Egy lekérdezés eredményének követése egy fájlon belül."""
+
+    def __init__(self, source, masked, context):
+        self.source = source
+        self.masked = masked
+        self.context = context
+        self.fields = set()
+        self.escapes = []
+        self.visited = set()
+
+    def escape(self, pos, reason):
+        self.escapes.append((_line(self.source, pos), reason))
+
+    def trace(self, name, kind, start, end, skip=()):
+        key = (name, kind, start)
+        if key in self.visited:
+            return
+        self.visited.add(key)
+        masked = self.masked
+        for match in re.finditer(rf'(?:(?<=\.\.\.)|(?<![\w$.])){re.escape(name)}(?![\w$])', masked[start:end]):
+            pos = start + match.start()
+            if any(a <= pos < b for a, b in skip):
+                continue
+            after = masked[pos + len(name):]
+            before = masked[:pos].rstrip()
+            if re.match(r'\s*(=>|=(?![=]))', after) or re.search(r'\b(?:const|let|var)$', before):
+                continue  # új kötés (paraméter, értékadás, attribútum név)
+            if re.match(r'\s*:', after) and before.endswith(('{', ',')):
+                continue  # objektum kulcs
+            if _in_parameters(masked, pos):
+                continue  # egy arrow függvény paraméter listája
+            self.follow(kind, pos, pos + len(name))
+
+    def follow(self, kind, start, end):
+        masked = self.masked
+        rest = masked[end:]
+        member = re.match(rf'\s*\??\.\s*({_IDENT})', rest)
+        if kind == 'row':
+            if member:
+                self.fields.add(member.group(1))
+                return
+            if re.match(r'\s*(?:\?\.)?\[', rest):
+                self.escape(start, 'számított mezőnév')
+                return
+        else:
+            if member:
+                method = member.group(1)
+                paren = end + member.end()
+                if method == 'length':
+                    return
+                if (method in ROW_CALLBACKS or method in ROW_PASSTHROUGH) and re.match(r'\s*\(', masked[paren:]):
+                    open_index = masked.index('(', paren)
+                    close = _match_close(masked, open_index)
+                    if method in ROW_CALLBACKS:
+                        self.callback(open_index, close, 2 if method == 'sort' else 1, kind='row')
+                        result = ROW_CALLBACKS[method]
+                    else:
+                        result = 'rows'
+                    if result:
+                        self.follow(result, start, close + 1)
+                    return
+                self.escape(start, f'.{method}')
+                return
+            if re.match(r'\s*\[', rest):
+                open_index = masked.index('[', end)
+                self.follow('row', start, _match_close(masked, open_index) + 1)
+                return
+        self.consumer(kind, start, end)
+
+    def callback(self, open_index, close, count, kind):
+        """Egy visszahívás első `count` paramétere `kind` (a törzsében)."""
+        masked = self.masked
+        match = _CALLBACK_RE.match(masked[open_index + 1:close])
+        if not match:
+            reference = re.match(rf'\s*({_IDENT})\s*(?:[,)]|$)', masked[open_index + 1:close + 1])
+            function = reference and self.context['functions'].get(reference.group(1))
+            if function:
+                self.parameters(function[0][:count], kind, function[1], function[2])
+            else:
+                self.escape(open_index, 'ismeretlen visszahívás')
+            return
+        params = _split_top(match.group(1) or match.group(2) or match.group(3) or '')
+        self.parameters(params[:count], kind, open_index + 1 + match.end(), close)
+
+    def parameters(self, params, kind, start, end):
+        for param in params:
+            param = param.split('=')[0].strip()
+            if param.startswith('{') and kind == 'row':
+                for part in _split_top(param.strip('{} ')):
+                    if part.startswith('...'):
+                        self.escape(start, 'spread paraméter')
+                    else:
+                        self.fields.add(re.match(_IDENT, part).group(0))
+            elif re.fullmatch(_IDENT, param):
+                self.trace(param, kind, start, end)
+            else:
+                self.escape(start, f'paraméter: {param}')
+
+    def consumer(self, kind, start, end):
+        masked = self.masked
+        fallback = re.match(r'\s*\|\|\s*\[\s*\]', masked[end:])
+        if fallback:
+            end += fallback.end()
+        after = masked[end:]
+        before = masked[:start].rstrip()
+        if re.match(r'\s*(&&|\|\||===|!==|==|!=|\?(?![.?]))', after) or \
+                before.endswith(('!', '===', '!==', '==', '!=', '&&', '||')) and not before.endswith('=>'):
+            return  # feltételként használva
+        bracket = _innermost_open(masked, start)
+        if bracket is not None and masked[bracket] == '[':
+            call = _enclosing_call(masked, bracket)
+            if call and call[2] in _HOOKS:
+                return  # hook függőség lista
+        prop = re.search(rf'<([A-Z][\w$]*)\b[^<]*?\s({_IDENT})\s*=\s*\{{$', before[-2000:])
+        if prop and re.match(r'\s*\}', after):
+            # prop egy ugyanebben a fájlban definiált komponensnek: a
+            # destrukturált paraméterét követjük
+            function = self.context['functions'].get(prop.group(1))
+            if function and function[0] and function[0][0].startswith('{'):
+                for part in _split_top(function[0][0].strip('{} ')):
+                    key, _, alias = part.partition(':')
+                    if key.strip() == prop.group(2):
+                        self.trace((alias or key).split('=')[0].strip(), kind, function[1], function[2])
+                        return
+            self.escape(start, f'<{prop.group(1)} {prop.group(2)}>')
+            return
+        if re.match(r'\s*[,)]', after):
+            call = _enclosing_call(masked, start)
+            if call:
+                open_index, position, callee = call
+                if callee in _BENIGN_CALLEES:
+                    return
+                if callee.endswith('.set') and 'cache' in callee.lower():
+                    return  # a cache-ből ugyanabba a state-be kerül vissza
+                state = self.context['setters'].get(callee)
+                if state and position == 0:
+                    self.state(state, kind)
+                    return
+                function = self.context['functions'].get(callee)
+                if function and position < len(function[0]):
+                    self.parameters([function[0][position]], kind, function[1], function[2])
+                    return
+                self.escape(start, f'{callee}()')
+                return
+        declaration = re.search(rf'(?:const|let|var)\s+({_IDENT})\s*=$', before)
+        if declaration:
+            block_start, block_end = _enclosing_block(masked, start)
+            self.trace(declaration.group(1), kind, end, block_end)
+            return
+        if re.match(r'\s*;', after) and re.search(r'(?:^|[;{}])$', before):
+            return  # önálló kifejezés
+        if before.endswith('...'):
+            self.escape(start, 'spread')
+        elif before.endswith('return') or before.endswith('=>'):
+            self.escape(start, 'visszatérési érték')
+        elif before.endswith('={') or before.endswith('{'):
+            self.escape(start, 'JSX prop / objektum érték')
+        else:
+            self.escape(start, 'nem követhető használat')
+
+    def state(self, name, kind):
+        declaration, setter = self.context['states'][name]
+        self.trace(name, kind, 0, len(self.masked), skip=[declaration])
+        # funkcionális frissítés: setX(prev => ...)
+        for match in re.finditer(rf'(?<![\w$.]){re.escape(setter)}\s*\(', self.masked):
+            open_index = match.end() - 1
+            close = _match_close(self.masked, open_index)
+            if _CALLBACK_RE.match(self.masked[open_index + 1:close]):
+                self.callback(open_index, close, 1, kind)
+
+
+def _file_context(masked):
+    states, setters, functions = {}, {}, {}
+    for match in _STATE_RE.finditer(masked):
+        states[match.group(1)] = (match.span(), match.group(2))
+        setters[match.group(2)] = match.group(1)
+    for match in _ARROW_FN_RE.finditer(masked):
+        params = _split_top(match.group(2) if match.group(2) is not None else match.group(3))
+        body = re.match(r'\s*\{', masked[match.end():])
+        if body:
+            open_index = match.end() + body.end() - 1
+            functions[match.group(1)] = (params, open_index, _match_close(masked, open_index))
+        else:
+            functions[match.group(1)] = (params, match.end(), _enclosing_block(masked, match.start())[1])
+    for match in _FUNCTION_RE.finditer(masked):
+        open_index = match.end() - 1
+        functions[match.group(1)] = (_split_top(match.group(2)), open_index, _match_close(masked, open_index))
+    return {'states': states, 'setters': setters, 'functions': functions}
+
+
+def analyze_source(rel_path, source, schema):
+    """Egy fájl select('*') lekérdezései: [bejegyzés], ahol a bejegyzés
+    path, line, table, span ('*' literál), status ('rewrite' / 'unresolved' /
+    'head'), columns, reasons."""
+    masked = _mask(source)
+    entries = []
+    matches = [match for match in _QUERY_RE.finditer(source) if masked[match.start()] == '.']
+    if not matches:
+        return entries
+    balanced = _balanced(masked)
+    context = _file_context(masked) if balanced else None
+    for match in matches:
+        table = match.group(2)
+        star = match.start(3), match.start(3) + 3
+        entry = {'path': rel_path, 'line': _line(source, match.start()), 'table': table, 'span': star,
+                 'status': 'unresolved', 'columns': None, 'reasons': []}
+        entries.append(entry)
+        if not balanced:
+            entry['reasons'].append('a fájl nem elemezhető (zárójelezés)')
+            continue
+        select_open = masked.rfind('(', 0, match.end())
+        select_close = _match_close(masked, select_open)
+        if re.search(r'head\s*:\s*true', masked[select_open:select_close]):
+            entry['status'] = 'head'
+            continue
+        calls = _chain(masked, select_close + 1)
+        kind = 'row' if any(name in ('single', 'maybeSingle') for name, _, _ in calls) else 'rows'
+        chain_end = calls[-1][2] + 1 if calls else select_close + 1
+        start = masked.rfind('supabase', 0, match.start())
+        binding = _BINDING_RE.search(masked[:start if start >= 0 else match.start()])
+        if not binding:
+            entry['reasons'].append('az eredmény nincs { data } változóba bontva')
+            continue
+        names = dict((part.split(':')[0].strip(), part.split(':')[-1].strip())
+                     for part in _split_top(binding.group(1)))
+        if 'data' not in names:
+            entry['reasons'].append('az eredmény data mezője nincs használva')
+            entry['status'], entry['columns'] = 'rewrite', [column for column in BASE_COLUMNS]
+            continue
+        trace = _Trace(source, masked, context)
+        block_start, block_end = _enclosing_block(masked, match.start())
+        trace.trace(names['data'], kind, chain_end, block_end)
+        known = schema.get(table, set())
+        unknown = sorted(field for field in trace.fields if field not in known)
+        for line, reason in trace.escapes:
+            entry['reasons'].append(f'{line}. sor: {reason}')
+        if unknown:
+            entry['reasons'].append(f"nem ismert oszlop: {', '.join(unknown)}")
+        if entry['reasons']:
+            continue
+        columns = [column for column in BASE_COLUMNS if column in known]
+        columns += sorted(field for field in trace.fields if field not in columns)
+        entry['status'], entry['columns'] = 'rewrite', columns
+    return entries
+
+
+def _text(content):
+    return content.decode('utf-8') if isinstance(content, (bytes, bytearray)) else content
+
+
+def compile_projections(files, schema=None):
+    """A `files` (rel_path -> str/bytes) fából a módosított komponensek
+    szótára és a jelentés. `schema` (tábla -> oszlopok) kiegészíti a
+    forrásokból kikövetkeztetett oszlopokat."""
+    sources = {rel_path: _text(files[rel_path]) for rel_path in files
+               if rel_path.startswith('src/') and rel_path.endswith(SOURCE_EXTENSIONS)}
+    known = infer_schema(sources)
+    for table, columns in (schema or {}).items():
+        known.setdefault(table, set()).update(columns)
+    output, entries = {}, []
+    for rel_path, source in sources.items():
+        file_entries = analyze_source(rel_path, source, known)
+        entries += file_entries
+        rewritten = source
+        for entry in sorted(file_entries, key=lambda entry: -entry['span'][0]):
+            if entry['status'] == 'rewrite':
+                start, end = entry['span']
+                quote = source[start]
+                rewritten = rewritten[:start] + quote + ', '.join(entry['columns']) + quote + rewritten[end:]
+        if rewritten != source:
+            output[rel_path] = rewritten
+    return output, {'queries': entries, 'schema': known}
+
+
+def print_report(report):
+    entries = report['queries']
+    rewritten = [entry for entry in entries if entry['status'] == 'rewrite']
+    print(f"Lekérdezések: {len(rewritten)}/{len(entries)} select('*') szűkítve")
+    for entry in entries:
+        where = f"{entry['path']}:{entry['line']} {entry['table']}"
+        if entry['status'] == 'rewrite':
+            print(f"  {where}: {', '.join(entry['columns'])}")
+        elif entry['status'] == 'head':
+            print(f"  {where}: csak darabszám (head), nincs sor a válaszban")
+        else:
+            print(f"  {where}: marad '*' ({'; '.join(entry['reasons'])})")
+
+
+# --- Mérés -------------------------------------------------------------------
+
+# A szintetikus fixture-ben a kódból ismert oszlopok mellé ezek is kerülnek:
+# a tipikus, listában nem olvasott oszlopok
+FIXTURE_EXTRA = {
+    'users': ('created_at', 'updated_at', 'language', 'last_seen_at'),
+    'search_events': ('description', 'created_at', 'updated_at', 'end_time', 'area'),
+    'missing_persons': ('description', 'created_at', 'updated_at'),
+    'help_content': ('created_at', 'updated_at'),
+    'map_markers': ('created_at', 'user_id', 'description'),
+    'markers': ('created_at', 'user_id', 'description'),
+    'event_participants': ('created_at',),
+}
+
+
+def _fixture_value(column, index, rng):
+    if column == 'id' or column.endswith('_id'):
+        return index if column == 'id' else rng.randint(1, 50)
+    if column.endswith(('_at', '_time')):
+        return f'2026-0{1 + index % 9}-1{index % 9}T0{index % 10}:1{index % 6}:00.000000+00:00'
+    if column in ('lat', 'latitude'):
+        return round(47.4 + rng.random() * 0.2, 6)
+    if column in ('lng', 'longitude'):
+        return round(19.0 + rng.random() * 0.2, 6)
+    if column in ('location', 'lat_lng'):
+        return {'lat': round(47.4 + rng.random() * 0.2, 6), 'lng': round(19.0 + rng.random() * 0.2, 6)}
+    if column in ('prob_zones', 'area', 'coordinates'):
+        return [{'lat': round(47.4 + rng.random() * 0.2, 6), 'lng': round(19.0 + rng.random() * 0.2, 6),
+                 'p': round(rng.random(), 3)} for _ in range(12)]
+    if column.endswith('_url'):
+        return f'https://example.supabase.co/storage/v1/object/public/photos/{index:08x}/medium.webp'
+    if column.startswith('text_') or column == 'description':
+        return ' '.join(rng.choice(('keresés', 'terület', 'csapat', 'jelzés', 'rádió', 'útvonal', 'erdő'))
+                        for _ in range(80 if column.startswith('text_') else 30))
+    if column in ('active', 'pause_status'):
+        return rng.random() < 0.8
+    if column in ('age', 'height_cm'):
+        return rng.randint(5, 190)
+    return f'{column}-{index}'
+
+
+def fixture(schema, rows=200, seed=1):
+    """Szintetikus adatbázis: táblánként `rows` sor az ismert és a
+    FIXTURE_EXTRA oszlopokkal."""
+    import random
+
+    rng = random.Random(seed)
+    tables = {}
+    for table, columns in schema.items():
+        names = sorted(set(columns) | set(FIXTURE_EXTRA.get(table, ())))
+        tables[table] = [{column: _fixture_value(column, index, rng) for column in names}
+                         for index in range(1, rows + 1)]
+    return tables
+
+
+def _read_tree(src_dir):
+    files = {}
+    root_dir = os.path.dirname(os.path.abspath(src_dir))
+    for root, _, names in os.walk(src_dir):
+        for name in names:
+            if name.endswith(SOURCE_EXTENSIONS):
+                full_path = os.path.join(root, name)
+                rel_path = os.path.relpath(full_path, root_dir).replace(os.sep, '/')
+                with open(full_path, encoding='utf-8') as f:
+                    files[rel_path] = f.read()
+    return files
+
+
+def _parse_ms(data, repeat=15):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        json.loads(data)
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000
+
+
+def measure(src_dir, fixture_path=None, rows=200):
+    """Lekérdezésenként a válasz mérete (nyers, gzip) és a JSON feldolgozás
+    ideje '*'-gal és a szűkített oszlopokkal, a fixture sorain (a teljes
+    tábla, ahogy a listák betöltik)."""
+    files = _read_tree(src_dir)
+    _, report = compile_projections(files)
+    if fixture_path:
+        with open(fixture_path, encoding='utf-8') as f:
+            tables = json.load(f)
+    else:
+        tables = fixture(report['schema'], rows)
+    print_report(report)
+    print(f"Fixture: {fixture_path or f'szintetikus, {rows} sor táblánként'}")
+    total_before = total_after = 0
+    for entry in report['queries']:
+        if entry['status'] != 'rewrite' or entry['table'] not in tables:
+            continue
+        rows_before = tables[entry['table']]
+        rows_after = [{column: row.get(column) for column in entry['columns']} for row in rows_before]
+        before = json.dumps(rows_before, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        after = json.dumps(rows_after, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        total_before += len(before)
+        total_after += len(after)
+        print(f"  {entry['path']}:{entry['line']} {entry['table']}: "
+              f"{len(before)} -> {len(after)} B ({len(gzip.compress(before))} -> {len(gzip.compress(after))} B gzip), "
+              f"JSON.parse ~{_parse_ms(before):.2f} -> {_parse_ms(after):.2f} ms")
+    if total_before:
+        print(f"  összesen: {total_before} -> {total_after} B ({100 * (1 - total_after / total_before):.0f}% kevesebb)")
+    return report
+
+
+def apply(src_dir):
+    """A szűkítés beírása egy projekt src mappájába (pl. az élő alkalmazásba)."""
+    files = _read_tree(src_dir)
+    output, report = compile_projections(files)
+    root_dir = os.path.dirname(os.path.abspath(src_dir))
+    for rel_path, content in output.items():
+        with open(os.path.join(root_dir, rel_path), 'w', encoding='utf-8') as f:
+            f.write(content)
+    print_report(report)
+    print(f"{len(output)} fájl módosítva")
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="select('*') lekérdezések szűkítése a használt oszlopokra")
+    parser.add_argument('command', choices=('report', 'measure', 'apply'))
+    parser.add_argument('src_dir')
+    parser.add_argument('--fixture', help='tábla -> sorok JSON (különben szintetikus)')
+    parser.add_argument('--rows', type=int, default=200, help='sorok táblánként a szintetikus fixture-ben')
+    args = parser.parse_args(argv)
+    if args.command == 'report':
+        print_report(compile_projections(_read_tree(args.src_dir))[1])
+    elif args.command == 'measure':
+        measure(args.src_dir, args.fixture, args.rows)
+    else:
+        apply(args.src_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Esemény törlése vagy archiválása szerver oldalon, kötegekben.
+
+A SearchManager deleteEvent eddig a böngészőből törölt táblánként (résztvevők,
+eltűnt személyek, majd markerek, poligonok és gps_tracks egyszerre, végül az
+esemény sora). Egy nagy eseménynél ez milliós gps_tracks törlés egyetlen
+utasításban (statement timeout), sok oda-vissza út, és ha a lap bezárul,
+félig törölt esemény marad.
+
+Most a kliens egyetlen RPC-t hív (request_event_purge), ami feladatot vesz fel
+az event_purge_jobs táblába, és az eseményt azonnal elrejti a listákból. Ez a
+futtató a feladatokat a purge_event_batch tárolt függvénnyel dolgozza fel:
+
+  - hívásonként egy köteg (alapból BATCH sor) egy tranzakcióban, a gyerek
+    táblák előbb (PURGE_ORDER), az esemény sora utoljára,
+  - a haladás (aktuális tábla, táblánként kész/összes sor) a feladat sorában
+    van, így a futtató bármikor leállítható és újraindítható, a következő
+    köteg onnan folytatja,
+  - archiválásnál a sorok ugyanabban a tranzakcióban az archive sémába kerülnek,
+  - a kijelölt (purge_requested_at) eseménybe trigger nem enged új sort, és az
+    esemény sorának törlése előtt a köteg még egyszer végignézi a gyerek
+    táblákat: ami egy már végigsöpört táblába mégis bekerült (a kijelölés
+    előtt indult tranzakcióból), azt előbb elviszi.
+
+A séma: rescue-admin/supabase/migrations/*_event_purge_jobs.sql
+
+    python rescue_purge.py worker                # SUPABASE_URL/SUPABASE_SERVICE_KEY
+    python rescue_purge.py run 42 --batch 20000
+    python rescue_purge.py bench --points 1000000
+"""
+
+import http.client
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+
+PURGE_ORDER = ('gps_tracks', 'map_markers', 'polygons', 'event_participants', 'missing_persons', 'search_events')
+ACTIVE = ('pending', 'running')
+BATCH = 20000
+POLL_S = 5.0
+RETRIES = 5
+
+
+def _key(table):
+    return 'id' if table == 'search_events' else 'event_id'
+
+
+def progress(job):
+    """(kész, összes) sorok száma a feladat soraiból."""
+    total = sum((job.get('total') or {}).values())
+    done = sum((job.get('done') or {}).values())
+    return done, total
+
+
+def _report(job, started, baseline=0):
+    done, total = progress(job)
+    elapsed = time.perf_counter() - started
+    rate = (done - baseline) / elapsed if elapsed > 0 else 0.0
+    share = f'{done / total:.0%}' if total else '-'
+    where = job.get('current_table') or job['status']
+    print(f"  #{job['id']} esemény {job['event_id']} ({job['mode']}): {done}/{total} sor ({share}), "
+          f"{where}, {rate:,.0f} sor/s", flush=True)
+
+
+# --- Futtató (PostgREST-en, rescue_data.DataClient) -------------------------
+
+def run_job(client, job_id, batch=BATCH, report=_report):
+    """Kötegeket kér, amíg a feladat kész nem lesz. Hálózati hibánál és 5xx
+    válasznál újrapróbál (a köteg ismétlése biztonságos: mindig a következő
+    még meglévő sorokat veszi); más hibánál a feladatot failed-re állítja."""
+    from rescue_data import DataError
+
+    # folytatásnál a korábban kész sorok nem számítanak a sebességbe
+    previous = client.table('event_purge_jobs').select('id,done').eq('id', job_id).single().execute().data
+    baseline = progress(previous)[0]
+    started = time.perf_counter()
+    failures = 0
+    while True:
+        try:
+            job = client.rpc('purge_event_batch', {'p_job_id': job_id, 'p_batch': batch}).data
+        except (OSError, http.client.HTTPException, DataError) as err:
+            transient = not isinstance(err, DataError) or err.status >= 500
+            failures += 1
+            if transient and failures <= RETRIES:
+                time.sleep(random.uniform(0, min(5.0, 0.2 * 2 ** failures)))
+                continue
+            client.table('event_purge_jobs').update({'status': 'failed', 'error': str(err)}) \
+                .eq('id', job_id).execute()
+            raise
+        failures = 0
+        if report:
+            report(job, started, baseline)
+        if job['status'] not in ACTIVE:
+            return job
+
+
+def active_jobs(client):
+    return client.table('event_purge_jobs').select('id,event_id,mode,status') \
+        .in_('status', ACTIVE).order('id').execute().data or []
+
+
+def worker(client, batch=BATCH, poll_s=POLL_S, once=False):
+    """A függő és félbemaradt feladatok feldolgozása sorban, majd várakozás."""
+    while True:
+        for job in active_jobs(client):
+            print(f"Feladat #{job['id']}: esemény {job['event_id']} ({job['mode']}, {job['status']})")
+            try:
+                run_job(client, job['id'], batch)
+            except Exception as err:  # a többi feladat menjen tovább
+                print(f"  #{job['id']} hiba: {err}")
+        if once:
+            return
+        time.sleep(poll_s)
+
+
+# --- Helyi mérés: ugyanaz a kötegelt algoritmus SQLite-on --------------------
+
+class SqlitePurge:
+    """A purge_event_batch SQLite-os megfelelője a méréshez: a sorok a main
+    adatbázisban, az archívum egy csatolt adatbázisban, a feladat a
+    event_purge_jobs táblában (total/done JSON szövegként)."""
+
+    def __init__(self, path):
+        import sqlite3
+
+        self.path = path
+        self.db = sqlite3.connect(path, isolation_level=None)
+        self.db.execute('pragma journal_mode=wal')
+        self.db.execute('pragma synchronous=normal')
+        self.db.execute('attach database ? as archive', (path + '.archive',))
+
+    def create(self):
+        columns = {
+            'search_events': 'id integer primary key, name text, status text, start_time text, '
+                             'purge_requested_at text',
+            'missing_persons': 'id integer primary key, event_id integer, name text, location text',
+            'event_participants': 'id integer primary key, event_id integer, user_id text, joined_at text',
+            'map_markers': 'id integer primary key, event_id integer, user_id text, latitude real, longitude real, '
+                           'description text',
+            'polygons': 'id integer primary key, event_id integer, user_id text, coordinates text',
+            'gps_tracks': 'id integer primary key, event_id integer, user_id text, lat real, lng real, acc real, '
+                          'time text',
+        }
+        for table, definition in columns.items():
+            self.db.execute(f'create table {table} ({definition})')
+            self.db.execute(f'create table archive.{table} ({definition}, archived_at text)')
+            if table != 'search_events':
+                self.db.execute(f'create index {table}_event_id_idx on {table} (event_id)')
+                # a migráció skip_purged_event_rows triggere
+                self.db.execute(f'create trigger {table}_skip_purged before insert on {table} '
+                                f'when exists (select 1 from search_events '
+                                f'where id = new.event_id and purge_requested_at is not null) '
+                                f'begin select raise(ignore); end')
+        self.db.execute("create table event_purge_jobs (id integer primary key, event_id integer, mode text, "
+                        "status text default 'pending', current_table text, total text default '{}', "
+                        "done text default '{}')")
+
+    def request(self, event_id, mode='delete'):
+        row = self.db.execute("select id from event_purge_jobs where event_id = ? and status in ('pending', 'running')",
+                              (event_id,)).fetchone()
+        if row:
+            return row[0]
+        self.db.execute("update search_events set purge_requested_at = datetime('now') where id = ?", (event_id,))
+        return self.db.execute('insert into event_purge_jobs (event_id, mode) values (?, ?)',
+                               (event_id, mode)).lastrowid
+
+    def job(self, job_id):
+        keys = ('id', 'event_id', 'mode', 'status', 'current_table', 'total', 'done')
+        row = self.db.execute(f"select {', '.join(keys)} from event_purge_jobs where id = ?", (job_id,)).fetchone()
+        job = dict(zip(keys, row))
+        job['total'], job['done'] = json.loads(job['total']), json.loads(job['done'])
+        return job
+
+    def batch(self, job_id, size=BATCH):
+        """Egy köteg egy tranzakcióban, a tárolt függvény lépései szerint."""
+        db = self.db
+        db.execute('begin immediate')
+        try:
+            job = self.job(job_id)
+            if job['status'] not in ACTIVE:
+                db.execute('commit')
+                return job
+            if job['status'] == 'pending':
+                for table in PURGE_ORDER:
+                    job['total'][table] = db.execute(f'select count(*) from {table} where {_key(table)} = ?',
+                                                     (job['event_id'],)).fetchone()[0]
+                job['status'], job['current_table'] = 'running', PURGE_ORDER[0]
+            table = job['current_table']
+            if table == 'search_events':
+                # újrasöprés: a lépésük után bekerült gyerek sorok előbb
+                for child in PURGE_ORDER[:-1]:
+                    if db.execute(f'select exists (select 1 from {child} where event_id = ?)',
+                                  (job['event_id'],)).fetchone()[0]:
+                        table = job['current_table'] = child
+                        break
+            db.execute('create temp table if not exists purge_batch (row integer primary key)')
+            db.execute('delete from purge_batch')
+            db.execute(f'insert into purge_batch select rowid from {table} where {_key(table)} = ? limit ?',
+                       (job['event_id'], size))
+            if job['mode'] == 'archive':
+                db.execute(f"insert into archive.{table} select *, datetime('now') from main.{table} "
+                           f"where rowid in (select row from purge_batch)")
+            moved = db.execute(f'delete from main.{table} where rowid in (select row from purge_batch)').rowcount
+            job['done'][table] = job['done'].get(table, 0) + moved
+            if moved < size:
+                if table == PURGE_ORDER[-1]:
+                    job['status'], job['current_table'] = 'done', None
+                else:
+                    job['current_table'] = PURGE_ORDER[PURGE_ORDER.index(table) + 1]
+            db.execute('update event_purge_jobs set status = ?, current_table = ?, total = ?, done = ? where id = ?',
+                       (job['status'], job['current_table'], json.dumps(job['total']), json.dumps(job['done']),
+                        job_id))
+            db.execute('commit')
+        except BaseException:
+            db.execute('rollback')
+            raise
+        return job
+
+    def close(self):
+        self.db.close()
+
+
+def seed_fixture(path, points=1_000_000, other_points=250_000, searchers=300, seed=1):
+    """Két esemény: az 1-es `points` GPS ponttal (a törlendő), a 2-es
+    `other_points`-tal (annak érintetlennek kell maradnia)."""
+    rng = random.Random(seed)
+    store = SqlitePurge(path)
+    store.create()
+    db = store.db
+    db.execute('begin')
+    db.executemany('insert into search_events (id, name, status, start_time) values (?, ?, ?, ?)',
+                   [(1, 'Nagy keresés', 'active', '2026-05-06T08:00:00+00:00'),
+                    (2, 'Másik keresés', 'active', '2026-05-07T08:00:00+00:00')])
+    for event_id, count in ((1, points), (2, other_points)):
+        users = [f'user-{event_id}-{index}' for index in range(searchers)]
+        db.executemany('insert into gps_tracks (event_id, user_id, lat, lng, acc, time) values (?, ?, ?, ?, ?, ?)',
+                       ((event_id, users[index % searchers], 47.5 + rng.random() / 10, 19.0 + rng.random() / 10,
+                         rng.uniform(3, 30), f'2026-05-06T{8 + index // 360000 % 12:02d}:00:00+00:00')
+                        for index in range(count)))
+        db.executemany('insert into map_markers (event_id, user_id, latitude, longitude, description) '
+                       'values (?, ?, ?, ?, ?)',
+                       ((event_id, rng.choice(users), 47.5, 19.0, 'Lábnyom a patak mellett')
+                        for _ in range(count // 200)))
+        db.executemany('insert into polygons (event_id, user_id, coordinates) values (?, ?, ?)',
+                       ((event_id, rng.choice(users), '[[19.0,47.5],[19.01,47.5],[19.01,47.51]]')
+                        for _ in range(count // 5000)))
+        db.executemany('insert into event_participants (event_id, user_id, joined_at) values (?, ?, ?)',
+                       ((event_id, user, '2026-05-06T08:00:00+00:00') for user in users))
+        db.executemany('insert into missing_persons (event_id, name, location) values (?, ?, ?)',
+                       [(event_id, 'Eltűnt személy', '{"lat": 47.5, "lng": 19.0}')])
+    db.execute('commit')
+    store.close()
+
+
+def _remaining(store, event_id):
+    return {table: store.db.execute(f'select count(*) from {table} where {_key(table)} = ?', (event_id,)).fetchone()[0]
+            for table in PURGE_ORDER}
+
+
+def bench(points=1_000_000, batches=(5000, 20000, 100000), other_points=250_000):
+    workdir = tempfile.mkdtemp(prefix='rescue_purge_')
+    template = os.path.join(workdir, 'fixture.db')
+    started = time.perf_counter()
+    seed_fixture(template, points, other_points)
+    print(f"Fixture: {points} GPS pont a törlendő eseményen, {other_points} egy másikon "
+          f"({time.perf_counter() - started:.1f} s)")
+
+    def fresh(name):
+        path = os.path.join(workdir, name + '.db')
+        shutil.copy(template, path)
+        shutil.copy(template + '.archive', path + '.archive')
+        return SqlitePurge(path)
+
+    try:
+        print(f"  {'mód':<38}{'sor':>10}{'sor/s':>12}{'köteg':>7}{'leghosszabb tr. (ms)':>22}")
+        # a régi kliens: táblánként egyetlen delete (egy nagy tranzakció)
+        store = fresh('single')
+        total = sum(_remaining(store, 1).values())
+        started = time.perf_counter()
+        store.db.execute('begin')
+        for table in PURGE_ORDER:
+            store.db.execute(f'delete from {table} where {_key(table)} = ?', (1,))
+        store.db.execute('commit')
+        elapsed = time.perf_counter() - started
+        print(f"  {'egy tranzakció (régi kliens)':<38}{total:>10}{total / elapsed:>12,.0f}{1:>7}{elapsed * 1000:>22.0f}")
+        store.close()
+
+        for mode in ('delete', 'archive'):
+            for size in batches if mode == 'delete' else (BATCH,):
+                store = fresh(f'{mode}-{size}')
+                job_id = store.request(1, mode)
+                longest, count = 0.0, 0
+                started = time.perf_counter()
+                while True:
+                    batch_started = time.perf_counter()
+                    job = store.batch(job_id, size)
+                    longest = max(longest, time.perf_counter() - batch_started)
+                    count += 1
+                    if job['status'] == 'done':
+                        break
+                elapsed = time.perf_counter() - started
+                done, total = progress(job)
+                assert done == total and not any(_remaining(store, 1).values())
+                assert _remaining(store, 2)['gps_tracks'] == other_points
+                label = f'kötegelt {mode}, {size} soros köteg'
+                print(f"  {label:<38}{done:>10}{done / elapsed:>12,.0f}{count:>7}{longest * 1000:>22.0f}")
+                store.close()
+
+        # folytathatóság: 10 köteg után a futtató "meghal", egy új kapcsolat folytatja
+        store = fresh('resume')
+        job_id = store.request(1)
+        for _ in range(10):
+            store.batch(job_id)
+        before = progress(store.job(job_id))[0]
+        store.close()
+        store = SqlitePurge(store.path)
+        job_id_again = store.request(1)
+        while store.batch(job_id_again)['status'] != 'done':
+            pass
+        done, total = progress(store.job(job_id_again))
+        ok = job_id_again == job_id and done == total and not any(_remaining(store, 1).values())
+        print(f"  folytatás: {before} sor után újraindítva, a feladat ugyanaz, kész: {done}/{total} "
+              f"({'rendben' if ok else 'HIBA'})")
+        store.close()
+
+        # késő beszúrások, miután a gps_tracks már végigsöpört: a kijelölés
+        # után érkezőt a trigger eldobja; a kijelölés előtt indult tranzakció
+        # sorát (itt: a bélyeg átmeneti levételével) az újrasöprés viszi el
+        store = fresh('late')
+        job_id = store.request(1)
+        while store.job(job_id)['current_table'] in (None, 'gps_tracks'):
+            store.batch(job_id)
+        late = 'insert into gps_tracks (event_id, user_id, lat, lng, acc, time) values (1, ?, 47.5, 19.0, 5.0, ?)'
+        store.db.execute(late, ('user-late', '2026-05-06T20:00:00+00:00'))
+        ignored = _remaining(store, 1)['gps_tracks'] == 0
+        store.db.execute('update search_events set purge_requested_at = null where id = 1')
+        store.db.execute(late, ('user-inflight', '2026-05-06T20:00:01+00:00'))
+        store.db.execute("update search_events set purge_requested_at = datetime('now') where id = 1")
+        while store.batch(job_id)['status'] != 'done':
+            pass
+        ok = ignored and not any(_remaining(store, 1).values())
+        print(f"  késő beszúrás: kijelölés után eldobva, előtte indult az újrasöpréssel törölve "
+              f"({'rendben' if ok else 'HIBA'})")
+        store.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Esemény törlése/archiválása kötegekben')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p_worker = sub.add_parser('worker', help='a függő feladatok feldolgozása')
+    p_worker.add_argument('--batch', type=int, default=BATCH)
+    p_worker.add_argument('--poll', type=float, default=POLL_S, help='várakozás két kör között (s)')
+    p_worker.add_argument('--once', action='store_true', help='egy kör után kilép')
+    p_run = sub.add_parser('run', help='egy feladat futtatása (vagy folytatása)')
+    p_run.add_argument('job_id', type=int)
+    p_run.add_argument('--batch', type=int, default=BATCH)
+    p_bench = sub.add_parser('bench', help='kötegelt törlés áteresztése SQLite fixture-ön')
+    p_bench.add_argument('--points', type=int, default=1_000_000)
+    p_bench.add_argument('--batches', default='5000,20000,100000')
+    args = parser.parse_args(argv)
+
+    if args.command == 'bench':
+        bench(args.points, tuple(int(n) for n in args.batches.split(',')))
+        return
+
+    from rescue_data import DataClient
+
+    with DataClient.from_env() as client:
+        if args.command == 'run':
+            job = run_job(client, args.job_id, args.batch)
+            print(f"Feladat #{job['id']}: {job['status']}")
+        else:
+            worker(client, args.batch, args.poll, args.once)
+
+
+if __name__ == '__main__':
+    main()
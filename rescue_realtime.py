@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+A SearchManager realtime terhelésének becslése (modell) egy nagy keresésen.
+
+A régi SearchManager hat külön postgres_changes csatornát nyitott, szűrés
+nélkül, és minden egyes változásra újratöltött (gps_tracks, map_markers,
+polygons -> loadMarkers: 3 kérés, benne a teljes optimized_user_tracks;
+search_events -> loadEvents; a többi -> a saját lista). Az új változat
+(useEventChanges.js) egyetlen, event_id szerint szűrt csatornát nyit, a sor
+szintű változásokat FLUSH_MS-es ablakokban gyűjti, és egy rendereléssel
+alkalmazza őket; kérés csak új résztvevő felhasználó adataiért megy. A GPS
+pontok nem soronként jönnek: a fogadó (rescue_ingest.py) kötegenként
+(INGEST_WINDOW_MS) és eseményenként egy broadcast üzenetet küld.
+
+Itt egy generált változás folyamon (keresőnként GPS pont GPS_INTERVAL_S-enként,
+markerek, poligonok, résztvevő állapotok) számoljuk mindkét kliensre a
+percenkénti renderelést, HTTP kérést, websocket üzenetet és letöltött
+adatmennyiséget. A renderelés számolása a React 18 automatikus kötegelését
+követi (egy szinkron blokk vagy egy await utáni folytatás = egy renderelés).
+
+A régi kódban a loadX függvények a cache.current-ből szolgáltak ki, ha ott
+volt az adat: ilyenkor nem ment kérés, de a térkép sem frissült (elavult
+adat). Ezért a régi kliens két változatban szerepel: cache-sel (elavult) és
+újratöltéssel (friss, ha a cache-t érvénytelenítjük).
+
+Ez modell, nem mérés, és a kimenet is becslésként címkézi. A renderelés
+oszlop a kötegelési szabályból következik (egy nem üres ablak = egy
+renderelés), így a flush ablakok számát mutatja; hogy a React valóban
+ennyiszer renderel-e, és mennyi ideig, azt nem ellenőrzi. A valódi számot
+a böngészőben, React Profilerrel kell mérni; a kérés, üzenet és bájt
+oszlopok is becsült méretekből számolnak.
+
+    python rescue_realtime.py bench --searchers 300 --minutes 10
+"""
+
+import heapq
+import random
+
+FLUSH_MS = 250
+GPS_INTERVAL_S = 5
+# rescue_ingest.WINDOW_MS: ennyi ideig gyűlnek a pontok egy broadcast üzenetbe
+INGEST_WINDOW_MS = 200
+
+# Becsült méretek (bájt): egy nyomvonal pont a nézet JSON-jában, egy marker
+# vagy poligon sor, egy realtime üzenet (payload + fejléc)
+POINT_BYTES = 75
+ROW_BYTES = 400
+MESSAGE_BYTES = 450
+GPS_ROW_BYTES = 110  # egy [user_id, lat, lng, acc, time] sor a köteg üzenetben
+
+# Percenkénti gyakoriságok keresőnként (a GPS pontokon kívül) és eseményenként
+PER_SEARCHER_PER_MIN = {
+    ('map_markers', 'INSERT'): 1 / 15,
+    ('event_participants', 'UPDATE'): 1 / 30,
+}
+PER_EVENT_PER_MIN = {
+    ('polygons', 'INSERT'): 0.5,
+    ('polygons', 'UPDATE'): 0.5,
+    ('event_participants', 'INSERT'): 2,
+    ('missing_persons', 'UPDATE'): 0.2,
+    ('search_events', 'UPDATE'): 0.1,
+}
+
+# A régi handlerek: tábla -> (kérések, renderelés friss betöltéskor, renderelés cache találatkor)
+_LEGACY = {
+    'gps_tracks': (3, 1, 1),        # loadMarkers: Promise.all, utána setMarkers + setUserTracks
+    'map_markers': (3, 1, 1),
+    'polygons': (3, 1, 1),
+    'search_events': (1, 2, 1),     # loadEvents: setLoading(true), majd await után setEvents + setLoading(false)
+    'missing_persons': (1, 1, 0),   # cache találatkor ugyanaz a tömb: nincs renderelés
+    'event_participants': (1, 1, 0),
+}
+
+
+def _poisson(rng, rate_per_min, minutes):
+    t, times = 0.0, []
+    if rate_per_min <= 0:
+        return times
+    while True:
+        t += rng.expovariate(rate_per_min / 60)
+        if t >= minutes * 60:
+            return times
+        times.append(t)
+
+
+def generate_changes(searchers=300, minutes=10, gps_interval_s=GPS_INTERVAL_S, event_id=1, seed=1):
+    """(idő s, tábla, esemény típus, event_id) rendezett lista egy eseményre."""
+    rng = random.Random(seed + event_id)
+    changes = []
+    for _ in range(searchers):
+        t = rng.uniform(0, gps_interval_s)
+        while t < minutes * 60:
+            changes.append((t, 'gps_tracks', 'INSERT', event_id))
+            t += gps_interval_s * rng.uniform(0.8, 1.2)
+        for (table, kind), rate in PER_SEARCHER_PER_MIN.items():
+            changes.extend((t, table, kind, event_id) for t in _poisson(rng, rate, minutes))
+    for (table, kind), rate in PER_EVENT_PER_MIN.items():
+        changes.extend((t, table, kind, event_id) for t in _poisson(rng, rate, minutes))
+    changes.sort()
+    return changes
+
+
+def legacy_client(changes, searchers, elapsed_min, gps_interval_s=GPS_INTERVAL_S, cached=False):
+    """A régi hat csatornás kliens: minden (bármely eseményből jövő) változásra
+    újratöltés, vagy cache találat esetén elavult adat újrarajzolása."""
+    stats = {'renders': 0, 'requests': 0, 'messages': 0, 'bytes': 0}
+    markers = searchers * elapsed_min * PER_SEARCHER_PER_MIN[('map_markers', 'INSERT')]
+    for t, table, _, _ in changes:
+        stats['messages'] += 1
+        stats['bytes'] += MESSAGE_BYTES
+        requests, fresh_renders, cached_renders = _LEGACY[table]
+        if cached:
+            stats['renders'] += cached_renders
+            continue
+        stats['requests'] += requests
+        stats['renders'] += fresh_renders
+        if requests == 3:
+            # a teljes nyomvonal nézet és az összes marker minden alkalommal
+            points = searchers * (elapsed_min * 60 + t) / gps_interval_s
+            stats['bytes'] += points * POINT_BYTES + markers * ROW_BYTES
+        else:
+            stats['bytes'] += searchers * ROW_BYTES / 4
+    return stats
+
+
+def batched_messages(changes, event_id, ingest_window_ms=INGEST_WINDOW_MS):
+    """A kliensnek jövő üzenetek (idő s, tábla, esemény típus, sorok száma):
+    a kiválasztott esemény GPS pontjai ingest ablakonként egy üzenetben (az
+    ablak végén), a többi változás soronként."""
+    messages, batches = [], {}
+    for t, table, kind, event in changes:
+        if table == 'gps_tracks':
+            if event == event_id:
+                window = int(t * 1000 // ingest_window_ms)
+                batches[window] = batches.get(window, 0) + 1
+        elif event == event_id or table == 'search_events':
+            messages.append((t, table, kind, 1))
+    messages += [((window + 1) * ingest_window_ms / 1000, 'gps_tracks', 'INSERT', rows)
+                 for window, rows in batches.items()]
+    messages.sort()
+    return messages
+
+
+def multiplexed_client(changes, event_id, flush_ms=FLUSH_MS, ingest_window_ms=INGEST_WINDOW_MS):
+    """Az új kliens: csak a kiválasztott esemény változásai (és a search_events)
+    jönnek, a GPS pontok köteg üzenetekben; az első üzenet nyit egy flush_ms-es
+    ablakot, annak végén egy (becsült) renderelés. Új résztvevőnél egy kérés
+    az ablakban érkezett sorokra."""
+    stats = {'renders': 0, 'requests': 0, 'messages': 0, 'bytes': 0}
+    window_end, joined = None, False
+    queue = batched_messages(changes, event_id, ingest_window_ms)
+    heapq.heapify(queue)
+
+    def flush():
+        stats['renders'] += 1
+        if joined:
+            stats['requests'] += 1
+            stats['bytes'] += ROW_BYTES
+
+    while queue:
+        t, table, kind, rows = heapq.heappop(queue)
+        if window_end is not None and t > window_end:
+            flush()
+            window_end, joined = None, False
+        if window_end is None:
+            window_end = t + flush_ms / 1000
+        joined = joined or (table == 'event_participants' and kind == 'INSERT')
+        stats['messages'] += 1
+        stats['bytes'] += MESSAGE_BYTES + (rows * GPS_ROW_BYTES if table == 'gps_tracks' else 0)
+    if window_end is not None:
+        flush()
+    return stats
+
+
+def bench(searchers=300, minutes=10, elapsed_min=60, other_events=0, flush_ms=FLUSH_MS,
+          gps_interval_s=GPS_INTERVAL_S, ingest_window_ms=INGEST_WINDOW_MS):
+    changes = generate_changes(searchers, minutes, gps_interval_s, event_id=1)
+    for index in range(other_events):
+        changes += generate_changes(searchers, minutes, gps_interval_s, event_id=2 + index)
+    changes.sort()
+    own = sum(1 for change in changes if change[3] == 1)
+    print(f"Becslés (modell, nem mérés): {searchers} kereső, GPS {gps_interval_s} s-onként, {minutes} perc "
+          f"(az esemény {elapsed_min}. percétől), további események: {other_events}")
+    print(f"  változás/perc: {own / minutes:.0f} a kiválasztott eseményen, {len(changes) / minutes:.0f} összesen")
+    print(f"  {'kliens':<40}{'becs. render/perc':>18}{'kérés/perc':>12}{'ws üzenet/perc':>16}{'MB/perc':>10}")
+    results = (
+        ('régi, 6 csatorna, újratöltés', legacy_client(changes, searchers, elapsed_min, gps_interval_s)),
+        ('régi, 6 csatorna, cache (elavult)', legacy_client(changes, searchers, elapsed_min, gps_interval_s, True)),
+        (f'multiplex, GPS köteg {ingest_window_ms} ms, {flush_ms} ms ablak',
+         multiplexed_client(changes, 1, flush_ms, ingest_window_ms)),
+    )
+    for label, stats in results:
+        print(f"  {label:<40}{stats['renders'] / minutes:>18.0f}{stats['requests'] / minutes:>12.0f}"
+              f"{stats['messages'] / minutes:>16.0f}{stats['bytes'] / minutes / 1e6:>10.1f}")
+    print("  A render oszlop a kötegelési szabályból számolt becslés (a nem üres ablakok száma),")
+    print("  nem React Profiler mérés; a kérés/üzenet/bájt oszlopok is becsült méretekből jönnek.")
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='SearchManager realtime terhelés becslés (modell)')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p_bench = sub.add_parser('bench', help='régi (6 csatorna) vs. multiplexelt kliens')
+    p_bench.add_argument('--searchers', type=int, default=300)
+    p_bench.add_argument('--minutes', type=float, default=10)
+    p_bench.add_argument('--elapsed-min', type=float, default=60, help='ennyi perce tart már az esemény')
+    p_bench.add_argument('--other-events', type=int, default=0, help='párhuzamos események száma')
+    p_bench.add_argument('--flush-ms', type=int, default=FLUSH_MS)
+    p_bench.add_argument('--gps-interval', type=float, default=GPS_INTERVAL_S)
+    p_bench.add_argument('--ingest-window-ms', type=int, default=INGEST_WINDOW_MS)
+    args = parser.parse_args(argv)
+
+    if args.command == 'bench':
+        bench(args.searchers, args.minutes, args.elapsed_min, args.other_events, args.flush_ms, args.gps_interval,
+              args.ingest_window_ms)
+
+
+if __name__ == '__main__':
+    main()
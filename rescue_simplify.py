@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Zoomfüggő nyomvonal egyszerűsítés (Douglas–Peucker piramis).
+
+A térkép minden megmaradt pontot Polyline-ként rajzol; hosszú keresésnél ez
+több százezer csúcs. Itt szakaszonként egyszer lefut a Douglas–Peucker, és
+minden pont megkapja a "jelentőségét": azt a tűrést (méterben), amely alatt
+még megmaradna. Ebből bármely tűrés szintje egyetlen szűrés, a piramis
+szintjei pedig a zoomhoz illő tűrések (kb. 1 képpont az adott zoomon).
+
+A szakaszok első és utolsó pontja minden szinten megmarad, így a
+segmentTimes kezdő és záró ideje szintenként változatlan.
+
+A DP nem rekurzív Pythonban fut: egy körben az összes még nyitott tartomány
+távolságait egyszerre számoljuk NumPy-jal, és mind a maximumánál hasad.
+
+    python rescue_simplify.py bench --users 200 --hours 8
+    python rescue_simplify.py pyramid nezet.json > piramis.json
+"""
+
+import math
+
+import numpy as np
+
+from rescue_tracks import TrackSegments
+
+EARTH_RADIUS = 6378137.0
+# A piramis szintjei: a legnagyobb zoom, amelyen a szint még pontos
+DEFAULT_ZOOMS = (10, 12, 14, 16)
+# Ennyi képpont eltérés még nem látszik
+PIXEL_TOLERANCE = 1.0
+
+
+def meters_per_pixel(zoom, lat):
+    """Web Mercator felbontás (256 px csempék) az adott szélességen."""
+    return 2 * math.pi * EARTH_RADIUS * math.cos(math.radians(lat)) / (256 * 2 ** zoom)
+
+
+def _local_meters(lat, lng):
+    """Egyenközű vetítés méterbe a pontok közepéhez képest; kis területen (egy
+    keresés) bőven elég, és a kis számok miatt float32-ben is mm pontos."""
+    lat0, lng0 = float(np.median(lat)), float(np.median(lng))
+    y = (np.radians(lat - lat0) * EARTH_RADIUS).astype(np.float32)
+    x = (np.radians(lng - lng0) * EARTH_RADIUS * np.cos(np.radians(lat))).astype(np.float32)
+    return x, y
+
+
+def _squared_distances(px, py, ax, ay, bx, by):
+    """Pont–egyenes távolság négyzete; ha a két végpont egybeesik (helyben
+    köröző szakasz), a ponttól mért távolságé."""
+    dx, dy = bx - ax, by - ay
+    px = px - ax
+    py = py - ay
+    length2 = dx * dx + dy * dy
+    cross = px * dy
+    cross -= py * dx
+    cross *= cross
+    point2 = px * px
+    point2 += py * py
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cross /= length2
+    return np.where(length2 > 0, cross, point2)
+
+
+def significance(segments, min_tolerance):
+    """Pontonként a DP tűrés, amelyig a pont megmarad (végpontok: inf).
+
+    A `min_tolerance` alatti hasításokat már nem követjük; ezek a pontok 0-t
+    kapnak (csak a teljes felbontású szinten jelennek meg)."""
+    x, y = _local_meters(segments.lat, segments.lng)
+    result = np.zeros(len(x))
+    offsets = segments.segment_offsets
+    result[offsets[:-1]] = np.inf
+    result[offsets[1:] - 1] = np.inf
+
+    start = offsets[:-1].copy()
+    end = offsets[1:] - 1
+    cap = np.full(len(start), np.inf)
+    min_squared = min_tolerance * min_tolerance
+    while len(start):
+        inner = end - start - 1
+        active = inner > 0
+        start, end, cap, inner = start[active], end[active], cap[active], inner[active]
+        if not len(start):
+            break
+        # A tartományok belső pontjainak indexei egy tömbben
+        first = np.cumsum(inner) - inner
+        index = np.arange(first[-1] + inner[-1]) + np.repeat(start + 1 - first, inner)
+        distance = _squared_distances(x[index], y[index],
+                                      np.repeat(x[start], inner), np.repeat(y[start], inner),
+                                      np.repeat(x[end], inner), np.repeat(y[end], inner))
+        peak = np.maximum.reduceat(distance, first)
+        # Az első maximum helye tartományonként (a tartományok sorban jönnek)
+        at_peak = np.flatnonzero(distance == np.repeat(peak, inner))
+        peak_range = np.searchsorted(first, at_peak, side='right') - 1
+        first_peak = np.r_[True, peak_range[1:] != peak_range[:-1]]
+        split = index[at_peak[first_peak]]
+
+        keep = peak > min_squared
+        start, end, cap, peak, split = start[keep], end[keep], cap[keep], peak[keep], split[keep]
+        # A gyerek jelentősége nem lehet nagyobb a szülőénél: így a szintek egymásba ágyazódnak
+        value = np.minimum(np.sqrt(peak.astype(np.float64)), cap)
+        result[split] = value
+        start, end, cap = np.concatenate((start, split)), np.concatenate((split, end)), np.concatenate((value, value))
+    return result
+
+
+class TrackPyramid:
+    """Egy TrackSegments több tűrésszinttel. level(i) TrackSegments-et ad,
+    amelynek a szakaszai és idői ugyanazok, csak kevesebb ponttal."""
+
+    def __init__(self, segments, zooms=DEFAULT_ZOOMS, pixel_tolerance=PIXEL_TOLERANCE):
+        self.segments = segments
+        self.zooms = tuple(sorted(zooms))
+        lat = float(np.median(segments.lat)) if len(segments.lat) else 0.0
+        self.tolerances = tuple(pixel_tolerance * meters_per_pixel(zoom, lat) for zoom in self.zooms)
+        self.significance = significance(segments, min(self.tolerances, default=0.0))
+
+    def level_for_zoom(self, zoom):
+        """A zoomhoz tartozó szint indexe. Az i. szint a zooms[i]-ig használható
+        (ott 1 képpont a tűrés, kisebb zoomon annál kevesebb); a legfinomabb
+        szint fölött None: ott a teljes felbontás kell."""
+        for index, max_zoom in enumerate(self.zooms):
+            if zoom <= max_zoom:
+                return index
+        return None
+
+    def keep_mask(self, level):
+        if level is None:
+            return np.ones(len(self.significance), dtype=bool)
+        return self.significance > self.tolerances[level]
+
+    def level(self, level):
+        segments = self.segments
+        keep = self.keep_mask(level)
+        counts = np.add.reduceat(keep.astype(np.int64), segments.segment_offsets[:-1]) \
+            if len(keep) else np.zeros(0, dtype=np.int64)
+        offsets = np.concatenate(([0], np.cumsum(counts)))
+        return TrackSegments(segments.user_ids, segments.user_info, segments.user_offsets, offsets,
+                             segments.lat[keep], segments.lng[keep], segments.time_ms[keep])
+
+    def vertex_counts(self):
+        return [int(self.keep_mask(level).sum()) for level in range(len(self.zooms))] + [len(self.significance)]
+
+    def to_dict(self):
+        """{'levels': [{minZoom, maxZoom, tolerance, users}]}; a users a
+        processUserTracks alakja, így a kliens változtatás nélkül rajzolja."""
+        levels = []
+        for index, zoom in enumerate(self.zooms):
+            levels.append({'minZoom': self.zooms[index - 1] + 1 if index else 0, 'maxZoom': zoom,
+                           'tolerance': round(self.tolerances[index], 2),
+                           'users': self.level(index).to_dict()})
+        levels.append({'minZoom': self.zooms[-1] + 1, 'maxZoom': None, 'tolerance': 0,
+                       'users': self.segments.to_dict()})
+        return {'levels': levels}
+
+
+def bench(users=200, hours=8):
+    import time
+
+    from rescue_tracks import process_columns, synthetic_columns
+
+    segments = process_columns(synthetic_columns(users, hours))
+    started = time.perf_counter()
+    pyramid = TrackPyramid(segments)
+    elapsed = time.perf_counter() - started
+    points = len(segments.lat)
+    print(f"{points} pont, {segments.segment_count()} szakasz; DP jelentőség: {elapsed * 1000:.0f} ms "
+          f"({points / elapsed / 1e6:.1f} M pont/s)")
+    started = time.perf_counter()
+    for level in range(len(pyramid.zooms)):
+        pyramid.level(level)
+    print(f"Szintek kivágása: {(time.perf_counter() - started) * 1000:.0f} ms")
+    for zoom, tolerance, count in zip(pyramid.zooms, pyramid.tolerances, pyramid.vertex_counts()):
+        print(f"  zoom <={zoom:>2} tűrés {tolerance:6.1f} m: {count:>8} csúcs ({points / max(count, 1):.0f}x kevesebb)")
+    print(f"  zoom >={pyramid.zooms[-1] + 1:>2} teljes:          {points:>8} csúcs")
+
+
+def main(argv=None):
+    import argparse
+    import json
+    import sys
+
+    from rescue_tracks import process_rows
+
+    parser = argparse.ArgumentParser(description='Nyomvonal egyszerűsítő piramis')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p_pyramid = sub.add_parser('pyramid', help='optimized_user_tracks JSON -> szintek JSON')
+    p_pyramid.add_argument('path', help="a nézet sorai JSON-ban ('-': stdin)")
+    p_pyramid.add_argument('--zooms', default=','.join(map(str, DEFAULT_ZOOMS)))
+    p_bench = sub.add_parser('bench')
+    p_bench.add_argument('--users', type=int, default=200)
+    p_bench.add_argument('--hours', type=float, default=8)
+    args = parser.parse_args(argv)
+
+    if args.command == 'pyramid':
+        if args.path == '-':
+            rows = json.load(sys.stdin)
+        else:
+            with open(args.path, encoding='utf-8') as f:
+                rows = json.load(f)
+        zooms = tuple(int(z) for z in args.zooms.split(','))
+        pyramid = TrackPyramid(process_rows(rows), zooms)
+        json.dump(pyramid.to_dict(), sys.stdout, ensure_ascii=False, separators=(',', ':'))
+    elif args.command == 'bench':
+        bench(args.users, args.hours)
+
+
+if __name__ == '__main__':
+    main()
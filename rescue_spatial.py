@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Eseményenkénti térbeli index a map_markers és polygons sorokra.
+
+A loadMarkers az esemény összes markerét és poligonját lekéri és kirajzolja;
+egy többnapos keresésnél ez több ezer elem. Az index egyenletes rács: minden
+elem a befoglaló téglalapja által érintett cellákba kerül, a cellakulcs
+szerint rendezett NumPy tömbökben. Lekérdezések:
+
+  - bbox(min_lng, min_lat, max_lng, max_lat): a nézetbe eső elemek,
+  - nearest(lng, lat, k): a k legközelebbi elem (méterben).
+
+A változások (Supabase realtime: INSERT/UPDATE/DELETE) nem építik újra az
+indexet: egy kis "friss" halmazba kerülnek, amelyet a lekérdezés lineárisan
+néz át, és csak ha ez megnő, épül újra a rendezett rész.
+
+    python rescue_spatial.py bench --features 100000
+"""
+
+import json
+import math
+
+import numpy as np
+
+from rescue_polygons import PolygonError, parse_coordinates
+
+EARTH_RADIUS = 6378137.0
+# Cellánként átlagosan ennyi elem legyen
+TARGET_PER_CELL = 4
+# Ennyi függő változás fölött újraépítjük a rendezett részt
+REBUILD_THRESHOLD = 2048
+_BIAS = 1 << 31
+
+
+def _keys(cx, cy):
+    # Soronként folytonos (y a felső, x az alsó fél), így egy sor cellái egy tartomány
+    return ((cy.astype(np.int64) + _BIAS) << 32) | (cx.astype(np.int64) + _BIAS)
+
+
+def feature_from_row(table, row):
+    """(kulcs, befoglaló téglalap) egy map_markers/polygons sorból; None, ha
+    nincs használható koordinátája."""
+    if table == 'map_markers':
+        try:
+            lat, lng = float(row['latitude']), float(row['longitude'])
+        except (KeyError, TypeError, ValueError):
+            return None
+        return (table, row['id']), (lng, lat, lng, lat)
+    if row.get('bbox_min_lng') is not None:
+        # A rescue_polygons.py által előre kiszámolt téglalap
+        return (table, row['id']), (row['bbox_min_lng'], row['bbox_min_lat'], row['bbox_max_lng'], row['bbox_max_lat'])
+    try:
+        ring, _ = parse_coordinates(row.get('coordinates'))
+    except PolygonError:
+        return None
+    if not len(ring):
+        return None
+    return (table, row['id']), (ring[:, 0].min(), ring[:, 1].min(), ring[:, 0].max(), ring[:, 1].max())
+
+
+class SpatialIndex:
+    """Egy esemény elemeinek rács indexe. A kulcs tetszőleges hashelhető
+    érték (itt (tábla, id)), a hozzá tartozó sor a `rows`-ban van."""
+
+    def __init__(self, cell_size=None):
+        self.cell_size = cell_size
+        self.rows = {}
+        self._boxes = {}
+        # rendezett rész
+        self._keys = np.empty(0, dtype=object)
+        self._box_array = np.empty((0, 4))
+        self._cell_keys = np.empty(0, dtype=np.int64)
+        self._cell_items = np.empty(0, dtype=np.int64)
+        # változások az utolsó építés óta
+        self._dirty = set()
+        self._built_for = 0
+
+    def __len__(self):
+        return len(self._boxes)
+
+    # --- módosítás ---
+
+    def bulk_load(self, items):
+        """(kulcs, téglalap, sor) hármasok betöltése egyetlen újraépítéssel."""
+        for key, box, row in items:
+            self._boxes[key] = tuple(float(v) for v in box)
+            self.rows[key] = row
+        self.rebuild()
+
+    def upsert(self, key, box, row=None):
+        self._boxes[key] = tuple(float(v) for v in box)
+        self.rows[key] = row
+        self._dirty.add(key)
+        self._maybe_rebuild()
+
+    def remove(self, key):
+        if self._boxes.pop(key, None) is not None:
+            self.rows.pop(key, None)
+            self._dirty.add(key)
+            self._maybe_rebuild()
+
+    def _maybe_rebuild(self):
+        if len(self._dirty) > max(REBUILD_THRESHOLD, len(self._keys) // 20):
+            self.rebuild()
+
+    def rebuild(self):
+        keys = list(self._boxes)
+        self._keys = np.empty(len(keys), dtype=object)
+        self._keys[:] = keys
+        boxes = np.array([self._boxes[key] for key in keys], dtype=np.float64).reshape(-1, 4)
+        self._box_array = boxes
+        self._dirty = set()
+        if not len(keys):
+            self._cell_keys = np.empty(0, dtype=np.int64)
+            self._cell_items = np.empty(0, dtype=np.int64)
+            return
+        if self.cell_size is None or len(keys) > 4 * self._built_for:
+            self._auto_cell_size(boxes)
+        cx0, cy0 = np.floor(boxes[:, 0] / self.cell_size), np.floor(boxes[:, 1] / self.cell_size)
+        cx1, cy1 = np.floor(boxes[:, 2] / self.cell_size), np.floor(boxes[:, 3] / self.cell_size)
+        span_x = (cx1 - cx0 + 1).astype(np.int64)
+        span_y = (cy1 - cy0 + 1).astype(np.int64)
+        counts = span_x * span_y
+        item = np.repeat(np.arange(len(keys)), counts)
+        local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        cx = cx0[item] + local % span_x[item]
+        cy = cy0[item] + local // span_x[item]
+        cell_keys = _keys(cx, cy)
+        order = np.argsort(cell_keys, kind='stable')
+        self._cell_keys = cell_keys[order]
+        self._cell_items = item[order]
+
+    def _auto_cell_size(self, boxes):
+        """A kiterjedésből olyan cellaméret, hogy cellánként ~TARGET_PER_CELL elem jusson."""
+        width = max(boxes[:, 2].max() - boxes[:, 0].min(), 1e-6)
+        height = max(boxes[:, 3].max() - boxes[:, 1].min(), 1e-6)
+        cells = max(len(boxes) / TARGET_PER_CELL, 1)
+        self.cell_size = max(math.sqrt(width * height / cells), 1e-6)
+        self._built_for = len(boxes)
+
+    # --- lekérdezés ---
+
+    def _indexed_candidates(self, min_x, min_y, max_x, max_y):
+        if not len(self._cell_keys):
+            return np.empty(0, dtype=np.int64)
+        size = self.cell_size
+        cx0, cx1 = math.floor(min_x / size), math.floor(max_x / size)
+        rows = np.arange(math.floor(min_y / size), math.floor(max_y / size) + 1)
+        lo = np.searchsorted(self._cell_keys, _keys(np.full(len(rows), cx0), rows), 'left')
+        hi = np.searchsorted(self._cell_keys, _keys(np.full(len(rows), cx1), rows), 'right')
+        counts = hi - lo
+        positions = np.arange(counts.sum()) + np.repeat(lo - (np.cumsum(counts) - counts), counts)
+        items = np.unique(self._cell_items[positions])
+        boxes = self._box_array[items]
+        hit = (boxes[:, 0] <= max_x) & (boxes[:, 2] >= min_x) & (boxes[:, 1] <= max_y) & (boxes[:, 3] >= min_y)
+        return items[hit]
+
+    def bbox(self, min_x, min_y, max_x, max_y):
+        """A téglalapot metsző elemek kulcsai."""
+        items = self._indexed_candidates(min_x, min_y, max_x, max_y)
+        keys = self._keys[items].tolist()
+        if self._dirty:
+            keys = [key for key in keys if key not in self._dirty]
+            for key in self._dirty:
+                box = self._boxes.get(key)
+                if box and box[0] <= max_x and box[2] >= min_x and box[1] <= max_y and box[3] >= min_y:
+                    keys.append(key)
+        return keys
+
+    def _distances(self, keys, x, y):
+        """Méterben a pont és az elemek befoglaló téglalapja között."""
+        boxes = np.array([self._boxes[key] for key in keys], dtype=np.float64).reshape(-1, 4)
+        dx = np.maximum(np.maximum(boxes[:, 0] - x, x - boxes[:, 2]), 0)
+        dy = np.maximum(np.maximum(boxes[:, 1] - y, y - boxes[:, 3]), 0)
+        return np.hypot(np.radians(dx) * math.cos(math.radians(y)), np.radians(dy)) * EARTH_RADIUS
+
+    def nearest(self, x, y, k=1):
+        """A k legközelebbi elem [(kulcs, távolság méterben)] növekvő sorrendben."""
+        if not self._boxes:
+            return []
+        k = min(k, len(self._boxes))
+        radius = self.cell_size or 1e-3
+        while True:
+            keys = self.bbox(x - radius, y - radius, x + radius, y + radius)
+            if len(keys) >= k:
+                distances = self._distances(keys, x, y)
+                order = np.argsort(distances, kind='stable')[:k]
+                # A négyzeten belüli kör sugara: ennél közelebbi elem nem maradhatott ki
+                safe = min(np.radians(radius) * math.cos(math.radians(y)), np.radians(radius)) * EARTH_RADIUS
+                if distances[order[-1]] <= safe or len(keys) == len(self._boxes):
+                    return [(keys[i], float(distances[i])) for i in order]
+            radius *= 2
+
+
+class SpatialIndexService:
+    """Eseményenként egy index; a realtime változások event_id szerint
+    jutnak a megfelelő indexbe."""
+
+    TABLES = ('map_markers', 'polygons')
+
+    def __init__(self):
+        self.indexes = {}
+
+    def load(self, event_id, markers, polygons):
+        index = SpatialIndex()
+        index.bulk_load((feature[0], feature[1], row)
+                        for table, rows in (('map_markers', markers), ('polygons', polygons))
+                        for row in rows
+                        for feature in [feature_from_row(table, row)] if feature is not None)
+        self.indexes[event_id] = index
+        return index
+
+    def apply_change(self, payload):
+        """Supabase postgres_changes payload: {eventType, table, new, old}."""
+        table = payload.get('table')
+        if table not in self.TABLES:
+            return
+        old, new = payload.get('old') or {}, payload.get('new') or {}
+        if payload.get('eventType') in ('UPDATE', 'DELETE') and old.get('id') is not None:
+            # Az UPDATE event_id-t is válthat: a régi helyéről mindenhonnan töröljük
+            for index in self.indexes.values():
+                index.remove((table, old['id']))
+        if payload.get('eventType') in ('INSERT', 'UPDATE'):
+            index = self.indexes.get(new.get('event_id'))
+            feature = feature_from_row(table, new)
+            if index is not None and feature is not None:
+                index.upsert(feature[0], feature[1], new)
+
+    def query(self, event_id, min_lng, min_lat, max_lng, max_lat):
+        """A nézetbe eső sorok."""
+        index = self.indexes.get(event_id)
+        if index is None:
+            return []
+        return [index.rows[key] for key in index.bbox(min_lng, min_lat, max_lng, max_lat)]
+
+    def nearest(self, event_id, lng, lat, k=10):
+        index = self.indexes.get(event_id)
+        if index is None:
+            return []
+        return [(index.rows[key], distance) for key, distance in index.nearest(lng, lat, k)]
+
+
+def synthetic_rows(count, seed=1, polygon_share=0.1):
+    rng = np.random.default_rng(seed)
+    markers, polygons = [], []
+    for i in range(count):
+        lat, lng = 47.8 + rng.random() * 0.3, 20.2 + rng.random() * 0.4
+        if rng.random() < polygon_share:
+            size = rng.uniform(0.0005, 0.005)
+            ring = [[lng, lat], [lng + size, lat], [lng + size, lat + size], [lng, lat + size], [lng, lat]]
+            polygons.append({'id': i, 'event_id': 1, 'coordinates': json.dumps(ring)})
+        else:
+            markers.append({'id': i, 'event_id': 1, 'latitude': lat, 'longitude': lng})
+    return markers, polygons
+
+
+def bench(features=100000, queries=1000):
+    import time
+
+    markers, polygons = synthetic_rows(features)
+    service = SpatialIndexService()
+    started = time.perf_counter()
+    index = service.load(1, markers, polygons)
+    print(f"{features} elem ({len(polygons)} poligon): építés {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    rng = np.random.default_rng(2)
+    for label, span in (('utca (0.01°)', 0.01), ('város (0.05°)', 0.05)):
+        started = time.perf_counter()
+        found = 0
+        for _ in range(queries):
+            x, y = 20.2 + rng.random() * 0.4, 47.8 + rng.random() * 0.3
+            found += len(index.bbox(x, y, x + span, y + span * 0.67))
+        elapsed = (time.perf_counter() - started) / queries
+        print(f"bbox {label}: {elapsed * 1e6:.0f} µs/lekérdezés, átlag {found / queries:.0f} találat")
+    started = time.perf_counter()
+    for _ in range(queries):
+        index.nearest(20.2 + rng.random() * 0.4, 47.8 + rng.random() * 0.3, 10)
+    print(f"10 legközelebbi: {(time.perf_counter() - started) / queries * 1e6:.0f} µs/lekérdezés")
+
+    started = time.perf_counter()
+    for i in range(5000):
+        service.apply_change({'eventType': 'UPDATE', 'table': 'map_markers', 'old': {'id': i},
+                              'new': {'id': i, 'event_id': 1, 'latitude': 47.9, 'longitude': 20.3}})
+    print(f"5000 realtime módosítás: {(time.perf_counter() - started) * 1000:.0f} ms "
+          f"(függő: {len(index._dirty)})")
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Térbeli index a térkép elemeire')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p_bench = sub.add_parser('bench')
+    p_bench.add_argument('--features', type=int, default=100000)
+    p_bench.add_argument('--queries', type=int, default=1000)
+    args = parser.parse_args(argv)
+    if args.command == 'bench':
+        bench(args.features, args.queries)
+
+
+if __name__ == '__main__':
+    main()
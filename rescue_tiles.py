@@ -0,0 +1,978 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Csempe (z/x/y) generátor az esemény térképi elemeihez.
+
+A térkép most az esemény teljes tábláit tölti le, és a Leaflet minden elemet
+külön DOM/SVG rétegként rajzol. Itt az esemény map_markers, polygons és
+(egyszerűsített) gps nyomvonal elemei csempékre bontva jönnek, és a kliens
+egy canvas GridLayer-rel csak a látható csempéket kéri le
+(src/components/VectorTileLayer.jsx).
+
+A csempe JSON (MVT-hez hasonló, de külön dekóder nélkül olvasható):
+
+    {"extent": 4096, "layers": {
+       "markers":  {"ids": [...], "coords": [x, y, ...]},
+       "polygons": {"ids": [...], "offsets": [...], "coords": [...]},
+       "tracks":   {"ids": [...], "offsets": [...], "coords": [...],
+                    "user": [...], "start": [...], "end": [...]}},
+     "users": [...]}
+
+A koordináták a csempén belüli egészek (0..extent, egy kis peremmel); a
+vonalak és poligonok részeinél az első pont abszolút, a többi az előzőhöz
+képesti eltérés (mint az MVT-ben), a kliens összegzi őket. A nyomvonalak
+a rescue_simplify piramis zoomhoz illő szintjéből jönnek, és a csempe
+szélén darabokra vágódnak.
+
+Az elemek rétegenként oszlopos tömbökben vannak, a csempe index a
+INDEX_ZOOM szintű csempékre rendezett kulcs tömb (mint a rescue_spatial
+rácsa). A változások (Supabase database webhook) csak az érintett
+csempéket dobják ki az LRU cache-ből. A webhook csak a közös titokkal
+(X-Webhook-Secret fejléc, a Supabase webhook beállításában megadva) fogadott;
+CORS fejléc csak az --allow-origin-nel megadott originnek megy.
+
+Az adatok a service kulccsal (RLS nélkül) jönnek, ezért a csempe kéréshez
+Supabase access token kell (Authorization: Bearer), és a felhasználónak az
+esemény résztvevőjének vagy admin/koordinátornak kell lennie. A betöltött
+események száma korlátos (LRU); a nem létező esemény nem marad a memóriában.
+
+    python rescue_tiles.py serve --port 8765 --allow-origin https://sarcoord.com
+                       # SUPABASE_URL/SUPABASE_SERVICE_KEY/SUPABASE_JWT_SECRET/TILES_WEBHOOK_SECRET
+    python rescue_tiles.py serve --synthetic 100000       # kipróbáláshoz
+    python rescue_tiles.py bench --features 10000,100000,1000000
+"""
+
+import gzip
+import hashlib
+import hmac
+import json
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+import numpy as np
+
+EXTENT = 4096
+BUFFER = 64
+INDEX_ZOOM = 14
+MAX_ZOOM = 22
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+# A nyomvonalakat legfeljebb ilyen gyakran építjük újra a gps_tracks változásaiból
+TRACK_REFRESH_S = 5.0
+# Ennyi függő változás fölött újraépítjük a réteg indexét
+REBUILD_THRESHOLD = 1024
+# Egyszerre ennyi esemény rétegei vannak a memóriában
+MAX_EVENTS = 16
+# A jogosultság (résztvevő / koordinátor) ennyi ideig érvényes a cache-ben
+ACCESS_TTL_S = 60.0
+MAX_ACCESS_ENTRIES = 4096
+COORDINATOR_ROLES = ('admin', 'coordinator')
+_BIAS = 1 << 31
+
+
+def world_xy(lng, lat):
+    """Web Mercator világkoordináta (0..1, y lefelé nő)."""
+    lng = np.asarray(lng, dtype=np.float64)
+    lat = np.asarray(lat, dtype=np.float64)
+    s = np.clip(np.sin(np.radians(lat)), -0.9999, 0.9999)
+    return (lng + 180.0) / 360.0, 0.5 - np.log((1 + s) / (1 - s)) / (4 * math.pi)
+
+
+def tile_bounds(z, x, y, buffer=BUFFER):
+    """A csempe (peremmel bővített) határai világkoordinátában."""
+    scale = 2.0 ** z
+    pad = buffer / EXTENT
+    return (x - pad) / scale, (y - pad) / scale, (x + 1 + pad) / scale, (y + 1 + pad) / scale
+
+
+class EventNotFound(LookupError):
+    """Nincs ilyen (vagy törlésre kijelölt) esemény."""
+
+
+class _SharedLock:
+    """Olvasó/író zár egy eseményhez: a csempék párhuzamosan készülhetnek, a
+    rétegek cseréje (apply_change, compact, set_tracks) kizárólagos. A
+    várakozó író elől az új olvasók félreállnak."""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._readers = 0
+        self._writer = False
+        self._waiting = 0
+
+    @contextmanager
+    def shared(self):
+        with self._cond:
+            while self._writer or self._waiting:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def exclusive(self):
+        with self._cond:
+            self._waiting += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._waiting -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = False
+                self._cond.notify_all()
+
+
+def _index_keys(tx, ty):
+    return ((ty.astype(np.int64) + _BIAS) << 32) | (tx.astype(np.int64) + _BIAS)
+
+
+class Layer:
+    """Egy elemtípus oszlopos tárolása.
+
+    A `i` elem pontjai x/y[offsets[i]:offsets[i + 1]] (világkoordináta), a
+    tulajdonságok oszloponként a `props`-ban. A törölt elem alive=False; az
+    új és módosított elemek a `pending` listába kerülnek, amíg a réteg újra
+    nem épül."""
+
+    def __init__(self, kind, ids, x, y, offsets, props=None):
+        self.kind = kind
+        self.ids = np.asarray(ids)
+        self.x = np.asarray(x, dtype=np.float64)
+        self.y = np.asarray(y, dtype=np.float64)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.props = {name: np.asarray(values) for name, values in (props or {}).items()}
+        self.alive = np.ones(len(self.ids), dtype=bool)
+        self.pending = {}
+        self._positions = None
+        self._build_index()
+
+    def __len__(self):
+        return int(self.alive.sum()) + len(self.pending)
+
+    def _build_index(self):
+        count = len(self.ids)
+        if count:
+            starts, ends = self.offsets[:-1], self.offsets[1:]
+            nonempty = ends > starts
+            self.min_x = np.full(count, np.inf)
+            self.min_y = np.full(count, np.inf)
+            self.max_x = np.full(count, -np.inf)
+            self.max_y = np.full(count, -np.inf)
+            if nonempty.any():
+                first = starts[nonempty]
+                self.min_x[nonempty] = np.minimum.reduceat(self.x, first)
+                self.min_y[nonempty] = np.minimum.reduceat(self.y, first)
+                self.max_x[nonempty] = np.maximum.reduceat(self.x, first)
+                self.max_y[nonempty] = np.maximum.reduceat(self.y, first)
+        else:
+            self.min_x = self.min_y = self.max_x = self.max_y = np.empty(0)
+        scale = 2.0 ** INDEX_ZOOM
+        usable = np.flatnonzero(np.isfinite(self.min_x))
+        tx0 = np.floor(self.min_x[usable] * scale).astype(np.int64)
+        ty0 = np.floor(self.min_y[usable] * scale).astype(np.int64)
+        span_x = np.floor(self.max_x[usable] * scale).astype(np.int64) - tx0 + 1
+        span_y = np.floor(self.max_y[usable] * scale).astype(np.int64) - ty0 + 1
+        counts = span_x * span_y
+        item = np.repeat(usable, counts)
+        owner = np.repeat(np.arange(len(usable)), counts)
+        local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        keys = _index_keys(tx0[owner] + local % span_x[owner], ty0[owner] + local // span_x[owner])
+        order = np.argsort(keys, kind='stable')
+        self._keys = keys[order]
+        self._items = item[order]
+
+    # --- változások ---
+
+    def _position(self, feature_id):
+        if self._positions is None:
+            self._positions = {value: index for index, value in enumerate(self.ids.tolist())}
+        return self._positions.get(feature_id)
+
+    def bbox(self, feature_id):
+        """Az elem világkoordinátás befoglaló téglalapja (None, ha nincs)."""
+        if feature_id in self.pending:
+            return self.pending[feature_id]['bbox']
+        index = self._position(feature_id)
+        if index is None or not self.alive[index] or not np.isfinite(self.min_x[index]):
+            return None
+        return self.min_x[index], self.min_y[index], self.max_x[index], self.max_y[index]
+
+    def remove(self, feature_id):
+        old = self.bbox(feature_id)
+        self.pending.pop(feature_id, None)
+        index = self._position(feature_id)
+        if index is not None:
+            self.alive[index] = False
+        return old
+
+    def upsert(self, feature_id, x, y, props=None):
+        """Egy elem felvétele vagy cseréje; visszaadja a régi és az új téglalapot."""
+        old = self.remove(feature_id)
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        new = (x.min(), y.min(), x.max(), y.max()) if len(x) else None
+        self.pending[feature_id] = {'x': x, 'y': y, 'props': props or {}, 'bbox': new}
+        if len(self.pending) > max(REBUILD_THRESHOLD, len(self.ids) // 20):
+            self.compact()
+        return old, new
+
+    def compact(self):
+        """A függő változások beolvasztása és az index újraépítése."""
+        keep = np.flatnonzero(self.alive)
+        counts = (self.offsets[1:] - self.offsets[:-1])[keep]
+        point_index = np.repeat(self.offsets[keep] - (np.cumsum(counts) - counts), counts) + np.arange(counts.sum())
+        xs, ys = [self.x[point_index]], [self.y[point_index]]
+        ids = self.ids[keep].tolist()
+        props = {name: values[keep].tolist() for name, values in self.props.items()}
+        sizes = counts.tolist()
+        for feature_id, feature in self.pending.items():
+            ids.append(feature_id)
+            xs.append(feature['x'])
+            ys.append(feature['y'])
+            sizes.append(len(feature['x']))
+            for name in props:
+                props[name].append(feature['props'].get(name))
+        self.__init__(self.kind, ids, np.concatenate(xs), np.concatenate(ys),
+                      np.concatenate(([0], np.cumsum(sizes, dtype=np.int64))), props)
+
+    # --- lekérdezés ---
+
+    def query(self, bounds):
+        """A (világkoordinátás) téglalapot metsző indexelt elemek indexei és a
+        függő elemek azonosítói."""
+        min_x, min_y, max_x, max_y = bounds
+        scale = 2.0 ** INDEX_ZOOM
+        tx0, tx1 = math.floor(max(min_x, 0) * scale), math.floor(min(max_x, 1 - 1e-12) * scale)
+        rows = np.arange(math.floor(max(min_y, 0) * scale), math.floor(min(max_y, 1 - 1e-12) * scale) + 1)
+        items = np.empty(0, dtype=np.int64)
+        if len(self._keys) and len(rows):
+            lo = np.searchsorted(self._keys, _index_keys(np.full(len(rows), tx0), rows), 'left')
+            hi = np.searchsorted(self._keys, _index_keys(np.full(len(rows), tx1), rows), 'right')
+            counts = hi - lo
+            if counts.sum():
+                positions = np.arange(counts.sum()) + np.repeat(lo - (np.cumsum(counts) - counts), counts)
+                items = np.unique(self._items[positions])
+                hit = (self.alive[items] & (self.min_x[items] <= max_x) & (self.max_x[items] >= min_x)
+                       & (self.min_y[items] <= max_y) & (self.max_y[items] >= min_y))
+                items = items[hit]
+        pending = [feature_id for feature_id, feature in self.pending.items()
+                   if feature['bbox'] and feature['bbox'][0] <= max_x and feature['bbox'][2] >= min_x
+                   and feature['bbox'][1] <= max_y and feature['bbox'][3] >= min_y]
+        return items, pending
+
+    def encode(self, z, x, y):
+        """A réteg csempéje (dict) vagy None, ha nincs benne elem."""
+        bounds = tile_bounds(z, x, y)
+        items, pending = self.query(bounds)
+        if not len(items) and not pending:
+            return None
+        counts = self.offsets[items + 1] - self.offsets[items]
+        point_index = np.repeat(self.offsets[items] - (np.cumsum(counts) - counts), counts) + np.arange(counts.sum())
+        px = [self.x[point_index]]
+        py = [self.y[point_index]]
+        ids = self.ids[items].tolist()
+        props = {name: values[items].tolist() for name, values in self.props.items()}
+        sizes = counts.tolist()
+        for feature_id in pending:
+            feature = self.pending[feature_id]
+            px.append(feature['x'])
+            py.append(feature['y'])
+            sizes.append(len(feature['x']))
+            ids.append(feature_id)
+            for name in props:
+                props[name].append(feature['props'].get(name))
+        px, py = np.concatenate(px), np.concatenate(py)
+        sizes = np.asarray(sizes, dtype=np.int64)
+        feature_of_point = np.repeat(np.arange(len(sizes)), sizes)
+        scale = 2.0 ** z
+        qx = np.round((px * scale - x) * EXTENT).astype(np.int64)
+        qy = np.round((py * scale - y) * EXTENT).astype(np.int64)
+
+        if self.kind == 'point':
+            if z < INDEX_ZOOM:
+                # Kis zoomon egy képponton (EXTENT / 256) csak az első marker marad
+                _, first = np.unique(((qy >> 4) << 20) | ((qx >> 4) & 0xFFFFF), return_index=True)
+                first.sort()
+                qx, qy = qx[first], qy[first]
+                ids = [ids[i] for i in first.tolist()]
+                props = {name: [values[i] for i in first.tolist()] for name, values in props.items()}
+            return {'ids': ids, 'coords': np.column_stack((qx, qy)).ravel().tolist(), **props}
+
+        keep = np.ones(len(qx), dtype=bool)
+        part_start = np.zeros(len(qx), dtype=bool)
+        part_start[np.cumsum(sizes)[:-1][sizes[1:] > 0] if len(sizes) > 1 else []] = True
+        if len(qx):
+            part_start[0] = True
+        if self.kind == 'line':
+            # Csak a csempébe eső pontok és közvetlen szomszédaik; a kimaradó
+            # pontoknál a vonal darabokra bomlik
+            limit = EXTENT + BUFFER
+            inside = (qx >= -BUFFER) & (qx <= limit) & (qy >= -BUFFER) & (qy <= limit)
+            same_prev = np.r_[False, feature_of_point[1:] == feature_of_point[:-1]]
+            same_next = np.r_[feature_of_point[1:] == feature_of_point[:-1], False]
+            keep = inside.copy()
+            keep[:-1] |= inside[1:] & same_next[:-1]
+            keep[1:] |= inside[:-1] & same_prev[1:]
+            part_start = keep & (~same_prev | ~np.r_[False, keep[:-1]])
+        # Kvantálás után egybeeső szomszédos pontok kihagyása (a rész eleje marad)
+        duplicate = np.r_[False, (qx[1:] == qx[:-1]) & (qy[1:] == qy[:-1])]
+        keep &= part_start | ~duplicate
+        qx, qy, part_start, feature_of_point = qx[keep], qy[keep], part_start[keep], feature_of_point[keep]
+        starts = np.flatnonzero(part_start)
+        part_sizes = np.diff(np.r_[starts, len(qx)])
+        minimum = 3 if self.kind == 'polygon' else 2
+        usable = part_sizes >= minimum
+        if not usable.any():
+            return None
+        # Részenként az első pont abszolút, a többi az előzőhöz képesti eltérés
+        dx = np.r_[qx[:1], np.diff(qx)]
+        dy = np.r_[qy[:1], np.diff(qy)]
+        dx[starts], dy[starts] = qx[starts], qy[starts]
+        part_keep = np.repeat(usable, part_sizes)
+        owner = feature_of_point[starts[usable]].tolist()
+        offsets = np.r_[0, np.cumsum(part_sizes[usable])].tolist()
+        return {'ids': [ids[i] for i in owner], 'offsets': offsets,
+                'coords': np.column_stack((dx[part_keep], dy[part_keep])).ravel().tolist(),
+                **{name: [values[i] for i in owner] for name, values in props.items()}}
+
+
+def track_layers(segments, zooms=None):
+    """Nyomvonal rétegek a rescue_simplify piramis szintjeiből: (zoomok, rétegek).
+    A `i`. réteg a zooms[i]-ig, az utolsó (teljes) afölött használható."""
+    from rescue_simplify import DEFAULT_ZOOMS, TrackPyramid
+
+    pyramid = TrackPyramid(segments, zooms or DEFAULT_ZOOMS)
+    layers = []
+    for level in list(range(len(pyramid.zooms))) + [None]:
+        data = pyramid.level(level) if level is not None else segments
+        counts = np.diff(data.user_offsets)
+        user = np.repeat(np.arange(len(counts)), counts)
+        x, y = world_xy(data.lng, data.lat)
+        layers.append(Layer('line', np.arange(data.segment_count()), x, y, data.segment_offsets,
+                            {'user': user, 'start': data.segment_start, 'end': data.segment_end}))
+    return pyramid.zooms, layers
+
+
+class EventTiles:
+    """Egy esemény rétegei és csempézése."""
+
+    def __init__(self, markers, polygons, segments=None):
+        self.markers = markers
+        self.polygons = polygons
+        self.lock = _SharedLock()
+        self.set_tracks(segments)
+
+    @classmethod
+    def from_rows(cls, marker_rows, polygon_rows, track_rows=()):
+        from rescue_polygons import PolygonError, decode_polyline, parse_coordinates
+        from rescue_tracks import process_tracks
+
+        ids, lng, lat = [], [], []
+        for row in marker_rows:
+            try:
+                lat_value, lng_value = float(row['latitude']), float(row['longitude'])
+            except (KeyError, TypeError, ValueError):
+                continue
+            ids.append(row['id'])
+            lat.append(lat_value)
+            lng.append(lng_value)
+        x, y = world_xy(lng, lat)
+        markers = Layer('point', ids, x, y, np.arange(len(ids) + 1))
+
+        ids, xs, ys, sizes = [], [], [], []
+        for row in polygon_rows:
+            try:
+                if row.get('coordinates_polyline'):
+                    ring_lat, ring_lng = decode_polyline(row['coordinates_polyline'])
+                else:
+                    ring, _ = parse_coordinates(row.get('coordinates'))
+                    ring_lng, ring_lat = ring[:, 0], ring[:, 1]
+            except PolygonError:
+                continue
+            if len(ring_lat) < 3:
+                continue
+            px, py = world_xy(ring_lng, ring_lat)
+            ids.append(row['id'])
+            xs.append(px)
+            ys.append(py)
+            sizes.append(len(px))
+        polygons = Layer('polygon', ids, np.concatenate(xs) if xs else [], np.concatenate(ys) if ys else [],
+                         np.concatenate(([0], np.cumsum(sizes, dtype=np.int64))))
+        return cls(markers, polygons, process_tracks(track_rows) if track_rows else None)
+
+    def set_tracks(self, segments, layers=None):
+        """Nyomvonalak cseréje; visszaadja a változott felhasználók téglalapjait.
+        A `layers` a track_layers(segments) előre (zár nélkül) kiszámolva."""
+        old = getattr(self, '_track_boxes', {})
+        self.segments = segments
+        if segments is None or not segments.segment_count():
+            self.track_zooms, self.track_levels, self.users, self._track_boxes = (), [], [], {}
+        else:
+            self.track_zooms, self.track_levels = layers or track_layers(segments)
+            self.users = list(segments.user_ids)
+            full = self.track_levels[-1]
+            self._track_boxes = {}
+            for index, user_id in enumerate(self.users):
+                first, last = segments.user_offsets[index], segments.user_offsets[index + 1]
+                self._track_boxes[user_id] = (
+                    float(full.min_x[first:last].min()), float(full.min_y[first:last].min()),
+                    float(full.max_x[first:last].max()), float(full.max_y[first:last].max()),
+                    int(segments.segment_offsets[last] - segments.segment_offsets[first]),
+                    int(segments.last_time[index]))
+        changed = []
+        for user_id in set(old) | set(self._track_boxes):
+            before, after = old.get(user_id), self._track_boxes.get(user_id)
+            if before != after:
+                changed.extend(box[:4] for box in (before, after) if box)
+        return changed
+
+    def track_layer(self, z):
+        if not self.track_levels:
+            return None
+        for index, max_zoom in enumerate(self.track_zooms):
+            if z <= max_zoom:
+                return self.track_levels[index]
+        return self.track_levels[-1]
+
+    def tile(self, z, x, y):
+        layers = {}
+        for name, layer in (('markers', self.markers), ('polygons', self.polygons), ('tracks', self.track_layer(z))):
+            if layer is not None:
+                encoded = layer.encode(z, x, y)
+                if encoded is not None:
+                    layers[name] = encoded
+        tile = {'extent': EXTENT, 'layers': layers}
+        if 'tracks' in layers:
+            tile['users'] = self.users
+        return tile
+
+    def apply_change(self, table, old, new):
+        """Egy map_markers/polygons sor változása; az érintett téglalapok."""
+        from rescue_polygons import PolygonError, decode_polyline, parse_coordinates
+
+        layer = self.markers if table == 'map_markers' else self.polygons
+        boxes = []
+        if old and old.get('id') is not None and (not new or new.get('id') != old.get('id')):
+            boxes.append(layer.remove(old['id']))
+        if new and new.get('id') is not None:
+            try:
+                if table == 'map_markers':
+                    lat, lng = [float(new['latitude'])], [float(new['longitude'])]
+                elif new.get('coordinates_polyline'):
+                    lat, lng = decode_polyline(new['coordinates_polyline'])
+                else:
+                    ring, _ = parse_coordinates(new.get('coordinates'))
+                    lng, lat = ring[:, 0], ring[:, 1]
+            except (KeyError, TypeError, ValueError, PolygonError):
+                boxes.append(layer.remove(new['id']))
+            else:
+                boxes.extend(layer.upsert(new['id'], *world_xy(lng, lat)))
+        return [box for box in boxes if box is not None]
+
+
+class TileCache:
+    """LRU cache a kész (gzipelt) csempékre, bájtkorláttal, zoomonkénti
+    nyilvántartással a téglalap szerinti érvénytelenítéshez."""
+
+    def __init__(self, max_bytes=DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = self.misses = 0
+        self._entries = OrderedDict()
+        self._by_zoom = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, entry):
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = entry
+            self._by_zoom.setdefault(key[:2], set()).add(key[2:])
+            self.size += len(entry[0])
+            while self.size > self.max_bytes and self._entries:
+                self._drop(next(iter(self._entries)))
+
+    def _drop(self, key):
+        entry = self._entries.pop(key)
+        self.size -= len(entry[0])
+        tiles = self._by_zoom.get(key[:2])
+        if tiles is not None:
+            tiles.discard(key[2:])
+
+    def invalidate(self, event_id, box):
+        """A téglalapot (perem csempékkel) érintő csempék kidobása."""
+        dropped = 0
+        with self._lock:
+            for (event, z), tiles in list(self._by_zoom.items()):
+                if event != event_id or not tiles:
+                    continue
+                scale = 2.0 ** z
+                pad = BUFFER / EXTENT
+                x0, x1 = math.floor(box[0] * scale - pad), math.floor(box[2] * scale + pad)
+                y0, y1 = math.floor(box[1] * scale - pad), math.floor(box[3] * scale + pad)
+                if (x1 - x0 + 1) * (y1 - y0 + 1) < len(tiles):
+                    hits = [(tx, ty) for tx in range(x0, x1 + 1) for ty in range(y0, y1 + 1) if (tx, ty) in tiles]
+                else:
+                    hits = [(tx, ty) for tx, ty in tiles if x0 <= tx <= x1 and y0 <= ty <= y1]
+                for tile in hits:
+                    self._drop((event, z) + tile)
+                    dropped += 1
+        return dropped
+
+    def invalidate_event(self, event_id):
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == event_id]:
+                self._drop(key)
+
+
+class TileService:
+    """Eseményenkénti csempézés + cache. A `loader(event_id)` adja a
+    (marker sorok, polygon sorok, nyomvonalak) hármast (nem létező
+    eseménynél EventNotFound), a `track_loader(event_id)` csak a
+    nyomvonalakat (frissítéshez), az `access(user_id, event_id)` azt, hogy a
+    felhasználó láthatja-e az eseményt (None: bármely bejelentkezett).
+
+    A közös zár csak a szótárakat védi. Az esemény betöltése egy Future-ön
+    át, zár nélkül fut (a többi kérő megvárja), a csempék az esemény saját
+    zárának olvasó oldalán készülnek, a rétegek cseréje az író oldalán."""
+
+    def __init__(self, loader, track_loader=None, access=None, cache_bytes=DEFAULT_CACHE_BYTES,
+                 max_events=MAX_EVENTS):
+        self.loader = loader
+        self.track_loader = track_loader
+        self.access = access
+        self.cache = TileCache(cache_bytes)
+        self.max_events = max_events
+        self.events = OrderedDict()
+        self._loading = {}
+        self._stale_tracks = {}
+        self._access = OrderedDict()
+        self._lock = threading.Lock()
+
+    def allowed(self, user_id, event_id):
+        """Láthatja-e a felhasználó az esemény csempéit (ACCESS_TTL_S-ig cache-elve)."""
+        if self.access is None:
+            return True
+        key = (user_id, event_id)
+        now = time.monotonic()
+        with self._lock:
+            cached = self._access.get(key)
+            if cached is not None and now - cached[1] < ACCESS_TTL_S:
+                return cached[0]
+        result = bool(self.access(user_id, event_id))
+        with self._lock:
+            self._access[key] = (result, now)
+            self._access.move_to_end(key)
+            while len(self._access) > MAX_ACCESS_ENTRIES:
+                self._access.popitem(last=False)
+        return result
+
+    def _add(self, event_id, tiles):
+        with self._lock:
+            self.events[event_id] = tiles
+            self.events.move_to_end(event_id)
+            evicted = []
+            while len(self.events) > self.max_events:
+                evicted.append(self.events.popitem(last=False)[0])
+                self._stale_tracks.pop(evicted[-1], None)
+        for old in evicted:
+            self.cache.invalidate_event(old)
+
+    def event(self, event_id):
+        with self._lock:
+            tiles = self.events.get(event_id)
+            if tiles is not None:
+                self.events.move_to_end(event_id)
+                future, owner = None, False
+            else:
+                future = self._loading.get(event_id)
+                owner = future is None
+                if owner:
+                    if self.loader is None:
+                        raise EventNotFound(event_id)
+                    future = self._loading[event_id] = Future()
+        if owner:
+            # a betöltés a közös zár nélkül fut; hibánál (nem létező esemény is)
+            # semmi nem marad a memóriában, a következő kérés újra próbálja
+            try:
+                tiles = EventTiles.from_rows(*self.loader(event_id))
+            except BaseException as err:
+                future.set_exception(err)
+                raise
+            else:
+                self._add(event_id, tiles)
+                future.set_result(tiles)
+            finally:
+                with self._lock:
+                    self._loading.pop(event_id, None)
+        elif future is not None:
+            tiles = future.result()
+        self._refresh_tracks(event_id, tiles)
+        return tiles
+
+    def _refresh_tracks(self, event_id, tiles):
+        with self._lock:
+            stale = self._stale_tracks.get(event_id)
+            if not stale or not self.track_loader or time.monotonic() - stale < TRACK_REFRESH_S:
+                return
+            # egyszerre egy kérő frissít, a többi addig a régi nyomvonalat kapja
+            del self._stale_tracks[event_id]
+        from rescue_tracks import process_tracks
+
+        segments = process_tracks(self.track_loader(event_id))
+        layers = track_layers(segments) if segments.segment_count() else None
+        with tiles.lock.exclusive():
+            boxes = tiles.set_tracks(segments, layers)
+            for box in boxes:
+                self.cache.invalidate(event_id, box)
+
+    def tile(self, event_id, z, x, y):
+        """(gzipelt JSON, etag) a csempéhez."""
+        key = (event_id, z, x, y)
+        entry = self.cache.get(key)
+        if entry is not None and event_id not in self._stale_tracks:
+            return entry
+        tiles = self.event(event_id)
+        # Az olvasó zár alatt az apply_webhook / Layer.compact nem cserélheti a
+        # tömböket, és egy közben érvénytelenített csempe régi tartalma sem
+        # kerülhet vissza a cache-be (a put is a zár alatt van)
+        with tiles.lock.shared():
+            entry = self.cache.get(key)
+            if entry is not None:
+                return entry
+            data = json.dumps(tiles.tile(z, x, y), separators=(',', ':')).encode('utf-8')
+            entry = (gzip.compress(data, 6), hashlib.sha1(data).hexdigest()[:16])
+            self.cache.put(key, entry)
+        return entry
+
+    def apply_webhook(self, payload):
+        """Supabase database webhook: {type, table, record, old_record}."""
+        table = payload.get('table')
+        new, old = payload.get('record'), payload.get('old_record')
+        event_id = (new or old or {}).get('event_id')
+        with self._lock:
+            tiles = self.events.get(event_id)
+            if tiles is not None and table == 'gps_tracks':
+                # A nyomvonal újraszámolása drága: legfeljebb TRACK_REFRESH_S-enként
+                self._stale_tracks.setdefault(event_id, time.monotonic())
+        if tiles is None or table not in ('map_markers', 'polygons'):
+            return 0
+        with tiles.lock.exclusive():
+            boxes = tiles.apply_change(table, old, new)
+            return sum(self.cache.invalidate(event_id, box) for box in boxes)
+
+
+# --- Adatforrás ----------------------------------------------------------------
+
+def supabase_loaders(client, batch=1000, track_batch=50000):
+    """(loader, track_loader) PostgREST-ről (rescue_data kliens), id szerinti
+    kulcsos lapozással; a három tábla egyszerre töltődik. A nyomvonalak a
+    gps_tracks tábla CSV lapjaiból oszloposan (columns_from_csv) jönnek, nem
+    az optimized_user_tracks nézet pontonkénti JSON soraiból."""
+    from rescue_tracks import columns_from_csv
+
+    def pages(table, columns, event_id):
+        return list(client.table(table).select(columns).eq('event_id', event_id).pages(batch))
+
+    def user_info(user_ids):
+        users = {}
+        for start in range(0, len(user_ids), 200):
+            rows = client.table('users').select('id,full_name,phone_number') \
+                .in_('id', user_ids[start:start + 200]).execute().data
+            users.update((row['id'], row) for row in rows)
+        return users
+
+    def track_loader(event_id):
+        pages = client.table('gps_tracks').select('id,user_id,lat,lng,acc,time').eq('event_id', event_id) \
+            .csv_pages(track_batch)
+        return columns_from_csv(pages, user_info)
+
+    def loader(event_id):
+        exists = client.table('search_events').select('id').eq('id', event_id) \
+            .is_('purge_requested_at', None).execute().data
+        if not exists:
+            raise EventNotFound(event_id)
+        markers = client.submit(pages, 'map_markers', 'id,event_id,latitude,longitude', event_id)
+        polygons = client.submit(pages, 'polygons', 'id,event_id,coordinates,coordinates_polyline', event_id)
+        tracks = track_loader(event_id)
+        return markers.result(), polygons.result(), tracks
+
+    return loader, track_loader
+
+
+def supabase_access(client):
+    """access(user_id, event_id): admin/koordinátor, vagy az esemény résztvevője."""
+    def access(user_id, event_id):
+        user = client.table('users').select('role').eq('id', user_id).execute().data
+        if user and user[0].get('role') in COORDINATOR_ROLES:
+            return True
+        return bool(client.table('event_participants').select('id').eq('event_id', event_id)
+                    .eq('user_id', user_id).limit(1).execute().data)
+
+    return access
+
+
+def synthetic_event(features, seed=1):
+    """EventTiles oszlopos szintetikus adatból: 70% marker, 10% poligon,
+    20% nyomvonal szakasz (~20 pont)."""
+    from rescue_tracks import TrackSegments
+
+    rng = np.random.default_rng(seed)
+    lat0, lng0, span = 47.8, 20.2, 0.4
+    n_markers, n_polygons = int(features * 0.7), int(features * 0.1)
+    n_segments = features - n_markers - n_polygons
+    x, y = world_xy(lng0 + rng.random(n_markers) * span, lat0 + rng.random(n_markers) * span * 0.75)
+    markers = Layer('point', np.arange(n_markers), x, y, np.arange(n_markers + 1))
+
+    vertices = rng.integers(4, 12, n_polygons)
+    owner = np.repeat(np.arange(n_polygons), vertices)
+    angle = (np.arange(vertices.sum()) - np.repeat(np.cumsum(vertices) - vertices, vertices)) \
+        / np.repeat(vertices, vertices) * 2 * math.pi
+    center_lng = lng0 + rng.random(n_polygons) * span
+    center_lat = lat0 + rng.random(n_polygons) * span * 0.75
+    radius = rng.uniform(0.0003, 0.003, n_polygons)[owner]
+    x, y = world_xy(center_lng[owner] + radius * 1.5 * np.cos(angle), center_lat[owner] + radius * np.sin(angle))
+    polygons = Layer('polygon', np.arange(n_polygons), x, y, np.r_[0, np.cumsum(vertices)])
+
+    points = rng.integers(10, 30, n_segments)
+    users = max(1, n_segments // 50)
+    steps = rng.normal(0, 0.00005, (points.sum(), 2))
+    first = np.r_[0, np.cumsum(points)[:-1]]
+    steps[first, 0] = lat0 + rng.random(n_segments) * span * 0.75
+    steps[first, 1] = lng0 + rng.random(n_segments) * span
+    walk = np.cumsum(steps, axis=0)
+    walk -= np.repeat(walk[first] - steps[first], points, axis=0)
+    time_ms = 1_715_000_000_000 + np.arange(points.sum()) * 1000
+    user_offsets = np.r_[np.arange(users) * (n_segments // users), n_segments].astype(np.int64)
+    segments = TrackSegments([f'user-{i}' for i in range(users)], [{} for _ in range(users)],
+                             user_offsets, np.r_[0, np.cumsum(points)].astype(np.int64),
+                             walk[:, 0], walk[:, 1], time_ms)
+    return EventTiles(markers, polygons, segments)
+
+
+# --- HTTP ------------------------------------------------------------------------
+
+def make_handler(service, jwt_secret, webhook_secret=None, allow_origins=()):
+    """HTTP kezelő. A csempékhez Supabase access token kell (jwt_secret), és
+    a service.allowed szerinti jogosultság; webhook_secret nélkül a /webhook
+    nem fogad változást; CORS fejléc csak az allow_origins originjeinek megy."""
+    from http.server import BaseHTTPRequestHandler
+
+    from rescue_ingest import AuthError, verify_jwt
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def _cors(self):
+            origin = self.headers.get('Origin')
+            if origin and origin in allow_origins:
+                self.send_header('Access-Control-Allow-Origin', origin)
+                self.send_header('Access-Control-Allow-Headers', 'Authorization, Content-Type, If-None-Match')
+                self.send_header('Vary', 'Origin')
+
+        def _send(self, status, body=b'', headers=()):
+            self.send_response(status)
+            self._cors()
+            for name, value in headers:
+                self.send_header(name, value)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_OPTIONS(self):
+            self._send(204)
+
+        def do_GET(self):
+            # /tiles/<event>/<z>/<x>/<y>.json
+            parts = self.path.split('?')[0].strip('/').split('/')
+            if len(parts) != 5 or parts[0] != 'tiles' or not parts[4].endswith('.json'):
+                self._send(404, b'not found')
+                return
+            try:
+                z, x, y = int(parts[2]), int(parts[3]), int(parts[4][:-5])
+            except ValueError:
+                self._send(400, b'bad tile')
+                return
+            if not (0 <= z <= MAX_ZOOM and 0 <= x < 2 ** z and 0 <= y < 2 ** z) or not parts[1].isdigit():
+                self._send(400, b'bad tile')
+                return
+            event_id = int(parts[1])
+            scheme, _, token = self.headers.get('Authorization', '').partition(' ')
+            try:
+                if scheme.lower() != 'bearer':
+                    raise AuthError('hiányzó token')
+                user_id = verify_jwt(token.strip(), jwt_secret)['sub']
+            except AuthError:
+                self._send(401, b'unauthorized', [('WWW-Authenticate', 'Bearer')])
+                return
+            try:
+                if not service.allowed(user_id, event_id):
+                    self._send(403, b'forbidden')
+                    return
+                data, etag = service.tile(event_id, z, x, y)
+            except EventNotFound:
+                self._send(404, b'no such event')
+                return
+            except Exception as err:  # Supabase hiba: a kérés később megismételhető
+                print(f"Csempe hiba (esemény {event_id}): {err}")
+                self._send(503, b'unavailable')
+                return
+            headers = [('ETag', f'"{etag}"'), ('Cache-Control', 'no-cache'), ('Vary', 'Accept-Encoding')]
+            if self.headers.get('If-None-Match') == f'"{etag}"':
+                self._send(304, headers=headers)
+            elif 'gzip' in self.headers.get('Accept-Encoding', ''):
+                self._send(200, data, headers + [('Content-Type', 'application/json'), ('Content-Encoding', 'gzip')])
+            else:
+                self._send(200, gzip.decompress(data), headers + [('Content-Type', 'application/json')])
+
+        def do_POST(self):
+            if self.path.split('?')[0].rstrip('/') != '/webhook':
+                self._send(404, b'not found')
+                return
+            length = int(self.headers.get('Content-Length') or 0)
+            body = self.rfile.read(length)
+            secret = self.headers.get('X-Webhook-Secret', '')
+            if not webhook_secret or not hmac.compare_digest(secret.encode('utf-8'), webhook_secret.encode('utf-8')):
+                self._send(403, b'forbidden')
+                return
+            try:
+                payload = json.loads(body or b'{}')
+            except ValueError:
+                self._send(400, b'bad json')
+                return
+            dropped = service.apply_webhook(payload)
+            self._send(200, json.dumps({'invalidated': dropped}).encode('utf-8'),
+                       [('Content-Type', 'application/json')])
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def serve(service, jwt_secret, host='127.0.0.1', port=8765, webhook_secret=None, allow_origins=()):
+    from http.server import ThreadingHTTPServer
+
+    server = ThreadingHTTPServer((host, port), make_handler(service, jwt_secret, webhook_secret, allow_origins))
+    print(f"Csempe szerver: http://{host}:{port}/tiles/<esemény>/{{z}}/{{x}}/{{y}}.json")
+    if not webhook_secret:
+        print("Figyelem: nincs webhook titok (--webhook-secret / TILES_WEBHOOK_SECRET), a /webhook nem fogad változást")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+# --- Benchmark ---------------------------------------------------------------
+
+def _viewport_tiles(z, lat=47.95, lng=20.4, width=4, height=3):
+    x, y = world_xy(lng, lat)
+    cx, cy = int(x * 2 ** z), int(y * 2 ** z)
+    return [(z, tx, ty) for tx in range(cx - width // 2, cx + (width + 1) // 2)
+            for ty in range(cy - height // 2, cy + (height + 1) // 2)]
+
+
+def _layer_bytes(layer):
+    arrays = [layer.x, layer.y, layer.offsets, layer.ids, layer.alive, layer.min_x, layer.min_y,
+              layer.max_x, layer.max_y, layer._keys, layer._items, *layer.props.values()]
+    return sum(array.nbytes for array in arrays)
+
+
+def bench(feature_counts=(10000, 100000, 1000000)):
+    for features in feature_counts:
+        started = time.perf_counter()
+        tiles = synthetic_event(features)
+        load_s = time.perf_counter() - started
+        resident = sum(_layer_bytes(layer) for layer in [tiles.markers, tiles.polygons, *tiles.track_levels])
+        service = TileService(loader=None)
+        service.events[1] = tiles
+        print(f"{features} elem: betöltés (index + nyomvonal piramis) {load_s * 1000:.0f} ms, "
+              f"rétegek memóriája {resident / 2 ** 20:.1f} MiB")
+        for z in (10, 12, 14, 16):
+            viewport = _viewport_tiles(z)
+            started = time.perf_counter()
+            size = sum(len(service.tile(1, *tile)[0]) for tile in viewport)
+            cold = (time.perf_counter() - started) / len(viewport)
+            started = time.perf_counter()
+            for tile in viewport:
+                service.tile(1, *tile)
+            warm = (time.perf_counter() - started) / len(viewport)
+            print(f"  zoom {z}: {len(viewport)} csempe, {size / len(viewport) / 1024:.1f} KiB/csempe (gzip), "
+                  f"hideg {cold * 1000:.1f} ms, cache-ből {warm * 1e6:.0f} µs")
+        started = time.perf_counter()
+        dropped = 0
+        for i in range(1000):
+            dropped += service.apply_webhook({'type': 'UPDATE', 'table': 'map_markers',
+                                              'old_record': {'id': i, 'event_id': 1},
+                                              'record': {'id': i, 'event_id': 1, 'latitude': 47.95,
+                                                         'longitude': 20.4}})
+        print(f"  1000 marker módosítás: {(time.perf_counter() - started) * 1000:.0f} ms, "
+              f"{dropped} csempe érvénytelenítve, cache {service.cache.size / 2 ** 20:.1f} MiB")
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Csempe generátor és szerver az esemény térképéhez')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p_serve = sub.add_parser('serve')
+    p_serve.add_argument('--host', default='127.0.0.1')
+    p_serve.add_argument('--port', type=int, default=8765)
+    p_serve.add_argument('--cache-mb', type=int, default=DEFAULT_CACHE_BYTES // 2 ** 20)
+    p_serve.add_argument('--synthetic', type=int, help='Supabase helyett ennyi szintetikus elem (esemény: 1)')
+    p_serve.add_argument('--jwt-secret', default=os.environ.get('SUPABASE_JWT_SECRET'),
+                         help='a Supabase projekt JWT secretje (alapból SUPABASE_JWT_SECRET)')
+    p_serve.add_argument('--webhook-secret', default=os.environ.get('TILES_WEBHOOK_SECRET'),
+                         help='a Supabase webhook X-Webhook-Secret fejlécének értéke (alapból TILES_WEBHOOK_SECRET)')
+    p_serve.add_argument('--allow-origin', action='append', default=[],
+                         help='CORS: engedélyezett böngészős origin (többször is megadható)')
+    p_bench = sub.add_parser('bench')
+    p_bench.add_argument('--features', default='10000,100000,1000000')
+    args = parser.parse_args(argv)
+
+    if args.command == 'bench':
+        bench(tuple(int(n) for n in args.features.split(',')))
+        return
+    if not args.jwt_secret:
+        parser.error('--jwt-secret (vagy SUPABASE_JWT_SECRET) kell')
+    if args.synthetic:
+        service = TileService(loader=None, cache_bytes=args.cache_mb * 2 ** 20)
+        service.events[1] = synthetic_event(args.synthetic)
+    else:
+        url, key = os.environ.get('SUPABASE_URL'), os.environ.get('SUPABASE_SERVICE_KEY')
+        if not url or not key:
+            parser.error('SUPABASE_URL és SUPABASE_SERVICE_KEY kell (vagy --synthetic N)')
+        from rescue_data import DataClient
+
+        client = DataClient(url, key)
+        loader, track_loader = supabase_loaders(client)
+        service = TileService(loader, track_loader, supabase_access(client), cache_bytes=args.cache_mb * 2 ** 20)
+    serve(service, args.jwt_secret, args.host, args.port, args.webhook_secret, tuple(args.allow_origin))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Időindexelt nyomvonal tár a „hol volt mindenki T időpontban?” kérdésekhez.
+
+A processUserTracks (és a rescue_tracks) csak szakaszokat és szakasz
+időket tart meg, így egy időpontra vagy idősávra csak a teljes gps_tracks
+újraolvasásával lehetne válaszolni. Itt a pontok felhasználónként idő
+szerint rendezve, egy közös tömbben vannak; a keresés egyetlen
+searchsorted hívás egy (felhasználó, idő) összetett kulcson, így egy
+időpont minden keresőre O(U log n), egy idősáv O(log n) + a találatok.
+
+A `frames` egy idővonal csúszkához egyszerre adja az összes képkocka
+pozícióit (képkocka x felhasználó mátrix), a `extend` az új pontokat
+rendezetten fésüli be újraolvasás nélkül.
+
+    python rescue_timeline.py at nezet.json --time 2026-05-06T14:32:00+00:00
+    python rescue_timeline.py bench --points 100000,1000000,10000000
+"""
+
+import json
+
+import numpy as np
+
+from rescue_tracks import ACCURACY_THRESHOLD, GAP_THRESHOLD_MS, columns_from_rows, parse_times
+
+# Az összetett kulcs alsó bitjei: az esemény kezdetétől eltelt ms (~34 év fér bele)
+_TIME_BITS = 40
+
+
+class TrackStore:
+    """Felhasználónként idő szerint rendezett pontok.
+
+    Az `u` felhasználó pontjai: lat/lng/time_ms[offsets[u]:offsets[u + 1]],
+    növekvő időrendben. A pontosság szűrés a betöltéskor történik (mint a
+    processUserTracks-ben)."""
+
+    def __init__(self, user_ids, user_info, offsets, lat, lng, time_ms):
+        self.user_ids = list(user_ids)
+        self.user_info = list(user_info)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.lat = np.asarray(lat, dtype=np.float64)
+        self.lng = np.asarray(lng, dtype=np.float64)
+        self.time_ms = np.asarray(time_ms, dtype=np.int64)
+        self._user_index = {user_id: index for index, user_id in enumerate(self.user_ids)}
+        self.base_ms = int(self.time_ms.min()) if len(self.time_ms) else 0
+        self._keys = self._make_keys(np.repeat(np.arange(len(self.user_ids)), np.diff(self.offsets)), self.time_ms)
+
+    def __len__(self):
+        return len(self.time_ms)
+
+    def _make_keys(self, user, time_ms):
+        return (np.asarray(user, dtype=np.int64) << _TIME_BITS) | (np.asarray(time_ms, dtype=np.int64) - self.base_ms)
+
+    def _query_keys(self, users, time_ms):
+        # Az esemény kezdete előtti időpont a felhasználó első pontja elé essen
+        relative = np.clip(np.asarray(time_ms, dtype=np.int64) - self.base_ms, 0, (1 << _TIME_BITS) - 1)
+        return (np.asarray(users, dtype=np.int64) << _TIME_BITS) | relative
+
+    @classmethod
+    def from_columns(cls, columns, accuracy_threshold=ACCURACY_THRESHOLD):
+        keep = ~(columns.acc > accuracy_threshold)
+        keep &= np.isfinite(columns.lat) & np.isfinite(columns.lng)
+        keep &= columns.time_ms != np.iinfo(np.int64).min
+        user, time_ms = columns.user[keep], columns.time_ms[keep]
+        # Felhasználó, azon belül idő szerint; azonos időnél az eredeti sorrend marad
+        order = np.lexsort((time_ms, user))
+        user, time_ms = user[order], time_ms[order]
+        counts = np.bincount(user, minlength=len(columns.user_ids))
+        present = np.flatnonzero(counts)
+        return cls([columns.user_ids[i] for i in present], [columns.user_info[i] for i in present],
+                   np.r_[0, np.cumsum(counts[present])], columns.lat[keep][order], columns.lng[keep][order],
+                   time_ms)
+
+    @classmethod
+    def from_rows(cls, rows, accuracy_threshold=ACCURACY_THRESHOLD):
+        """Az optimized_user_tracks nézet soraiból."""
+        return cls.from_columns(columns_from_rows(rows), accuracy_threshold)
+
+    def extend(self, columns, accuracy_threshold=ACCURACY_THRESHOLD):
+        """Új pontok befésülése (pl. a realtime gps_tracks beszúrásokból).
+        Az ismeretlen felhasználók a végére kerülnek; a tipikus, időben
+        utólag érkező pontoknál a stabil rendezés két rendezett futamot fésül."""
+        incoming = TrackStore.from_columns(columns, accuracy_threshold)
+        if not len(incoming):
+            return 0
+        user_ids, user_info = list(self.user_ids), list(self.user_info)
+        mapping = np.empty(len(incoming.user_ids), dtype=np.int64)
+        for index, user_id in enumerate(incoming.user_ids):
+            known = self._user_index.get(user_id)
+            if known is None:
+                known = len(user_ids)
+                user_ids.append(user_id)
+                user_info.append(incoming.user_info[index])
+            mapping[index] = known
+        user = np.r_[np.repeat(np.arange(len(self.user_ids)), np.diff(self.offsets)),
+                     np.repeat(mapping, np.diff(incoming.offsets))]
+        time_ms = np.r_[self.time_ms, incoming.time_ms]
+        order = np.lexsort((time_ms, user))
+        counts = np.bincount(user, minlength=len(user_ids))
+        self.__init__(user_ids, user_info, np.r_[0, np.cumsum(counts)],
+                      np.r_[self.lat, incoming.lat][order], np.r_[self.lng, incoming.lng][order], time_ms[order])
+        return len(incoming)
+
+    def time_range(self):
+        if not len(self.time_ms):
+            return None
+        return int(self.time_ms.min()), int(self.time_ms.max())
+
+    def user_slice(self, user_id, start_ms=None, end_ms=None):
+        """Egy felhasználó pontjainak indextartománya a [start_ms, end_ms] sávban."""
+        index = self._user_index[user_id]
+        first, last = int(self.offsets[index]), int(self.offsets[index + 1])
+        times = self.time_ms[first:last]
+        lo = first if start_ms is None else first + int(np.searchsorted(times, start_ms, 'left'))
+        hi = last if end_ms is None else first + int(np.searchsorted(times, end_ms, 'right'))
+        return lo, hi
+
+    def window(self, start_ms, end_ms):
+        """Minden felhasználó pontjainak [lo, hi) tartománya a [start_ms,
+        end_ms] sávban (két vektoros keresés)."""
+        users = np.arange(len(self.user_ids))
+        lo = np.searchsorted(self._keys, self._query_keys(users, start_ms), 'left')
+        if end_ms < self.base_ms:
+            return lo, lo
+        hi = np.searchsorted(self._keys, self._query_keys(users, end_ms), 'right')
+        return lo, np.maximum(hi, lo)
+
+    def window_points(self, start_ms, end_ms):
+        """(felhasználó index, lat, lng, time_ms) a sávba eső összes pontra."""
+        lo, hi = self.window(start_ms, end_ms)
+        counts = hi - lo
+        index = np.repeat(lo - (np.cumsum(counts) - counts), counts) + np.arange(counts.sum())
+        return np.repeat(np.arange(len(counts)), counts), self.lat[index], self.lng[index], self.time_ms[index]
+
+    def _positions(self, users, time_ms, max_age_ms, interpolate):
+        """A (users, time_ms) párok pozíciói; a kettő azonos alakú tömb."""
+        after = np.searchsorted(self._keys, self._query_keys(users, time_ms), 'right')
+        before = after - 1
+        start = self.offsets[users]
+        end = self.offsets[users + 1]
+        has_before = before >= start
+        safe_before = np.where(has_before, before, 0)
+        fix_time = np.where(has_before, self.time_ms[safe_before], np.iinfo(np.int64).min)
+        age = np.where(has_before, time_ms - fix_time, np.iinfo(np.int64).max)
+        # Az esemény kezdete előtti időpontot a kulcs a kezdetre vágja: age < 0
+        valid = has_before & (age >= 0) & (age <= max_age_ms)
+        lat = np.where(valid, self.lat[safe_before], np.nan)
+        lng = np.where(valid, self.lng[safe_before], np.nan)
+        if interpolate:
+            # A következő fix is a szünet küszöbön belül: egyenes vonalon a kettő között
+            has_after = valid & (after < end)
+            safe_after = np.where(has_after, after, 0)
+            span = self.time_ms[safe_after] - fix_time
+            has_after &= span <= GAP_THRESHOLD_MS
+            weight = np.where(has_after & (span > 0), age / np.where(span > 0, span, 1), 0.0)
+            lat = np.where(has_after, lat + (self.lat[safe_after] - lat) * weight, lat)
+            lng = np.where(has_after, lng + (self.lng[safe_after] - lng) * weight, lng)
+        return lat, lng, np.where(valid, fix_time, -1), valid
+
+    def positions_at(self, time_ms, max_age_ms=GAP_THRESHOLD_MS, interpolate=True):
+        """Minden kereső pozíciója az adott időpontban: (lat, lng, utolsó fix
+        ideje, érvényes) felhasználónként. Érvénytelen, ha max_age_ms-nál
+        régebbi az utolsó fix (vagy még nem volt)."""
+        users = np.arange(len(self.user_ids))
+        return self._positions(users, np.full(len(users), int(time_ms), dtype=np.int64), max_age_ms, interpolate)
+
+    def frames(self, start_ms, end_ms, step_ms, max_age_ms=GAP_THRESHOLD_MS, interpolate=True):
+        """Idővonal csúszka: (idők, lat, lng, érvényes), a pozíció tömbök
+        alakja (képkocka, felhasználó)."""
+        times = np.arange(int(start_ms), int(end_ms) + 1, int(step_ms), dtype=np.int64)
+        users = np.arange(len(self.user_ids))
+        grid_users = np.broadcast_to(users, (len(times), len(users))).ravel()
+        grid_times = np.repeat(times, len(users))
+        lat, lng, _, valid = self._positions(grid_users, grid_times, max_age_ms, interpolate)
+        shape = (len(times), len(users))
+        return times, lat.reshape(shape), lng.reshape(shape), valid.reshape(shape)
+
+    def snapshot(self, time_ms, max_age_ms=GAP_THRESHOLD_MS, interpolate=True):
+        """A kliensnek: [{user_id, full_name, lat, lng, fixTime, ageMs}]."""
+        lat, lng, fix_time, valid = self.positions_at(time_ms, max_age_ms, interpolate)
+        lat, lng, fix_time = lat.tolist(), lng.tolist(), fix_time.tolist()
+        return [{'user_id': self.user_ids[index], 'full_name': self.user_info[index].get('full_name'),
+                 'lat': lat[index], 'lng': lng[index], 'fixTime': fix_time[index],
+                 'ageMs': int(time_ms) - fix_time[index]}
+                for index in np.flatnonzero(valid).tolist()]
+
+
+# --- Benchmark ---------------------------------------------------------------
+
+def _scan_positions(columns, time_ms, max_age_ms=GAP_THRESHOLD_MS):
+    """Összehasonlításhoz: a teljes ponthalmaz átnézése (ahogy a gps_tracks
+    újraolvasása tenné), interpoláció nélkül."""
+    keep = ~(columns.acc > ACCURACY_THRESHOLD) & (columns.time_ms <= time_ms) \
+        & (columns.time_ms >= time_ms - max_age_ms)
+    user, times = columns.user[keep], columns.time_ms[keep]
+    latest = np.full(len(columns.user_ids), -1, dtype=np.int64)
+    np.maximum.at(latest, user, times)
+    return latest
+
+
+def bench(point_counts=(100000, 1000000, 10000000), users=300, queries=1000):
+    import time
+
+    from rescue_tracks import synthetic_columns
+
+    rng = np.random.default_rng(1)
+    print(f"{users} kereső, 1 Hz")
+    print(f"{'pont':>10}{'építés':>10}{'T pozíció':>12}{'10 perc sáv':>13}"
+          f"{'képkockák':>20}{'teljes átnézés':>16}")
+    for points in point_counts:
+        columns = synthetic_columns(users, points / users / 3600)
+        started = time.perf_counter()
+        store = TrackStore.from_columns(columns)
+        build = time.perf_counter() - started
+        first, last = store.time_range()
+        probes = rng.integers(first, last, queries)
+
+        timings = []
+        for t in probes.tolist():
+            started = time.perf_counter()
+            store.positions_at(t)
+            timings.append(time.perf_counter() - started)
+        at_us = sorted(timings)[len(timings) // 2] * 1e6
+
+        timings = []
+        for t in probes[:200].tolist():
+            started = time.perf_counter()
+            store.window(t, t + 600_000)
+            timings.append(time.perf_counter() - started)
+        window_us = sorted(timings)[len(timings) // 2] * 1e6
+
+        started = time.perf_counter()
+        times, _, _, _ = store.frames(first, last, 60_000)
+        frames_ms = (time.perf_counter() - started) * 1000
+
+        timings = []
+        for t in probes[:5].tolist():
+            started = time.perf_counter()
+            expected = _scan_positions(columns, t)
+            timings.append(time.perf_counter() - started)
+            _, _, fix_time, valid = store.positions_at(t, interpolate=False)
+            got = np.full(len(columns.user_ids), -1, dtype=np.int64)
+            present = [columns.user_ids.index(user_id) for user_id in store.user_ids]
+            got[present] = np.where(valid, fix_time, -1)
+            assert np.array_equal(got, expected), 'eltérés a teljes átnézéstől'
+        scan_ms = sorted(timings)[len(timings) // 2] * 1000
+
+        print(f"{len(store):>10}{build * 1000:>8.0f}ms{at_us:>10.0f}µs{window_us:>11.0f}µs"
+              f"{frames_ms:>9.0f}ms/{len(times):>5} kép{scan_ms:>14.1f}ms")
+
+
+def main(argv=None):
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description='Időindexelt nyomvonal tár (visszajátszás)')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p_at = sub.add_parser('at', help='a keresők pozíciója egy időpontban')
+    p_at.add_argument('path', help="optimized_user_tracks sorai JSON-ban ('-': stdin)")
+    p_at.add_argument('--time', required=True, help='ISO időpont, pl. 2026-05-06T14:32:00+00:00')
+    p_at.add_argument('--max-age', type=int, default=GAP_THRESHOLD_MS // 1000, help='másodperc')
+    p_at.add_argument('--no-interpolate', action='store_true')
+    p_bench = sub.add_parser('bench')
+    p_bench.add_argument('--points', default='100000,1000000,10000000')
+    p_bench.add_argument('--users', type=int, default=300)
+    args = parser.parse_args(argv)
+
+    if args.command == 'bench':
+        bench(tuple(int(n) for n in args.points.split(',')), args.users)
+        return
+    if args.path == '-':
+        rows = json.load(sys.stdin)
+    else:
+        with open(args.path, encoding='utf-8') as f:
+            rows = json.load(f)
+    time_ms = int(parse_times([args.time])[0])
+    if time_ms == np.iinfo(np.int64).min:
+        parser.error(f'Érvénytelen időpont: {args.time}')
+    store = TrackStore.from_rows(rows)
+    json.dump(store.snapshot(time_ms, args.max_age * 1000, not args.no_interpolate), sys.stdout,
+              ensure_ascii=False, separators=(',', ':'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,510 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Nyomvonal feldolgozás oszlopos NumPy tömbökkel.
+
+Ugyanazt csinálja, mint a SearchManager.jsx processUserTracks függvénye az
+optimized_user_tracks nézet sorain, csak pontonkénti JS ciklus helyett
+vektorosan:
+
+  1. pontosság szűrés: az 50 m-nél pontatlanabb pontok kiesnek,
+  2. szünet detektálás: két pont között 120 s-nál nagyobb idő új szakaszt nyit,
+  3. szakaszonként kezdő és záró idő, felhasználónként az utolsó idő.
+
+Az eredmény (TrackSegments) tömör: a pontok egy közös lat/lng tömbben vannak,
+a szakaszokat és a felhasználókat offset tömbök határolják. A to_dict() a JS
+által használt alakot adja ({segments, segmentTimes, userInfo, lastTime}).
+
+Bemenet: a nézet JSON sorai (columns_from_rows, kis eseményre), vagy nagy
+eseménynél a gps_tracks tábla PostgREST CSV lapjai (columns_from_csv), amik
+lapról lapra, pontonkénti dict-ek nélkül lesznek oszlopok.
+
+    python rescue_tracks.py process nezet.json > szakaszok.json
+    python rescue_tracks.py bench --users 200 --hours 8
+"""
+
+import io
+import json
+from datetime import datetime
+from operator import itemgetter
+
+import numpy as np
+
+ACCURACY_THRESHOLD = 50  # méter
+GAP_THRESHOLD_MS = 120 * 1000  # 2 perc
+ROW_BENCH_USERS = 20
+
+
+class TrackColumns:
+    """Pontok oszlopos alakban; egy felhasználó pontjai egymás után, az
+    eredeti sorrendben. user: index a user_ids/user_info listákba."""
+
+    def __init__(self, user_ids, user_info, user, lat, lng, acc, time_ms):
+        self.user_ids = list(user_ids)
+        self.user_info = list(user_info)
+        self.user = np.asarray(user, dtype=np.int32)
+        self.lat = np.asarray(lat, dtype=np.float64)
+        self.lng = np.asarray(lng, dtype=np.float64)
+        self.acc = np.asarray(acc, dtype=np.float64)
+        self.time_ms = np.asarray(time_ms, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.user)
+
+
+class TrackSegments:
+    """Szakaszokra bontott nyomvonalak.
+
+    A `s` szakasz pontjai: lat/lng/time_ms[segment_offsets[s]:segment_offsets[s + 1]],
+    az `u` felhasználó szakaszai: user_offsets[u]:user_offsets[u + 1].
+    """
+
+    def __init__(self, user_ids, user_info, user_offsets, segment_offsets, lat, lng, time_ms):
+        self.user_ids = user_ids
+        self.user_info = user_info
+        self.user_offsets = user_offsets
+        self.segment_offsets = segment_offsets
+        self.lat = lat
+        self.lng = lng
+        self.time_ms = time_ms
+
+    @property
+    def segment_start(self):
+        return self.time_ms[self.segment_offsets[:-1]]
+
+    @property
+    def segment_end(self):
+        return self.time_ms[self.segment_offsets[1:] - 1]
+
+    @property
+    def last_time(self):
+        """Felhasználónként az utolsó (érvényes) pont ideje."""
+        return self.time_ms[self.segment_offsets[self.user_offsets[1:]] - 1]
+
+    def __len__(self):
+        return len(self.user_ids)
+
+    def segment_count(self):
+        return len(self.segment_offsets) - 1
+
+    def user_segments(self, index):
+        """Az `index`-edik felhasználó szakaszai: [(lat, lng, time_ms)] nézetek."""
+        offsets = self.segment_offsets[self.user_offsets[index]:self.user_offsets[index + 1] + 1]
+        return [(self.lat[a:b], self.lng[a:b], self.time_ms[a:b]) for a, b in zip(offsets[:-1], offsets[1:])]
+
+    def to_dict(self):
+        """A processUserTracks kimenete: {user_id: {segments, segmentTimes, userInfo, lastTime}}."""
+        coords = np.column_stack((self.lat, self.lng)).tolist()
+        offsets = self.segment_offsets.tolist()
+        starts = self.segment_start.tolist()
+        ends = self.segment_end.tolist()
+        last_times = self.last_time.tolist()
+        result = {}
+        for index, user_id in enumerate(self.user_ids):
+            first, last = self.user_offsets[index], self.user_offsets[index + 1]
+            result[user_id] = {
+                'segments': [coords[offsets[s]:offsets[s + 1]] for s in range(first, last)],
+                'segmentTimes': [{'start': starts[s], 'end': ends[s]} for s in range(first, last)],
+                'userInfo': self.user_info[index],
+                'lastTime': last_times[index],
+            }
+        return result
+
+
+# --- Betöltés a nézet soraiból -----------------------------------------------
+
+def _js_truthy(value):
+    return value not in (None, '', 0, False)
+
+
+def _js_truthy_array(values):
+    """_js_truthy elemenként egy object tömbön (a False == 0 miatt elég a 0)."""
+    return np.not_equal(values, None) & np.not_equal(values, '') & np.not_equal(values, 0)
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _float_array(values):
+    """object tömb (számok vagy számot tartalmazó szövegek) -> float64; ami
+    nem szám, az NaN."""
+    try:
+        return values.astype(np.float64)
+    except (TypeError, ValueError):
+        return np.array([_to_float(v) for v in values.tolist()], dtype=np.float64)
+
+
+def parse_times(values):
+    """ISO időbélyegek -> epoch ms (int64). A Postgres timestamptz JSON-ja
+    UTC-ben jön ('...+00:00' vagy 'Z', a CSV/szöveges alak '...+00'): ennél a
+    végződést a karakterkódok tömbjében nullázzuk ki, és egyetlen datetime64
+    konverzió jön; a többi eltolást elemenként kezeljük. Az érvénytelen idő
+    helyén INT64 minimum áll."""
+    texts = np.asarray(values, dtype=str)
+    invalid = np.iinfo(np.int64).min
+    if len(texts) == 0:
+        return np.empty(0, dtype=np.int64)
+    result = np.full(len(texts), invalid, dtype=np.int64)
+    lengths = np.char.str_len(texts)
+    suffix = np.select([np.char.endswith(texts, '+00:00'), np.char.endswith(texts, '+00'), np.char.endswith(texts, 'Z')],
+                       [6, 3, 1], 0)
+    utc = suffix > 0
+    if utc.any():
+        width = texts.dtype.itemsize // 4
+        codes = np.ascontiguousarray(texts[utc]).view(np.uint32).reshape(-1, width).copy()
+        # A végződés helyén 0: a fix szélességű unicode tömbben ez a szöveg vége
+        codes[np.arange(width) >= (lengths[utc] - suffix[utc])[:, None]] = 0
+        try:
+            result[utc] = codes.view(texts.dtype).ravel().astype('datetime64[ms]').astype(np.int64)
+        except ValueError:
+            utc[:] = False
+    for index in np.flatnonzero(~utc):
+        try:
+            parsed = datetime.fromisoformat(texts[index].replace('Z', '+00:00'))
+        except ValueError:
+            continue
+        if parsed.tzinfo is None:
+            # A JS Date az eltolás nélküli időt helyi időnek veszi; a szerver UTC
+            result[index] = int(np.datetime64(parsed, 'ms').astype(np.int64))
+        else:
+            result[index] = int(parsed.timestamp() * 1000)
+    return result
+
+
+_POINT_FIELDS = tuple(itemgetter(key) for key in ('lat', 'lng', 'acc', 'time'))
+
+
+def _point_fields(points):
+    """Egy sor pontjai -> (lat, lng, acc, time) oszlop listák. A gyors út
+    mezőnként egy C szintű map(itemgetter); hiányzó kulcsnál vagy üres
+    pontnál .get-tel."""
+    try:
+        return [list(map(getter, points)) for getter in _POINT_FIELDS]
+    except (KeyError, TypeError):
+        return [[point.get(key) if point else None for point in points] for key in ('lat', 'lng', 'acc', 'time')]
+
+
+def columns_from_rows(rows):
+    """Az optimized_user_tracks nézet sorai (user_id, user_name, user_phone,
+    track_points: [{lat, lng, acc, time}]) -> TrackColumns.
+
+    A pontokat soronként egyben oszlopokra bontjuk, a JS-hez hasonló szűrés
+    (hiányzó/üres lat, lng vagy time kiesik) és a szám/idő konverzió már a
+    lapított tömbökön fut, pontonkénti Python ciklus nélkül."""
+    user_ids, user_info, counts = [], [], []
+    lat, lng, acc, times = [], [], [], []
+    for row in rows:
+        if not row or not _js_truthy(row.get('user_id')) or not row.get('track_points'):
+            continue
+        user_ids.append(row['user_id'])
+        user_info.append({'full_name': row.get('user_name') or 'Ismeretlen',
+                          'phone_number': row.get('user_phone') or 'N/A'})
+        fields = _point_fields(row['track_points'])
+        counts.append(len(row['track_points']))
+        for column, values in zip((lat, lng, acc, times), fields):
+            column.extend(values)
+    user = np.repeat(np.arange(len(user_ids), dtype=np.int32), counts)
+    lat, lng, acc, times = (np.array(column, dtype=object) for column in (lat, lng, acc, times))
+    keep = _js_truthy_array(lat) & _js_truthy_array(lng) & _js_truthy_array(times)
+    if not keep.all():
+        user, lat, lng, acc, times = user[keep], lat[keep], lng[keep], acc[keep], times[keep]
+    # A JS csak igaz értékű acc-ot vizsgál: a hiányzó acc átmegy a szűrőn
+    acc = np.where(_js_truthy_array(acc), acc, np.nan)
+    return TrackColumns(user_ids, user_info, user, _float_array(lat), _float_array(lng), _float_array(acc),
+                        parse_times(times))
+
+
+CSV_COLUMNS = ('user_id', 'lat', 'lng', 'acc', 'time')
+
+
+def _csv_page(page):
+    """Egy PostgREST text/csv lap (fejléc + sorok, a null üres mező) ->
+    (user_id, lat, lng, acc, time) oszlopok; a fejléc szerint bármilyen
+    oszlop sorrendben. A számokat a np.loadtxt C olvasója bontja."""
+    header, _, body = page.partition(b'\n')
+    names = header.decode('ascii').strip().split(',')
+    try:
+        positions = [names.index(name) for name in CSV_COLUMNS]
+    except ValueError:
+        raise ValueError(f"a CSV oszlopai: {', '.join(CSV_COLUMNS)} (ez: {header!r})") from None
+    if not body.strip():
+        return None
+    # az üres (null) mezők helyére 'nan' (a ',,,' miatt kétszer); a sor eleji
+    # és végi üres mezőt a körülvevő sortörésekkel együtt cseréljük
+    body = b'\n' + body.rstrip(b'\n') + b'\n'
+    body = body.replace(b',,', b',nan,').replace(b',,', b',nan,')
+    body = body.replace(b',\n', b',nan\n').replace(b'\n,', b'\nnan,')
+    dtype = [(name, 'S64' if name in ('user_id', 'time') else 'f8') for name in CSV_COLUMNS]
+    table = np.loadtxt(io.BytesIO(body), delimiter=',', quotechar='"', usecols=positions, dtype=dtype, ndmin=1,
+                       encoding=None)
+    return [table[name] for name in CSV_COLUMNS]
+
+
+def columns_from_csv(pages, user_info=None):
+    """gps_tracks sorok PostgREST CSV lapjai (user_id, lat, lng, acc, time) ->
+    TrackColumns, a nézet sorai és a soronkénti dict-ek nélkül.
+
+    Lapról lapra bontjuk oszlopokra, így a memóriában csak a numerikus
+    tömbök és az éppen feldolgozott lap van. Egy felhasználó pontjai a lapok
+    sorrendjében maradnak (a process_columns stabil rendezéssel csoportosít);
+    a user_info {user_id: {full_name, phone_number}}, vagy egy függvény, ami
+    a user_id listából adja ezt; a hiányzó felhasználó 'Ismeretlen' / 'N/A'.
+
+    Nem gyorsabb a columns_from_rows-nál (mindkettőnél a szöveg -> szám
+    konverzió a korlát, ~0.3 M pont/s), de a memória pontonként ~36 bájt és
+    egy lap, a nézet JSON sorainak ~0.5 kB-ja helyett: 200 kereső x 8 óra
+    így ~0.2 GB, nem ~2.7 GB."""
+    index, user_ids = {}, []
+    parts = []
+    for page in pages:
+        columns = _csv_page(page)
+        if columns is None:
+            continue
+        users, lat, lng, acc, times = columns
+        unique, first, inverse = np.unique(users, return_index=True, return_inverse=True)
+        mapping = np.empty(len(unique), dtype=np.int32)
+        # az első előfordulás sorrendjében, ahogy a nézet sorai is jönnének
+        for position in np.argsort(first).tolist():
+            user_id = unique[position].decode('utf-8')
+            if user_id not in index:
+                index[user_id] = len(user_ids)
+                user_ids.append(user_id)
+            mapping[position] = index[user_id]
+        keep = (users != b'nan') & (times != b'nan')
+        parts.append((mapping[inverse][keep], lat[keep], lng[keep], acc[keep],
+                      parse_times(np.char.decode(times[keep], 'ascii'))))
+    if not parts:
+        return TrackColumns([], [], [], [], [], [], [])
+    if callable(user_info):
+        user_info = user_info(user_ids)
+    user_info = user_info or {}
+    info = [{'full_name': (user_info.get(user_id) or {}).get('full_name') or 'Ismeretlen',
+             'phone_number': (user_info.get(user_id) or {}).get('phone_number') or 'N/A'} for user_id in user_ids]
+    # a JS csak igaz értékű lat/lng-t enged át: a 0 és a hiányzó kiesik
+    user, lat, lng, acc, time_ms = (np.concatenate(column) for column in zip(*parts))
+    keep = np.isfinite(lat) & np.isfinite(lng) & (lat != 0) & (lng != 0)
+    return TrackColumns(user_ids, info, user[keep], lat[keep], lng[keep], np.where(acc != 0, acc, np.nan)[keep],
+                        time_ms[keep])
+
+
+# --- Feldolgozás -------------------------------------------------------------
+
+def process_columns(columns, accuracy_threshold=ACCURACY_THRESHOLD, gap_ms=GAP_THRESHOLD_MS):
+    """Pontosság szűrés + szünet szerinti szakaszolás. Egy felhasználó pontjai
+    a TrackColumns-ban egymás után állnak; a sorrendjükön nem változtatunk
+    (a JS sem rendez)."""
+    user = columns.user
+    if len(user) > 1 and np.any(user[1:] < user[:-1]):
+        order = np.argsort(user, kind='stable')
+    else:
+        order = None
+
+    # NaN acc (hiányzó vagy nem szám) átmegy, ahogy a JS-ben is
+    keep = ~(columns.acc > accuracy_threshold)
+    keep &= np.isfinite(columns.lat) & np.isfinite(columns.lng)
+    keep &= columns.time_ms != np.iinfo(np.int64).min
+    if order is not None:
+        order = order[keep[order]]
+        user, lat, lng, time_ms = user[order], columns.lat[order], columns.lng[order], columns.time_ms[order]
+    else:
+        user, lat, lng, time_ms = user[keep], columns.lat[keep], columns.lng[keep], columns.time_ms[keep]
+
+    count = len(user)
+    boundary = np.ones(count, dtype=bool)
+    if count > 1:
+        boundary[1:] = (user[1:] != user[:-1]) | (np.diff(time_ms) > gap_ms)
+    segment_starts = np.flatnonzero(boundary)
+    segment_offsets = np.append(segment_starts, count).astype(np.int64)
+
+    # Csak az érvényes ponttal rendelkező felhasználók maradnak
+    segment_user = user[segment_starts]
+    user_first = np.flatnonzero(np.r_[True, segment_user[1:] != segment_user[:-1]]) if len(segment_user) else \
+        np.empty(0, dtype=np.int64)
+    user_offsets = np.append(user_first, len(segment_starts)).astype(np.int64)
+    present = segment_user[user_first]
+    return TrackSegments([columns.user_ids[i] for i in present], [columns.user_info[i] for i in present],
+                         user_offsets, segment_offsets, lat, lng, time_ms)
+
+
+def process_rows(rows, accuracy_threshold=ACCURACY_THRESHOLD, gap_ms=GAP_THRESHOLD_MS):
+    """A backend belépési pontja: nézet sorai -> TrackSegments.
+
+    Korlátok: a sorok (pontonként egy dict) átalakítása kb. 0.3-0.4 M pont/s,
+    és a JSON szöveggel együtt pontonként ~0.5 kB memória; 200 kereső x 8 óra
+    (5.8 M pont) ~20 s és ~2.7 GB. Nagy eseménynél a gps_tracks CSV lapjait
+    kell columns_from_csv-vel betölteni (process_tracks)."""
+    return process_columns(columns_from_rows(rows), accuracy_threshold, gap_ms)
+
+
+def process_tracks(tracks, accuracy_threshold=ACCURACY_THRESHOLD, gap_ms=GAP_THRESHOLD_MS):
+    """TrackColumns (columns_from_csv) vagy a nézet sorai -> TrackSegments."""
+    if isinstance(tracks, TrackColumns):
+        return process_columns(tracks, accuracy_threshold, gap_ms)
+    return process_rows(tracks, accuracy_threshold, gap_ms)
+
+
+# --- Benchmark ---------------------------------------------------------------
+
+def synthetic_columns(users=200, hours=8, rate_hz=1, seed=1):
+    """Szintetikus esemény: bolyongó kereső pontok, ~5% pontatlan pont,
+    időnként 3-10 perces kiesés."""
+    rng = np.random.default_rng(seed)
+    per_user = int(hours * 3600 * rate_hz)
+    count = users * per_user
+    user = np.repeat(np.arange(users, dtype=np.int32), per_user)
+    step_ms = np.full(count, int(1000 / rate_hz), dtype=np.int64)
+    gaps = rng.random(count) < 1 / 1800
+    step_ms[gaps] += rng.integers(180, 600, gaps.sum()) * 1000
+    step_ms[::per_user] = 0
+    time_ms = 1_715_000_000_000 + np.cumsum(step_ms)
+    time_ms -= np.repeat(time_ms[::per_user] - 1_715_000_000_000, per_user)
+    walk = rng.normal(0, 0.00002, (count, 2))
+    walk[::per_user] = 0
+    walk = np.cumsum(walk, axis=0)
+    walk -= np.repeat(walk[::per_user], per_user, axis=0)
+    lat = 47.9 + walk[:, 0] + np.repeat(rng.normal(0, 0.01, users), per_user)
+    lng = 20.4 + walk[:, 1] + np.repeat(rng.normal(0, 0.01, users), per_user)
+    acc = np.where(rng.random(count) < 0.05, rng.uniform(51, 200, count), rng.uniform(3, 30, count))
+    user_ids = [f'user-{i}' for i in range(users)]
+    info = [{'full_name': f'Kereső {i}', 'phone_number': 'N/A'} for i in range(users)]
+    return TrackColumns(user_ids, info, user, lat, lng, acc, time_ms)
+
+
+def _reference(rows):
+    """A processUserTracks soronkénti megfelelője az eredmény ellenőrzéséhez."""
+    result = {}
+    for row in rows:
+        segments, times, last_time = [[]], [{'start': None, 'end': None}], None
+        for point in row['track_points']:
+            if point['acc'] and float(point['acc']) > ACCURACY_THRESHOLD:
+                continue
+            current = point['time_ms']
+            if last_time and current - last_time > GAP_THRESHOLD_MS:
+                segments.append([])
+                times.append({'start': current, 'end': current})
+            segments[-1].append([float(point['lat']), float(point['lng'])])
+            if len(segments[-1]) == 1:
+                times[-1]['start'] = current
+            times[-1]['end'] = current
+            last_time = current
+        if segments[0]:
+            result[row['user_id']] = (segments, times, last_time)
+    return result
+
+
+def bench(users=200, hours=8, repeat=5):
+    import time
+
+    columns = synthetic_columns(users, hours)
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        segments = process_columns(columns)
+        timings.append(time.perf_counter() - started)
+    print(f"{users} kereső x {hours} óra, 1 Hz: {len(columns)} pont -> "
+          f"{segments.segment_count()} szakasz, {len(segments.lat)} pont marad")
+    print(f"process_columns: legjobb {min(timings) * 1000:.0f} ms, medián "
+          f"{sorted(timings)[len(timings) // 2] * 1000:.0f} ms")
+
+    # A backend útja: a gps_tracks CSV lapjai (id szerint, a felhasználók
+    # pontjai összefésülve, ahogy beérkeztek) -> oszlopok -> szakaszok; a lapok
+    # felépítése nem számít bele
+    order = np.lexsort((columns.user, columns.time_ms))
+    pages = []
+    for start in range(0, len(order), 50000):
+        chunk = order[start:start + 50000]
+        stamps = np.char.replace(columns.time_ms[chunk].astype('datetime64[ms]').astype(str), 'T', ' ').tolist()
+        lines = ['id,user_id,lat,lng,acc,time']
+        lines += [f'{i},{columns.user_ids[u]},{a!r},{b!r},{c!r},"{t}+00"' for i, u, a, b, c, t in zip(
+            (chunk + 1).tolist(), columns.user[chunk].tolist(), columns.lat[chunk].tolist(),
+            columns.lng[chunk].tolist(), columns.acc[chunk].tolist(), stamps)]
+        pages.append('\n'.join(lines).encode())
+    conversion, total = [], []
+    for _ in range(max(1, repeat // 2)):
+        started = time.perf_counter()
+        converted = columns_from_csv(pages, dict(zip(columns.user_ids, columns.user_info)))
+        conversion.append(time.perf_counter() - started)
+        from_csv = process_columns(converted)
+        total.append(time.perf_counter() - started)
+    print(f"gps_tracks CSV ({sum(map(len, pages)) / 1e6:.0f} MB, {len(pages)} lap): legjobb "
+          f"{min(total) * 1000:.0f} ms, ebből columns_from_csv {min(conversion) * 1000:.0f} ms "
+          f"({len(columns) / min(conversion) / 1e6:.1f} M pont/s)")
+    same_csv = all(np.array_equal(getattr(from_csv, name), getattr(segments, name))
+                   for name in ('user_offsets', 'segment_offsets', 'lat', 'lng', 'time_ms'))
+    print(f"A CSV-ből épített szakaszok egyeznek: {'igen' if same_csv else 'NEM'}")
+    del pages, converted, from_csv
+
+    # A nézet JSON sorai (pontonként egy dict): a teljes eseményre nem fér a
+    # memóriába, ezért csak az első ROW_BENCH_USERS keresőn mérjük
+    sample_users = min(users, ROW_BENCH_USERS)
+    sample_count = int(np.searchsorted(columns.user, sample_users))
+    times = columns.time_ms[:sample_count].astype('datetime64[ms]').astype(str)
+    bounds = np.r_[0, np.cumsum(np.bincount(columns.user[:sample_count], minlength=sample_users))].tolist()
+    lat, lng, acc = columns.lat.tolist(), columns.lng.tolist(), columns.acc.tolist()
+    times = times.tolist()
+    view_rows = [{'user_id': user_id, 'user_name': info['full_name'], 'user_phone': info['phone_number'],
+                  'track_points': [{'lat': repr(lat[i]), 'lng': repr(lng[i]), 'acc': repr(acc[i]),
+                                    'time': times[i] + '+00:00'} for i in range(bounds[u], bounds[u + 1])]}
+                 for u, (user_id, info) in enumerate(zip(columns.user_ids[:sample_users],
+                                                         columns.user_info[:sample_users]))]
+    conversion, total = [], []
+    for _ in range(max(1, repeat // 2)):
+        started = time.perf_counter()
+        converted = columns_from_rows(view_rows)
+        conversion.append(time.perf_counter() - started)
+        process_columns(converted)
+        total.append(time.perf_counter() - started)
+    print(f"process_rows ({sample_users} kereső nézet sorai, {sample_count} pont): legjobb "
+          f"{min(total) * 1000:.0f} ms, ebből columns_from_rows {min(conversion) * 1000:.0f} ms "
+          f"({sample_count / min(conversion) / 1e6:.1f} M pont/s)")
+    same_rows = all(np.array_equal(getattr(converted, name), getattr(columns, name)[:sample_count], equal_nan=True)
+                    for name in ('user', 'lat', 'lng', 'acc', 'time_ms'))
+    print(f"A sorokból visszaalakított oszlopok egyeznek: {'igen' if same_rows else 'NEM'}")
+
+    # Ellenőrzés a soronkénti változattal egy kisebb mintán
+    sample = synthetic_columns(5, 1, seed=2)
+    rows = []
+    for index, user_id in enumerate(sample.user_ids):
+        mask = sample.user == index
+        rows.append({'user_id': user_id, 'track_points': [
+            {'lat': repr(a), 'lng': repr(b), 'acc': repr(c), 'time_ms': int(t)}
+            for a, b, c, t in zip(sample.lat[mask].tolist(), sample.lng[mask].tolist(), sample.acc[mask].tolist(),
+                                  sample.time_ms[mask].tolist())]})
+    expected = _reference(rows)
+    got = process_columns(sample).to_dict()
+    same = all(got[u]['segments'] == segs and got[u]['segmentTimes'] == times and got[u]['lastTime'] == last
+               for u, (segs, times, last) in expected.items()) and set(got) == set(expected)
+    print(f"Egyezés a soronkénti feldolgozással: {'igen' if same else 'NEM'}")
+
+
+def main(argv=None):
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description='Nyomvonalak szakaszolása (processUserTracks, NumPy)')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p_process = sub.add_parser('process', help='optimized_user_tracks JSON -> szakaszok JSON')
+    p_process.add_argument('path', help="a nézet sorai JSON-ban ('-': stdin)")
+    p_bench = sub.add_parser('bench')
+    p_bench.add_argument('--users', type=int, default=200)
+    p_bench.add_argument('--hours', type=float, default=8)
+    p_bench.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    if args.command == 'process':
+        if args.path == '-':
+            rows = json.load(sys.stdin)
+        else:
+            with open(args.path, encoding='utf-8') as f:
+                rows = json.load(f)
+        json.dump(process_rows(rows).to_dict(), sys.stdout, ensure_ascii=False, separators=(',', ':'))
+    elif args.command == 'bench':
+        bench(args.users, args.hours, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
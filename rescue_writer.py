@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Inkrementális, atomikus fájlírás a generátor scriptekhez.
+
+A cél mappában egy manifest (.rescue-manifest.json) tárolja minden generált
+fájl sha256 hash-ét, méretét és mtime-ját. Csak a ténylegesen változott
+fájlokat írjuk újra, így a Vite dev szerver is csak azokat tölti újra;
+a manifestben szereplő, de már nem generált fájlokat töröljük.
+
+Az írás két lépésben történik: a változott fájlokat egy szálkészleten
+ideiglenes fájlokba írjuk a célfájl mellé, majd az egész halmazt egy
+tranzakcióként, atomikus átnevezéssel publikáljuk. Hiba vagy Ctrl-C esetén
+a már publikált fájlokat visszaállítjuk, így a projekt nem marad félig
+frissítve.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+MANIFEST_NAME = '.rescue-manifest.json'
+MANIFEST_VERSION = 1
+BACKUP_SUFFIX = '.rescue-bak'
+
+# Az umask csak visszaállítással olvasható ki; egyszer, még a szálak előtt
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def load_manifest(base_dir, manifest_name=MANIFEST_NAME):
+    path = os.path.join(base_dir, manifest_name)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+    if manifest.get('version') != MANIFEST_VERSION:
+        return {}
+    return manifest.get('files', {})
+
+
+def save_manifest(base_dir, entries, manifest_name=MANIFEST_NAME):
+    path = os.path.join(base_dir, manifest_name)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': MANIFEST_VERSION, 'files': entries}, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def _stat_entry(full_path, digest):
+    st = os.stat(full_path)
+    return {'sha256': digest, 'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+
+
+def disk_hash(full_path, entry=None):
+    """A lemezen lévő fájl hash-e; ha a méret és az mtime egyezik a
+    manifesttel, a fájlt nem olvassuk be újra."""
+    try:
+        st = os.stat(full_path)
+    except FileNotFoundError:
+        return None
+    if entry and entry.get('size') == st.st_size and entry.get('mtime_ns') == st.st_mtime_ns:
+        return entry['sha256']
+    with open(full_path, 'rb') as f:
+        return content_hash(f.read())
+
+
+def _target_mode(full_path):
+    """A mkstemp 0600-as jogosultsága helyett a meglévő fájlé, vagy az
+    umask szerinti alapértelmezett."""
+    try:
+        return os.stat(full_path).st_mode & 0o777
+    except FileNotFoundError:
+        return 0o666 & ~_UMASK
+
+
+def _stage(full_path, files, rel_path, digest, entry, encoding):
+    """Kódolás, hash-elés és (ha kell) ideiglenes fájlba írás egy szálon.
+
+    Ha a hash előre ismert és egyezik a lemezen lévővel, a tartalmat
+    (files[rel_path]) nem is olvassuk ki."""
+    start = time.perf_counter()
+    tmp_path = None
+    if digest is not None and disk_hash(full_path, entry) == digest:
+        return digest, tmp_path, time.perf_counter() - start
+    content = files[rel_path]
+    data = content.encode(encoding) if isinstance(content, str) else bytes(content)
+    digest = content_hash(data)
+    if disk_hash(full_path, entry) != digest:
+        directory = os.path.dirname(full_path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(full_path) + '.',
+                                        suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.chmod(tmp_path, _target_mode(full_path))
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+    return digest, tmp_path, time.perf_counter() - start
+
+
+def _backup(full_path):
+    """A meglévő célfájl mentése a visszaállításhoz (hardlink, ha lehet)."""
+    if not os.path.exists(full_path):
+        return None
+    backup_path = full_path + BACKUP_SUFFIX
+    if os.path.lexists(backup_path):
+        os.remove(backup_path)
+    try:
+        os.link(full_path, backup_path)
+    except OSError:
+        shutil.copy2(full_path, backup_path)
+    return backup_path
+
+
+class WriteTransaction:
+    """Ideiglenes fájlok publikálása és törlések egy visszagörgethető
+    egységként."""
+
+    def __init__(self):
+        self._staged = []      # (full_path, tmp_path)
+        self._removals = []    # full_path
+        self._done = []        # (full_path, backup_path)
+
+    def stage(self, full_path, tmp_path):
+        self._staged.append((full_path, tmp_path))
+
+    def remove(self, full_path):
+        self._removals.append(full_path)
+
+    def commit(self):
+        try:
+            for full_path, tmp_path in self._staged:
+                backup_path = _backup(full_path)
+                self._done.append((full_path, backup_path))
+                os.replace(tmp_path, full_path)
+            for full_path in self._removals:
+                backup_path = _backup(full_path)
+                self._done.append((full_path, backup_path))
+                os.remove(full_path)
+        except BaseException:
+            self.rollback()
+            raise
+        for _, backup_path in self._done:
+            if backup_path:
+                os.remove(backup_path)
+        self._done = []
+
+    def rollback(self):
+        for full_path, backup_path in reversed(self._done):
+            if backup_path:
+                os.replace(backup_path, full_path)
+            elif os.path.exists(full_path):
+                os.remove(full_path)
+        self._done = []
+        self.discard()
+
+    def discard(self):
+        for _, tmp_path in self._staged:
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        self._staged = []
+
+
+def sync_files(base_dir, files, encoding='utf-8', max_workers=None, digests=None, manifest_name=MANIFEST_NAME):
+    """Kiírja a `files` (rel_path -> tartalom) leképezést a base_dir alá.
+
+    A `files` lehet lusta leképezés is (pl. rescue_pack.TemplatePack); ha a
+    `digests` (rel_path -> sha256) meg van adva, a változatlan fájlok
+    tartalmát nem olvassuk ki.
+
+    Csak a `manifest_name` manifestben szereplő fájlokat tekintjük sajátnak:
+    ami ott van, de a `files`-ban nincs, törlődik. Külön eszköz (pl. a
+    rescue_images önálló futtatása) ezért saját manifestet használjon.
+
+    Visszatérés: {'written': [...], 'skipped': [...], 'removed': [...],
+    'timings': {rel_path: mp}, 'total': mp}
+    """
+    start = time.perf_counter()
+    old_manifest = load_manifest(base_dir, manifest_name)
+    new_manifest = {}
+    report = {'written': [], 'skipped': [], 'removed': [], 'timings': {}}
+    txn = WriteTransaction()
+    futures = {}
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for rel_path in files:
+                futures[rel_path] = pool.submit(_stage, os.path.join(base_dir, rel_path), files, rel_path,
+                                                (digests or {}).get(rel_path), old_manifest.get(rel_path),
+                                                encoding)
+    finally:
+        # Minden sikeresen elkészült ideiglenes fájl a tranzakcióba kerül,
+        # hogy hiba esetén a discard() eltakarítsa őket
+        for rel_path, future in futures.items():
+            if future.done() and not future.cancelled() and future.exception() is None \
+                    and future.result()[1]:
+                txn.stage(os.path.join(base_dir, rel_path), future.result()[1])
+
+    try:
+        for rel_path, future in futures.items():
+            digest, tmp_path, elapsed = future.result()
+            new_manifest[rel_path] = digest
+            report['timings'][rel_path] = elapsed
+            report['written' if tmp_path else 'skipped'].append(rel_path)
+    except BaseException:
+        txn.discard()
+        raise
+
+    # Már nem generált kimenetek törlése
+    for rel_path in old_manifest:
+        full_path = os.path.join(base_dir, rel_path)
+        if rel_path not in files and os.path.exists(full_path):
+            txn.remove(full_path)
+            report['removed'].append(rel_path)
+
+    txn.commit()
+    save_manifest(base_dir, {rel_path: _stat_entry(os.path.join(base_dir, rel_path), digest)
+                             for rel_path, digest in new_manifest.items()}, manifest_name)
+    report['total'] = time.perf_counter() - start
+    return report
+
+
+def print_report(report, slowest=5):
+    for key, label in (('written', 'Írva'), ('removed', 'Törölve')):
+        for rel_path in report[key]:
+            print(f"  {label}: {rel_path}")
+    timings = sorted(report['timings'].items(), key=lambda item: item[1], reverse=True)
+    for rel_path, elapsed in timings[:slowest]:
+        print(f"  {elapsed * 1000:8.2f} ms  {rel_path}")
+    print(f"Írva: {len(report['written'])}, változatlan: {len(report['skipped'])}, "
+          f"törölve: {len(report['removed'])}, összesen {report['total'] * 1000:.1f} ms")
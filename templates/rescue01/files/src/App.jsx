@@ -0,0 +1,55 @@
+import { useState } from 'react';
+import { BrowserRouter as Router, Routes, Route, Link } from 'react-router-dom';
+import { useTranslation } from 'react-i18next';
+import './index.css'; // A stílusod
+import Users from './components/Users';
+import Events from './components/Events';
+import MapComponent from './components/Map';
+import { supabase } from './supabase';
+import i18n from './i18n';
+
+function App() {
+  const { t } = useTranslation();
+  const [language, setLanguage] = useState(i18n.language);
+
+  const changeLanguage = async (lng) => {
+    i18n.changeLanguage(lng);
+    setLanguage(lng);
+    localStorage.setItem('language', lng);
+    // Opcionális: Frissítsd a user language-t Supabase-ben
+    const { data: { user } } = await supabase.auth.getUser();
+    if (user) {
+      await supabase.from('users').update({ language: lng }).eq('id', user.id);
+    }
+  };
+
+  return (
+    <Router basename="/rescue-admin">  {/* GitHub Pages basename */}
+      <header>
+        <h1>{t('header-title')}</h1>
+        <nav>
+          <Link to="/users">{t('nav-users')}</Link>
+          <Link to="/events">{t('nav-events')}</Link>
+          <Link to="/map">{t('nav-map')}</Link>
+          <select value={language} onChange={(e) => changeLanguage(e.target.value)}>
+            <option value="hu">Magyar</option>
+            <option value="en">English</option>
+            <option value="sk">Slovenský</option>
+            <option value="ro">Română</option>
+            <option value="pl">Polski</option>
+          </select>
+        </nav>
+      </header>
+      <main>
+        <Routes>
+          <Route path="/users" element={<Users />} />
+          <Route path="/events" element={<Events />} />
+          <Route path="/map" element={<MapComponent />} />
+          <Route path="/" element={<div>Válassz egy oldalt</div>} />
+        </Routes>
+      </main>
+    </Router>
+  );
+}
+
+export default App;
\ No newline at end of file
@@ -0,0 +1,68 @@
+import { useState, useEffect } from 'react';
+import { useTranslation } from 'react-i18next';
+import { supabase } from '../supabase';
+
+const Events = () => {
+  const { t } = useTranslation();
+  const [events, setEvents] = useState([]);
+  const [eventName, setEventName] = useState('');
+
+  useEffect(() => {
+    loadEvents();
+  }, []);
+
+  const loadEvents = async () => {
+    const { data, error } = await supabase.from('search_events').select('*');
+    if (error) alert('Error: ' + error.message);
+    else setEvents(data);
+  };
+
+  const createEvent = async (e) => {
+    e.preventDefault();
+    const { error } = await supabase.from('search_events').insert({
+      name: eventName,
+      status: 'active',
+      start_time: new Date().toISOString(),
+      coordinator_id: 'your_admin_user_id' // Cseréld a sajátodra
+    });
+    if (error) alert(`${t('event-create-fail')} ${error.message}`);
+    else {
+      alert(t('event-create-success'));
+      loadEvents();
+      setEventName('');
+    }
+  };
+
+  return (
+    <section>
+      <h2>{t('events-h2')}</h2>
+      <table>
+        <thead>
+          <tr>
+            <th>{t('event-table-id')}</th>
+            <th>{t('event-table-name')}</th>
+            <th>{t('event-table-status')}</th>
+            <th>{t('event-table-starttime')}</th>
+          </tr>
+        </thead>
+        <tbody>
+          {events.map(event => (
+            <tr key={event.id}>
+              <td>{event.id}</td>
+              <td>{event.name}</td>
+              <td>{event.status}</td>
+              <td>{new Date(event.start_time).toLocaleString()}</td>
+            </tr>
+          ))}
+        </tbody>
+      </table>
+      <form onSubmit={createEvent}>
+        <label>{t('event-name-label')}</label>
+        <input value={eventName} onChange={(e) => setEventName(e.target.value)} required />
+        <button type="submit">{t('create-event-btn')}</button>
+      </form>
+    </section>
+  );
+};
+
+export default Events;
\ No newline at end of file
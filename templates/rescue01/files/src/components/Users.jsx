@@ -0,0 +1,75 @@
+import { useState } from 'react';
+import { useTranslation } from 'react-i18next';
+import { supabase } from '../supabase';
+import useKeysetPage from '../useKeysetPage';
+
+const COLUMNS = 'id, email, full_name, role';
+
+const Users = () => {
+  const { t } = useTranslation();
+  const list = useKeysetPage({ table: 'users', columns: COLUMNS, searchColumns: ['full_name', 'email'], initialSort: 'full_name' });
+  const [userId, setUserId] = useState('');
+  const [role, setRole] = useState('searcher');
+
+  const updateRole = async (e) => {
+    e.preventDefault();
+    const { data, error } = await supabase.from('users').update({ role }).eq('id', userId).select(COLUMNS).single();
+    if (error) alert(`${t('role-update-fail')} ${error.message}`);
+    else {
+      alert(t('role-update-success'));
+      list.replaceRow(data);
+    }
+  };
+
+  const sortMark = (column) => (list.sort.column === column ? (list.sort.ascending ? ' ▲' : ' ▼') : '');
+
+  return (
+    <section>
+      <h2>{t('users-h2')}</h2>
+      <input
+        type="search"
+        value={list.search}
+        onChange={(e) => list.setSearch(e.target.value)}
+        placeholder={t('search-placeholder')}
+      />
+      {list.error && <p style={{ color: 'red' }}>{t('error-loading-list')} {list.error.message}</p>}
+      <table>
+        <thead>
+          <tr>
+            <th>{t('user-table-id')}</th>
+            <th onClick={() => list.toggleSort('email')}>{t('user-table-email')}{sortMark('email')}</th>
+            <th onClick={() => list.toggleSort('full_name')}>{t('user-table-fullname')}{sortMark('full_name')}</th>
+            <th onClick={() => list.toggleSort('role')}>{t('user-table-role')}{sortMark('role')}</th>
+          </tr>
+        </thead>
+        <tbody>
+          {list.rows.map(user => (
+            <tr key={user.id}>
+              <td>{user.id}</td>
+              <td>{user.email}</td>
+              <td>{user.full_name}</td>
+              <td>{user.role}</td>
+            </tr>
+          ))}
+        </tbody>
+      </table>
+      <div className="pager">
+        <button type="button" onClick={list.prev} disabled={!list.hasPrev || list.loading}>{t('prev-page')}</button>
+        <span>{t('page-label')} {list.page}</span>
+        <button type="button" onClick={list.next} disabled={!list.hasNext || list.loading}>{t('next-page')}</button>
+      </div>
+      <form onSubmit={updateRole}>
+        <label>{t('user-id-label')}</label>
+        <input value={userId} onChange={(e) => setUserId(e.target.value)} required />
+        <label>{t('role-label')}</label>
+        <select value={role} onChange={(e) => setRole(e.target.value)}>
+          <option value="searcher">{t('role-searcher')}</option>
+          <option value="coordinator">{t('role-coordinator')}</option>
+        </select>
+        <button type="submit">{t('update-role-btn')}</button>
+      </form>
+    </section>
+  );
+};
+
+export default Users;
\ No newline at end of file
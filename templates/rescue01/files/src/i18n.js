@@ -0,0 +1,199 @@
+import i18n from 'i18next';
+import { initReactI18next } from 'react-i18next';
+
+const resources = {
+  en: {
+    translation: {
+      'header-title': 'Admin Dashboard',
+      'nav-users': 'Users',
+      'nav-events': 'Events',
+      'nav-map': 'Map',
+      'users-h2': 'User Management',
+      'user-id-label': 'User ID:',
+      'role-label': 'Role:',
+      'update-role-btn': 'Update Role',
+      'events-h2': 'Event Management',
+      'event-name-label': 'Event Name:',
+      'create-event-btn': 'Create Event',
+      'map-h2': 'Live Map',
+      'role-searcher': 'Searcher',
+      'role-coordinator': 'Coordinator',
+      'user-table-id': 'ID',
+      'user-table-email': 'Email',
+      'user-table-fullname': 'Full Name',
+      'user-table-role': 'Role',
+      'event-table-id': 'ID',
+      'event-table-name': 'Name',
+      'event-table-status': 'Status',
+      'event-table-starttime': 'Start Time',
+      'search-placeholder': 'Search…',
+      'all-roles': 'All roles',
+      'prev-page': '‹ Previous',
+      'next-page': 'Next ›',
+      'page-label': 'Page',
+      'error-loading-list': 'Failed to load the list:',
+      'error-loading-markers': 'Failed to load markers:',
+      'role-update-success': 'Role updated successfully',
+      'role-update-fail': 'Failed to update role:',
+      'event-create-success': 'Event created successfully',
+      'event-create-fail': 'Failed to create event:'
+    }
+  },
+  hu: {
+    translation: {
+      'header-title': 'Admin Irányítópult',
+      'nav-users': 'Felhasználók',
+      'nav-events': 'Események',
+      'nav-map': 'Térkép',
+      'users-h2': 'Felhasználó Kezelés',
+      'user-id-label': 'Felhasználó ID:',
+      'role-label': 'Szerep:',
+      'update-role-btn': 'Szerep Frissítése',
+      'events-h2': 'Esemény Kezelés',
+      'event-name-label': 'Esemény Neve:',
+      'create-event-btn': 'Esemény Létrehozása',
+      'map-h2': 'Élő Térkép',
+      'role-searcher': 'Kereső',
+      'role-coordinator': 'Koordinátor',
+      'user-table-id': 'ID',
+      'user-table-email': 'Email',
+      'user-table-fullname': 'Teljes Név',
+      'user-table-role': 'Szerep',
+      'event-table-id': 'ID',
+      'event-table-name': 'Név',
+      'event-table-status': 'Állapot',
+      'event-table-starttime': 'Kezdési Idő',
+      'search-placeholder': 'Keresés…',
+      'all-roles': 'Minden szerepkör',
+      'prev-page': '‹ Előző',
+      'next-page': 'Következő ›',
+      'page-label': 'Oldal',
+      'error-loading-list': 'Nem sikerült betölteni a listát:',
+      'error-loading-markers': 'Nem sikerült betölteni a markereket:',
+      'role-update-success': 'Szerep sikeresen frissítve',
+      'role-update-fail': 'Szerep frissítése sikertelen:',
+      'event-create-success': 'Esemény sikeresen létrehozva',
+      'event-create-fail': 'Esemény létrehozása sikertelen:'
+    }
+  },
+  sk: {
+    translation: {
+      'header-title': 'Administrátorský Panel',
+      'nav-users': 'Používatelia',
+      'nav-events': 'Udalosti',
+      'nav-map': 'Mapa',
+      'users-h2': 'Správa Používateľov',
+      'user-id-label': 'ID Používateľa:',
+      'role-label': 'Rola:',
+      'update-role-btn': 'Aktualizovať Rolu',
+      'events-h2': 'Správa Udalostí',
+      'event-name-label': 'Názov Udalosti:',
+      'create-event-btn': 'Vytvoriť Udalosť',
+      'map-h2': 'Živá Mapa',
+      'role-searcher': 'Hľadač',
+      'role-coordinator': 'Koordinátor',
+      'user-table-id': 'ID',
+      'user-table-email': 'Email',
+      'user-table-fullname': 'Plné Meno',
+      'user-table-role': 'Rola',
+      'event-table-id': 'ID',
+      'event-table-name': 'Názov',
+      'event-table-status': 'Stav',
+      'event-table-starttime': 'Čas Začiatku',
+      'search-placeholder': 'Hľadať…',
+      'all-roles': 'Všetky roly',
+      'prev-page': '‹ Predchádzajúca',
+      'next-page': 'Ďalšia ›',
+      'page-label': 'Strana',
+      'error-loading-list': 'Nepodarilo sa načítať zoznam:',
+      'error-loading-markers': 'Nepodarilo sa načítať značky:',
+      'role-update-success': 'Rola úspešne aktualizovaná',
+      'role-update-fail': 'Aktualizácia roly zlyhala:',
+      'event-create-success': 'Udalosť úspešne vytvorená',
+      'event-create-fail': 'Vytvorenie udalosti zlyhalo:'
+    }
+  },
+  ro: {
+    translation: {
+      'header-title': 'Panou de Administrare',
+      'nav-users': 'Utilizatori',
+      'nav-events': 'Evenimente',
+      'nav-map': 'Hartă',
+      'users-h2': 'Gestionare Utilizatori',
+      'user-id-label': 'ID Utilizator:',
+      'role-label': 'Rol:',
+      'update-role-btn': 'Actualizare Rol',
+      'events-h2': 'Gestionare Evenimente',
+      'event-name-label': 'Nume Eveniment:',
+      'create-event-btn': 'Creare Eveniment',
+      'map-h2': 'Hartă Live',
+      'role-searcher': 'Căutător',
+      'role-coordinator': 'Coordonator',
+      'user-table-id': 'ID',
+      'user-table-email': 'Email',
+      'user-table-fullname': 'Nume Complet',
+      'user-table-role': 'Rol',
+      'event-table-id': 'ID',
+      'event-table-name': 'Nume',
+      'event-table-status': 'Stare',
+      'event-table-starttime': 'Timp de Început',
+      'search-placeholder': 'Căutare…',
+      'all-roles': 'Toate rolurile',
+      'prev-page': '‹ Anterioara',
+      'next-page': 'Următoarea ›',
+      'page-label': 'Pagina',
+      'error-loading-list': 'Nu s-a putut încărca lista:',
+      'error-loading-markers': 'Nu s-a putut încărca marcajele:',
+      'role-update-success': 'Rol actualizat cu succes',
+      'role-update-fail': 'Actualizarea rolului a eșuat:',
+      'event-create-success': 'Eveniment creat cu succes',
+      'event-create-fail': 'Crearea evenimentului a eșuat:'
+    }
+  },
+  pl: {
+    translation: {
+      'header-title': 'Panel Administracyjny',
+      'nav-users': 'Użytkownicy',
+      'nav-events': 'Wydarzenia',
+      'nav-map': 'Mapa',
+      'users-h2': 'Zarządzanie Użytkownikami',
+      'user-id-label': 'ID Użytkownika:',
+      'role-label': 'Rola:',
+      'update-role-btn': 'Aktualizuj Rolę',
+      'events-h2': 'Zarządzanie Wydarzeniami',
+      'event-name-label': 'Nazwa Wydarzenia:',
+      'create-event-btn': 'Utwórz Wydarzenie',
+      'map-h2': 'Mapa Na Żywo',
+      'role-searcher': 'Szukający',
+      'role-coordinator': 'Koordynator',
+      'user-table-id': 'ID',
+      'user-table-email': 'Email',
+      'user-table-fullname': 'Pełne Imię',
+      'user-table-role': 'Rola',
+      'event-table-id': 'ID',
+      'event-table-name': 'Nazwa',
+      'event-table-status': 'Status',
+      'event-table-starttime': 'Czas Rozpoczęcia',
+      'search-placeholder': 'Szukaj…',
+      'all-roles': 'Wszystkie role',
+      'prev-page': '‹ Poprzednia',
+      'next-page': 'Następna ›',
+      'page-label': 'Strona',
+      'error-loading-list': 'Nie udało się załadować listy:',
+      'error-loading-markers': 'Nie udało się załadować znaczników:',
+      'role-update-success': 'Rola zaktualizowana pomyślnie',
+      'role-update-fail': 'Aktualizacja roli nie powiodła się:',
+      'event-create-success': 'Wydarzenie utworzone pomyślnie',
+      'event-create-fail': 'Utworzenie wydarzenia nie powiodło się:'
+    }
+  }
+};
+
+i18n.use(initReactI18next).init({
+  resources,
+  lng: localStorage.getItem('language') || 'hu',
+  fallbackLng: 'en',
+  interpolation: { escapeValue: false }
+});
+
+export default i18n;
\ No newline at end of file
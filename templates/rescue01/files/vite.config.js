@@ -0,0 +1,8 @@
+import { defineConfig } from 'vite'
+import react from '@vitejs/plugin-react'
+
+// https://vitejs.dev/config/
+export default defineConfig({
+  plugins: [react()],
+  base: '/rescue-admin/'  // Cseréld a repo nevedre, pl. '/repo-name/' GitHub Pages-hez
+})
\ No newline at end of file
@@ -0,0 +1,3 @@
+// Alaptérkép csempe URL. Terepen a rescue_basemap.py helyi szerverére
+// állítható (VITE_BASEMAP_URL=http://localhost:8766/{z}/{x}/{y}.png).
+export const BASEMAP_URL = import.meta.env.VITE_BASEMAP_URL || 'https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png';
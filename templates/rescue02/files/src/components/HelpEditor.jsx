@@ -0,0 +1,139 @@
+import { useState, useEffect } from 'react';
+import { useTranslation } from 'react-i18next';
+import { supabase } from '../supabase';
+
+const HelpEditor = () => {
+  const { t } = useTranslation();
+  const [helpItems, setHelpItems] = useState([]);
+  const [selectedItem, setSelectedItem] = useState(null);
+  const [section, setSection] = useState('');
+  const [textHu, setTextHu] = useState('');
+  const [textEn, setTextEn] = useState('');
+  const [textSk, setTextSk] = useState('');
+  const [textRo, setTextRo] = useState('');
+  const [textPl, setTextPl] = useState('');
+
+  useEffect(() => {
+    loadHelp();
+  }, []);
+
+  const loadHelp = async () => {
+    const { data, error } = await supabase.from('help_content').select('*');
+    if (error) alert('Error: ' + error.message);
+    else setHelpItems(data);
+  };
+
+  const createHelp = async (e) => {
+    e.preventDefault();
+    const { error } = await supabase.from('help_content').insert({
+      section,
+      text_hu: textHu,
+      text_en: textEn,
+      text_sk: textSk,
+      text_ro: textRo,
+      text_pl: textPl
+    });
+    if (error) alert(`${t('help-create-fail')} ${error.message}`);
+    else {
+      alert(t('help-create-success'));
+      loadHelp();
+      resetForm();
+    }
+  };
+
+  const updateHelp = async (e) => {
+    e.preventDefault();
+    const { error } = await supabase.from('help_content').update({
+      section,
+      text_hu: textHu,
+      text_en: textEn,
+      text_sk: textSk,
+      text_ro: textRo,
+      text_pl: textPl
+    }).eq('id', selectedItem.id);
+    if (error) alert(`${t('help-update-fail')} ${error.message}`);
+    else {
+      alert(t('help-update-success'));
+      loadHelp();
+      resetForm();
+    }
+  };
+
+  const deleteHelp = async (id) => {
+    if (window.confirm('Biztos törölni?')) {
+      const { error } = await supabase.from('help_content').delete().eq('id', id);
+      if (error) alert(`${t('help-delete-fail')} ${error.message}`);
+      else {
+        alert(t('help-delete-success'));
+        loadHelp();
+      }
+    }
+  };
+
+  const selectItem = (item) => {
+    setSelectedItem(item);
+    setSection(item.section);
+    setTextHu(item.text_hu);
+    setTextEn(item.text_en);
+    setTextSk(item.text_sk);
+    setTextRo(item.text_ro);
+    setTextPl(item.text_pl);
+  };
+
+  const resetForm = () => {
+    setSelectedItem(null);
+    setSection('');
+    setTextHu('');
+    setTextEn('');
+    setTextSk('');
+    setTextRo('');
+    setTextPl('');
+  };
+
+  return (
+    <section>
+      <h2>{t('help-editor-h2')}</h2>
+      <table>
+        <thead>
+          <tr>
+            <th>{t('user-table-id')}</th>
+            <th>{t('help-table-section')}</th>
+            <th>{t('help-table-text-hu')}</th>
+            <th>Actions</th>
+          </tr>
+        </thead>
+        <tbody>
+          {helpItems.map(item => (
+            <tr key={item.id}>
+              <td>{item.id}</td>
+              <td>{item.section}</td>
+              <td>{item.text_hu}</td>
+              <td>
+                <button onClick={() => selectItem(item)}>{t('update-help-btn')}</button>
+                <button className="delete-btn" onClick={() => deleteHelp(item.id)}>{t('delete-help-btn')}</button>
+              </td>
+            </tr>
+          ))}
+        </tbody>
+      </table>
+      <form onSubmit={selectedItem ? updateHelp : createHelp}>
+        <label>{t('section-label')}</label>
+        <input value={section} onChange={(e) => setSection(e.target.value)} required />
+        <label>{t('text-hu-label')}</label>
+        <input value={textHu} onChange={(e) => setTextHu(e.target.value)} />
+        <label>{t('text-en-label')}</label>
+        <input value={textEn} onChange={(e) => setTextEn(e.target.value)} />
+        <label>{t('text-sk-label')}</label>
+        <input value={textSk} onChange={(e) => setTextSk(e.target.value)} />
+        <label>{t('text-ro-label')}</label>
+        <input value={textRo} onChange={(e) => setTextRo(e.target.value)} />
+        <label>{t('text-pl-label')}</label>
+        <input value={textPl} onChange={(e) => setTextPl(e.target.value)} />
+        <button type="submit">{selectedItem ? t('update-help-btn') : t('create-help-btn')}</button>
+        {selectedItem && <button type="button" onClick={resetForm}>Cancel</button>}
+      </form>
+    </section>
+  );
+};
+
+export default HelpEditor;
\ No newline at end of file
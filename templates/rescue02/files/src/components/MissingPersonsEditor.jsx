@@ -0,0 +1,184 @@
+import { useState } from 'react';
+import { useTranslation } from 'react-i18next';
+import { supabase } from '../supabase';
+import useKeysetPage from '../useKeysetPage';
+
+const COLUMNS = 'id, event_id, name, age, height_cm, clothing, photo_url, behavior_category, prob_zones';
+
+const MissingPersonsEditor = () => {
+  const { t } = useTranslation();
+  const list = useKeysetPage({
+    table: 'missing_persons',
+    columns: COLUMNS,
+    searchColumns: ['name', 'clothing', 'behavior_category'],
+    initialSort: 'name'
+  });
+  const [selectedPerson, setSelectedPerson] = useState(null);
+  const [eventId, setEventId] = useState('');
+  const [name, setName] = useState('');
+  const [age, setAge] = useState('');
+  const [height, setHeight] = useState('');
+  const [clothing, setClothing] = useState('');
+  const [photoUrl, setPhotoUrl] = useState('');
+  const [behaviorCategory, setBehaviorCategory] = useState('');
+  const [probZones, setProbZones] = useState('');
+
+  const createMissing = async (e) => {
+    e.preventDefault();
+    const { data, error } = await supabase.from('missing_persons').insert({
+      event_id: eventId,
+      name,
+      age: parseInt(age),
+      height_cm: parseInt(height),
+      clothing,
+      photo_url: photoUrl,
+      behavior_category: behaviorCategory,
+      prob_zones: JSON.parse(probZones)
+    }).select(COLUMNS).single();
+    if (error) alert(`${t('missing-create-fail')} ${error.message}`);
+    else {
+      alert(t('missing-create-success'));
+      list.addRow(data);
+      resetForm();
+    }
+  };
+
+  const updateMissing = async (e) => {
+    e.preventDefault();
+    const { data, error } = await supabase.from('missing_persons').update({
+      event_id: eventId,
+      name,
+      age: parseInt(age),
+      height_cm: parseInt(height),
+      clothing,
+      photo_url: photoUrl,
+      behavior_category: behaviorCategory,
+      prob_zones: JSON.parse(probZones)
+    }).eq('id', selectedPerson.id).select(COLUMNS).single();
+    if (error) alert(`${t('missing-update-fail')} ${error.message}`);
+    else {
+      alert(t('missing-update-success'));
+      list.replaceRow(data);
+      resetForm();
+    }
+  };
+
+  const deleteMissing = async (id) => {
+    if (window.confirm('Biztos törölni?')) {
+      const { error } = await supabase.from('missing_persons').delete().eq('id', id);
+      if (error) alert(`${t('missing-delete-fail')} ${error.message}`);
+      else {
+        alert(t('missing-delete-success'));
+        list.removeRow(id);
+      }
+    }
+  };
+
+  const selectPerson = (person) => {
+    setSelectedPerson(person);
+    setEventId(person.event_id);
+    setName(person.name);
+    setAge(person.age || '');
+    setHeight(person.height_cm || '');
+    setClothing(person.clothing || '');
+    setPhotoUrl(person.photo_url || '');
+    setBehaviorCategory(person.behavior_category || '');
+    setProbZones(JSON.stringify(person.prob_zones || {}));
+  };
+
+  const sortMark = (column) => (list.sort.column === column ? (list.sort.ascending ? ' ▲' : ' ▼') : '');
+
+  const resetForm = () => {
+    setSelectedPerson(null);
+    setEventId('');
+    setName('');
+    setAge('');
+    setHeight('');
+    setClothing('');
+    setPhotoUrl('');
+    setBehaviorCategory('');
+    setProbZones('');
+  };
+
+  return (
+    <section>
+      <h2>{t('missing-persons-editor-h2')}</h2>
+      <div className="list-filters">
+        <input
+          type="search"
+          value={list.search}
+          onChange={(e) => list.setSearch(e.target.value)}
+          placeholder={t('search-placeholder')}
+        />
+        <input
+          value={list.filters.event_id || ''}
+          onChange={(e) => list.setFilter('event_id', e.target.value)}
+          placeholder={t('event-id-label')}
+        />
+      </div>
+      {list.error && <p style={{ color: 'red' }}>{t('error-loading-list')} {list.error.message}</p>}
+      <table>
+        <thead>
+          <tr>
+            <th>{t('user-table-id')}</th>
+            <th>{t('event-id-label')}</th>
+            <th onClick={() => list.toggleSort('name')}>{t('missing-table-name')}{sortMark('name')}</th>
+            <th onClick={() => list.toggleSort('age')}>{t('missing-table-age')}{sortMark('age')}</th>
+            <th onClick={() => list.toggleSort('height_cm')}>{t('missing-table-height')}{sortMark('height_cm')}</th>
+            <th>{t('missing-table-clothing')}</th>
+            <th>{t('missing-table-photo')}</th>
+            <th>{t('missing-table-behavior')}</th>
+            <th>{t('missing-table-prob-zones')}</th>
+            <th>Actions</th>
+          </tr>
+        </thead>
+        <tbody>
+          {list.rows.map(person => (
+            <tr key={person.id}>
+              <td>{person.id}</td>
+              <td>{person.event_id}</td>
+              <td>{person.name}</td>
+              <td>{person.age}</td>
+              <td>{person.height_cm}</td>
+              <td>{person.clothing}</td>
+              <td>{person.photo_url}</td>
+              <td>{person.behavior_category}</td>
+              <td>{JSON.stringify(person.prob_zones)}</td>
+              <td>
+                <button onClick={() => selectPerson(person)}>{t('update-missing-btn')}</button>
+                <button className="delete-btn" onClick={() => deleteMissing(person.id)}>{t('delete-missing-btn')}</button>
+              </td>
+            </tr>
+          ))}
+        </tbody>
+      </table>
+      <div className="pager">
+        <button type="button" onClick={list.prev} disabled={!list.hasPrev || list.loading}>{t('prev-page')}</button>
+        <span>{t('page-label')} {list.page}</span>
+        <button type="button" onClick={list.next} disabled={!list.hasNext || list.loading}>{t('next-page')}</button>
+      </div>
+      <form onSubmit={selectedPerson ? updateMissing : createMissing}>
+        <label>{t('event-id-label')}</label>
+        <input value={eventId} onChange={(e) => setEventId(e.target.value)} required />
+        <label>{t('name-label')}</label>
+        <input value={name} onChange={(e) => setName(e.target.value)} required />
+        <label>{t('age-label')}</label>
+        <input type="number" value={age} onChange={(e) => setAge(e.target.value)} />
+        <label>{t('height-label')}</label>
+        <input type="number" value={height} onChange={(e) => setHeight(e.target.value)} />
+        <label>{t('clothing-label')}</label>
+        <input value={clothing} onChange={(e) => setClothing(e.target.value)} />
+        <label>{t('photo-url-label')}</label>
+        <input value={photoUrl} onChange={(e) => setPhotoUrl(e.target.value)} />
+        <label>{t('behavior-category-label')}</label>
+        <input value={behaviorCategory} onChange={(e) => setBehaviorCategory(e.target.value)} />
+        <label>{t('prob-zones-label')}</label>
+        <input value={probZones} onChange={(e) => setProbZones(e.target.value)} />
+        <button type="submit">{selectedPerson ? t('update-missing-btn') : t('create-missing-btn')}</button>
+        {selectedPerson && <button type="button" onClick={resetForm}>Cancel</button>}
+      </form>
+    </section>
+  );
+};
+
+export default MissingPersonsEditor;
\ No newline at end of file
@@ -0,0 +1,173 @@
+import { useState } from 'react';
+import { useTranslation } from 'react-i18next';
+import { supabase } from '../supabase';
+import useKeysetPage from '../useKeysetPage';
+
+const COLUMNS = 'id, email, full_name, phone_number, role, active';
+
+const UsersManager = () => {
+  const { t } = useTranslation();
+  const list = useKeysetPage({
+    table: 'users',
+    columns: COLUMNS,
+    searchColumns: ['full_name', 'email', 'phone_number'],
+    initialSort: 'full_name'
+  });
+  const [selectedUser, setSelectedUser] = useState(null);
+  const [fullName, setFullName] = useState('');
+  const [phone, setPhone] = useState('');
+  const [email, setEmail] = useState('');
+  const [password, setPassword] = useState('');
+  const [role, setRole] = useState('searcher');
+  const [active, setActive] = useState(true);
+
+  const createUser = async (e) => {
+    e.preventDefault();
+    const { data: authData, error: authError } = await supabase.auth.signUp({ email, password });
+    if (authError) {
+      alert(`${t('user-create-fail')} ${authError.message}`);
+      return;
+    }
+    const { data, error } = await supabase.from('users').insert({
+      id: authData.user.id,
+      full_name: fullName,
+      phone_number: phone,
+      role,
+      email,
+      active
+    }).select(COLUMNS).single();
+    if (error) alert(`${t('user-create-fail')} ${error.message}`);
+    else {
+      alert(t('user-create-success'));
+      list.addRow(data);
+      resetForm();
+    }
+  };
+
+  const updateUser = async (e) => {
+    e.preventDefault();
+    const updates = { full_name: fullName, phone_number: phone, role, active };
+    if (password) {
+      const { error: pwError } = await supabase.auth.updateUser({ password });
+      if (pwError) alert(pwError.message);
+    }
+    const { data, error } = await supabase.from('users').update(updates).eq('id', selectedUser.id).select(COLUMNS).single();
+    if (error) alert(`${t('user-update-fail')} ${error.message}`);
+    else {
+      alert(t('user-update-success'));
+      list.replaceRow(data);
+      resetForm();
+    }
+  };
+
+  const deleteUser = async (id) => {
+    if (window.confirm('Biztos törölni?')) {
+      const { error } = await supabase.from('users').delete().eq('id', id);
+      if (error) alert(`${t('user-delete-fail')} ${error.message}`);
+      else {
+        alert(t('user-delete-success'));
+        list.removeRow(id);
+      }
+    }
+  };
+
+  const selectUser = (user) => {
+    setSelectedUser(user);
+    setFullName(user.full_name);
+    setPhone(user.phone_number);
+    setEmail(user.email);
+    setRole(user.role);
+    setActive(user.active);
+    setPassword('');
+  };
+
+  const sortMark = (column) => (list.sort.column === column ? (list.sort.ascending ? ' ▲' : ' ▼') : '');
+
+  const resetForm = () => {
+    setSelectedUser(null);
+    setFullName('');
+    setPhone('');
+    setEmail('');
+    setPassword('');
+    setRole('searcher');
+    setActive(true);
+  };
+
+  return (
+    <section>
+      <h2>{t('users-manager-h2')}</h2>
+      <div className="list-filters">
+        <input
+          type="search"
+          value={list.search}
+          onChange={(e) => list.setSearch(e.target.value)}
+          placeholder={t('search-placeholder')}
+        />
+        <select value={list.filters.role || ''} onChange={(e) => list.setFilter('role', e.target.value)}>
+          <option value="">{t('all-roles')}</option>
+          <option value="searcher">{t('role-searcher')}</option>
+          <option value="coordinator">{t('role-coordinator')}</option>
+        </select>
+      </div>
+      {list.error && <p style={{ color: 'red' }}>{t('error-loading-list')} {list.error.message}</p>}
+      <table>
+        <thead>
+          <tr>
+            <th>{t('user-table-id')}</th>
+            <th onClick={() => list.toggleSort('email')}>{t('user-table-email')}{sortMark('email')}</th>
+            <th onClick={() => list.toggleSort('full_name')}>{t('user-table-fullname')}{sortMark('full_name')}</th>
+            <th>{t('user-table-phone')}</th>
+            <th onClick={() => list.toggleSort('role')}>{t('user-table-role')}{sortMark('role')}</th>
+            <th>{t('user-table-active')}</th>
+            <th>Actions</th>
+          </tr>
+        </thead>
+        <tbody>
+          {list.rows.map(user => (
+            <tr key={user.id}>
+              <td>{user.id}</td>
+              <td>{user.email}</td>
+              <td>{user.full_name}</td>
+              <td>{user.phone_number}</td>
+              <td>{user.role}</td>
+              <td>{user.active ? 'Yes' : 'No'}</td>
+              <td>
+                <button onClick={() => selectUser(user)}>{t('update-user-btn')}</button>
+                <button className="delete-btn" onClick={() => deleteUser(user.id)}>{t('delete-user-btn')}</button>
+              </td>
+            </tr>
+          ))}
+        </tbody>
+      </table>
+      <div className="pager">
+        <button type="button" onClick={list.prev} disabled={!list.hasPrev || list.loading}>{t('prev-page')}</button>
+        <span>{t('page-label')} {list.page}</span>
+        <button type="button" onClick={list.next} disabled={!list.hasNext || list.loading}>{t('next-page')}</button>
+      </div>
+      <form onSubmit={selectedUser ? updateUser : createUser}>
+        <label>{t('full-name-label')}</label>
+        <input value={fullName} onChange={(e) => setFullName(e.target.value)} required />
+        <label>{t('phone-label')}</label>
+        <input value={phone} onChange={(e) => setPhone(e.target.value)} required />
+        <label>{t('email-label')}</label>
+        <input type="email" value={email} onChange={(e) => setEmail(e.target.value)} required={!selectedUser} disabled={!!selectedUser} />
+        <label>{t('password-label')}</label>
+        <input type="password" value={password} onChange={(e) => setPassword(e.target.value)} required={!selectedUser} />
+        <label>{t('role-label')}</label>
+        <select value={role} onChange={(e) => setRole(e.target.value)}>
+          <option value="searcher">{t('role-searcher')}</option>
+          <option value="coordinator">{t('role-coordinator')}</option>
+        </select>
+        <label>{t('active-label')}</label>
+        <select value={active} onChange={(e) => setActive(e.target.value === 'true')}>
+          <option value={true}>Yes</option>
+          <option value={false}>No</option>
+        </select>
+        <button type="submit">{selectedUser ? t('update-user-btn') : t('create-user-btn')}</button>
+        {selectedUser && <button type="button" onClick={resetForm}>Cancel</button>}
+      </form>
+    </section>
+  );
+};
+
+export default UsersManager;
\ No newline at end of file
@@ -0,0 +1,117 @@
+import threading
+import time
+
+import pytest
+
+import rescue_data
+from rescue_data import DataClient, DataError, StandIn, keyset_page
+
+
+@pytest.fixture
+def stand_in():
+    stand_in = StandIn()
+    server = stand_in.start()
+    client = DataClient(f'http://127.0.0.1:{server.server_port}', 'kulcs', retries=2)
+    yield stand_in, client
+    client.close()
+    server.shutdown()
+    server.server_close()
+
+
+def _all_pages(query, size, sort, descending):
+    rows, cursor = keyset_page(query, size, sort, descending)
+    pages = [rows]
+    while cursor is not None:
+        rows, cursor = keyset_page(query, size, sort, descending, cursor)
+        pages.append(rows)
+    return [row['id'] for page in pages for row in page]
+
+
+@pytest.mark.parametrize('descending', [False, True])
+def test_keyset_page_with_nulls_and_duplicates(stand_in, descending):
+    stand_in, client = stand_in
+    names = ['b', None, 'a', 'b', None, 'c', 'a', 'b', None, 'a', 'c', None, 'b']
+    stand_in.seed('missing_persons', [{'id': i + 1, 'event_id': 1, 'name': name} for i, name in enumerate(names)])
+    stand_in.seed('missing_persons', [{'id': 100, 'event_id': 2, 'name': 'a'}])
+
+    present = sorted((name, i + 1) for i, name in enumerate(names) if name is not None)
+    if descending:
+        # csökkenőben is a null a végén (nullslast), egyezésnél az id növekvő
+        present.sort(key=lambda item: (-ord(item[0]), item[1]))
+    expected = [row_id for _, row_id in present] + [i + 1 for i, name in enumerate(names) if name is None]
+
+    query = client.table('missing_persons').select('id,name').eq('event_id', 1)
+    for size in (1, 3, len(names)):
+        assert _all_pages(query, size, 'name', descending) == expected
+    ids = _all_pages(query, 4, 'id', descending)
+    assert ids == sorted(ids, reverse=descending) and len(ids) == len(names)
+
+
+def _race(client, value):
+    """Két hívó ugyanarra a kulcsra, miközben az első futása még tart."""
+    started, release = threading.Event(), threading.Event()
+    calls, results = [], []
+
+    def run():
+        calls.append(value)
+        started.set()
+        release.wait(5)
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+    def call():
+        try:
+            results.append(client._coalesced('kulcs', run))
+        except ValueError as err:
+            results.append(err)
+
+    coalesced = client.stats['coalesced']
+    threads = [threading.Thread(target=call), threading.Thread(target=call)]
+    threads[0].start()
+    assert started.wait(5)
+    threads[1].start()
+    while client.stats['coalesced'] == coalesced:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    return calls, results
+
+
+@pytest.mark.parametrize('value', [[1, 2, 3], ValueError('hiba')])
+def test_coalesced_shares_result_and_exception(stand_in, value):
+    _, client = stand_in
+    calls, results = _race(client, value)
+    # egyetlen futás, a második hívó ugyanazt az objektumot (vagy kivételt) kapja
+    assert calls == [value]
+    assert len(results) == 2 and results[0] is results[1] is value
+    assert not client._inflight
+
+
+def test_retry_only_idempotent_methods(monkeypatch):
+    monkeypatch.setattr(rescue_data, 'BACKOFF_BASE_S', 0.001)
+
+    class Busy(StandIn):
+        def handle(self, method, path, headers, body):
+            return 503, {}, b'{"message": "busy"}'
+
+    busy = Busy()
+    server = busy.start()
+    client = DataClient(f'http://127.0.0.1:{server.server_port}', 'kulcs', retries=2)
+    try:
+        expected = {'GET': 3, 'PATCH': 3, 'DELETE': 3, 'POST': 1}
+        queries = {'GET': client.table('users').select('id'),
+                   'PATCH': client.table('users').eq('id', 1).update({'active': False}),
+                   'DELETE': client.table('users').eq('id', 1).delete(),
+                   'POST': client.table('users').insert({'id': 1})}
+        for method, query in queries.items():
+            before = busy.requests
+            with pytest.raises(DataError) as error:
+                query.execute()
+            assert error.value.status == 503
+            assert busy.requests - before == expected[method], method
+    finally:
+        client.close()
+        server.shutdown()
+        server.server_close()
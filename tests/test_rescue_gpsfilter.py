@@ -0,0 +1,64 @@
+import numpy as np
+
+from rescue_gpsfilter import STILL_KEEP_S, StreamFilter, filter_columns
+from rescue_timeline import TrackStore
+from rescue_tracks import GAP_THRESHOLD_MS, TrackColumns, process_columns
+
+START_MS = 1_715_000_000_000
+
+
+def _walk_stop_walk(stop_minutes=15, walk_minutes=5, noise=4.0, seed=3):
+    """1 Hz: séta 1.2 m/s, megállás (csak GPS zaj), újra séta."""
+    rng = np.random.default_rng(seed)
+    walk = walk_minutes * 60
+    stop = stop_minutes * 60
+    east = np.r_[np.arange(walk) * 1.2, np.full(stop, walk * 1.2), walk * 1.2 + np.arange(walk) * 1.2]
+    east = east + rng.normal(0, noise, len(east))
+    north = rng.normal(0, noise, len(east))
+    lat = 47.9 + north / 111_320
+    lng = 20.4 + east / (111_320 * np.cos(np.radians(47.9)))
+    count = len(east)
+    times = START_MS + np.arange(count, dtype=np.int64) * 1000
+    columns = TrackColumns(['searcher'], [{}], np.zeros(count), lat, lng, np.full(count, 5.0), times)
+    return columns, walk, stop
+
+
+def test_still_run_keeps_segments_and_positions():
+    columns, walk, stop = _walk_stop_walk()
+    filtered, report = filter_columns(columns)
+    assert report['still_collapsed'] > stop / 2
+
+    before, after = process_columns(columns), process_columns(filtered)
+    assert after.segment_count() == before.segment_count() == 1
+    assert np.diff(filtered.time_ms).max() <= STILL_KEEP_S * 1000 + 1000
+
+    # A megállás alatt a kereső végig látszik, közel a valódi helyéhez
+    times = START_MS + np.arange(walk, walk + stop, 10, dtype=np.int64) * 1000
+    raw_store, filtered_store = TrackStore.from_columns(columns), TrackStore.from_columns(filtered)
+    for time_ms in times.tolist():
+        raw_lat, raw_lng, _, raw_valid = raw_store.positions_at(time_ms)
+        lat, lng, _, valid = filtered_store.positions_at(time_ms)
+        assert raw_valid[0] and valid[0]
+        east = (lng[0] - raw_lng[0]) * 111_320 * np.cos(np.radians(47.9))
+        north = (lat[0] - raw_lat[0]) * 111_320
+        assert np.hypot(east, north) < 30
+
+
+def test_stream_filter_emits_while_still_and_flushes():
+    columns, walk, stop = _walk_stop_walk()
+    stream = StreamFilter()
+    emitted = []
+    values = zip(columns.lat.tolist(), columns.lng.tolist(), columns.acc.tolist(), columns.time_ms.tolist())
+    for lat, lng, acc, time_ms in list(values)[:walk + stop]:
+        emitted.extend(stream.push('searcher', lat, lng, acc, time_ms))
+    assert stream.stats['still_collapsed'] > stop / 2
+
+    times = [time_ms for _, _, time_ms in emitted]
+    assert times == sorted(times)
+    assert max(np.diff(times)) <= STILL_KEEP_S * 1000 + 1000 < GAP_THRESHOLD_MS
+
+    # A folyam megszakad: a visszatartott pontok a flush-sal jönnek ki, időrendben
+    flushed = stream.flush()['searcher']
+    assert flushed and flushed[0][2] > times[-1]
+    assert flushed[-1][2] == int(columns.time_ms[walk + stop - 1])
+    assert stream.flush() == {}
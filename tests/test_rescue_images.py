@@ -0,0 +1,49 @@
+import io
+import json
+import os
+
+import pytest
+
+import rescue_images
+from rescue_writer import MANIFEST_NAME, content_hash, save_manifest
+
+
+def _write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def test_standalone_cli_leaves_generator_files_alone(tmp_path):
+    image = pytest.importorskip('PIL.Image')
+    project = str(tmp_path / 'project')
+    buffer = io.BytesIO()
+    image.new('RGB', (200, 100), (200, 30, 30)).save(buffer, 'PNG')
+    _write(os.path.join(project, 'src/assets/logo.png'), buffer.getvalue())
+
+    # A generátor fájljai, a generátor manifestjében
+    generated = {'src/App.jsx': b'export default () => null;\n', 'package.json': b'{}\n',
+                 'vite.config.js': b'export default {};\n'}
+    entries = {}
+    for rel_path, data in generated.items():
+        _write(os.path.join(project, rel_path), data)
+        st = os.stat(os.path.join(project, rel_path))
+        entries[rel_path] = {'sha256': content_hash(data), 'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+    save_manifest(project, entries)
+    with open(os.path.join(project, MANIFEST_NAME), 'rb') as f:
+        manifest_before = f.read()
+
+    argv = [project, '--widths', '80,160', '--cache-dir', str(tmp_path / 'cache')]
+    rescue_images.main(argv)
+    rescue_images.main(argv)  # újrafuttatás: a saját korábbi kimeneteit sem törli
+
+    for rel_path, data in generated.items():
+        with open(os.path.join(project, rel_path), 'rb') as f:
+            assert f.read() == data
+    with open(os.path.join(project, MANIFEST_NAME), 'rb') as f:
+        assert f.read() == manifest_before
+    assert os.path.exists(os.path.join(project, rescue_images.IMAGES_MODULE))
+    with open(os.path.join(project, rescue_images.MANIFEST_NAME), encoding='utf-8') as f:
+        owned = json.load(f)['files']
+    assert rescue_images.IMAGES_MODULE in owned
+    assert not set(owned) & set(generated)
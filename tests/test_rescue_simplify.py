@@ -0,0 +1,63 @@
+import numpy as np
+
+from rescue_simplify import TrackPyramid, _local_meters, significance
+from rescue_tracks import process_columns, synthetic_columns
+
+
+def _douglas_peucker(x, y, tolerance):
+    """Rekurzív referencia: a megtartott indexek halmaza."""
+    keep = {0, len(x) - 1}
+
+    def split(first, last):
+        if last - first < 2:
+            return
+        ax, ay, bx, by = x[first], y[first], x[last], y[last]
+        px, py = x[first + 1:last] - ax, y[first + 1:last] - ay
+        dx, dy = bx - ax, by - ay
+        length2 = dx * dx + dy * dy
+        distance = (px * dy - py * dx) ** 2 / length2 if length2 > 0 else px * px + py * py
+        index = int(np.argmax(distance))
+        if distance[index] > tolerance * tolerance:
+            keep.add(first + 1 + index)
+            split(first, first + 1 + index)
+            split(first + 1 + index, last)
+
+    split(0, len(x) - 1)
+    return keep
+
+
+def test_levels_match_recursive_douglas_peucker():
+    segments = process_columns(synthetic_columns(users=3, hours=0.5, seed=4))
+    pyramid = TrackPyramid(segments)
+    x, y = _local_meters(segments.lat, segments.lng)
+    offsets = segments.segment_offsets.tolist()
+    for level, tolerance in enumerate(pyramid.tolerances):
+        mask = pyramid.keep_mask(level)
+        for first, last in zip(offsets[:-1], offsets[1:]):
+            expected = _douglas_peucker(x[first:last].astype(np.float64), y[first:last].astype(np.float64), tolerance)
+            assert set(np.flatnonzero(mask[first:last]).tolist()) == expected
+
+
+def test_levels_are_nested_and_keep_segment_times():
+    segments = process_columns(synthetic_columns(users=4, hours=1, seed=6))
+    pyramid = TrackPyramid(segments)
+    counts = pyramid.vertex_counts()
+    assert counts == sorted(counts) and counts[-1] == len(segments.lat)
+    for level in range(len(pyramid.zooms) - 1):
+        # a durvább szint pontjai a finomabban is megvannak
+        assert not (pyramid.keep_mask(level) & ~pyramid.keep_mask(level + 1)).any()
+    full = segments.to_dict()
+    for level in range(len(pyramid.zooms)):
+        coarse = pyramid.level(level).to_dict()
+        for user_id, entry in full.items():
+            assert coarse[user_id]['segmentTimes'] == entry['segmentTimes']
+            assert coarse[user_id]['lastTime'] == entry['lastTime']
+
+
+def test_straight_line_keeps_only_endpoints():
+    segments = process_columns(synthetic_columns(users=1, hours=0.01, seed=1))
+    segments.lat = np.linspace(47.0, 47.01, len(segments.lat))
+    segments.lng = np.full(len(segments.lat), 19.0)
+    values = significance(segments, 0.01)
+    assert np.isinf(values[[0, -1]]).all()
+    assert (values[1:-1] == 0).all()
@@ -0,0 +1,71 @@
+import math
+
+import numpy as np
+
+import rescue_spatial
+from rescue_spatial import EARTH_RADIUS, SpatialIndex
+
+
+def _boxes(count, seed):
+    rng = np.random.default_rng(seed)
+    lng, lat = rng.uniform(19.0, 19.2, count), rng.uniform(47.4, 47.6, count)
+    # a harmada poligon jellegű téglalap, a többi pont
+    width = np.where(rng.random(count) < 0.3, rng.uniform(0, 0.02, count), 0)
+    height = np.where(width > 0, rng.uniform(0, 0.02, count), 0)
+    return {('map_markers', i): (lng[i], lat[i], lng[i] + width[i], lat[i] + height[i]) for i in range(count)}
+
+
+def _brute_bbox(boxes, min_x, min_y, max_x, max_y):
+    return {key for key, box in boxes.items()
+            if box[0] <= max_x and box[2] >= min_x and box[1] <= max_y and box[3] >= min_y}
+
+
+def _brute_distance(box, x, y):
+    dx = max(box[0] - x, x - box[2], 0)
+    dy = max(box[1] - y, y - box[3], 0)
+    return math.hypot(math.radians(dx) * math.cos(math.radians(y)), math.radians(dy)) * EARTH_RADIUS
+
+
+def _check(index, boxes, rng):
+    for _ in range(50):
+        x0, y0 = rng.uniform(18.95, 19.2), rng.uniform(47.35, 47.6)
+        query = (x0, y0, x0 + rng.uniform(0, 0.1), y0 + rng.uniform(0, 0.1))
+        result = index.bbox(*query)
+        assert len(result) == len(set(result))
+        assert set(result) == _brute_bbox(boxes, *query)
+
+        x, y = rng.uniform(19.0, 19.2), rng.uniform(47.4, 47.6)
+        nearest = index.nearest(x, y, k=5)
+        distances = sorted(_brute_distance(box, x, y) for box in boxes.values())[:5]
+        np.testing.assert_allclose([distance for _, distance in nearest], distances, rtol=1e-9, atol=1e-6)
+
+
+def test_bbox_and_nearest_match_brute_force(monkeypatch):
+    # kis küszöb: a módosítások egy része a friss halmazban, egy része újraépítve
+    monkeypatch.setattr(rescue_spatial, 'REBUILD_THRESHOLD', 50)
+    rng = np.random.default_rng(2)
+    boxes = _boxes(2000, seed=1)
+    index = SpatialIndex()
+    index.bulk_load((key, box, None) for key, box in boxes.items())
+    _check(index, boxes, rng)
+
+    moved = _boxes(300, seed=3)
+    for step, key in enumerate(list(boxes)[:300]):
+        if step % 3 == 0:
+            index.remove(key)
+            del boxes[key]
+        else:
+            boxes[key] = moved[('map_markers', step)]
+            index.upsert(key, boxes[key])
+        if step in (10, 299):
+            assert len(index) == len(boxes)
+            _check(index, boxes, rng)
+
+    index.rebuild()
+    _check(index, boxes, rng)
+
+
+def test_empty_index():
+    index = SpatialIndex()
+    index.bulk_load([])
+    assert index.bbox(0, 0, 1, 1) == [] and index.nearest(0, 0, 3) == []
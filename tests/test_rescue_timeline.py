@@ -0,0 +1,63 @@
+import numpy as np
+
+from rescue_timeline import TrackStore, _scan_positions
+from rescue_tracks import ACCURACY_THRESHOLD, GAP_THRESHOLD_MS, TrackColumns, synthetic_columns
+
+
+def _shuffled(columns, seed=1):
+    """A pontok felhasználók és idő szerint összekeverve, ahogy a gps_tracks-ből jönnének."""
+    order = np.random.default_rng(seed).permutation(len(columns))
+    return TrackColumns(columns.user_ids, columns.user_info, columns.user[order], columns.lat[order],
+                        columns.lng[order], columns.acc[order], columns.time_ms[order])
+
+
+def test_positions_match_full_scan():
+    columns = _shuffled(synthetic_columns(users=6, hours=1, seed=3))
+    store = TrackStore.from_columns(columns)
+    start, end = store.time_range()
+    for time_ms in np.linspace(start - 60_000, end + 200_000, 40).astype(np.int64).tolist():
+        _, _, fix_time, valid = store.positions_at(time_ms, interpolate=False)
+        latest = _scan_positions(columns, time_ms)
+        expected = latest[[columns.user_ids.index(user_id) for user_id in store.user_ids]]
+        assert (valid == (expected >= 0)).all()
+        assert (fix_time[valid] == expected[valid]).all()
+
+
+def test_interpolation_between_fixes():
+    columns = TrackColumns(['a'], [{}], [0, 0, 0], [47.0, 47.001, 47.5], [19.0, 19.002, 19.5], [5, 5, 5],
+                           [0, 60_000, 60_000 + 2 * GAP_THRESHOLD_MS])
+    store = TrackStore.from_columns(columns)
+    lat, lng, fix_time, valid = store.positions_at(15_000)
+    assert valid[0] and fix_time[0] == 0
+    np.testing.assert_allclose([lat[0], lng[0]], [47.00025, 19.0005])
+    # a következő fix a szünet küszöbön túl van: nincs interpoláció, és a fix elavul
+    lat, lng, _, valid = store.positions_at(60_000 + 30_000)
+    assert valid[0] and (lat[0], lng[0]) == (47.001, 19.002)
+    assert store.positions_at(60_000 + GAP_THRESHOLD_MS)[3][0]
+    assert not store.positions_at(60_000 + GAP_THRESHOLD_MS + 1)[3][0]
+    assert not store.positions_at(-1)[3][0]
+
+
+def test_window_and_extend():
+    columns = synthetic_columns(users=4, hours=0.5, seed=5)
+    # az első kereső csak később csatlakozik, a többiek pontjai időben folytatódnak
+    early = (columns.time_ms < np.median(columns.time_ms)) & (columns.user != 0)
+    first, rest = (TrackColumns(columns.user_ids, columns.user_info, *(
+        getattr(columns, name)[mask] for name in ('user', 'lat', 'lng', 'acc', 'time_ms'))) for mask in (early, ~early))
+    store = TrackStore.from_columns(first)
+    assert store.extend(rest) > 0
+    full = TrackStore.from_columns(columns)
+    # az új felhasználó a végére kerül, a pontjai ugyanazok
+    assert store.user_ids == ['user-1', 'user-2', 'user-3', 'user-0']
+    for user_id in full.user_ids:
+        got, expected = slice(*store.user_slice(user_id)), slice(*full.user_slice(user_id))
+        for name in ('lat', 'lng', 'time_ms'):
+            assert np.array_equal(getattr(store, name)[got], getattr(full, name)[expected])
+
+    start, end = full.time_range()
+    window_start, window_end = start + 300_000, start + 600_000
+    user, _, _, times = full.window_points(window_start, window_end)
+    keep = ~(columns.acc > ACCURACY_THRESHOLD) & (columns.time_ms >= window_start) & (columns.time_ms <= window_end)
+    assert sorted(zip(user.tolist(), times.tolist())) == sorted(zip(
+        [full.user_ids.index(columns.user_ids[u]) for u in columns.user[keep].tolist()],
+        columns.time_ms[keep].tolist()))
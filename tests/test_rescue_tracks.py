@@ -0,0 +1,46 @@
+import numpy as np
+
+from rescue_tracks import columns_from_csv, parse_times, process_rows, process_tracks
+
+
+def _points(count=600):
+    rng = np.random.default_rng(5)
+    for i in range(count):
+        user = ('u-1', 'u-2')[i % 2]
+        # percenként egy 3 perces kiesés -> több szakasz
+        minute = i // 60 + (3 if i % 120 >= 60 else 0)
+        acc = None if i % 13 == 0 else round(float(rng.uniform(3, 80)), 2)
+        yield user, 47.5 + i * 1e-5, 19.0 + i * 1e-5, acc, f'2024-05-06 12:{minute:02d}:{i % 60:02d}.{i % 7}'
+
+
+def _csv_pages(points, size=250):
+    """PostgREST text/csv alak: fejléc lapokként, null üres, az idő idézőjelben."""
+    lines = [f'{i},{u},{lat!r},{lng!r},{"" if acc is None else acc},"{t}+00"'
+             for i, (u, lat, lng, acc, t) in enumerate(points, 1)]
+    return ['\n'.join(['id,user_id,lat,lng,acc,time'] + lines[start:start + size]).encode()
+            for start in range(0, len(lines), size)]
+
+
+def test_parse_times_postgres_text_suffix():
+    got = parse_times(['2024-05-06 12:00:01.5+00', '2024-05-06T12:00:01.500+00:00', '2024-05-06T12:00:01.5Z'])
+    assert len(set(got.tolist())) == 1
+
+
+def test_columns_from_csv_matches_view_rows():
+    points = list(_points())
+    rows = [{'user_id': user, 'user_name': 'Kiss Anna' if user == 'u-1' else None,
+             'track_points': [{'lat': lat, 'lng': lng, 'acc': acc, 'time': time.replace(' ', 'T') + '+00:00'}
+                              for u, lat, lng, acc, time in points if u == user]}
+            for user in ('u-1', 'u-2')]
+    columns = columns_from_csv(_csv_pages(points), {'u-1': {'full_name': 'Kiss Anna'}})
+    assert columns.user_ids == ['u-1', 'u-2']
+    assert np.isnan(columns.acc[::13]).all()
+
+    expected = process_rows(rows)
+    assert expected.segment_count() > 2
+    assert process_tracks(columns).to_dict() == expected.to_dict()
+
+
+def test_columns_from_csv_empty():
+    columns = columns_from_csv([b'id,user_id,lat,lng,acc,time'], lambda user_ids: {})
+    assert len(columns) == 0 and process_tracks(columns).segment_count() == 0